@@ -1,4 +1,4 @@
-import os, json, datetime, asyncio
+import os, json, gzip, hmac, datetime, asyncio
 from pathlib import Path
 from flask import Flask, request, jsonify, render_template, send_file, abort
 from flask_sqlalchemy import SQLAlchemy
@@ -11,6 +11,15 @@ app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///rmc.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
 
+# ---------- Materials (apps/ingredients.json, shared with the desktop) ----------
+INGREDIENTS_PATH = Path(os.environ.get("RMC_INGREDIENTS") or Path(__file__).resolve().parents[2] / "ingredients.json")
+MATERIALS = json.loads(INGREDIENTS_PATH.read_text(encoding="utf-8"))["materials"]
+MAT_KEYS = [m["key"] for m in MATERIALS]                                   # recipe/actual keys, display order
+PLANT_KEYS = {n.lower(): m["key"] for m in MATERIALS for n in (m.get("plant") or [m["key"]])}   # plant name -> key
+
+# ---------- Plant link ----------
+PLANT_TOKEN = os.environ.get("RMC_PLANT_TOKEN", "")   # the desktop's sync "token"; unset: plant batches are refused
+
 # ---------- Models ----------
 class Setting(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -41,7 +50,7 @@ class Recipe(db.Model):
 class RecipeItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)
-    material = db.Column(db.String(16), nullable=False)  # cement/sand/agg1/agg2/water/admix
+    material = db.Column(db.String(16), nullable=False)  # a MAT_KEYS entry
     per_m3_qty = db.Column(db.Float, nullable=False)
 
 class Order(db.Model):
@@ -61,7 +70,7 @@ class OrderRow(db.Model):
     seq_no = db.Column(db.Integer, nullable=False)
     planned_m3 = db.Column(db.Float, nullable=False, default=1.000)
     state = db.Column(db.String(16), default="pending")  # pending/running/done
-    actual_json = db.Column(db.Text)  # JSON {cement,sand,agg1,agg2,water,admix}
+    actual_json = db.Column(db.Text)  # JSON {material key: kg}
     started_at = db.Column(db.DateTime)
     done_at = db.Column(db.DateTime)
     car_run_id = db.Column(db.Integer, db.ForeignKey("car_run.id"), nullable=True)
@@ -79,12 +88,23 @@ class CarRun(db.Model):
     order = db.relationship("Order", backref="car_runs")
     vehicle = db.relationship("Vehicle")
 
+class PlantBatch(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    uid = db.Column(db.String(64), unique=True, nullable=False)  # desktop batch id; replays are ignored
+    plant = db.Column(db.String(64))
+    recipe = db.Column(db.String(128))
+    batch_at = db.Column(db.DateTime, nullable=False)
+    items_json = db.Column(db.Text, nullable=False)  # JSON [{name,target,actual}] as weighed
+    total_kg = db.Column(db.Float)
+    order_row_id = db.Column(db.Integer, db.ForeignKey("order_row.id"), nullable=True)
+    received_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
 # ---------- Helpers ----------
 def now(): return datetime.datetime.utcnow()
 def round3(x: float) -> float: return float(f"{x:.3f}")
 
 def recipe_to_dict(recipe):
-    out = {"cement":0,"sand":0,"agg1":0,"agg2":0,"water":0,"admix":0}
+    out = dict.fromkeys(MAT_KEYS, 0)
     for it in recipe.items: out[it.material] = it.per_m3_qty
     return out
 
@@ -126,14 +146,8 @@ def ensure_seed():
 
         if Recipe.query.count() == 0:
             r = Recipe(name="M25 DEFAULT"); db.session.add(r)
-            db.session.add_all([
-                RecipeItem(recipe=r, material="cement", per_m3_qty=350.0),
-                RecipeItem(recipe=r, material="sand",   per_m3_qty=650.0),
-                RecipeItem(recipe=r, material="agg1",   per_m3_qty=600.0),
-                RecipeItem(recipe=r, material="agg2",   per_m3_qty=400.0),
-                RecipeItem(recipe=r, material="water",  per_m3_qty=180.0),
-                RecipeItem(recipe=r, material="admix",  per_m3_qty=2.500),
-            ])
+            db.session.add_all([RecipeItem(recipe=r, material=m["key"], per_m3_qty=float(m.get("seed_per_m3", 0.0)))
+                                for m in MATERIALS])
 
         if Setting.query.count() == 0:
             db.session.add(Setting(tolerance_pct=2.5, mixer_capacity_m3=1.0))
@@ -215,6 +229,10 @@ def delete_vehicle(vid):
         return jsonify({"error":"Vehicle has related delivery runs and cannot be deleted."}), 400
     v = Vehicle.query.get_or_404(vid); db.session.delete(v); db.session.commit(); return jsonify({"ok": True})
 
+@app.get("/api/materials")
+def list_materials():
+    return jsonify([{"key":m["key"],"label":m.get("label",m["key"]),"kind":m.get("kind")} for m in MATERIALS])
+
 @app.get("/api/recipes")
 def list_recipes():
     rs = Recipe.query.order_by(Recipe.id).all()
@@ -227,7 +245,7 @@ def create_recipe():
     if not nm: return jsonify({"error":"Name required"}), 400
     sp = d.get("setpoints") or {}
     r = Recipe(name=nm); db.session.add(r); db.session.flush()
-    for k in ["cement","sand","agg1","agg2","water","admix"]:
+    for k in MAT_KEYS:
         db.session.add(RecipeItem(recipe_id=r.id, material=k, per_m3_qty=float(sp.get(k,0))))
     db.session.commit(); return jsonify({"id": r.id}), 201
 
@@ -242,7 +260,7 @@ def update_recipe(rid):
     if "setpoints" in d and isinstance(d["setpoints"], dict):
         for it in list(r.items): db.session.delete(it)
         sp = d["setpoints"]
-        for k in ["cement","sand","agg1","agg2","water","admix"]:
+        for k in MAT_KEYS:
             db.session.add(RecipeItem(recipe_id=r.id, material=k, per_m3_qty=float(sp.get(k,0))))
     db.session.commit(); return jsonify({"ok": True})
 
@@ -337,7 +355,7 @@ def _rollback_running_rows(order_id: int):
 
 def _summary_for_order(o: Order):
     setp = recipe_to_dict(o.recipe)
-    mats = ["cement","sand","agg1","agg2","water","admix"]
+    mats = list(setp)
     set_tot = {m:0.0 for m in mats}
     act_tot = {m:0.0 for m in mats}
     delta   = {m:0.0 for m in mats}
@@ -407,6 +425,11 @@ def simulate_actual(setpoints: dict, tol_pct: float):
         out[k] = float(f"{v*(1.0+jitter):.3f}")
     return out
 
+def _finish_row(r: OrderRow, actual: dict):
+    r.actual_json = json.dumps(actual); r.done_at=now(); r.state="done"
+    remain = OrderRow.query.filter_by(order_id=r.order_id).filter(OrderRow.state!="done", OrderRow.id!=r.id).count()
+    if remain == 0: Order.query.get(r.order_id).status="done"
+
 @app.post("/api/orders/<int:oid>/rows/<int:rid>/mark-done")
 def mark_done(oid, rid):
     r = OrderRow.query.filter_by(order_id=oid, id=rid).first_or_404()
@@ -415,12 +438,66 @@ def mark_done(oid, rid):
     actual = simulate_actual(recipe_to_dict(recipe), s.tolerance_pct if s else 2.5)
     scale = r.planned_m3 / 1.0
     for k in actual: actual[k] = float(f"{actual[k]*scale:.3f}")
-    r.actual_json = json.dumps(actual); r.done_at=now(); r.state="done"
-    remain = OrderRow.query.filter_by(order_id=oid).filter(OrderRow.state!="done").count()
-    if remain == 0: Order.query.get(oid).status="done"
-    db.session.commit()
+    _finish_row(r, actual); db.session.commit()
     return jsonify({"ok": True, "actual": actual})
 
+# ---------- Plant batches (measured weights synced from the desktop SCADA) ----------
+def _plant_batch(plant, b: dict) -> PlantBatch:
+    items = [{"name": str(i["name"]), "target": float(i.get("target") or 0.0), "actual": float(i["actual"])}
+             for i in b.get("items") or []]
+    pb = PlantBatch(uid=str(b["uid"]), plant=plant, recipe=b.get("recipe"),
+                    batch_at=datetime.datetime.utcfromtimestamp(float(b["t"])),
+                    items_json=json.dumps(items), total_kg=round3(sum(i["actual"] for i in items)))
+    # a batch made for an order row completes that row with the measured (not simulated) weights
+    if b.get("orderId") and b.get("rowId"):
+        r = OrderRow.query.filter_by(order_id=int(b["orderId"]), id=int(b["rowId"])).first()
+        if r is not None:
+            pb.order_row_id = r.id
+            if r.state != "done":
+                actual = {m: 0.0 for m in recipe_to_dict(r.order.recipe)}
+                for i in items:
+                    k = PLANT_KEYS.get(i["name"].lower())
+                    if k in actual: actual[k] = round3(actual[k] + i["actual"])
+                _finish_row(r, actual)
+    return pb
+
+@app.post("/api/plant/batches")
+def ingest_plant_batches():
+    """Body {plant, batches:[{uid,t,recipe,items:[{name,target,actual}],orderId?,rowId?}]}, optionally gzip.
+    Idempotent: every uid received before is acknowledged again but not stored twice.
+    Needs "Authorization: Bearer <RMC_PLANT_TOKEN>" (it writes production and completes order rows)."""
+    auth = request.headers.get("Authorization", "")
+    if not PLANT_TOKEN or not hmac.compare_digest(auth.encode(), f"Bearer {PLANT_TOKEN}".encode()):
+        return jsonify({"error": "missing or wrong plant token"}), 401
+    raw = request.get_data()
+    if request.headers.get("Content-Encoding", "").lower() == "gzip":
+        try: raw = gzip.decompress(raw)
+        except (OSError, EOFError): return jsonify({"error":"bad gzip body"}), 400
+    try:
+        d = json.loads(raw or b"{}"); batches = d.get("batches") or []
+        uids = [str(b["uid"]) for b in batches]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return jsonify({"error":"expected {plant, batches:[{uid,...}]}"}), 400
+    known = {u for (u,) in db.session.query(PlantBatch.uid).filter(PlantBatch.uid.in_(uids)).all()} if uids else set()
+    added = 0
+    try:
+        for b in batches:
+            if str(b["uid"]) in known: continue
+            db.session.add(_plant_batch(d.get("plant"), b)); known.add(str(b["uid"])); added += 1
+        db.session.commit()
+    except (ValueError, KeyError, TypeError, OverflowError, OSError) as e:   # OverflowError/OSError: t out of range
+        db.session.rollback(); return jsonify({"error": f"bad batch: {e}"}), 400
+    return jsonify({"ok": True, "accepted": uids, "added": added, "duplicates": len(uids) - added})
+
+@app.get("/api/plant/batches")
+def list_plant_batches():
+    limit = request.args.get("limit", default=50, type=int)
+    q = PlantBatch.query.order_by(PlantBatch.batch_at.desc()).limit(limit).all()
+    return jsonify([{
+        "uid": b.uid, "plant": b.plant, "recipe": b.recipe, "batch_at": b.batch_at.isoformat(),
+        "items": json.loads(b.items_json), "total_kg": b.total_kg, "order_row_id": b.order_row_id
+    } for b in q])
+
 # ---------- Runs ----------
 @app.get("/api/runs/by-order/<int:oid>")
 def runs_by_order(oid):
@@ -481,7 +558,8 @@ def row_view(o: Order, only_vehicle_id=None):
         rows = [r for r in rows if r.car_run_id in run_ids]
     view=[]; totals = {"planned_m3":0, "set":{k:0 for k in setp}, "act":{k:0 for k in setp}, "delta":{k:0 for k in setp}}
     for r in rows:
-        actual = json.loads(r.actual_json) if r.actual_json else {k:None for k in setp}
+        actual = json.loads(r.actual_json) if r.actual_json else {}
+        actual = {k: actual.get(k) for k in setp}     # rows finished before a material was added: None
         delta={}
         for k in setp:
             sv = round3(setp[k] * r.planned_m3)
@@ -518,7 +596,8 @@ def loads_html(oid):
     veh = Vehicle.query.get(vehicle_id) if vehicle_id else None
     return render_template("loads.html",
         order=o, client=o.client.name, recipe=o.recipe.name,
-        vehicle=veh, rows=rows, totals=totals, tolerance_pct=tol
+        vehicle=veh, rows=rows, totals=totals, tolerance_pct=tol,
+        materials=[(m["key"], m.get("label", m["key"])) for m in MATERIALS]
     )
 
 async def render_pdf_with_playwright(url: str, out_path: Path):
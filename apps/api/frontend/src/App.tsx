@@ -11,6 +11,7 @@ import Settings from "./pages/Settings";
 import Orders from "./pages/Orders";
 import Production from "./pages/Production";
 import Reports from "./pages/Reports";
+import PlantMirror from "./pages/PlantMirror";
 
 export default function App(){
   return (
@@ -25,6 +26,7 @@ export default function App(){
           <Route path="/orders" element={<Orders />} />
           <Route path="/production" element={<Production />} />
           <Route path="/reports" element={<Reports />} />
+          <Route path="/plant" element={<PlantMirror />} />
           <Route path="*" element={<Navigate to="/" replace />} />
         </Routes>
       </Layout>
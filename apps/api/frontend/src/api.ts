@@ -23,7 +23,8 @@ async function http<T>(path: string, opts: RequestInit = {}): Promise<T> {
 /* ---------- Types ---------- */
 export type Client = { id: number; name: string; cell?: string|null; email?: string|null; office_addr?: string|null; delivery_addr?: string|null; };
 export type Vehicle = { id: number; name: string; capacity_m3: number; plate?: string|null; driver_name?: string|null; };
-export type Mat = { cement:number; sand:number; agg1:number; agg2:number; water:number; admix:number };
+export type Mat = Record<string, number>;   // material key -> kg (keys from /api/materials)
+export type Material = { key:string; label:string; kind?:string|null };
 export type Recipe = { id:number; name:string; setpoints: Mat };
 export type OrderRow = { id:number; seq_no:number; planned_m3:number; state:string; actual?:Mat|null; car_run_id?:number|null };
 export type Order = { id:number; client:{id:number; name:string}; recipe:{id:number; name:string; setpoints:Mat}; total_m3:number; status:string; rows:OrderRow[]; };
@@ -42,6 +43,9 @@ export async function createVehicle(name:string, capacity_m3=15, plate?:string,
 export async function updateVehicle(id:number, p:Partial<Pick<Vehicle,"name"|"capacity_m3"|"plate"|"driver_name">>){ return http<{ok:boolean}>(`/api/vehicles/${id}`,{method:"PUT",body:JSON.stringify(p)}); }
 export async function deleteVehicle(id:number){ return http<{ok:boolean}>(`/api/vehicles/${id}`,{method:"DELETE"}); }
 
+/* ---------- Materials ---------- */
+export async function listMaterials(){ return http<Material[]>("/api/materials"); }
+
 /* ---------- Recipes ---------- */
 export async function listRecipes(){ return http<Recipe[]>("/api/recipes"); }
 export async function createRecipe(name:string, setpoints:Mat){ return http<{id:number}>("/api/recipes",{method:"POST",body:JSON.stringify({name,setpoints})}); }
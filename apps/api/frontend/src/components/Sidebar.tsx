@@ -5,6 +5,7 @@ import {
   ClipboardList,  // Orders
   FlaskConical,   // Production
   FileText,       // Reports
+  Factory,        // Plant (live mirror)
   Users,          // Clients
   Beaker,         // Recipes
   Truck,          // Vehicles
@@ -16,6 +17,7 @@ const links = [
   { to: "/orders",     label: "Orders",     icon: ClipboardList },
   { to: "/production", label: "Production", icon: FlaskConical },
   { to: "/reports",    label: "Reports",    icon: FileText },
+  { to: "/plant",      label: "Plant",      icon: Factory },
   { to: "/clients",    label: "Clients",    icon: Users },
   { to: "/recipes",    label: "Recipes",    icon: Beaker },
   { to: "/vehicles",   label: "Vehicles",   icon: Truck },
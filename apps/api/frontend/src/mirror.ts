@@ -0,0 +1,69 @@
+// frontend/src/mirror.ts — read-only plant mirror client (desktop HMI -> WebSocket, binary frames)
+// Frame layout: apps/desktop/mirror/frames.py. The first message is the hello JSON (text).
+import { useEffect, useRef, useState } from "react";
+
+export const MIRROR_URL: string = import.meta.env.VITE_MIRROR_URL || "ws://127.0.0.1:8765";
+
+export type MirrorSilo = { name:string; tag:string; run:string; capacity_kg:number };
+export type MirrorIngredient = { name:string; label:string; kind:string; tag:string; feed?:string|null; capacity_kg:number; target_kg:number };
+export type MirrorTank = { name:string; tag:string; capacity_kg:number };
+export type MirrorHello = { v:number; recipe?:string; silos:MirrorSilo[]; ingredients:MirrorIngredient[]; tanks:MirrorTank[]; mixer:{run:string; gate:string} };
+export type TagValue = number | boolean | string;
+export type MirrorStatus = "connecting" | "live" | "closed";
+
+const NAMES = 1, NUM = 0, BOOL = 1;
+const utf8 = new TextDecoder();
+
+/** Applies frames to `values`; returns the frame sequence number (0 for a names frame). */
+export function applyFrame(buf: ArrayBuffer, kinds: Map<number, number>, names: Map<number, string>, values: Map<string, TagValue>): number {
+  const dv = new DataView(buf); const bytes = new Uint8Array(buf);
+  if (dv.getUint8(0) === NAMES) {
+    const n = dv.getUint16(1, true); let p = 3;
+    for (let k = 0; k < n; k++) {
+      const id = dv.getUint16(p, true), kind = dv.getUint8(p + 2), len = dv.getUint8(p + 3); p += 4;
+      names.set(id, utf8.decode(bytes.subarray(p, p + len))); kinds.set(id, kind); p += len;
+    }
+    return 0;
+  }
+  const seq = dv.getUint32(1, true), n = dv.getUint16(13, true); let p = 15;
+  for (let k = 0; k < n; k++) {
+    const id = dv.getUint16(p, true), kind = kinds.get(id); p += 2;
+    let v: TagValue;
+    if (kind === NUM) { v = dv.getFloat32(p, true); p += 4; }
+    else if (kind === BOOL) { v = dv.getUint8(p) !== 0; p += 1; }
+    else { const len = dv.getUint8(p); v = utf8.decode(bytes.subarray(p + 1, p + 1 + len)); p += 1 + len; }
+    const name = names.get(id); if (name !== undefined) values.set(name, v);
+  }
+  return seq;
+}
+
+/** Connects (and reconnects, backing off to 10 s) while mounted; re-renders at most once per animation frame. */
+export function useMirror(url: string) {
+  const values = useRef(new Map<string, TagValue>());
+  const [hello, setHello] = useState<MirrorHello | null>(null);
+  const [status, setStatus] = useState<MirrorStatus>("connecting");
+  const [seq, setSeq] = useState(0);
+
+  useEffect(() => {
+    let ws: WebSocket | null = null, timer = 0, raf = 0, backoff = 500, stopped = false, last = 0;
+    const kinds = new Map<number, number>(), names = new Map<number, string>();
+    const open = () => {
+      setStatus("connecting"); ws = new WebSocket(url); ws.binaryType = "arraybuffer";
+      ws.onopen = () => { backoff = 500; };
+      ws.onmessage = (e) => {
+        if (typeof e.data === "string") { kinds.clear(); names.clear(); values.current.clear(); setHello(JSON.parse(e.data)); setStatus("live"); return; }
+        const s = applyFrame(e.data as ArrayBuffer, kinds, names, values.current);
+        if (s) last = s;
+        if (!raf) raf = requestAnimationFrame(() => { raf = 0; setSeq(last); });
+      };
+      ws.onclose = () => {
+        setStatus("closed"); if (stopped) return;
+        timer = window.setTimeout(open, backoff); backoff = Math.min(10000, backoff * 2);
+      };
+    };
+    open();
+    return () => { stopped = true; clearTimeout(timer); cancelAnimationFrame(raf); ws?.close(); };
+  }, [url]);
+
+  return { hello, status, seq, values: values.current };
+}
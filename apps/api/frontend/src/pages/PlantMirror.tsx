@@ -0,0 +1,76 @@
+// frontend/src/pages/PlantMirror.tsx — live, read-only view of the desktop HMI (silos, hoppers, tanks, mixer)
+import React, { useState } from "react";
+import { Panel, Badge, Button } from "../components/ui";
+import { MIRROR_URL, useMirror } from "../mirror";
+import type { TagValue } from "../mirror";
+
+const num = (v: TagValue | undefined) => (typeof v === "number" && Number.isFinite(v) ? v : 0);
+
+function Bar({ label, value, max, unit, target, on }:{ label:string; value:number; max:number; unit:string; target?:number; on?:boolean }){
+  const pct = max > 0 ? Math.max(0, Math.min(100, value * 100 / max)) : 0;
+  const tgt = target && max > 0 ? Math.min(100, target * 100 / max) : null;
+  return (
+    <div>
+      <div className="flex items-center justify-between text-sm">
+        <span className="flex items-center gap-2">
+          {on !== undefined && <span className={`h-2 w-2 rounded-full ${on ? "bg-emerald-500" : "bg-slate-300"}`} />}
+          {label}
+        </span>
+        <span className="tabular-nums text-slate-600">{value.toFixed(unit === "%" ? 1 : value < 20 ? 2 : 0)} {unit}</span>
+      </div>
+      <div className="relative h-3 mt-1 rounded bg-slate-100 overflow-hidden">
+        <div className="h-full bg-blue-500 transition-[width] duration-200" style={{ width: `${pct}%` }} />
+        {tgt !== null && <div className="absolute top-0 h-full w-0.5 bg-amber-500" style={{ left: `${tgt}%` }} />}
+      </div>
+    </div>
+  );
+}
+
+export default function PlantMirror(){
+  const [input, setInput] = useState(MIRROR_URL);
+  const [url, setUrl] = useState(MIRROR_URL);
+  const { hello, status, seq, values } = useMirror(url);
+  const v = (tag: string) => values.get(tag);
+
+  return (
+    <div className="space-y-6">
+      <Panel className="p-4 flex flex-wrap items-center gap-3">
+        <h3 className="font-semibold mr-auto">Plant (live)</h3>
+        <Badge tone={status === "live" ? "green" : "amber"}>{status}{status === "live" ? ` · #${seq}` : ""}</Badge>
+        {hello?.recipe && <Badge>{hello.recipe}</Badge>}
+        <input className="input w-64" value={input} onChange={e=>setInput(e.target.value)} />
+        <Button variant="primary" onClick={()=>setUrl(input.trim())}>Connect</Button>
+      </Panel>
+
+      {hello && (
+        <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
+          <Panel className="p-4 space-y-3">
+            <h4 className="font-semibold">Silos &amp; tanks</h4>
+            {hello.silos.map(s=>(
+              <Bar key={s.tag} label={s.name} value={num(v(s.tag))} max={100} unit="%" on={v(s.run) === true} />
+            ))}
+            {hello.tanks.map(t=>(
+              <Bar key={t.tag} label={t.name} value={num(v(t.tag))} max={t.capacity_kg} unit="kg" />
+            ))}
+          </Panel>
+
+          <Panel className="p-4 space-y-3">
+            <h4 className="font-semibold">Weigh hoppers</h4>
+            {hello.ingredients.map(g=>(
+              <Bar key={g.tag} label={g.label} value={num(v(g.tag))} max={g.capacity_kg} unit="kg" target={g.target_kg}
+                   on={g.feed ? v(g.feed) === true : undefined} />
+            ))}
+          </Panel>
+
+          <Panel className="p-4 space-y-3">
+            <h4 className="font-semibold">Mixer</h4>
+            <div className="flex gap-2">
+              <Badge tone={v(hello.mixer.run) === true ? "green" : "default"}>{v(hello.mixer.run) === true ? "Running" : "Stopped"}</Badge>
+              <Badge tone={v(hello.mixer.gate) === true ? "amber" : "default"}>Gate {v(hello.mixer.gate) === true ? "open" : "closed"}</Badge>
+            </div>
+          </Panel>
+        </div>
+      )}
+    </div>
+  );
+}
@@ -1,10 +1,12 @@
 import React, { useEffect, useState } from "react";
-import { Recipe, Mat, listRecipes, createRecipe, updateRecipe, deleteRecipe, getSettings } from "../api";
+import { Recipe, Mat, Material, listRecipes, createRecipe, updateRecipe, deleteRecipe, getSettings, listMaterials } from "../api";
 
-const emptyMat: Mat = {cement:0,sand:0,agg1:0,agg2:0,water:0,admix:0};
-const mats: (keyof Mat)[] = ["cement","sand","agg1","agg2","water","admix"];
+const emptyOf = (ms: Material[]): Mat => Object.fromEntries(ms.map(m=>[m.key, 0]));
 
 export default function Recipes(){
+  const [materials, setMaterials] = useState<Material[]>([]);
+  const mats = materials.map(m=>m.key);
+  const emptyMat = emptyOf(materials);
   const [recipes, setRecipes] = useState<Recipe[]>([]);
   const [name, setName] = useState("");
   const [sp, setSp] = useState<Mat>({...emptyMat});
@@ -14,6 +16,8 @@ export default function Recipes(){
   const [eSp, setESp] = useState<Mat>({...emptyMat});
 
   const refresh = async ()=>{
+    const ms = await listMaterials(); setMaterials(ms);
+    setSp(sp=>({...emptyOf(ms), ...sp}));
     setRecipes(await listRecipes());
     const st = await getSettings();
     if(st?.default_recipe) setSp(st.default_recipe.setpoints);
@@ -21,7 +25,7 @@ export default function Recipes(){
   useEffect(()=>{ refresh(); },[]);
 
   const beginEdit = (r: Recipe)=>{
-    setEditId(r.id); setEName(r.name); setESp({...r.setpoints});
+    setEditId(r.id); setEName(r.name); setESp({...emptyMat, ...r.setpoints});
   };
   const cancelEdit = ()=>{ setEditId(null); };
 
@@ -55,9 +59,9 @@ export default function Recipes(){
           <input className="input md:col-span-3" placeholder="Name (e.g., M25 DEFAULT)" value={name} onChange={e=>setName(e.target.value)} />
           {mats.map(k=>(
             <div key={k} className="flex items-center gap-2">
-              <label className="w-20 capitalize">{k}</label>
+              <label className="w-20">{materials.find(m=>m.key===k)?.label ?? k}</label>
               <input className="input" type="number" step="0.001"
-                     value={sp[k]} onChange={e=>setSp({...sp, [k]: Number(e.target.value)})}/>
+                     value={sp[k] ?? 0} onChange={e=>setSp({...sp, [k]: Number(e.target.value)})}/>
             </div>
           ))}
           <div className="md:col-span-3">
@@ -71,7 +75,7 @@ export default function Recipes(){
               <tr>
                 <th style={{width:60}}>ID</th>
                 <th style={{minWidth:180}}>Name</th>
-                {mats.map(m=> <th key={m} className="capitalize">{m}</th>)}
+                {materials.map(m=> <th key={m.key}>{m.label}</th>)}
                 <th style={{width:200}}>Actions</th>
               </tr>
             </thead>
@@ -88,8 +92,8 @@ export default function Recipes(){
                     <td key={m}>
                       {editId===r.id
                         ? <input className="input" type="number" step="0.001"
-                                 value={eSp[m]} onChange={e=>setESp({...eSp, [m]: Number(e.target.value)})}/>
-                        : r.setpoints[m]}
+                                 value={eSp[m] ?? 0} onChange={e=>setESp({...eSp, [m]: Number(e.target.value)})}/>
+                        : (r.setpoints[m] ?? 0)}
                     </td>
                   ))}
                   <td className="flex gap-2">
@@ -0,0 +1,3 @@
+# alarms package — plant alarms (deadband, delays, priority, ack, shelving, flood suppression) and their journal (no Qt)
+from .engine import AlarmDef, Alarm, AlarmEngine, PRIORITIES, NORMAL, UNACK, ACKED, RTN_UNACK, parse_alarm, compile_alarms
+from .journal import AlarmJournal, JournalReader, KINDS
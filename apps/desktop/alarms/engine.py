@@ -0,0 +1,240 @@
+# alarms/engine.py — alarms on plant tags: deadband, on/off delays, priority, ack, shelving, flood suppression (no Qt)
+#
+# An alarm is one condition on one tag, written like an interlock condition:
+#   {"id": "water_tank.empty", "text": "Water tank empty", "when": "water_tank.kg <= 0", "deadband": 5, "priority": "high"}
+#   deadband     an alarm on "< L" clears at L + deadband, on "> L" at L - deadband (no chatter around the limit)
+#   on_delay_s   the condition must hold this long before the alarm raises; off_delay_s: be gone before it clears
+#   "{silo}" / "{n}" repeat an alarm per silo / aggregate hopper. Built in: each weigh hopper at its capacity
+#   (overfill) and each dosed ingredient whose last dose missed its tolerance (dosing.<name>.out_of_tol).
+# evaluate() (every plant tick) looks only at the alarms whose tag changed (TagBus.watch) and at pending
+# delays and shelves. An active or unacknowledged alarm is listed until it is both cleared and acknowledged;
+# a shelved one is not listed until its shelf time ends. More than flood.max raises within flood.window_s is
+# a flood: until the rate drops again, new alarms below flood.keep priority are suppressed (journaled, not
+# listed; listed when the flood ends if still active). Every transition goes to the journal.
+import time
+from collections import deque
+from dataclasses import dataclass
+from interlocks import RuleError, parse_condition
+
+PRIORITIES = {"high": 1, "medium": 2, "low": 3}
+NORMAL, UNACK, ACKED, RTN_UNACK = "normal", "unack", "acked", "rtn_unack"   # ISA-18.2 annunciation states
+
+@dataclass(frozen=True)
+class AlarmDef:
+    id: str
+    text: str
+    tag: str
+    op: str
+    limit: object                      # a number, or a bool for on/off tags (bool(value) == limit)
+    deadband: float = 0.0
+    on_delay_s: float = 0.0
+    off_delay_s: float = 0.0
+    priority: int = 2
+
+class Alarm:
+    """Runtime state of one AlarmDef; state is the annunciation state (NORMAL, UNACK, ACKED, RTN_UNACK)."""
+    __slots__ = ("d", "cond", "active", "acked", "t", "value", "shelved_until", "suppressed")
+
+    def __init__(self, d: AlarmDef):
+        self.d = d; self.cond = False; self.active = False; self.acked = True; self.t = 0.0; self.value = None
+        self.shelved_until = 0.0; self.suppressed = False
+
+    @property
+    def state(self) -> str:
+        if self.active: return ACKED if self.acked else UNACK
+        return NORMAL if self.acked else RTN_UNACK
+
+    @property
+    def listed(self) -> bool:
+        return (self.active or not self.acked) and not self.shelved_until and not self.suppressed
+
+def parse_alarm(d: dict, *, n_aggs: int = 0, n_silos: int = 0) -> list[AlarmDef]:
+    """One config alarm -> AlarmDef(s); raises RuleError (the interlock rule error: same condition syntax)."""
+    if not isinstance(d, dict): raise RuleError(f"expected an object, got {d!r}")
+    aid = d.get("id")
+    if not isinstance(aid, str) or not aid: raise RuleError("alarm without an id")
+    try:
+        tag, op, limit = parse_condition(d.get("when"))
+        pr = d.get("priority", "medium")
+        if pr not in PRIORITIES: raise RuleError(f"priority {pr!r}: expected one of {', '.join(PRIORITIES)}")
+        nums = {}
+        for k in ("deadband", "on_delay_s", "off_delay_s"):
+            v = d.get(k, 0.0)
+            if isinstance(v, bool) or not isinstance(v, (int, float)) or v < 0: raise RuleError(f"{k}: expected a number >= 0, got {v!r}")
+            nums[k] = float(v)
+    except RuleError as e:
+        raise RuleError(f"{aid}: {e}") from None
+    text = str(d.get("text", aid))
+    if "{silo}" in aid + text + tag: keys, n = "{silo}", n_silos
+    elif "{n}" in aid + text + tag: keys, n = "{n}", n_aggs
+    else: return [AlarmDef(aid, text, tag, op, limit, priority=PRIORITIES[pr], **nums)]
+    return [AlarmDef(aid.replace(keys, str(i)), text.replace(keys, str(i)), tag.replace(keys, str(i)), op, limit,
+                     priority=PRIORITIES[pr], **nums) for i in range(1, n + 1)]
+
+def builtin_alarms(acfg: dict, ingr, dosed: tuple[str, ...] = ()) -> list[AlarmDef]:
+    """Overfill per weigh hopper (at its capacity, 1 % deadband) and out of tolerance per dosed ingredient."""
+    out = []
+    if ingr is not None and acfg.get("overfill", True):
+        out += [AlarmDef(f"{g.prefix}.overfill", f"{g.name} hopper overfilled", g.weight_tag, ">=", ingr.cap[k],
+                         deadband=ingr.cap[k] * 0.01, priority=1) for k, g in enumerate(ingr.items)]
+    if acfg.get("tolerance", True):
+        out += [AlarmDef(f"dosing.{n}.out_of_tol", f"{n} batch out of tolerance", f"dosing.{n}.out_of_tol", "==", True,
+                         priority=2) for n in dosed]
+    return out
+
+def compile_alarms(acfg: dict | None, ingr=None, *, dosed: tuple[str, ...] = (), n_aggs: int = 0, n_silos: int = 0) -> list[AlarmDef]:
+    acfg = acfg or {}
+    defs = builtin_alarms(acfg, ingr, dosed)
+    for d in acfg.get("defs") or []: defs += parse_alarm(d, n_aggs=n_aggs, n_silos=n_silos)
+    seen = set()
+    for a in defs:
+        if a.id in seen: raise RuleError(f"{a.id}: alarm id used twice")
+        seen.add(a.id)
+    return defs
+
+class AlarmEngine:
+    """
+    Alarms indexed by tag; evaluate(now) checks only the alarms whose tag changed, then due delays and shelves.
+    Operator actions: ack(id) / ack() (all listed), shelve(id, s), unshelve(id). Each transition is passed to
+    journal.submit(t, alarm_id, kind, priority, value, text) and bumps `version` (the panel redraws on change);
+    the counts are published as alarms.listed / alarms.unacked / alarms.shelved / alarms.suppressed / alarms.flood.
+      stats: raised, suppressed_total, floods, checked (condition checks)
+    """
+    def __init__(self, bus, defs: list[AlarmDef], *, journal=None, flood_window_s: float = 10.0, flood_max: int = 10,
+                 flood_keep: int = 1, max_shelve_s: float = 8 * 3600.0):
+        self.bus = bus; self.journal = journal
+        self.alarms = [Alarm(d) for d in defs]; self.by_id = {a.d.id: a for a in self.alarms}
+        self._by_tag: dict[str, list[Alarm]] = {}
+        for a in self.alarms: self._by_tag.setdefault(a.d.tag, []).append(a)
+        self._dirty = bus.watch(self._by_tag); self._dirty.update(self._by_tag)       # first call checks all
+        self._pending: dict[str, float] = {}; self._shelved: dict[str, float] = {}
+        self.flood_window_s = float(flood_window_s); self.flood_max = int(flood_max); self.flood_keep = int(flood_keep)
+        self.max_shelve_s = float(max_shelve_s)
+        self._raises: deque[float] = deque(); self.flood = False
+        self.version = 0; self.raised = 0; self.suppressed_total = 0; self.floods = 0; self.checked = 0
+        self._counts = None
+
+    @classmethod
+    def from_config(cls, acfg: dict, bus, ingr=None, *, dosed=(), n_aggs: int = 0, n_silos: int = 0, journal=None) -> "AlarmEngine":
+        fl = acfg.get("flood") or {}
+        return cls(bus, compile_alarms(acfg, ingr, dosed=tuple(dosed), n_aggs=n_aggs, n_silos=n_silos), journal=journal,
+                   flood_window_s=fl.get("window_s", 10.0), flood_max=fl.get("max", 10),
+                   flood_keep=PRIORITIES.get(fl.get("keep", "high"), 1), max_shelve_s=float(acfg.get("max_shelve_h", 8)) * 3600.0)
+
+    # ---------- evaluation ----------
+    def _cond(self, a: Alarm, v) -> bool:
+        d = a.d; k = d.limit
+        if isinstance(k, bool): return bool(v) is k
+        if v is None or v.__class__ is str: return False
+        op = d.op
+        if a.cond and d.deadband:                          # holds until the value is deadband past the limit
+            if op in ("<", "<="): return v < k + d.deadband
+            if op in (">", ">="): return v > k - d.deadband
+        if op == "<": return v < k
+        if op == "<=": return v <= k
+        if op == ">": return v > k
+        if op == ">=": return v >= k
+        return (v == k) if op == "==" else (v != k)
+
+    def evaluate(self, now: float | None = None) -> int:
+        """Apply changed tags, due delays and shelf ends; returns the number of raise/clear transitions."""
+        now = time.time() if now is None else now; n = 0
+        if self._dirty:
+            get = self.bus.value; pending = self._pending
+            for tag in self._dirty:
+                v = get(tag)
+                for a in self._by_tag[tag]:
+                    self.checked += 1; a.value = v
+                    c = self._cond(a, v)
+                    if c == a.cond: continue
+                    a.cond = c
+                    if c == a.active: pending.pop(a.d.id, None); continue      # flicker inside the delay
+                    delay = a.d.on_delay_s if c else a.d.off_delay_s
+                    if delay > 0: pending[a.d.id] = now + delay
+                    else: pending.pop(a.d.id, None); self._set(a, c, now); n += 1
+            self._dirty.clear()
+        if self._pending:
+            for aid, due in list(self._pending.items()):
+                if now >= due:
+                    del self._pending[aid]; a = self.by_id[aid]
+                    if a.cond != a.active: self._set(a, a.cond, now); n += 1
+        if self._shelved:
+            for aid, until in list(self._shelved.items()):
+                if now >= until: self.unshelve(aid, now, why="expired")
+        if self.flood: self._flood_check(now)
+        self._publish_counts()
+        return n
+
+    def _set(self, a: Alarm, active: bool, now: float):
+        a.active = active; a.t = now; self.version += 1
+        if active:
+            a.acked = False; self.raised += 1
+            self._raises.append(now); self._flood_check(now)
+            if self.flood and a.d.priority > self.flood_keep:
+                a.suppressed = True; self.suppressed_total += 1; self._log(now, a, "suppressed")
+            else: self._log(now, a, "raise")
+        else:
+            if a.suppressed or a.shelved_until: a.acked = True             # nobody was shown it: nothing to ack
+            a.suppressed = False; self._log(now, a, "clear")
+
+    def _flood_check(self, now: float):
+        r = self._raises; cut = now - self.flood_window_s
+        while r and r[0] < cut: r.popleft()
+        if not self.flood and len(r) > self.flood_max:
+            self.flood = True; self.floods += 1; self.version += 1; self._log(now, None, "flood", f"{len(r)} alarms in {self.flood_window_s:g} s")
+        elif self.flood and len(r) <= self.flood_max // 2:
+            self.flood = False; self.version += 1
+            held = [a for a in self.alarms if a.suppressed]
+            for a in held: a.suppressed = False
+            self._log(now, None, "flood_end", f"{len(held)} suppressed alarm(s) still active")
+
+    def _log(self, now: float, a: Alarm | None, kind: str, text: str | None = None):
+        if self.journal is None: return
+        if a is None: self.journal.submit(now, "", kind, 0, None, text or ""); return
+        v = a.value
+        self.journal.submit(now, a.d.id, kind, a.d.priority, float(v) if isinstance(v, (int, float)) else None,
+                            a.d.text if text is None else text)
+
+    def _publish_counts(self):
+        if self._counts == self.version: return
+        self._counts = self.version; listed = unacked = shelved = supp = 0
+        for a in self.alarms:
+            if a.listed: listed += 1; unacked += not a.acked
+            shelved += bool(a.shelved_until); supp += a.suppressed
+        pub = self.bus.publish
+        pub("alarms.listed", listed); pub("alarms.unacked", unacked); pub("alarms.shelved", shelved)
+        pub("alarms.suppressed", supp); pub("alarms.flood", self.flood)
+
+    # ---------- operator ----------
+    def ack(self, aid: str | None = None, now: float | None = None) -> int:
+        """Acknowledge one alarm, or every listed unacknowledged one; returns how many."""
+        now = time.time() if now is None else now; n = 0
+        for a in ([self.by_id[aid]] if aid else [a for a in self.alarms if a.listed]):
+            if a.acked: continue
+            a.acked = True; n += 1; self._log(now, a, "ack")
+        if n: self.version += 1; self._publish_counts()
+        return n
+
+    def shelve(self, aid: str, seconds: float, now: float | None = None):
+        now = time.time() if now is None else now; a = self.by_id[aid]
+        s = max(1.0, min(self.max_shelve_s, float(seconds)))
+        a.shelved_until = self._shelved[aid] = now + s; self.version += 1
+        self._log(now, a, "shelve", f"{a.d.text} (shelved {s / 60.0:g} min)"); self._publish_counts()
+
+    def unshelve(self, aid: str, now: float | None = None, why: str = "operator"):
+        now = time.time() if now is None else now; a = self.by_id[aid]
+        if not self._shelved.pop(aid, None): return
+        a.shelved_until = 0.0; self.version += 1
+        self._log(now, a, "unshelve", f"{a.d.text} ({why})"); self._publish_counts()
+
+    # ---------- views ----------
+    def listed(self) -> list[Alarm]:
+        """Listed alarms, most urgent first: priority, unacknowledged before acknowledged, newest first."""
+        return sorted((a for a in self.alarms if a.listed), key=lambda a: (a.d.priority, a.acked, -a.t))
+
+    def shelved(self) -> list[Alarm]:
+        return sorted((a for a in self.alarms if a.shelved_until), key=lambda a: a.shelved_until)
+
+    def stats(self) -> dict:
+        return {"alarms": len(self.alarms), "listed": sum(a.listed for a in self.alarms), "raised": self.raised,
+                "suppressed": self.suppressed_total, "floods": self.floods, "checked": self.checked}
@@ -0,0 +1,127 @@
+# alarms/journal.py — persisted alarm event journal (SQLite WAL, written off the GUI thread, paged reads)
+#
+# events(id, t, alarm, kind, priority, value, text); kind is raise / clear / ack / shelve / unshelve /
+# suppressed / flood / flood_end. Reads page backwards by id (`before`), so the newest page and every older
+# one cost the same however long the journal gets; the (alarm, id) index serves one alarm's history and
+# the t index time ranges and retention.
+import os, queue, threading, time
+from writer_thread import WriterThread
+
+KINDS = ("raise", "clear", "ack", "shelve", "unshelve", "suppressed", "flood", "flood_end")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events(
+    id INTEGER PRIMARY KEY, t REAL NOT NULL, alarm TEXT NOT NULL, kind TEXT NOT NULL,
+    priority INTEGER NOT NULL, value REAL, text TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS events_t ON events(t);
+CREATE INDEX IF NOT EXISTS events_alarm ON events(alarm, id);
+"""
+
+def _connect(path: str):
+    import sqlite3                                          # not at HMI startup: the journal opens after the first frame
+    db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL"); db.execute("PRAGMA synchronous=NORMAL"); db.executescript(SCHEMA)
+    return db
+
+class AlarmJournal(WriterThread):
+    """
+    submit() queues an event and returns; this thread writes everything queued in one transaction
+    (a flood of a few hundred transitions is one commit). Events older than retain_days are deleted
+    at start and then once an hour. A failed write keeps its events for the next drain.
+      stats: submitted, written, errors, last_error, max_write_ms
+    """
+    def __init__(self, path: str, *, retain_days: float = 90.0):
+        super().__init__("alarm-journal")
+        self.path = path; self.retain_days = float(retain_days)
+        self._q: queue.SimpleQueue = queue.SimpleQueue(); self._idle = threading.Condition()
+        self.submitted = 0; self.written = 0; self.errors = 0; self.last_error = ""; self.max_write_ms = 0.0
+
+    @classmethod
+    def from_config(cls, acfg: dict, base_dir: str) -> "AlarmJournal":
+        path = acfg.get("journal", "alarms.db")
+        return cls(path if os.path.isabs(path) else os.path.join(base_dir, path), retain_days=acfg.get("retain_days", 90))
+
+    def submit(self, t: float, alarm: str, kind: str, priority: int, value: float | None, text: str):
+        self.submitted += 1; self._q.put((t, alarm, kind, priority, value, text))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        end = time.monotonic() + timeout
+        with self._idle:
+            while self.written < self.submitted and self.is_alive():
+                left = end - time.monotonic()
+                if left <= 0: return False
+                self._idle.wait(min(left, 0.1))
+        return self.written >= self.submitted
+
+    def _signal_stop(self): self._q.put(None)
+
+    def _has_pending(self) -> bool: return self.submitted > self.written
+
+    def run(self):
+        import sqlite3
+        try: db = _connect(self.path)
+        except sqlite3.Error as ex:
+            self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"; return
+        last_trim = float("-inf"); rows: list[tuple] = []; halt = False
+        while not halt:
+            try: first = self._q.get(timeout=1.0)
+            except queue.Empty: first = ()
+            if first is None: halt = True
+            elif first: rows.append(first)
+            while True:
+                try: e = self._q.get_nowait()
+                except queue.Empty: break
+                if e is None: halt = True
+                else: rows.append(e)
+            if rows:
+                s = time.perf_counter()
+                try:
+                    with db:
+                        db.execute("BEGIN"); db.executemany("INSERT INTO events(t, alarm, kind, priority, value, text) VALUES (?,?,?,?,?,?)", rows)
+                except sqlite3.Error as ex:
+                    self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"
+                    if not halt: time.sleep(0.5); continue
+                else:
+                    self.max_write_ms = max(self.max_write_ms, (time.perf_counter() - s) * 1000.0)
+                    with self._idle: self.written += len(rows); self._idle.notify_all()
+                rows = []
+            if self.retain_days > 0 and time.monotonic() - last_trim > 3600.0:
+                last_trim = time.monotonic()
+                try: db.execute("DELETE FROM events WHERE t < ?", (time.time() - self.retain_days * 86400.0,))
+                except sqlite3.Error as ex: self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"
+        db.close()
+
+class JournalReader:
+    """Pages of events, newest first: page(n) then page(n, before=<smallest id seen>); one indexed seek each."""
+    COLS = "id, t, alarm, kind, priority, value, text"
+
+    def __init__(self, path: str):
+        self.path = path; self._db = None
+
+    def _conn(self):
+        if self._db is None and os.path.exists(self.path): self._db = _connect(self.path)
+        return self._db
+
+    def page(self, n: int = 200, *, before: int | None = None, alarm: str | None = None,
+             kinds: tuple[str, ...] | None = None) -> list[tuple]:
+        """Up to n (id, t, alarm, kind, priority, value, text) rows with id < before, newest first."""
+        db = self._conn()
+        if db is None: return []
+        where, args = ["id < ?"], [before if before is not None else 1 << 62]
+        if alarm: where.append("alarm = ?"); args.append(alarm)
+        if kinds: where.append(f"kind IN ({','.join('?' * len(kinds))})"); args += list(kinds)
+        return db.execute(f"SELECT {self.COLS} FROM events WHERE {' AND '.join(where)} ORDER BY id DESC LIMIT ?",
+                          (*args, int(n))).fetchall()
+
+    def between(self, t0: float, t1: float, limit: int = 10000) -> list[tuple]:
+        db = self._conn()
+        if db is None: return []
+        return db.execute(f"SELECT {self.COLS} FROM events WHERE t >= ? AND t < ? ORDER BY t, id LIMIT ?",
+                          (t0, t1, int(limit))).fetchall()
+
+    def count(self) -> int:
+        db = self._conn()
+        return db.execute("SELECT COUNT(*) FROM events").fetchone()[0] if db else 0
+
+    def close(self):
+        if self._db is not None: self._db.close(); self._db = None
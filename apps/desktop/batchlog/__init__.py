@@ -0,0 +1,4 @@
+# batchlog package — batch (discharge) records written off the GUI thread, SQLite or rotated CSV, synced to the API
+from .store import BatchRecord, SqliteBatchStore, CsvBatchStore, open_store, export_csv, import_legacy_csv
+from .writer import BatchLogWriter
+from .sync import BatchSync, Outbox
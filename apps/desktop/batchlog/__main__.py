@@ -0,0 +1,32 @@
+# batchlog/__main__.py — export the batch log to CSV
+#   python -m batchlog export batches_export.csv                 # everything
+#   python -m batchlog export day.csv --since "2026-10-19 00:00" --until "2026-10-20 00:00"
+import argparse, json, os, sys, time
+from .store import open_store, export_csv
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _t(s: str | None) -> float | None:
+    return None if not s else time.mktime(time.strptime(s, "%Y-%m-%d %H:%M" if len(s) > 10 else "%Y-%m-%d"))
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m batchlog", description="Batch log tools")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export", help="write batches to CSV ('-' = stdout)")
+    ex.add_argument("out"); ex.add_argument("--db", help="SQLite batch log (default: config.json batch_log.path)")
+    ex.add_argument("--since"); ex.add_argument("--until")
+    a = ap.parse_args()
+
+    path = a.db
+    if path is None:
+        with open(os.path.join(APP_DIR, "config.json"), encoding="utf-8") as f: bcfg = json.load(f).get("batch_log") or {}
+        if bcfg.get("backend", "sqlite") != "sqlite": sys.exit("batch_log.backend is csv: the log files already are CSV")
+        path = bcfg.get("path", "batches.db")
+        if not os.path.isabs(path): path = os.path.join(APP_DIR, path)
+    store = open_store("sqlite", path, "off")
+    recs = store.records(_t(a.since), _t(a.until)); store.close()
+    export_csv(recs, sys.stdout if a.out == "-" else a.out)
+    if a.out != "-": print(f"{len(recs)} batches -> {a.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# batchlog/store.py — batch records and their on-disk stores (SQLite WAL or rotated CSV)
+#
+# A batch is one discharge: recipe, timestamp and (target, actual) for any number of ingredients.
+# Stores are used from the BatchLogWriter thread only; `fsync` decides when a write is made durable:
+#   always    every record is its own durable commit (slowest, loses nothing)
+#   batch     one durable commit per queue drain (default: a burst of records costs one sync)
+#   interval  synced at most every fsync_s seconds (a crash may lose the last interval)
+#   off       left to the OS page cache
+import csv, io, os, sqlite3, time, uuid
+from dataclasses import dataclass, field
+
+FSYNC = ("always", "batch", "interval", "off")
+
+@dataclass
+class BatchRecord:
+    recipe: str
+    items: list[tuple[str, float, float]]            # (ingredient, target_kg, actual_kg), config order
+    t: float = field(default_factory=time.time)
+    uid: str = field(default_factory=lambda: uuid.uuid4().hex)   # stable id (export/sync dedupe)
+    total_target: float | None = None                # defaults to the sum of the item targets
+
+    @property
+    def total_actual(self) -> float: return sum(a for _, _, a in self.items)
+
+    def target(self) -> float:
+        return sum(t for _, t, _ in self.items) if self.total_target is None else self.total_target
+
+def varpct(target: float, actual: float) -> float:
+    return 0.0 if target == 0 else (actual - target) * 100.0 / target
+
+def stamp(t: float) -> str: return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+def csv_header(names: list[str]) -> list[str]:
+    """BatchTime, Recipe, <Name>_Target/_Actual/_VarPct per ingredient, Total_* (the old batches.csv layout)."""
+    cols = ["BatchTime", "Recipe"]
+    for n in names + ["Total"]: cols += [f"{n}_Target", f"{n}_Actual", f"{n}_VarPct"]
+    return cols
+
+def csv_row(rec: BatchRecord, names: list[str]) -> list[str]:
+    by = {n: (t, a) for n, t, a in rec.items}; row = [stamp(rec.t), rec.recipe]
+    for n in names:
+        if n in by: t, a = by[n]; row += [f"{t:.1f}", f"{a:.1f}", f"{varpct(t, a):.2f}"]
+        else: row += ["", "", ""]
+    t, a = rec.target(), rec.total_actual
+    return row + [f"{t:.1f}", f"{a:.1f}", f"{varpct(t, a):.2f}"]
+
+class SqliteBatchStore:
+    """batches(uid, t, recipe, totals) + batch_items(batch_id, pos, ingredient, target, actual)."""
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS batches(
+        id INTEGER PRIMARY KEY, uid TEXT UNIQUE NOT NULL, t REAL NOT NULL, recipe TEXT NOT NULL,
+        total_target REAL NOT NULL, total_actual REAL NOT NULL);
+    CREATE INDEX IF NOT EXISTS batches_t ON batches(t);
+    CREATE TABLE IF NOT EXISTS batch_items(
+        batch_id INTEGER NOT NULL REFERENCES batches(id), pos INTEGER NOT NULL, ingredient TEXT NOT NULL,
+        target REAL NOT NULL, actual REAL NOT NULL, PRIMARY KEY(batch_id, pos));
+    """
+
+    def __init__(self, path: str, fsync: str = "batch"):
+        self.path = path; self.fsync = fsync
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=" + {"always": "FULL", "batch": "FULL", "interval": "NORMAL", "off": "OFF"}[fsync])
+        self.db.executescript(self.SCHEMA)
+
+    def write(self, records: list[BatchRecord]) -> int:
+        """Insert records (already-known uids are skipped); one transaction unless fsync == 'always'."""
+        groups = [[r] for r in records] if self.fsync == "always" else [records]
+        n = 0
+        for g in groups:
+            with self.db:
+                self.db.execute("BEGIN")
+                for r in g:
+                    cur = self.db.execute("INSERT OR IGNORE INTO batches(uid, t, recipe, total_target, total_actual) "
+                                          "VALUES (?,?,?,?,?)", (r.uid, r.t, r.recipe, r.target(), r.total_actual))
+                    if not cur.rowcount: continue
+                    self.db.executemany("INSERT INTO batch_items VALUES (?,?,?,?,?)",
+                                        [(cur.lastrowid, i, nm, t, a) for i, (nm, t, a) in enumerate(r.items)])
+                    n += 1
+        return n
+
+    def sync(self):
+        # NORMAL only syncs the WAL at checkpoints; a passive checkpoint makes the interval durable
+        if self.fsync == "interval": self.db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def records(self, t0: float | None = None, t1: float | None = None) -> list[BatchRecord]:
+        q = "SELECT id, uid, t, recipe, total_target FROM batches WHERE t >= ? AND t < ? ORDER BY t, id"
+        rng = (t0 if t0 is not None else float("-inf"), t1 if t1 is not None else float("inf"))
+        rows = self.db.execute(q, rng).fetchall()
+        items: dict[int, list] = {}
+        for bid, nm, t, a in self.db.execute(
+                "SELECT i.batch_id, i.ingredient, i.target, i.actual FROM batch_items i JOIN batches b ON b.id = i.batch_id "
+                "WHERE b.t >= ? AND b.t < ? ORDER BY i.batch_id, i.pos", rng):
+            items.setdefault(bid, []).append((nm, t, a))
+        return [BatchRecord(recipe, items.get(bid, []), t=t, uid=uid, total_target=tt) for bid, uid, t, recipe, tt in rows]
+
+    def count(self) -> int: return self.db.execute("SELECT COUNT(*) FROM batches").fetchone()[0]
+
+    def close(self): self.db.close()
+
+class CsvBatchStore:
+    """
+    Append-only CSV, one file per month (<stem>-YYYYMM.csv), column per ingredient target/actual.
+    A different ingredient list starts a new file (<stem>-YYYYMM-2.csv) instead of breaking the header.
+    """
+    def __init__(self, path: str, fsync: str = "batch"):
+        self.stem = os.path.splitext(path)[0]; self.fsync = fsync
+        self._f = None; self._file = None; self._names: list[str] | None = None
+
+    def _target(self, rec: BatchRecord) -> tuple[str, list[str]]:
+        names = [n for n, _, _ in rec.items]; month = time.strftime("%Y%m", time.localtime(rec.t)); k = 1
+        while True:
+            path = f"{self.stem}-{month}{'' if k == 1 else f'-{k}'}.csv"
+            if not os.path.exists(path) or os.path.getsize(path) == 0: return path, names
+            with open(path, newline="", encoding="utf-8") as f: head = next(csv.reader(f), [])
+            if head == csv_header(names): return path, names
+            k += 1
+
+    def write(self, records: list[BatchRecord]) -> int:
+        """All or nothing: on any failure every file touched is cut back to its size before the call, so the
+        writer's retry of the whole batch appends each row once."""
+        start: dict[str, int] = {} if self._f is None else {self._file: os.fstat(self._f.fileno()).st_size}
+        try:
+            for r in records:
+                names = [n for n, _, _ in r.items]
+                if self._f is None or names != self._names or not self._file.startswith(
+                        f"{self.stem}-{time.strftime('%Y%m', time.localtime(r.t))}"):
+                    self._close_file(); self._file, self._names = self._target(r)
+                    size = os.path.getsize(self._file) if os.path.exists(self._file) else 0
+                    start.setdefault(self._file, size)
+                    self._f = open(self._file, "a", newline="", encoding="utf-8")
+                    if size == 0: csv.writer(self._f).writerow(csv_header(names))
+                csv.writer(self._f).writerow(csv_row(r, self._names))
+                if self.fsync == "always": self._f.flush(); os.fsync(self._f.fileno())
+            if self._f is not None:
+                self._f.flush()
+                if self.fsync == "batch": os.fsync(self._f.fileno())
+        except BaseException:
+            self._rollback(start); raise
+        return len(records)
+
+    def _rollback(self, start: dict[str, int]):
+        f, self._f = self._f, None
+        if f is not None:
+            try: f.close()
+            except OSError: pass
+        for path, size in start.items():
+            try: os.truncate(path, size)
+            except OSError: pass
+
+    def sync(self):
+        if self._f is not None and self.fsync == "interval": os.fsync(self._f.fileno())
+
+    def _close_file(self):
+        if self._f is not None:
+            self._f.flush()
+            if self.fsync != "off": os.fsync(self._f.fileno())
+            self._f.close(); self._f = None
+
+    def close(self): self._close_file()
+
+def open_store(backend: str, path: str, fsync: str = "batch"):
+    if fsync not in FSYNC: raise ValueError(f"batch_log.fsync must be one of {FSYNC}, not {fsync!r}")
+    if backend == "sqlite": return SqliteBatchStore(path, fsync)
+    if backend == "csv": return CsvBatchStore(path, fsync)
+    raise ValueError(f"unknown batch_log.backend {backend!r} (sqlite | csv)")
+
+def export_csv(records: list[BatchRecord], out=None) -> str:
+    """CSV text (or written to `out`, a path or file) with the union of ingredients, first-seen order."""
+    names: list[str] = []
+    for r in records:
+        for n, _, _ in r.items:
+            if n not in names: names.append(n)
+    buf = io.StringIO(newline=""); w = csv.writer(buf)
+    w.writerow(csv_header(names))
+    for r in records: w.writerow(csv_row(r, names))
+    text = buf.getvalue()
+    if isinstance(out, str):
+        with open(out, "w", newline="", encoding="utf-8") as f: f.write(text)
+    elif out is not None: out.write(text)
+    return text
+
+def import_legacy_csv(path: str, store) -> int:
+    """Load the old fixed-layout batches.csv (Agg1..4 + Total) into a store; returns records added."""
+    if not os.path.exists(path): return 0
+    recs = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                t = time.mktime(time.strptime(row["BatchTime"], "%Y-%m-%d %H:%M:%S"))
+                names = [k[:-7] for k in row if k and k.endswith("_Target") and k != "Total_Target"]
+                items = [(n, float(row[f"{n}_Target"] or 0), float(row[f"{n}_Actual"] or 0)) for n in names]
+                uid = uuid.uuid5(uuid.NAMESPACE_URL, "batches.csv:" + ",".join(row.values())).hex
+                recs.append(BatchRecord(row.get("Recipe", ""), items, t=t, uid=uid,
+                                        total_target=float(row.get("Total_Target") or 0) or None))
+            except (KeyError, ValueError):
+                continue
+    return store.write(recs) if recs else 0
@@ -0,0 +1,138 @@
+# batchlog/sync.py — push discharged batches to the office API through a persistent outbox
+#
+# submit() only enqueues. The sync thread first stores the record in outbox.db (SQLite WAL), so it
+# survives restarts and network outages, then POSTs the oldest pending records in groups of up to
+# batch_max (gzip above gzip_min_bytes) to POST /api/plant/batches. A record leaves the outbox only
+# when the server lists its uid as accepted; the server ignores uids it already has, so replaying
+# after a lost response is harmless. A group the server rejects (HTTP 4xx), or fails on with HTTP 500
+# for park_after tries, is retried one record at a time until the offending record is parked (kept,
+# not retried) so it cannot block the rest. Login (401/403) and gateway (502-504) errors only back off.
+import gzip, json, os, queue, sqlite3, threading, time
+from .store import BatchRecord
+
+class Outbox:
+    """uid -> JSON body, oldest first; parked rows stay for inspection."""
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL"); self.db.execute("PRAGMA synchronous=FULL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS outbox(uid TEXT PRIMARY KEY, t REAL NOT NULL, body TEXT NOT NULL, "
+                        "tries INTEGER NOT NULL DEFAULT 0, parked TEXT)")
+
+    def put(self, records: list[BatchRecord]):
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR IGNORE INTO outbox(uid, t, body) VALUES (?,?,?)",
+                                [(r.uid, r.t, json.dumps(payload(r))) for r in records])
+
+    def peek(self, n: int) -> list[tuple[str, dict, int]]:
+        """(uid, body, failed tries) of the oldest n unparked records."""
+        rows = self.db.execute("SELECT uid, body, tries FROM outbox WHERE parked IS NULL ORDER BY t, uid LIMIT ?", (n,)).fetchall()
+        return [(u, json.loads(b), k) for u, b, k in rows]
+
+    def ack(self, uids):
+        with self.db:
+            self.db.execute("BEGIN"); self.db.executemany("DELETE FROM outbox WHERE uid = ?", [(u,) for u in uids])
+
+    def tried(self, uids):
+        self.db.executemany("UPDATE outbox SET tries = tries + 1 WHERE uid = ?", [(u,) for u in uids])
+
+    def park(self, uid: str, reason: str):
+        self.db.execute("UPDATE outbox SET parked = ? WHERE uid = ?", (reason[:200], uid))
+
+    def count(self, parked: bool = False) -> int:
+        return self.db.execute(f"SELECT COUNT(*) FROM outbox WHERE parked IS {'NOT ' if parked else ''}NULL").fetchone()[0]
+
+    def close(self): self.db.close()
+
+def payload(rec: BatchRecord) -> dict:
+    return {"uid": rec.uid, "t": rec.t, "recipe": rec.recipe,
+            "items": [{"name": n, "target": t, "actual": a} for n, t, a in rec.items]}
+
+class BatchSync(threading.Thread):
+    """
+    Outbox uploader (see module comment).
+      stats: pending, parked, posted (records acked), requests, bytes_raw, bytes_sent, errors, last_error, last_ok
+    """
+    def __init__(self, outbox_path: str, url: str, *, plant: str = "", token: str = "", batch_max: int = 50,
+                 gzip_min_bytes: int = 1024, timeout_s: float = 5.0, backoff_max_s: float = 60.0, park_after: int = 10):
+        super().__init__(name="batch-sync", daemon=True)
+        self.outbox = Outbox(outbox_path); self.url = url; self.plant = plant; self.token = token
+        self.batch_max = max(1, int(batch_max)); self.gzip_min = int(gzip_min_bytes)
+        self.timeout_s = float(timeout_s); self.backoff_max_s = float(backoff_max_s); self.park_after = max(1, int(park_after))
+        self._q: queue.Queue = queue.Queue(); self._halt = threading.Event(); self._solo = False
+        self.pending = self.outbox.count(); self.parked = self.outbox.count(parked=True)
+        self.posted = 0; self.requests = 0; self.bytes_raw = 0; self.bytes_sent = 0
+        self.errors = 0; self.last_error = ""; self.last_ok: float | None = None
+
+    @classmethod
+    def from_config(cls, scfg: dict, base_dir: str) -> "BatchSync":
+        path = scfg.get("outbox", "outbox.db")
+        if not os.path.isabs(path): path = os.path.join(base_dir, path)
+        return cls(path, scfg["url"], plant=scfg.get("plant", ""), token=scfg.get("token", ""),
+                   batch_max=scfg.get("batch_max", 50), gzip_min_bytes=scfg.get("gzip_min_bytes", 1024),
+                   timeout_s=scfg.get("timeout_s", 5.0), backoff_max_s=scfg.get("backoff_max_s", 60.0),
+                   park_after=scfg.get("park_after", 10))
+
+    # ---------- producer (GUI thread) ----------
+    def submit(self, rec: BatchRecord):
+        self._q.put(rec)
+
+    def close(self, timeout: float = 2.0):
+        """Stop (unsent records stay in the outbox for the next start)."""
+        self._halt.set(); self._q.put(None)
+        if self.is_alive(): self.join(timeout)
+        if not self.is_alive(): self.outbox.close()
+
+    # ---------- sync thread ----------
+    def _post(self, batches: list[dict]) -> list[str]:
+        """-> uids the server accepted. Raises urllib.error.HTTPError / OSError."""
+        import urllib.request
+        body = json.dumps({"plant": self.plant, "batches": batches}, separators=(",", ":")).encode()
+        headers = {"Content-Type": "application/json"}
+        self.bytes_raw += len(body)
+        if len(body) >= self.gzip_min: body = gzip.compress(body, 6); headers["Content-Encoding"] = "gzip"
+        if self.token: headers["Authorization"] = f"Bearer {self.token}"
+        req = urllib.request.Request(self.url, data=body, headers=headers, method="POST")
+        self.requests += 1; self.bytes_sent += len(body)
+        with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            return [str(u) for u in json.loads(resp.read() or b"{}").get("accepted", [])]
+
+    def _drain(self, wait: float) -> bool:
+        recs = []
+        try:
+            r = self._q.get(timeout=wait) if wait > 0 else self._q.get_nowait()
+            while True:
+                if r is not None: recs.append(r)
+                r = self._q.get_nowait()
+        except queue.Empty:
+            pass
+        if recs: self.outbox.put(recs); self.pending = self.outbox.count()
+        return bool(recs)
+
+    def run(self):
+        import urllib.error                                # http.client/ssl load here, not on the GUI's startup path
+        backoff = 1.0; next_try = 0.0
+        while not self._halt.is_set():
+            self._drain(max(0.0, min(1.0, next_try - time.monotonic())) if self.pending else 1.0)
+            if self._halt.is_set() or not self.pending or time.monotonic() < next_try: continue
+            rows = self.outbox.peek(1 if self._solo else self.batch_max)
+            if not rows: self.pending = 0; continue
+            try:
+                acked = self._post([b for _, b, _ in rows])
+            except urllib.error.HTTPError as e:
+                self.errors += 1; self.last_error = f"HTTP {e.code}"; self.outbox.tried([u for u, _, _ in rows])
+                poison = e.code == 500 and max(k for _, _, k in rows) + 1 >= self.park_after   # the server trips on it
+                if poison or (400 <= e.code < 500 and e.code not in (401, 403, 408, 429)):   # this data, not the link or login
+                    if len(rows) > 1: self._solo = True; continue
+                    self.outbox.park(rows[0][0], f"HTTP {e.code}"); self._solo = False
+                    self.parked += 1; self.pending = self.outbox.count(); continue
+                next_try = time.monotonic() + backoff; backoff = min(self.backoff_max_s, backoff * 2); continue
+            except (OSError, ValueError) as e:             # offline, refused, timeout, garbled reply
+                self.errors += 1; self.last_error = f"{type(e).__name__}: {e}"
+                next_try = time.monotonic() + backoff; backoff = min(self.backoff_max_s, backoff * 2); continue
+            if not acked:                                  # 2xx without our uids: not the batch endpoint
+                self.errors += 1; self.last_error = "no uids accepted"
+                next_try = time.monotonic() + backoff; backoff = min(self.backoff_max_s, backoff * 2); continue
+            self.outbox.ack(acked); self.posted += len(acked); self.last_ok = time.time()
+            self.pending = self.outbox.count(); backoff = 1.0; next_try = 0.0
+        self._drain(0.0)                                   # submitted during shutdown: keep for next start
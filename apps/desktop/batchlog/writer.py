@@ -0,0 +1,82 @@
+# batchlog/writer.py — background batch record writer (the GUI thread only enqueues)
+import os, queue, threading, time
+from .store import BatchRecord, open_store, import_legacy_csv
+
+class BatchLogWriter(threading.Thread):
+    """
+    submit() puts a record on a queue and returns immediately; this thread drains the queue and
+    writes everything pending in one store.write(), so a slow or stalled disk delays the log,
+    never the HMI. A failed write keeps its records and is retried with backoff.
+      stats: submitted, written, errors, errors_dropped, last_error, max_write_ms, pending
+    """
+    def __init__(self, store, *, fsync_s: float = 5.0, backoff_max_s: float = 30.0):
+        super().__init__(name="batch-log", daemon=True)
+        self.store = store; self.fsync_s = float(fsync_s); self.backoff_max_s = float(backoff_max_s)
+        self._q: queue.Queue = queue.Queue(); self._halt = threading.Event(); self._idle = threading.Condition()
+        self._retry: list[BatchRecord] = []
+        self.submitted = 0; self.written = 0; self.errors = 0; self.last_error = ""; self.max_write_ms = 0.0
+        self.errors_dropped = 0                         # records given up on at close() (disk still failing)
+
+    @classmethod
+    def from_config(cls, bcfg: dict, base_dir: str) -> "BatchLogWriter":
+        backend = bcfg.get("backend", "sqlite")
+        path = bcfg.get("path", "batches.db" if backend == "sqlite" else "batches.csv")
+        if not os.path.isabs(path): path = os.path.join(base_dir, path)
+        fresh = not os.path.exists(path)
+        store = open_store(backend, path, bcfg.get("fsync", "batch"))
+        legacy = bcfg.get("import_csv")                  # one-off: old per-discharge batches.csv
+        if fresh and legacy and backend == "sqlite":
+            import_legacy_csv(legacy if os.path.isabs(legacy) else os.path.join(base_dir, legacy), store)
+        return cls(store, fsync_s=bcfg.get("fsync_s", 5.0))
+
+    # ---------- producer (any thread) ----------
+    def submit(self, rec: BatchRecord):
+        self.submitted += 1; self._q.put(rec)
+
+    @property
+    def pending(self) -> int: return self._q.qsize() + len(self._retry)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is on disk (True) or the timeout expires."""
+        end = time.monotonic() + timeout
+        with self._idle:
+            while self.written + self.errors_dropped < self.submitted:
+                left = end - time.monotonic()
+                if left <= 0: return False
+                self._idle.wait(min(left, 0.1))
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout); self._halt.set(); self._q.put(None)
+        if self.is_alive(): self.join(timeout)
+        self.store.close()
+
+    # ---------- writer thread ----------
+    def run(self):
+        backoff = 0.5; last_sync = time.monotonic()
+        while True:
+            try: first = self._q.get(timeout=0.5 if not self._retry else backoff)
+            except queue.Empty: first = None
+            batch = self._retry; self._retry = []
+            if first is not None: batch.append(first)
+            while True:
+                try: r = self._q.get_nowait()
+                except queue.Empty: break
+                if r is not None: batch.append(r)
+            if batch:
+                s = time.perf_counter()
+                try:
+                    self.store.write(batch)
+                except Exception as ex:                 # disk full, file locked, ...: keep and retry
+                    self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"
+                    self._retry = batch; backoff = min(self.backoff_max_s, backoff * 2)
+                    if self._halt.is_set(): self.errors_dropped += len(batch); self._retry = []; break
+                    continue
+                self.max_write_ms = max(self.max_write_ms, (time.perf_counter() - s) * 1000.0)
+                backoff = 0.5
+                with self._idle: self.written += len(batch); self._idle.notify_all()
+            if time.monotonic() - last_sync >= self.fsync_s:
+                try: self.store.sync()
+                except Exception as ex: self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"
+                last_sync = time.monotonic()
+            if self._halt.is_set() and self._q.empty() and not self._retry: break
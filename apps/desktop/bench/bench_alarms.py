@@ -0,0 +1,79 @@
+# bench/bench_alarms.py — alarm engine cost per 50 Hz scan, flood handling, journal write rate and paged reads (no Qt)
+#   python bench/bench_alarms.py --alarms 200,2000 --events 100000
+import argparse, os, random, shutil, tempfile, time
+from common import stats_ms, print_table
+
+from tagbus import TagBus
+from alarms import AlarmEngine, AlarmJournal, JournalReader, parse_alarm
+
+def make_defs(n: int, rnd: random.Random):
+    out = []
+    for i in range(n):
+        hi = rnd.random() < 0.5; lim = rnd.uniform(100, 900)
+        out += parse_alarm({"id": f"a{i}", "when": f"v{i}.kg {'>' if hi else '<'} {lim:.1f}", "deadband": 5,
+                            "on_delay_s": rnd.choice((0, 0, 2)), "priority": rnd.choice(("high", "medium", "low"))})
+    return out
+
+def scan_case(n: int, scans: int, change: float, seed: int = 3):
+    rnd = random.Random(seed); bus = TagBus(); defs = make_defs(n, rnd)
+    for i in range(n): bus.publish(f"v{i}.kg", 500.0)
+    eng = AlarmEngine(bus, defs, flood_max=50); eng.evaluate(0.0)
+    per = max(1, int(n * change / 100.0)); ev = []
+    for k in range(scans):
+        for _ in range(per):
+            i = rnd.randrange(n); bus.publish(f"v{i}.kg", min(1000.0, max(0.0, bus.value(f"v{i}.kg") + rnd.gauss(0, 60))))
+        s = time.perf_counter(); eng.evaluate(k / 50.0); ev.append(time.perf_counter() - s)
+        if k % 50 == 0: eng.ack(now=k / 50.0)
+    st = stats_ms(ev)
+    return [n, per, st["mean"] * 1000, st["p95"] * 1000, st["max"] * 1000, eng.raised, eng.floods, eng.suppressed_total]
+
+def flood_case(n: int):
+    """Every alarm raises in one scan (a power dip): the cost of that scan and what the operator sees."""
+    bus = TagBus(); defs = make_defs(n, random.Random(5))
+    for i in range(n): bus.publish(f"v{i}.kg", 500.0)
+    eng = AlarmEngine(bus, [d.__class__(**{**d.__dict__, "on_delay_s": 0.0}) for d in defs]); eng.evaluate(0.0)
+    for d in eng.alarms: bus.publish(d.d.tag, 0.0 if d.d.op == "<" else 1000.0)
+    s = time.perf_counter(); eng.evaluate(1.0); ms = (time.perf_counter() - s) * 1000
+    return [n, ms, eng.raised, len(eng.listed()), eng.suppressed_total]
+
+def journal_case(root: str, events: int):
+    path = os.path.join(root, "alarms.db"); j = AlarmJournal(path, retain_days=0); j.start()
+    t0 = time.time() - events; s = time.perf_counter()
+    for k in range(events): j.submit(t0 + k, f"a{k % 500}", ("raise", "ack", "clear")[k % 3], 1 + k % 3, float(k % 1000), f"Alarm {k % 500}")
+    j.flush(120); w = time.perf_counter() - s; j.close()
+    r = JournalReader(path); rows = []
+    def timed(label, fn, reps=50):
+        ts = []
+        for _ in range(reps): s = time.perf_counter(); out = fn(); ts.append(time.perf_counter() - s)
+        rows.append([label, len(out), stats_ms(ts)["mean"], stats_ms(ts)["p95"]])
+    timed("newest page (200)", lambda: r.page(200))
+    timed("page in the middle", lambda: r.page(200, before=events // 2))
+    timed("oldest page", lambda: r.page(200, before=201))
+    timed("one alarm, newest 200", lambda: r.page(200, alarm="a77"))
+    timed("one hour by time", lambda: r.between(t0 + events / 2, t0 + events / 2 + 3600))
+    r.close()
+    return events / w, os.path.getsize(path) + (os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0), rows
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Alarm engine + journal benchmark")
+    ap.add_argument("--alarms", default="200,2000")
+    ap.add_argument("--scans", type=int, default=2500, help="50 Hz scans")
+    ap.add_argument("--change", type=float, default=5.0, help="% of the alarm tags that change per scan")
+    ap.add_argument("--events", type=int, default=100000)
+    a = ap.parse_args()
+    ns = [int(x) for x in a.alarms.split(",")]
+    print(f"evaluate() per 50 Hz scan ({a.scans} scans, {a.change:g} % of the alarm tags change per scan, 20 ms budget)")
+    print_table(["alarms", "changed/scan", "mean us", "p95 us", "max us", "raised", "floods", "suppressed"],
+                [scan_case(n, a.scans, a.change) for n in ns])
+    print("\nflood: every alarm raises in the same scan")
+    print_table(["alarms", "scan ms", "raised", "listed", "suppressed"], [flood_case(n) for n in ns])
+    root = tempfile.mkdtemp(prefix="alarm-bench-")
+    try:
+        rate, size, rows = journal_case(root, a.events)
+        print(f"\njournal: {a.events} events written at {rate:,.0f}/s (writer thread), {size / 1e6:.1f} MB")
+        print_table(["read", "rows", "mean ms", "p95 ms"], rows)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main_bench()
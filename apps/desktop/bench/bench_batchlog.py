@@ -0,0 +1,64 @@
+# bench/bench_batchlog.py — cost of logging a batch on the calling (GUI) thread
+#   python bench/bench_batchlog.py                  # 200 batches, every backend x fsync policy
+#   python bench/bench_batchlog.py --stall-ms 500   # plus a disk that stalls 500 ms per write
+# "inline" is the old way (open/append/close on the GUI thread); the others only enqueue.
+import argparse, csv, os, shutil, tempfile, time
+from common import stats_ms, print_table
+
+from batchlog import BatchLogWriter, BatchRecord, open_store
+from batchlog.store import FSYNC, csv_header, csv_row
+
+ITEMS = [("Agg1", 600, 598), ("Agg2", 500, 501), ("Agg3", 400, 400), ("Agg4", 300, 299),
+         ("Cement", 350, 351), ("Water", 175, 174), ("Admix", 3.5, 3.5)]
+
+class _Stalled:
+    """Store wrapper: every write first sleeps (USB stick, AV scan, full network share...)."""
+    def __init__(self, store, stall_s): self.store = store; self.stall_s = stall_s
+    def write(self, recs): time.sleep(self.stall_s); return self.store.write(recs)
+    def sync(self): self.store.sync()
+    def close(self): self.store.close()
+
+def inline(path: str, n: int, stall_s: float) -> list[float]:
+    names = [i[0] for i in ITEMS]; per = []
+    for _ in range(n):
+        s = time.perf_counter()
+        time.sleep(stall_s)
+        new = not os.path.exists(path)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            if new: w.writerow(csv_header(names))
+            w.writerow(csv_row(BatchRecord("M25", ITEMS), names))
+        per.append(time.perf_counter() - s)
+    return per
+
+def queued(store, n: int) -> tuple[list[float], float, BatchLogWriter]:
+    w = BatchLogWriter(store); w.start(); per = []
+    for _ in range(n):
+        s = time.perf_counter(); w.submit(BatchRecord("M25", ITEMS)); per.append(time.perf_counter() - s)
+    s = time.perf_counter(); w.close(timeout=120.0)
+    return per, time.perf_counter() - s, w
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Batch log benchmark")
+    ap.add_argument("--batches", type=int, default=200)
+    ap.add_argument("--stall-ms", type=float, default=0.0)
+    a = ap.parse_args()
+    root = tempfile.mkdtemp(prefix="batchlog-bench-"); stall = a.stall_ms / 1000.0
+    n_inline = a.batches if not stall else min(a.batches, 5)
+    try:
+        st = stats_ms(inline(os.path.join(root, "inline.csv"), n_inline, stall))
+        rows = [["inline csv", "-", n_inline, st["mean"], st["p95"], st["max"], "-", "-"]]
+        for backend in ("sqlite", "csv"):
+            for fs in FSYNC:
+                path = os.path.join(root, f"{backend}-{fs}.{'db' if backend == 'sqlite' else 'csv'}")
+                store = open_store(backend, path, fs)
+                if stall: store = _Stalled(store, stall)
+                per, drain, w = queued(store, a.batches); st = stats_ms(per)
+                rows.append([backend, fs, a.batches, st["mean"], st["p95"], st["max"], w.max_write_ms, drain * 1000.0])
+        print(f"== batch log: GUI-thread cost per batch (stall {a.stall_ms:g} ms per disk write)")
+        print_table(["store", "fsync", "batches", "submit mean ms", "p95 ms", "max ms", "max write ms", "drain ms"], rows)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main_bench()
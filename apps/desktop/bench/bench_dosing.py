@@ -0,0 +1,55 @@
+# bench/bench_dosing.py — dosing accuracy and time per strategy on the simulated feeders (no Qt)
+#   python bench/bench_dosing.py                   # 30 batches per strategy, config.json feeders/targets
+#   python bench/bench_dosing.py --batches 100 --jitter 0.1
+# Strategies: cut at target (no fine feed, no compensation), coarse/fine with the configured in-flight
+# estimate, and coarse/fine learning the in-flight from every batch (starting from 0 kg).
+import argparse
+from common import load_config, print_table
+
+from tagbus import TagBus
+from control import DosingEngine, FeedSim
+
+def _ingredients(cfg: dict) -> list[tuple[str, str, float]]:
+    t = cfg.get("targets", {})
+    out = [(f"Agg{i+1}", f"agg{i+1}.weight_kg", float(t.get(f"Agg{i+1}", 0))) for i in range(len(cfg.get("hoppers", [])))]
+    for name, tag in (("Cement", "cement_hopper.weight_kg"), ("Water", "water_hopper.weight_kg"), ("Admix", "admix_hopper.weight_kg")):
+        out.append((name, tag, float(t.get(name, 0))))
+    return out
+
+def run(cfg: dict, mode: str, batches: int, jitter: float, seed: int = 1) -> list[dict]:
+    dcfg = dict(cfg["dosing"], learned=None, learn=0.3 if mode == "learned" else 0.0)
+    bus = TagBus(); sim = FeedSim(bus, seed=seed); ingr = _ingredients(cfg)
+    eng = DosingEngine.from_config(dcfg, bus, [(n, tag) for n, tag, _ in ingr], ".", sim=sim)
+    sim.add_feeders(eng, dcfg, jitter=jitter)
+    for f in eng.feeders.values():
+        if mode == "cut-at-target": f.fine_tag = None; f.inflight_kg = 0.0
+        if mode == "learned": f.inflight_kg = 0.0
+    out = []
+    for _ in range(batches):
+        for _, tag, _ in ingr: bus.publish(tag, 0.0, force=True)
+        t0 = eng.t; eng.start({n: t for n, _, t in ingr})
+        while eng.active: eng.step()
+        out.append({"cycle_s": eng.t - t0, "rows": eng.results[-len(eng.feeders):]})
+    return out
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Dosing benchmark")
+    ap.add_argument("--batches", type=int, default=30)
+    ap.add_argument("--jitter", type=float, default=0.05, help="feed rate noise (fraction)")
+    a = ap.parse_args()
+    cfg = load_config()
+    rows = []
+    for mode in ("cut-at-target", "coarse/fine", "learned"):
+        res = run(cfg, mode, a.batches, a.jitter)
+        tail = res[len(res) // 3:]                     # after the learner has had a few batches
+        for name in [r["name"] for r in res[0]["rows"]]:
+            rs = [r for b in tail for r in b["rows"] if r["name"] == name]
+            errs = sorted(abs(r["error"]) for r in rs)
+            rows.append([mode, name, sum(r["error"] for r in rs) / len(rs), errs[len(errs) // 2], errs[int(len(errs) * 0.95) - 1],
+                         sum(r["topups"] for r in rs) / len(rs), sum(r["dose_s"] for r in rs) / len(rs), rs[-1]["inflight_kg"]])
+        rows.append([mode, "(cycle)", "", "", "", "", sum(b["cycle_s"] for b in tail) / len(tail), ""])
+    print(f"== dosing: {a.batches} batches per strategy, rate noise +/-{a.jitter * 100:g}% (stats over the last 2/3)")
+    print_table(["strategy", "feeder", "mean err kg", "p50 |err|", "p95 |err|", "top-ups", "dose s", "in-flight kg"], rows)
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,43 @@
+# bench/bench_headless.py — headless runtime: batches per wall second and cost per control step (no Qt, temp dir)
+#   python bench/bench_headless.py --batches 200
+import argparse, shutil, sys, tempfile, time
+from common import stats_ms, print_table, load_config
+
+from batchlog import BatchLogWriter
+from runtime import HeadlessRuntime
+
+def run_case(cfg: dict, batches: int, log: bool, pipelined: bool):
+    root = tempfile.mkdtemp(prefix="headless-bench-")
+    try:
+        cfg = dict(cfg, sequencer=dict(cfg.get("sequencer") or {}, pipelined=pipelined))
+        w = None
+        if log:
+            bcfg = dict(cfg.get("batch_log") or {}); bcfg.pop("import_csv", None)
+            w = BatchLogWriter.from_config(bcfg, root); w.start()
+        rt = HeadlessRuntime(cfg, base_dir=root, log=w)
+        steps = []; run = rt.step
+        def timed():
+            s = time.perf_counter(); run(); steps.append(time.perf_counter() - s)
+        rt.step = timed
+        r = rt.run(batches)
+        if w: w.close()
+        st = stats_ms(steps)
+        return ["pipelined" if pipelined else "sequential", "yes" if log else "no", r["batches"], r["wall_s"],
+                r["batches"] / r["wall_s"] if r["wall_s"] else 0.0, r["speedup"], st["mean"] * 1000, st["p95"] * 1000,
+                r["m3_per_h"], "yes" if r["fault"] or r["stalled"] else "no"]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Headless runtime benchmark")
+    ap.add_argument("--batches", type=int, default=200)
+    a = ap.parse_args()
+    cfg = load_config()
+    rows = [run_case(cfg, a.batches, False, True), run_case(cfg, a.batches, True, True), run_case(cfg, a.batches, False, False)]
+    print(f"{a.batches} batches per case; step = dosing step (feed sim, dosing, sequencer) + the plant ticks inside it")
+    print_table(["sequencer", "batch log", "batches", "wall s", "batches/s", "x real time", "step us", "step p95 us",
+                 "m3/h", "fault"], rows)
+    print("Qt imported:", "yes" if any(m.startswith("PySide6") for m in sys.modules) else "no")
+
+if __name__ == "__main__":
+    main_bench()
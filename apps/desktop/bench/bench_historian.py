@@ -0,0 +1,66 @@
+# bench/bench_historian.py — historian write/query cost for a simulated shift (no Qt, temp directory)
+#   python bench/bench_historian.py                    # 8 h at 10 Hz, 16 tags
+#   python bench/bench_historian.py --hours 24 --tags 40
+# Query rows compare a raw bucketed scan with the min/max pyramid (TrendSource) used by the trend panel.
+import argparse, math, os, random, shutil, tempfile, time
+from common import stats_ms, print_table
+
+from historian import Historian, HistorianReader, TrendSource
+from tagbus import TagBus
+
+class SyntheticPlant:
+    """TagBus-shaped source: weights ramp and dump per batch, levels drift, drives toggle."""
+    def __init__(self, n_tags: int):
+        self.t = 0.0; self.n = n_tags; rnd = random.Random(7)
+        self.kind = ["weight" if i % 4 < 2 else ("level" if i % 4 == 2 else "run") for i in range(n_tags)]
+        self.phase = [rnd.random() * 300 for _ in range(n_tags)]
+        self._bus = TagBus(); self._bus.publish_many({n: 0.0 for n in self.names()})
+    def names(self): return [f"t{i}.{k}" for i, k in enumerate(self.kind)]
+    def match(self, patterns): return self._bus.match(patterns)
+    def value(self, name: str):
+        i = int(name[1:name.index(".")]); k = self.kind[i]; c = (self.t + self.phase[i]) % 300.0
+        if k == "weight": return 0.0 if c > 120 else min(1500.0, c * 12.5) + random.uniform(-0.2, 0.2)
+        if k == "level":  return 50.0 + 30.0 * math.sin((self.t + self.phase[i]) / 3600.0)
+        return c < 90
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Historian benchmark")
+    ap.add_argument("--hours", type=float, default=8.0)
+    ap.add_argument("--tags", type=int, default=16)
+    ap.add_argument("--hz", type=float, default=10.0)
+    a = ap.parse_args()
+
+    root = tempfile.mkdtemp(prefix="hist-bench-")
+    try:
+        src = SyntheticPlant(a.tags)
+        h = Historian(root, src, {"*.weight": 0.5, "*.level": 0.05, "*.run": 0}, rate_hz=a.hz, retain_h=0)
+        t0 = 1_700_000_000.0; steps = int(a.hours * 3600 * a.hz); per = []
+        wall = time.perf_counter()
+        for i in range(steps):
+            src.t = i / a.hz
+            s = time.perf_counter(); h.sample(t0 + src.t); per.append(time.perf_counter() - s)
+        h.close(); wall = time.perf_counter() - wall
+        disk = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(root) for f in fs)
+        raw = steps * a.tags * 12                      # float64 time + float32 value per sample, uncompressed
+        st = stats_ms(per)
+        print(f"== write: {a.hours:g} h x {a.tags} tags @ {a.hz:g} Hz = {steps * a.tags:,} samples in {wall:.1f}s")
+        print(f"   stored {h.stored:,} points ({100.0 * h.stored / (steps * a.tags):.1f}%), "
+              f"{disk / 1024:.0f} KiB on disk vs {raw / 1024:.0f} KiB raw; sample() mean {st['mean']:.3f} ms p95 {st['p95']:.3f} ms")
+
+        rd = HistorianReader(root); rows = []
+        now = t0 + a.hours * 3600.0
+        for name in rd.tags()[:4]:
+            cold = TrendSource(HistorianReader(root)); warm = TrendSource(rd, h)
+            warm.columns(name, t0, now, 1000, now=now)
+            for span_h, buckets in ((a.hours, 1000), (1.0, 1000), (0.1, 600)):
+                q0 = t0 + (a.hours - span_h) * 1800.0; q1 = q0 + span_h * 3600.0
+                s = time.perf_counter(); rd.query(name, q0, q1, buckets); raw_ms = (time.perf_counter() - s) * 1000.0
+                s = time.perf_counter(); cold.columns(name, q0, q1, buckets, now=now); cold_ms = (time.perf_counter() - s) * 1000.0
+                s = time.perf_counter(); warm.columns(name, q0, q1, buckets, now=now); warm_ms = (time.perf_counter() - s) * 1000.0
+                rows.append([name, f"{span_h:g} h", buckets, raw_ms, cold_ms, warm_ms])
+        print(); print_table(["tag", "range", "columns", "raw scan ms", "pyramid ms (1st)", "pyramid ms"], rows)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main_bench()
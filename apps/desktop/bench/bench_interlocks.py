@@ -0,0 +1,56 @@
+# bench/bench_interlocks.py — interlock rule engine: cost per 50 Hz scan with N rules, incremental vs every rule (no Qt)
+#   a synthetic plant of weights, levels and drives; each scan moves --change % of the analog tags and restarts a
+#   few tripped drives (the PLC/operator), then evaluate() runs — only the changed rules, or all of them (full)
+#   python bench/bench_interlocks.py --rules 500 --scans 2500
+import argparse, random, time
+from common import stats_ms, print_table
+
+from tagbus import TagBus
+from interlocks import InterlockEngine, RuleTable, parse_rule
+
+def make_rules(n_rules: int, n_analog: int, n_drives: int, rnd: random.Random) -> list[dict]:
+    """Limit rules (analog >= x and drive on -> drive off) and permissive rules (drive on without another on)."""
+    out = []
+    for i in range(n_rules):
+        a, b = rnd.randrange(n_analog), rnd.randrange(n_analog); d, p = rnd.randrange(n_drives), rnd.randrange(n_drives)
+        if i % 3:
+            when = [f"w{a}.kg >= {rnd.uniform(800, 990):.1f}", f"d{d}.run"] + ([f"w{b}.kg > 100"] if i % 2 else [])
+        else:
+            when = [f"d{d}.run", f"!p{p}.ok"]
+        out.append({"name": f"rule {i}", "when": when, "force": {f"d{d}.run": False}})
+    return out
+
+def run_case(n_rules: int, scans: int, change: float, full: bool, seed: int = 7):
+    rnd = random.Random(seed); n_analog = max(8, n_rules // 2); n_drives = max(4, n_rules // 4)
+    bus = TagBus({"w*.kg": 0.5})
+    for i in range(n_analog): bus.publish(f"w{i}.kg", rnd.uniform(0, 1000))
+    for i in range(n_drives): bus.publish(f"d{i}.run", True); bus.publish(f"p{i}.ok", True)
+    s = time.perf_counter(); rules = [r for d in make_rules(n_rules, n_analog, n_drives, rnd) for r in parse_rule(d)]
+    eng = InterlockEngine(bus, rules); compile_ms = (time.perf_counter() - s) * 1000
+    eng.evaluate(0.0, full=full)
+    per_scan = max(1, int(n_analog * change / 100.0)); evals = []; checked0 = eng.evaluated
+    for k in range(scans):
+        for _ in range(per_scan):
+            i = rnd.randrange(n_analog); bus.publish(f"w{i}.kg", rnd.uniform(0, 1000))
+        if k % 10 == 0:                                         # a tripped drive restarted, a permissive drops
+            bus.publish(f"d{rnd.randrange(n_drives)}.run", True); bus.publish(f"p{rnd.randrange(n_drives)}.ok", rnd.random() < 0.9)
+        s = time.perf_counter(); eng.evaluate(k / 50.0, full=full); evals.append(time.perf_counter() - s)
+    st = stats_ms(evals)
+    return ["every rule" if full else "changed only", n_rules, len(RuleTable(rules).tags), compile_ms,
+            (eng.evaluated - checked0) / scans, st["mean"] * 1000, st["p95"] * 1000, st["max"] * 1000,
+            st["mean"] / 20.0 * 100.0, eng.trips]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Interlock rule engine benchmark")
+    ap.add_argument("--rules", default="50,500,2000")
+    ap.add_argument("--scans", type=int, default=2500, help="50 Hz scans (2500 = 50 s of plant time)")
+    ap.add_argument("--change", type=float, default=5.0, help="% of the analog tags that change per scan")
+    a = ap.parse_args()
+    rows = []
+    for n in (int(x) for x in a.rules.split(",")):
+        rows += [run_case(n, a.scans, a.change, False), run_case(n, a.scans, a.change, True)]
+    print(f"{a.scans} scans at 50 Hz (20 ms budget), {a.change:g} % of the analog tags change per scan")
+    print_table(["evaluate", "rules", "tags", "compile ms", "rules/scan", "mean us", "p95 us", "max us", "% of scan", "trips"], rows)
+
+if __name__ == "__main__":
+    main_bench()
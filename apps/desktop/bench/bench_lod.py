@@ -0,0 +1,42 @@
+# bench/bench_lod.py — component level of detail: frame time per zoom level with LOD on/off
+#   "rezoom": the scale changes every frame, so every cached item is painted again (fit, wheel zoom)
+#   "tick":   steady zoom, plant animating (overlays, pipes, belt repaint every frame)
+#   QT_QPA_PLATFORM=offscreen python bench/bench_lod.py --zooms 0.15,0.26,0.4,0.6,1.0 --frames 60
+import argparse, time
+from common import load_config, stats_ms, print_table, animate_plant
+
+from PySide6.QtWidgets import QApplication
+
+def run_case(app, cfg: dict, *, zoom: float, lod: bool, frames: int, size=(1920, 1080)):
+    import main
+    cfg = dict(cfg); cfg["view"] = dict(cfg.get("view", {}), lod=lod, details=[])   # the overview alone
+    win = main.MainWindow(cfg); win.timer.stop()
+    win.showNormal(); win.resize(*size); app.processEvents()
+    view = win.view; vp = view.viewport()
+    view.resetTransform(); view.scale(zoom, zoom); view.centerOn(win.scene.itemsBoundingRect().center())
+    animate_plant(win)
+    for _ in range(10): win._tick(); vp.repaint(); app.processEvents()   # warm caches
+    rezoom = []
+    for f in range(frames):
+        k = 1.01 if f % 2 else 1 / 1.01; view.scale(k, k)
+        t0 = time.perf_counter(); vp.repaint(); app.processEvents(); rezoom.append(time.perf_counter() - t0)
+    tick = []
+    for _ in range(frames):
+        t0 = time.perf_counter(); win._tick(); app.processEvents(); vp.repaint(); tick.append(time.perf_counter() - t0)
+    rz, tk = stats_ms(rezoom), stats_ms(tick)
+    win.close(); win.deleteLater(); app.processEvents()
+    return [f"{zoom:g}", "on" if lod else "off", rz["mean"], rz["p95"], tk["mean"], tk["p95"]]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--zooms", default="0.15,0.26,0.4,0.6,1.0", help="view scales (0.26 ~ whole plant fitted on 1080p)")
+    ap.add_argument("--frames", type=int, default=60)
+    a = ap.parse_args()
+    app = QApplication.instance() or QApplication([])
+    cfg = load_config()
+    rows = [run_case(app, cfg, zoom=float(z), lod=on, frames=a.frames) for z in a.zooms.split(",") for on in (False, True)]
+    print(f"platform={QApplication.platformName()}  frames/case={a.frames}  1920x1080  (full viewport repaint, ms)")
+    print_table(["zoom", "lod", "rezoom mean", "rezoom p95", "tick mean", "tick p95"], rows)
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,77 @@
+# bench/bench_mirror.py — web mirror: HMI-side cost and wire traffic as remote viewers are added (no Qt)
+#   a PLC-like scan publishes the plant's tags at 50 Hz; the mirror samples at rate_hz and the server thread
+#   fans frames out to N raw WebSocket viewers (one reader thread drains them all, as browsers elsewhere would)
+#   python bench/bench_mirror.py --viewers 0,1,10,50 --seconds 5
+import argparse, base64, math, os, selectors, socket, threading, time
+from common import stats_ms, print_table
+
+from tagbus import TagBus
+from mirror import BusMirror, MirrorServer
+
+WEIGHTS = ["agg1", "agg2", "agg3", "agg4", "cement_hopper", "water_hopper", "admix_hopper"]
+DRIVES = ["silo1.run", "silo2.run", "cement_screw.run", "water_pump.run", "admix_pump.run", "mixer.run", "mixer.gate_open"]
+
+def scan(bus: TagBus, t: float):
+    """One scan of a plant in mid-batch: hoppers fill and dump, levels drift, drives toggle."""
+    for k, w in enumerate(WEIGHTS):
+        c = (t + 7 * k) % 40.0; bus.publish(f"{w}.weight_kg", 0.0 if c > 30 else c * 40.0)
+    for n in (1, 2): bus.publish(f"silo{n}.level_pct", 60.0 + 20.0 * math.sin(t / 60.0 + n))
+    bus.publish("water_tank.kg", 800.0 - (t * 3.0) % 500); bus.publish("admix_tank.kg", 160.0 - (t * 0.2) % 100)
+    for k, d in enumerate(DRIVES): bus.publish(d, int(t / (3 + k)) % 2 == 0)
+
+class Viewers(threading.Thread):
+    """N WebSocket connections read by one thread; counts what arrives."""
+    def __init__(self, port: int, n: int):
+        super().__init__(daemon=True); self.sel = selectors.DefaultSelector(); self.bytes = 0; self.stop = False
+        for _ in range(n):
+            s = socket.create_connection(("127.0.0.1", port)); key = base64.b64encode(os.urandom(16)).decode()
+            s.sendall(f"GET / HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+            s.setblocking(False); self.sel.register(s, selectors.EVENT_READ)
+    def run(self):
+        while not self.stop:
+            for key, _ in self.sel.select(0.1):
+                try: self.bytes += len(key.fileobj.recv(65536))
+                except BlockingIOError: pass
+    def close(self):
+        self.stop = True; self.join(1)
+        for key in list(self.sel.get_map().values()): key.fileobj.close()
+
+def run_case(n_viewers: int | None, seconds: float, rate_hz: float, scan_hz: float = 50.0):
+    """n_viewers None: the same paced scan with no mirror at all (the baseline row)."""
+    bus = TagBus({"*.weight_kg": 0.5, "silo*.level_pct": 0.1, "*_tank.kg": 0.5})
+    scan(bus, 0.0)
+    if n_viewers is None:
+        scans = []; t0 = time.perf_counter(); k = 0
+        while time.perf_counter() - t0 < seconds:
+            s = time.perf_counter(); scan(bus, k / scan_hz); scans.append(time.perf_counter() - s); k += 1
+            time.sleep(max(0.0, t0 + k / scan_hz - time.perf_counter()))
+        return ["no mirror", stats_ms(scans)["mean"] * 1000, "-", "-", "-", "-", "-", "-"]
+    server = MirrorServer("127.0.0.1", 0); server.start()
+    m = BusMirror(bus, server, rate_hz); m.sample()
+    viewers = Viewers(server.port, n_viewers); viewers.start(); time.sleep(0.2)
+    scans, samples = [], []; t0 = time.perf_counter(); next_sample = t0; k = 0
+    while (now := time.perf_counter()) - t0 < seconds:
+        s = time.perf_counter(); scan(bus, k / scan_hz); scans.append(time.perf_counter() - s); k += 1
+        if now >= next_sample:
+            s = time.perf_counter(); m.sample(); samples.append(time.perf_counter() - s); next_sample += 1.0 / m.rate_hz
+        time.sleep(max(0.0, t0 + k / scan_hz - time.perf_counter()))
+    time.sleep(0.3); viewers.close(); m.close()
+    sc, sa = stats_ms(scans), stats_ms(samples)
+    per_viewer = viewers.bytes / max(1, n_viewers) / seconds if n_viewers else 0.0
+    return [n_viewers, sc["mean"] * 1000, sa["mean"] * 1000, sa["p95"] * 1000, server.frames,
+            server.bytes_out / max(1, server.frames * max(1, n_viewers)), per_viewer / 1024, server.resyncs]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Web mirror benchmark")
+    ap.add_argument("--viewers", default="0,1,10,50")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--rate", type=float, default=10.0, help="mirror rate_hz (<= 10)")
+    a = ap.parse_args()
+    rows = [run_case(None, a.seconds, a.rate)] + [run_case(int(n), a.seconds, a.rate) for n in a.viewers.split(",")]
+    print(f"{a.seconds:g} s per case, scan 50 Hz ({len(WEIGHTS) + 4 + len(DRIVES)} tags), mirror {min(a.rate, 10):g} Hz "
+          f"(HMI thread: scan = publish incl. the mirror's change marking, sample = hand-over to the server)")
+    print_table(["viewers", "scan us", "sample us", "sample p95 us", "frames", "B/frame/viewer", "KiB/s/viewer", "resyncs"], rows)
+
+if __name__ == "__main__":
+    main_bench()
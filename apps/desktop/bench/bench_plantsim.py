@@ -0,0 +1,34 @@
+# bench/bench_plantsim.py — discrete-event capacity model: agreement with the stepped sequencer, speed, pool scaling
+#   python bench/bench_plantsim.py                 # 12-case sweep, inline vs process pool
+#   python bench/bench_plantsim.py --batches 5000 --workers 4
+import argparse, os, time
+from common import load_config, print_table
+
+from plantsim import PlantParams, PlantSim, sweep, with_overrides
+from bench_sequencer import run as run_sequencer
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Plant simulator benchmark")
+    ap.add_argument("--batches", type=int, default=2000)
+    ap.add_argument("--workers", type=int, default=None)
+    a = ap.parse_args()
+    cfg = load_config(); p = PlantParams.from_config(cfg); m3 = p.batch_m3
+
+    rows = []                                   # same plant without trucks: event model vs 20 Hz sequencer
+    for pipelined in (False, True):
+        seq = run_sequencer(cfg, pipelined, 12).summary(last=11, batch_m3=m3)
+        t = time.perf_counter(); r = PlantSim(with_overrides(p, {"trucks": 0, "pipelined": pipelined}), seed=1).run(a.batches)
+        dt = time.perf_counter() - t
+        rows.append(["pipelined" if pipelined else "sequential", seq["m3_per_h"], r["m3_per_h"], a.batches / dt])
+    print("== event model vs stepped BatchSequencer (no truck limit)")
+    print_table(["mode", "sequencer m3/h", "event m3/h", "batches/s"], rows)
+
+    spec = {"trucks": [3, 4, 6, 8], "mix_s": [20, 30, 45]}; rows = []
+    for workers in (1, a.workers or max(2, os.cpu_count() or 1)):
+        t = time.perf_counter(); out = sweep(p, spec, batches=a.batches, seeds=(1, 2, 3), workers=workers)
+        rows.append([workers, len(out) * 3, time.perf_counter() - t])
+    print(f"\n== sweep: 12 cases x 3 seeds x {a.batches} batches ({os.cpu_count()} CPUs)")
+    print_table(["workers", "runs", "wall s"], rows)
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,93 @@
+# bench/bench_plc.py — PLC scan cost against the simulated FX5U (no hardware needed)
+#   python bench/bench_plc.py                          # config.json tags, 0 and 5 ms link delay
+#   python bench/bench_plc.py --spread 24 --latency 2  # 24 tags far apart -> 24 blocks
+#   python bench/bench_plc.py --link                   # PlcWorker: signals + reconnect after a PLC restart
+import argparse, asyncio, time
+from common import load_config, stats_ms, print_table
+
+from plc.sim_server import SimFx5u
+from plc.tags import TagTable, make_tag
+from plc.client import McClient
+from plc.scanner import PlcScanner
+from plc.aio_client import AsyncMcClient
+
+def spread_table(n: int) -> TagTable:
+    """n REAL tags 40 words apart: too far to merge, so every tag is its own block."""
+    return TagTable([make_tag(f"t{i}", f"D{1000 + i * 40}") for i in range(n)])
+
+def bench_sync_per_tag(port, table, scans):
+    c = McClient(port=port); out = []
+    for _ in range(scans):
+        t0 = time.perf_counter()
+        for t in table.tags.values(): c.read(t.dev, t.index, t.width)
+        out.append(time.perf_counter() - t0)
+    c.close(); return out, len(table)
+
+def bench_sync_blocks(port, table, scans):
+    sc = PlcScanner(table, McClient(port=port)); out = []
+    for _ in range(scans):
+        t0 = time.perf_counter(); sc.scan_once(); out.append(time.perf_counter() - t0)
+    sc.client.close(); return out, sc.frames_per_scan
+
+def bench_async_pipelined(port, table, scans):
+    async def go():
+        c = AsyncMcClient(port=port); out = []
+        for _ in range(scans):
+            t0 = time.perf_counter(); await c.read_blocks(table.plan); out.append(time.perf_counter() - t0)
+        await c.close(); return out, c.stats.summary()
+    out, lat = asyncio.run(go())
+    return out, len(table.plan), lat
+
+def run_scans(table, latencies, scans):
+    for lat_ms in latencies:
+        srv = SimFx5u(port=0, latency_ms=lat_ms).start()
+        rows = []
+        for name, fn in (("sync, one read per tag", bench_sync_per_tag),
+                         ("sync, block reads", bench_sync_blocks),
+                         ("asyncio, pipelined blocks", bench_async_pipelined)):
+            res = fn(srv.port, table, scans); s = stats_ms(res[0])
+            rows.append([name, res[1], s["mean"], s["p50"], s["p95"], s["max"]])
+        srv.stop()
+        print(f"\n== {len(table)} tags, {len(table.plan)} blocks, link delay {lat_ms:g} ms, {scans} scans")
+        print_table(["strategy", "frames/scan", "mean", "p50", "p95", "max"], rows)
+        if lat_ms == latencies[-1]: print("asyncio request latency:", res[2])
+
+def run_link(cfg_plc: dict, seconds: float):
+    """Worker against the simulator: count snapshot signals, restart the PLC, check it reconnects."""
+    from PySide6.QtCore import QCoreApplication, QTimer
+    from plc.worker import PlcWorker
+    app = QCoreApplication.instance() or QCoreApplication([])
+    srv = SimFx5u(port=0).start(); port = srv.port
+    srv.memory.set_real(cfg_plc["tags"]["agg1.weight_kg"]["addr"], 612.5)
+    w = PlcWorker.from_config({**cfg_plc, "host": "127.0.0.1", "port": port, "scan_ms": 50, "backoff_max_s": 0.5})
+    got = {"snap": 0, "last": {}, "link": None}
+    def on_snap(d): got["snap"] += 1; got["last"] = d
+    def on_link(d): got["link"] = d
+    w.snapshot.connect(on_snap); w.link.connect(on_link)
+    state = {"srv": srv}
+    def kill(): state["srv"].stop(); print(f"  t={seconds/3:.1f}s  PLC stopped   (snapshots so far: {got['snap']})")
+    def revive():
+        state["srv"] = SimFx5u(port=port).start(); state["srv"].memory.set_real("D110", 700.0)
+        print(f"  t={2*seconds/3:.1f}s  PLC restarted (snapshots so far: {got['snap']})")
+    QTimer.singleShot(int(seconds * 1000 / 3), kill)
+    QTimer.singleShot(int(seconds * 2000 / 3), revive)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    w.start(); app.exec(); w.stop(); state["srv"].stop()
+    print(f"  snapshots received in GUI thread: {got['snap']}, agg1.weight_kg={got['last'].get('agg1.weight_kg')}")
+    print(f"  link: {w.link_state()}")
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="PLC scan benchmark (simulated FX5U)")
+    ap.add_argument("--scans", type=int, default=200)
+    ap.add_argument("--spread", type=int, default=0, help="use N unmergeable tags instead of config.json")
+    ap.add_argument("--latency", default="0,5", help="comma list of simulated link delays in ms")
+    ap.add_argument("--link", action="store_true", help="PlcWorker signal + reconnect run")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    a = ap.parse_args()
+    cfg_plc = load_config()["plc"]
+    if a.link: run_link(cfg_plc, a.seconds); return
+    table = spread_table(a.spread) if a.spread else TagTable.from_config(cfg_plc)
+    run_scans(table, [float(x) for x in a.latency.split(",")], a.scans)
+
+if __name__ == "__main__":
+    main_bench()
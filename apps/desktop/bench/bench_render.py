@@ -0,0 +1,148 @@
+# bench/bench_render.py — headless per-component render benchmark for the MainWindow scene
+#   QT_QPA_PLATFORM=offscreen python bench/bench_render.py --frames 120
+#   python bench/bench_render.py --scale 8,12,20        # 8 silos, 12 hoppers, 20 pipes
+#   python bench/bench_render.py --sweep                 # base config + a few scaled-up plants
+import argparse, copy, time, tracemalloc
+from collections import defaultdict
+from common import load_config, stats_ms, print_table, animate_plant
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage, QPainter, QColor
+from PySide6.QtWidgets import QApplication
+
+COMPONENTS = ["Silo", "Mixer", "AggHopper", "CollectingHopper", "CementHopper",
+              "BeltConveyor", "FlowConnectorItem", "MotorBadge"]
+
+# ---------- per-class paint timing ----------
+_paint_s = defaultdict(float); _paint_n = defaultdict(int)
+
+def _instrument():
+    """Wrap paint() of every component class (overlays are charged to their parent's class)."""
+    from components.silo import Silo
+    from components.mixer import Mixer
+    from components.agg_hopper import AggHopper
+    from components.collector_hopper import CollectingHopper
+    from components.cement_hopper import CementHopper
+    from components.belt_conveyor import BeltConveyor
+    from components.flow_connector import FlowConnectorItem
+    from components.motor_badge import MotorBadge
+    from components.overlays import PaintOverlay
+    classes = [Silo, Mixer, AggHopper, CollectingHopper, CementHopper, BeltConveyor, FlowConnectorItem, MotorBadge]
+
+    def wrap(cls, name_fn):
+        orig = cls.paint
+        if getattr(orig, "_bench_wrapped", False): return
+        def timed(self, p, opt, widget=None):
+            t0 = time.perf_counter()
+            try: return orig(self, p, opt, widget)
+            finally:
+                name = name_fn(self); _paint_s[name] += time.perf_counter() - t0; _paint_n[name] += 1
+        timed._bench_wrapped = True
+        cls.paint = timed
+    for cls in classes:
+        # subclasses (WaterHopper/AdmixtureHopper) are reported under the base class they inherit paint from
+        wrap(cls, lambda self, n=cls.__name__: n)
+    def overlay_owner(self):
+        parent = self.parentItem()
+        for cls in classes:
+            if isinstance(parent, cls): return cls.__name__
+        return "PaintOverlay"
+    wrap(PaintOverlay, overlay_owner)
+
+# ---------- scaled configs ----------
+def scaled_config(base: dict, silos: int, hoppers: int) -> dict:
+    cfg = copy.deepcopy(base)
+    cfg["silos"] = [{"name": f"Silo {i+1}", "pos": [120 + (i // 2) * 420, -220 + (i % 2) * 340]} for i in range(silos)]
+    cfg["hoppers"] = [{"name": f"Aggregate {i+1}", "capacity_kg": 1500, "pos": [-480 + i * 300, -420]} for i in range(hoppers)]
+    return cfg
+
+def add_extra_pipes(win, n: int):
+    """Extra silo→hopper pipes (idle flow) so pipe count can be scaled independently."""
+    from components.flow_connector import FlowConnectorItem
+    have = sum(1 for p in (win.cement_pipe, win.water_pipe, win.admix_pipe) if p)
+    srcs = win.silos or [win.mixer]; dsts = win.hoppers or [win.mixer]
+    store = {"v": 0.0}
+    for k in range(max(0, n - have)):
+        a = srcs[k % len(srcs)]; b = dsts[k % len(dsts)]
+        pipe = FlowConnectorItem(
+            a, (a.pipe_origin_scene if hasattr(a, "pipe_origin_scene") else a.scenePos),
+            b, b.scenePos,
+            lambda: store["v"], lambda v: None, lambda: store["v"], lambda v: None,
+            enabled_fn=lambda: False, shape="L")
+        win.scene.addItem(pipe)
+
+# ---------- one run ----------
+def run_case(app, cfg: dict, *, frames: int, pipes: int, size=(1920, 1080)):
+    import main
+    win = main.MainWindow(cfg); win.timer.stop()
+    add_extra_pipes(win, pipes)
+    win.hide(); app.processEvents()   # only the QImage render below paints; the tick stays pure model work
+    animate_plant(win)
+    sc = win.scene; src = sc.itemsBoundingRect()
+    img = QImage(size[0], size[1], QImage.Format_ARGB32_Premultiplied)
+
+    def frame():
+        img.fill(QColor("#1E2024"))
+        p = QPainter(img); p.setRenderHint(QPainter.Antialiasing, True)
+        sc.render(p, QRectF(0, 0, size[0], size[1]), src); p.end()
+
+    for _ in range(5): win._tick(); frame()                      # warm item caches
+    _paint_s.clear(); _paint_n.clear()
+
+    ticks, renders = [], []
+    tracemalloc.start(); snap0 = tracemalloc.take_snapshot()
+    for _ in range(frames):
+        t0 = time.perf_counter(); win._tick(); app.processEvents(); t1 = time.perf_counter()
+        frame(); t2 = time.perf_counter()
+        ticks.append(t1 - t0); renders.append(t2 - t1)
+    snap1 = tracemalloc.take_snapshot(); _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    diff = snap1.compare_to(snap0, "filename")
+    alloc_blocks = sum(max(0, d.count_diff) for d in diff)
+    alloc_bytes  = sum(max(0, d.size_diff) for d in diff)
+
+    n_items = len(sc.items())
+    win.close(); win.deleteLater(); app.processEvents()
+    return {"tick": stats_ms(ticks), "render": stats_ms(renders), "items": n_items,
+            "paint": {k: (_paint_s[k] * 1000.0 / frames, _paint_n[k] / frames) for k in _paint_s},
+            "alloc_blocks": alloc_blocks, "alloc_bytes": alloc_bytes, "peak_bytes": peak}
+
+def report(title: str, r: dict):
+    print(f"\n== {title}  (scene items: {r['items']})")
+    print_table(["phase", "mean", "p50", "p95", "max"],
+                [[k, r[k]["mean"], r[k]["p50"], r[k]["p95"], r[k]["max"]] for k in ("tick", "render")])
+    rows = []
+    for name in COMPONENTS + sorted(set(r["paint"]) - set(COMPONENTS)):
+        if name in r["paint"]:
+            ms, calls = r["paint"][name]; rows.append([name, ms, calls])
+    print(); print_table(["component", "paint ms/frame", "paint calls/frame"], rows)
+    print(f"alloc over run: +{r['alloc_blocks']} blocks / +{r['alloc_bytes']/1024:.1f} KiB retained, "
+          f"peak {r['peak_bytes']/1024:.1f} KiB traced")
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Headless render benchmark")
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--scale", default="", help="silos,hoppers,pipes  e.g. 8,12,20")
+    ap.add_argument("--sweep", action="store_true", help="base config plus 4/6/10, 8/12/20 scaled plants")
+    ap.add_argument("--config", default=None)
+    a = ap.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    _instrument()
+    base = load_config(a.config)
+    cases = []
+    if a.sweep:
+        cases.append(("base config", base, 3))
+        for s, h, p in ((4, 6, 10), (8, 12, 20)):
+            cases.append((f"{s} silos / {h} hoppers / {p} pipes", scaled_config(base, s, h), p))
+    elif a.scale:
+        s, h, p = (int(x) for x in a.scale.split(","))
+        cases.append((f"{s} silos / {h} hoppers / {p} pipes", scaled_config(base, s, h), p))
+    else:
+        cases.append(("base config", base, 3))
+
+    print(f"platform={QApplication.platformName()}  frames/case={a.frames}")
+    for title, cfg, pipes in cases:
+        report(title, run_case(app, cfg, frames=a.frames, pipes=pipes))
+
+if __name__ == "__main__":
+    main_bench()
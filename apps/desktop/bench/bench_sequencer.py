@@ -0,0 +1,49 @@
+# bench/bench_sequencer.py — batch cycle time and throughput, pipelined vs one-batch-at-a-time (no Qt)
+#   python bench/bench_sequencer.py                  # 10 batches each way, config.json dosing/sequencer
+#   python bench/bench_sequencer.py --batches 20 --mix-s 45
+# Runs the DosingEngine + BatchSequencer on FeedSim in simulated time (fast) and prints the mean
+# seconds per stage, the cycle time between discharges and m3/h.
+import argparse
+from common import load_config, print_table
+
+from tagbus import TagBus
+from control import DosingEngine, BatchSequencer, FeedSim
+from control.sequencer import STAGES
+
+def ingredients(cfg: dict) -> list[tuple[str, str, str, float]]:
+    """(name, weight tag, gate tag, target kg) for the configured hoppers (as MainWindow builds them)."""
+    t = cfg.get("targets", {})
+    out = [(f"Agg{i+1}", f"agg{i+1}.weight_kg", f"agg{i+1}.gate_open", float(t.get(f"Agg{i+1}", 0)))
+           for i in range(len(cfg.get("hoppers", [])))]
+    for name, hop in (("Cement", "cement_hopper"), ("Water", "water_hopper"), ("Admix", "admix_hopper")):
+        out.append((name, f"{hop}.weight_kg", f"{hop}.gate_open", float(t.get(name, 0))))
+    return out
+
+def run(cfg: dict, pipelined: bool, batches: int, seed: int = 1) -> BatchSequencer:
+    dcfg = dict(cfg["dosing"], learned=None); scfg = dict(cfg["sequencer"], pipelined=pipelined)
+    bus = TagBus(); sim = FeedSim(bus, seed=seed); ingr = ingredients(cfg)
+    eng = DosingEngine.from_config(dcfg, bus, [(n, w) for n, w, _, _ in ingr], ".", sim=sim)
+    seq = BatchSequencer.from_config(scfg, bus, eng, [(n, w, g) for n, w, g, _ in ingr])
+    sim.add_feeders(eng, dcfg); sim.add_discharges([(n, w, g) for n, w, g, _ in ingr], scfg.get("sim") or {})
+    seq.start(batches, {n: t for n, _, _, t in ingr})
+    while seq.running and eng.t < 3600 * 4: eng.step()
+    return seq
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Batch sequencer benchmark")
+    ap.add_argument("--batches", type=int, default=10)
+    ap.add_argument("--mix-s", type=float, default=None)
+    a = ap.parse_args()
+    cfg = load_config()
+    if a.mix_s is not None: cfg["sequencer"]["mix_s"] = a.mix_s
+    m3 = float(cfg["sequencer"].get("batch_m3", 1.0)); rows = []
+    for pipelined in (False, True):
+        seq = run(cfg, pipelined, a.batches)
+        s = seq.summary(last=max(2, a.batches - 1), batch_m3=m3)     # drop the first batch (pipeline fill)
+        rows.append(["pipelined" if pipelined else "sequential", len(seq.done)] + [s[k] for k in STAGES]
+                    + [s["cycle"], s["m3_per_h"], seq.done[-1].t_out])
+    print(f"== batch cycle: {a.batches} x {m3:g} m3, mix {cfg['sequencer']['mix_s']:g} s (stage means, s)")
+    print_table(["mode", "batches"] + list(STAGES) + ["cycle s", "m3/h", "total s"], rows)
+
+if __name__ == "__main__":
+    main_bench()
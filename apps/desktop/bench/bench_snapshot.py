@@ -0,0 +1,50 @@
+# bench/bench_snapshot.py — state snapshots: GUI-thread cost per sample, write time, restore time (no Qt, temp dir)
+#   python bench/bench_snapshot.py --samples 2000
+import argparse, os, shutil, tempfile, time
+from common import stats_ms, print_table
+
+from tagbus import TagBus
+import snapshot
+
+def plant_bus(n_aggs: int = 4, n_silos: int = 2) -> TagBus:
+    bus = TagBus()
+    for i in range(1, n_aggs + 1): bus.publish(f"agg{i}.weight_kg", 0.0)
+    for i in range(1, n_silos + 1): bus.publish(f"silo{i}.level_pct", 50.0); bus.publish(f"silo{i}.run", False)
+    for h in ("cement_hopper", "water_hopper", "admix_hopper"): bus.publish(f"{h}.weight_kg", 0.0)
+    for d in ("cement_screw", "water_pump", "admix_pump", "mixer"): bus.publish(f"{d}.run", False)
+    bus.publish("water_tank.kg", 800.0); bus.publish("admix_tank.kg", 160.0); bus.publish("feeder.active", 1)
+    return bus
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="State snapshot benchmark")
+    ap.add_argument("--samples", type=int, default=2000)
+    ap.add_argument("--aggs", type=int, default=4)
+    a = ap.parse_args()
+    root = tempfile.mkdtemp(prefix="snap-bench-"); path = os.path.join(root, "state.snap")
+    try:
+        bus = plant_bus(a.aggs); snap = snapshot.Snapshotter(path, bus)
+        changed, still = [], []
+        for k in range(a.samples):
+            bus.publish("agg1.weight_kg", float(k)); bus.publish("water_tank.kg", 800.0 - k * 0.01)
+            s = time.perf_counter(); snap.sample(); changed.append(time.perf_counter() - s)
+            s = time.perf_counter(); snap.sample(); still.append(time.perf_counter() - s)
+        writes = []
+        for _ in range(50):
+            data = snapshot.encode({n: bus.value(n) for n in bus.names()}, time.time())
+            s = time.perf_counter(); snapshot.write_atomic(path, data); writes.append(time.perf_counter() - s)
+        restores = []
+        for _ in range(200):
+            fresh = plant_bus(a.aggs)
+            s = time.perf_counter(); n, _ = snapshot.restore(fresh, path); restores.append(time.perf_counter() - s)
+        size = os.path.getsize(path)
+        rows = [["sample (changed: encode + hand-over)", *[stats_ms(changed)[k] for k in ("mean", "p95", "max")]],
+                ["sample (nothing changed)", *[stats_ms(still)[k] for k in ("mean", "p95", "max")]],
+                ["write (tmp + fsync + rename, thread)", *[stats_ms(writes)[k] for k in ("mean", "p95", "max")]],
+                ["restore (read + check + publish)", *[stats_ms(restores)[k] for k in ("mean", "p95", "max")]]]
+        print(f"{n} tags, {size} bytes per snapshot, {a.samples} samples")
+        print_table(["step", "mean ms", "p95 ms", "max ms"], rows)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main_bench()
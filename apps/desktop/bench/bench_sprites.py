@@ -0,0 +1,108 @@
+# bench/bench_sprites.py — sprite pipes: one item per tile (old) vs one shared-atlas item vs a vector stroke;
+#   frame times for a zoomed, a still and a dragged view (one pipe end follows the mouse)
+#   QT_QPA_PLATFORM=offscreen python bench/bench_sprites.py --pipes 40 --frames 120
+import argparse, os, tempfile, time
+from common import stats_ms, print_table
+
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap, QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsObject, QGraphicsPathItem, QGraphicsPixmapItem, QGraphicsScene
+
+def make_tiles(d: str) -> tuple[str, str, str]:
+    """Small straight/elbow/flange PNGs (the repo ships none for pipes)."""
+    out = []
+    for name, w, h in (("straight", 32, 16), ("elbow", 24, 24), ("flange", 28, 28)):
+        pm = QPixmap(w, h); pm.fill(Qt.transparent); p = QPainter(pm); p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(QPen(QColor(60, 66, 74), 2)); p.setBrush(QColor(170, 178, 190))
+        p.drawRoundedRect(1, 1, w - 2, h - 2, 4, 4); p.end()
+        path = os.path.join(d, f"{name}.png"); pm.save(path); out.append(path)
+    return tuple(out)
+
+def pipe_points(i: int, cols: int = 8) -> list[QPointF]:
+    """An L/U-shaped route per pipe on a grid, ~900 px long."""
+    x0, y0 = (i % cols) * 420.0, (i // cols) * 360.0
+    return [QPointF(x0, y0), QPointF(x0 + 300, y0), QPointF(x0 + 300, y0 + 260), QPointF(x0 + 60, y0 + 260), QPointF(x0 + 60, y0 + 120)]
+
+class TilePipe(QGraphicsObject):
+    """The previous SpritePipe: its own QPixmaps, one QGraphicsPixmapItem (scaled/rotated) per tile."""
+    def __init__(self, straight, elbow, flange, scale=1.0):
+        super().__init__(); self._s = QPixmap(straight); self._e = QPixmap(elbow); self._f = QPixmap(flange)
+        self._scale = scale; self._children = []
+    def boundingRect(self): return self.childrenBoundingRect()
+    def paint(self, p, opt, widget=None): pass
+    def set_path_points(self, pts):
+        for c in self._children:
+            if c.scene(): c.scene().removeItem(c)
+        self._children.clear(); sc = self._scale
+        for a, b in zip(pts, pts[1:]):
+            if abs(a.y() - b.y()) < 0.5:
+                x1, x2 = sorted((a.x(), b.x())); x = x1
+                while x < x2:
+                    t = QGraphicsPixmapItem(self._s, self); t.setScale(sc); t.setPos(x, a.y() - self._s.height() * sc / 2)
+                    self._children.append(t); x += max(1.0, self._s.width() * sc)
+            else:
+                y1, y2 = sorted((a.y(), b.y())); y = y1
+                while y < y2:
+                    t = QGraphicsPixmapItem(self._s, self); t.setScale(sc); t.setTransform(QTransform().rotate(90), True)
+                    t.setPos(a.x() - self._s.height() * sc / 2, y); self._children.append(t); y += max(1.0, self._s.height() * sc)
+        for cur in pts[1:-1]:
+            for pm in (self._e, self._f):
+                t = QGraphicsPixmapItem(pm, self); t.setScale(sc)
+                t.setPos(cur.x() - pm.width() * sc / 2, cur.y() - pm.height() * sc / 2); self._children.append(t)
+
+def build(mode: str, scene: QGraphicsScene, tiles, n: int, scale: float):
+    from components.sprite_pipe import SpritePipe
+    t0 = time.perf_counter(); pipes = []
+    for i in range(n):
+        pts = pipe_points(i)
+        if mode == "vector":
+            path = QPainterPath(pts[0])
+            for q in pts[1:]: path.lineTo(q)
+            it = QGraphicsPathItem(path); it.setPen(QPen(QColor(170, 178, 190), 16 * scale, Qt.SolidLine, Qt.FlatCap, Qt.MiterJoin))
+            it.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        else:
+            it = (TilePipe if mode == "tiles" else SpritePipe)(*tiles, scale=scale); it.set_path_points(pts)
+        scene.addItem(it); pipes.append(it)
+    return pipes, time.perf_counter() - t0
+
+def run_case(app, mode: str, tiles, *, pipes: int, frames: int, scale: float):
+    from components.plant_view import PlantView
+    scene = QGraphicsScene(); items, build_s = build(mode, scene, tiles, pipes, scale)
+    view = PlantView(scene); view.resize(1600, 900); view.show(); app.processEvents(); view.fit_to_items()
+    vp = view.viewport()
+    for _ in range(5): vp.repaint(); app.processEvents()
+    redraw, still = [], []
+    for f in range(frames):                             # alternate zoom: device caches are redrawn every frame
+        view.scale(1.01 if f % 2 else 1 / 1.01, 1.01 if f % 2 else 1 / 1.01)
+        t0 = time.perf_counter(); vp.repaint(); app.processEvents(); redraw.append(time.perf_counter() - t0)
+    for f in range(frames):                             # same view, whole viewport repainted (animation elsewhere)
+        t0 = time.perf_counter(); vp.repaint(); app.processEvents(); still.append(time.perf_counter() - t0)
+    drag = []
+    for f in range(frames):                             # drag one anchor: the first pipe's free end moves 1 px a frame
+        pts = pipe_points(0); pts[-1] = QPointF(pts[-1].x(), pts[-1].y() + (f % 40))
+        t0 = time.perf_counter()
+        if mode == "vector":
+            path = QPainterPath(pts[0])
+            for q in pts[1:]: path.lineTo(q)
+            items[0].setPath(path)
+        else: items[0].set_path_points(pts)
+        app.processEvents(); vp.repaint(); drag.append(time.perf_counter() - t0)
+    rd, st, dr = stats_ms(redraw), stats_ms(still), stats_ms(drag); n = len(scene.items())
+    view.close(); view.deleteLater(); scene.clear(); app.processEvents()
+    return [mode, pipes, n, build_s * 1000.0 / pipes, rd["mean"], st["mean"], dr["mean"], dr["p95"]]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pipes", type=int, default=40)
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--scale", type=float, default=1.0)
+    a = ap.parse_args()
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as d:
+        tiles = make_tiles(d)
+        rows = [run_case(app, m, tiles, pipes=a.pipes, frames=a.frames, scale=a.scale) for m in ("tiles", "sprite", "vector")]
+    print(f"platform={QApplication.platformName()}  pipes={a.pipes}  frames={a.frames}  (full viewport repaint, ms)")
+    print_table(["mode", "pipes", "scene items", "build ms/pipe", "zoom mean", "still mean", "drag mean", "drag p95"], rows)
+
+if __name__ == "__main__":
+    main_bench()
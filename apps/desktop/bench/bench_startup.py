@@ -0,0 +1,35 @@
+# bench/bench_startup.py — time to first frame of the desktop app, per startup phase, over fresh processes
+#   python bench/bench_startup.py                 # 7 cold starts (offscreen)
+#   python bench/bench_startup.py --runs 15
+# Each run is `python main.py --startup-time -platform offscreen`; "spawn" is the wall time from process
+# start to the report (interpreter start-up included), the phases come from main.py's own marks.
+import argparse, os, statistics, subprocess, sys, time
+from common import APP_DIR, print_table
+
+def one_run() -> tuple[float, dict[str, float]]:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "main.py", "--startup-time", "-platform", "offscreen"], cwd=APP_DIR, env=env,
+                         capture_output=True, text=True, timeout=60).stdout
+    wall = time.perf_counter() - t0
+    phases = {}
+    for line in out.splitlines()[1:]:
+        name, ms, _ = line.rsplit(None, 2); phases[name] = float(ms)
+    return wall, phases
+
+def main_bench():
+    ap = argparse.ArgumentParser(description="Desktop startup benchmark")
+    ap.add_argument("--runs", type=int, default=7)
+    a = ap.parse_args()
+    one_run()                                                  # warm the OS file cache and .pyc files
+    runs = [one_run() for _ in range(a.runs)]
+    names = list(runs[0][1])
+    rows = [[n, statistics.median(r[1].get(n, 0.0) for r in runs), max(r[1].get(n, 0.0) for r in runs)] for n in names]
+    to_frame = [sum(v for k, v in r[1].items() if k != "background") for r in runs]
+    rows.append(["= first frame", statistics.median(to_frame), max(to_frame)])
+    rows.append(["(process wall)", statistics.median(r[0] for r in runs) * 1000, max(r[0] for r in runs) * 1000])
+    print(f"== desktop startup, {a.runs} runs (ms)")
+    print_table(["phase", "median", "max"], rows)
+
+if __name__ == "__main__":
+    main_bench()
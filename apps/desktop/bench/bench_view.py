@@ -0,0 +1,47 @@
+# bench/bench_view.py — PlantView frame-time benchmark (viewport mode / update mode / antialiasing)
+#   QT_QPA_PLATFORM=offscreen python bench/bench_view.py --frames 300 --mode smart
+#   python bench/bench_view.py --matrix          # every update mode, AA on/off
+import argparse, time
+from common import load_config, stats_ms, print_table, animate_plant
+
+from PySide6.QtWidgets import QApplication
+
+def run_case(app, cfg: dict, *, frames: int, mode: str, gl: bool, aa: bool, size=(1920, 1080)):
+    import main
+    cfg = dict(cfg); cfg["view"] = {"accelerated": gl, "update_mode": mode, "antialias": aa}
+    win = main.MainWindow(cfg); win.timer.stop()
+    win.showNormal(); win.resize(*size); app.processEvents(); win.view.fit_to_items()
+    animate_plant(win)
+    vp = win.view.viewport()
+    for _ in range(10): win._tick(); vp.repaint(); app.processEvents()   # warm caches
+    samples = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        win._tick(); app.processEvents(); vp.repaint()
+        samples.append(time.perf_counter() - t0)
+    st = stats_ms(samples)
+    label = f"{mode}{' +GL' if win.view.accelerated else (' (GL n/a)' if gl else '')}{'' if aa else ' noAA'}"
+    win.close(); win.deleteLater(); app.processEvents()
+    return [label, st["n"], st["mean"], st["p50"], st["p95"], st["max"]]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--mode", default="smart", choices=["minimal", "smart", "bounding", "full"])
+    ap.add_argument("--gl", action="store_true", help="request the QOpenGLWidget viewport")
+    ap.add_argument("--no-aa", action="store_true")
+    ap.add_argument("--matrix", action="store_true", help="run all update modes with AA on/off")
+    a = ap.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    cfg = load_config()
+    if a.matrix:
+        cases = [(m, aa) for m in ("minimal", "smart", "bounding", "full") for aa in (True, False)]
+    else:
+        cases = [(a.mode, not a.no_aa)]
+    rows = [run_case(app, cfg, frames=a.frames, mode=m, gl=a.gl, aa=aa) for m, aa in cases]
+    print(f"platform={QApplication.platformName()}  frames/case={a.frames}  (tick + repaint, ms)")
+    print_table(["case", "n", "mean", "p50", "p95", "max"], rows)
+
+if __name__ == "__main__":
+    main_bench()
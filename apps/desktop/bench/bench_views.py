@@ -0,0 +1,49 @@
+# bench/bench_views.py — overview + detail panes on one scene: GUI-thread cost per tick as views are added
+#   ticks run at the app's TICK_S pace; each sample is the GUI thread's CPU time from one tick to the next
+#   (the tick, the repaints it causes and any held-back pane repaint that falls in between)
+#   QT_QPA_PLATFORM=offscreen python bench/bench_views.py --frames 200
+import argparse, time
+from common import load_config, stats_ms, print_table, animate_plant
+
+from PySide6.QtWidgets import QApplication
+
+def run_case(app, cfg: dict, label: str, *, details: bool, zoom: float, overview: bool, fps: float, frames: int,
+             size=(1920, 1080)):
+    import main
+    from runtime.plant import TICK_S
+    cfg = dict(cfg); v = dict(cfg.get("view", {}), detail_fps=fps)
+    if not details: v["details"] = []
+    cfg["view"] = v
+    win = main.MainWindow(cfg); win.timer.stop()
+    win.showNormal(); win.resize(*size); app.processEvents()
+    for pane in win.detail_views:                                       # zoom in on the middle of each pane
+        c = pane.mapToScene(pane.viewport().rect().center()); pane.scale(zoom, zoom); pane.centerOn(c)
+    win.view.setVisible(overview)
+    animate_plant(win)
+    for _ in range(10): win._tick(); app.processEvents()                 # warm caches
+    samples = []; due = time.perf_counter()
+    for _ in range(frames):
+        c0 = time.thread_time(); win._tick(); app.processEvents(); due += TICK_S
+        while time.perf_counter() < due: app.processEvents(); time.sleep(0.001)
+        samples.append(time.thread_time() - c0)
+    st = stats_ms(samples); n = int(overview) + len(win.detail_views)
+    win.close(); win.deleteLater(); app.processEvents()
+    return [label, n, fps if details else "-", st["mean"], st["p50"], st["p95"]]
+
+def main_bench():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--frames", type=int, default=200)
+    a = ap.parse_args()
+    app = QApplication.instance() or QApplication([])
+    cfg = load_config()
+    fps = float(cfg.get("view", {}).get("detail_fps", 15))
+    cases = [("no views (tick + timers)", False, 1.0, False, 0), ("overview", False, 1.0, True, 0)]
+    for f in (0, fps):
+        cases += [("overview + panes (fitted)", True, 1.0, True, f), ("overview + panes (zoomed x3)", True, 3.0, True, f),
+                  ("panes only (zoomed x3)", True, 3.0, False, f)]
+    rows = [run_case(app, cfg, lbl, details=d, zoom=z, overview=o, fps=f, frames=a.frames) for lbl, d, z, o, f in cases]
+    print(f"platform={QApplication.platformName()}  frames/case={a.frames}  (GUI-thread CPU per tick, ms; pane fps 0 = every tick)")
+    print_table(["case", "views", "pane fps", "mean", "p50", "p95"], rows)
+
+if __name__ == "__main__":
+    main_bench()
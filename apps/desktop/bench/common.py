@@ -0,0 +1,37 @@
+# bench/common.py — shared helpers for the headless benchmark scripts
+# Run the scripts from apps/desktop, e.g.:  QT_QPA_PLATFORM=offscreen python bench/bench_view.py
+import os, sys, json, statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path: sys.path.insert(0, APP_DIR)
+
+def load_config(path: str | None = None) -> dict:
+    with open(path or os.path.join(APP_DIR, "config.json"), "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg.setdefault("historian", {})["enabled"] = False     # benchmarks never write history files
+    cfg.setdefault("snapshot", {})["enabled"] = False      # ... nor restore or save plant state
+    cfg.setdefault("alarms", {})["enabled"] = False        # ... nor journal alarms
+    return cfg
+
+def stats_ms(samples_s: list[float]) -> dict:
+    """Seconds in -> {n, mean, p50, p95, max} in milliseconds."""
+    if not samples_s: return {"n": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ms = sorted(x * 1000.0 for x in samples_s)
+    return {"n": len(ms), "mean": statistics.fmean(ms), "p50": ms[len(ms)//2],
+            "p95": ms[min(len(ms)-1, int(len(ms)*0.95))], "max": ms[-1]}
+
+def print_table(headers: list[str], rows: list[list]):
+    cells = [[str(h) for h in headers]] + [[f"{c:.3f}" if isinstance(c, float) else str(c) for c in r] for r in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    for n, r in enumerate(cells):
+        print("  ".join(c.rjust(widths[i]) if i else c.ljust(widths[i]) for i, c in enumerate(r)))
+        if n == 0: print("  ".join("-" * w for w in widths))
+
+def animate_plant(win):
+    """Put the plant in its busiest visual state (everything that animates is animating)."""
+    for i in range(len(win.silos)): win._set_silo(i + 1, True)
+    win._set_mixer(True); win.bus.publish("mixer.gate_open", True)
+    if win.collector: win.collector.open_gate()
+    for i in range(len(win.hoppers)): win._bump_hopper(i, 50)
+    win._set_cement_screw(True); win._set_water_pump(True); win._set_admix_pump(True)
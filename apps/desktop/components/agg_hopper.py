@@ -3,8 +3,10 @@ from PySide6.QtCore import QRectF, QPointF, Qt
 from PySide6.QtGui import (
     QPainter, QPen, QBrush, QColor, QPainterPath, QLinearGradient, QRadialGradient, QFont
 )
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsSimpleTextItem
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
 from theme import YELLOW, STEEL_EDGE, TXT
+from components.overlays import PaintOverlay
+from components.lod import lod, LodText, BOLTS, SEAMS, GLASS, TEXT
 
 # -------- Hopper colors --------
 HOPPER_FACE   = YELLOW
@@ -44,6 +46,7 @@ class AggHopper(QGraphicsObject):
     """
     Aggregate hopper (single HOPPER capsule gauge, weight readout, optional discharge gate).
     New (optional): set_dosing(True/False) => brief glow pulse on the hopper body.
+    Static body is cached; dosing glow and gauge fill are child overlays.
     """
     def __init__(self, w=380, h=400, draggable=True, parent=None):
         super().__init__(parent)
@@ -68,10 +71,15 @@ class AggHopper(QGraphicsObject):
             self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
-        self.title_item  = QGraphicsSimpleTextItem(self._title, self)
-        self.weight_item = QGraphicsSimpleTextItem("WEIGHT: 0.00 kg", self)
+        # animated parts
+        self._glow_overlay  = PaintOverlay(self, self._body_path_rect, self._paint_glow)
+        self._gauge_overlay = PaintOverlay(self, self._gauge_rect, self._paint_capsule_fill, pad=16)
+
+        self.title_item  = LodText(self._title, self)
+        self.weight_item = LodText("WEIGHT: 0.00 kg", self)
         self.title_item.setBrush(QBrush(WEIGHT_TXT))
         self.weight_item.setBrush(QBrush(WEIGHT_TXT))
+        self._place_title(); self._place_weight()
 
     # ---------- geometry ----------
     def boundingRect(self) -> QRectF:
@@ -102,6 +110,30 @@ class AggHopper(QGraphicsObject):
 
         return body_top_l, body_top_r, body_bot_l, body_bot_r, lip_rect, outlet_rect, base_rect, gr
 
+    def _body_path(self) -> QPainterPath:
+        tl, tr, bl, br = self._layout()[:4]
+        body = QPainterPath(tl); body.lineTo(tr); body.lineTo(br); body.lineTo(bl); body.closeSubpath()
+        return body
+
+    def _body_path_rect(self) -> QRectF:
+        return self._body_path().boundingRect()
+
+    def _gauge_rect(self) -> QRectF:
+        return self._layout()[7]
+
+    def _place_title(self):
+        tl, tr, _, _, lip_rect = self._layout()[:5]
+        self.title_item.setText(self._title)
+        tbr = self.title_item.boundingRect()
+        self.title_item.setPos((tl.x()+tr.x())/2 - tbr.width()/2, lip_rect.top() - tbr.height() - 10)
+
+    def _place_weight(self):
+        tl, tr = self._layout()[:2]; base_rect = self._layout()[6]
+        self.weight_item.setText(f"WEIGHT: {self._weight_kg:0.2f} kg")
+        wbr = self.weight_item.boundingRect()
+        mid_x = (tl.x()+tr.x())/2
+        self.weight_item.setPos(mid_x - wbr.width()/2, base_rect.bottom()+10)
+
     # ---------- percent ----------
     def _hopper_frac(self) -> float:
         if self._level_override_pct is not None:
@@ -110,65 +142,58 @@ class AggHopper(QGraphicsObject):
             return 0.0
         return max(0.0, min(1.0, self._weight_kg / self._capacity_kg))
 
-    # ---------- paint ----------
+    # ---------- paint (static body; cached) ----------
     def paint(self, p: QPainter, option, widget=None):
         del option, widget
         p.setRenderHint(QPainter.Antialiasing, True)
-        tl, tr, bl, br, lip_rect, outlet_rect, base_rect, gr = self._layout()
-
-        # title
-        self.title_item.setText(self._title)
-        tbr = self.title_item.boundingRect()
-        self.title_item.setPos((tl.x()+tr.x())/2 - tbr.width()/2, lip_rect.top() - tbr.height() - 10)
+        tl, tr, bl, br, lip_rect, outlet_rect, base_rect, gr = self._layout(); l = lod(p)
 
         # body
         p.setPen(QPen(HOPPER_EDGE, 3))
-        body = QPainterPath(tl); body.lineTo(tr); body.lineTo(br); body.lineTo(bl); body.closeSubpath()
-        p.setBrush(QBrush(HOPPER_FACE)); p.drawPath(body)
-
-        # dosing glow (if pulsing)
-        if self._dosing_pulse > 0:
-            a = max(0, min(180, self._dosing_pulse))  # alpha
-            p.setPen(Qt.NoPen)
-            p.setBrush(QColor(255, 255, 255, a//2))
-            p.drawPath(body)
-            self._dosing_pulse -= 6  # decay
+        p.setBrush(QBrush(HOPPER_FACE)); p.drawPath(self._body_path())
 
         # lip + shine
         p.setPen(QPen(HOPPER_EDGE, 3)); p.setBrush(QBrush(HOPPER_FACE))
         p.drawRoundedRect(lip_rect, 8, 8)
-        p.setBrush(QBrush(HOPPER_SHINE)); p.setPen(Qt.NoPen)
-        p.drawRoundedRect(QRectF(lip_rect.left()+10, lip_rect.top()+4, lip_rect.width()-20, lip_rect.height()*0.45), 6, 6)
+        if l >= GLASS:
+            p.setBrush(QBrush(HOPPER_SHINE)); p.setPen(Qt.NoPen)
+            p.drawRoundedRect(QRectF(lip_rect.left()+10, lip_rect.top()+4, lip_rect.width()-20, lip_rect.height()*0.45), 6, 6)
 
         # outlet box + plug
         p.setPen(QPen(OUTLET_EDGE, 3)); p.setBrush(QBrush(OUTLET_FACE)); p.drawRoundedRect(outlet_rect, 6, 6)
-        plug_r = 7
-        p.setBrush(QBrush(OUTLET_PLUG)); p.setPen(QPen(OUTLET_PLUG, 1))
-        p.drawEllipse(QPointF(outlet_rect.center().x(), outlet_rect.center().y()), plug_r, plug_r)
+        if l >= BOLTS:
+            plug_r = 7
+            p.setBrush(QBrush(OUTLET_PLUG)); p.setPen(QPen(OUTLET_PLUG, 1))
+            p.drawEllipse(QPointF(outlet_rect.center().x(), outlet_rect.center().y()), plug_r, plug_r)
 
         # base tray
         p.setPen(Qt.NoPen); p.setBrush(QBrush(BASE_FACE)); p.drawRoundedRect(base_rect, 3, 3)
 
-        # capsule gauge (HOPPER)
-        self._paint_capsule(p, gr, self._hopper_frac(), title="HOPPER")
+        # capsule gauge casing (HOPPER); fill + % live in _gauge_overlay
+        self._paint_capsule(p, gr, title="HOPPER")
 
         # gate (CLOSED plate only—kept simple here)
         if False:
             pass  # (If you need the open stream on agg bins too, we can enable like the mixer)
 
-        # weight readout
-        self.weight_item.setText(f"WEIGHT: {self._weight_kg:0.2f} kg")
-        wbr = self.weight_item.boundingRect()
-        mid_x = (tl.x()+tr.x())/2
-        self.weight_item.setPos(mid_x - wbr.width()/2, base_rect.bottom()+10)
+    # ---------- overlays (animated) ----------
+    def _paint_glow(self, p: QPainter):
+        # dosing glow (if pulsing); decay happens in advance_phase
+        if self._dosing_pulse > 0:
+            a = max(0, min(180, self._dosing_pulse))  # alpha
+            p.setPen(Qt.NoPen)
+            p.setBrush(QColor(255, 255, 255, a//2))
+            p.drawPath(self._body_path())
 
-    def _paint_capsule(self, p: QPainter, r: QRectF, frac: float, *, title: str):
+    def _paint_capsule(self, p: QPainter, r: QRectF, *, title: str):
         radius = r.width()/2
         # case
         p.setBrush(QBrush(GLASS_BG)); p.setPen(QPen(GLASS_EDGE, 2))
         p.drawRoundedRect(r, radius, radius)
+        l = lod(p)
 
         # ticks
+        if l < SEAMS: return
         p.setPen(QPen(TICK_MINOR, 1))
         for i in range(1, 20):
             if i % 2 == 0: continue
@@ -180,6 +205,7 @@ class AggHopper(QGraphicsObject):
             p.drawLine(QPointF(r.left()+6, y), QPointF(r.right()-6, y))
 
         # labels + title
+        if l < TEXT: return
         p.setPen(QPen(LABEL_COL))
         f = QFont(p.font()); f.setBold(True); f.setPointSize(8); p.setFont(f)
         p.drawText(QPointF(r.right()+6, r.top()+10), "FULL")
@@ -187,8 +213,11 @@ class AggHopper(QGraphicsObject):
         if title:
             p.drawText(QPointF(r.left(), r.top()-6), title)
 
+    def _paint_capsule_fill(self, p: QPainter):
+        r = self._gauge_rect()
+
         # fill
-        frac = max(0.0, min(1.0, frac))
+        frac = max(0.0, min(1.0, self._hopper_frac()))
         fill_h = (r.height() - 8) * frac
         if fill_h > 1:
             fill_rect = QRectF(r.left()+4, r.bottom()-4 - fill_h, r.width()-8, fill_h)
@@ -198,6 +227,7 @@ class AggHopper(QGraphicsObject):
             p.drawRoundedRect(fill_rect, (r.width()-8)/2, (r.width()-8)/2)
 
         # % text
+        if lod(p) < TEXT: return
         pct_text = f"{int(round(frac*100))}%"
         p.setPen(QPen(PCT_COL))
         f2 = QFont(p.font()); f2.setBold(True); f2.setPointSize(16); p.setFont(f2)
@@ -206,21 +236,25 @@ class AggHopper(QGraphicsObject):
         p.drawText(QPointF(r.center().x() - brw/2, r.center().y() + brh/2), pct_text)
 
     # ---------- public API ----------
-    def set_title(self, text: str): self._title = str(text); self.update()
-    def set_weight_kg(self, kg: float): self._weight_kg = max(0.0, float(kg)); self.update()
+    def set_title(self, text: str): self._title = str(text); self._place_title()
+    def set_weight_kg(self, kg: float):
+        kg = max(0.0, float(kg))
+        if kg == self._weight_kg: return
+        self._weight_kg = kg; self._place_weight(); self._gauge_overlay.update()
     def get_weight_kg(self) -> float:   return self._weight_kg
-    def set_capacity_kg(self, kg: float): self._capacity_kg = max(1.0, float(kg)); self.update()
+    def bind(self, bus, prefix: str):   bus.subscribe(f"{prefix}.weight_kg", self.set_weight_kg)
+    def set_capacity_kg(self, kg: float): self._capacity_kg = max(1.0, float(kg)); self._gauge_overlay.update()
     def get_capacity_kg(self) -> float:   return self._capacity_kg
-    def set_level_pct(self, pct: float): self._level_override_pct = max(0.0, min(100.0, float(pct))); self.update()
-    def clear_level_pct_override(self): self._level_override_pct = None; self.update()
-    # Compatibility no-ops for now (kept to avoid breaking calls)
-    def set_cement_pct(self, pct: float): self._cement_pct = max(0.0, min(100.0, float(pct))); self.update()
-    def set_mixer_pct(self,  pct: float): self._mixer_pct  = max(0.0, min(100.0, float(pct))); self.update()
+    def set_level_pct(self, pct: float): self._level_override_pct = max(0.0, min(100.0, float(pct))); self._gauge_overlay.update()
+    def clear_level_pct_override(self): self._level_override_pct = None; self._gauge_overlay.update()
+    # Compatibility no-ops for now (kept to avoid breaking calls; nothing is drawn for them)
+    def set_cement_pct(self, pct: float): self._cement_pct = max(0.0, min(100.0, float(pct)))
+    def set_mixer_pct(self,  pct: float): self._mixer_pct  = max(0.0, min(100.0, float(pct)))
 
     def set_dosing(self, on: bool = True, intensity: int = 180):
         """Call briefly while a gate is dosing; draws a fading glow over ~1s."""
         self._dosing_pulse = max(self._dosing_pulse, intensity)
-        self.update()
+        self._glow_overlay.update()
 
     def open_gate(self):  pass
     def close_gate(self): pass
@@ -230,4 +264,4 @@ class AggHopper(QGraphicsObject):
         # decay the dosing pulse if active
         if self._dosing_pulse > 0:
             self._dosing_pulse = max(0, self._dosing_pulse - 6)
-            self.update()
+            self._glow_overlay.update()
@@ -0,0 +1,163 @@
+# components/alarm_view.py — alarm list panel (listed + shelved alarms, operator actions) and the journal history
+import time
+from PySide6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QItemSelectionModel
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableView, QHeaderView,
+                               QAbstractItemView, QStackedWidget)
+from theme import TXT, GREY_TEXT, YELLOW, WARN_RED, STEEL_DK
+from alarms import UNACK, ACKED, RTN_UNACK
+
+PRI_NAME = {1: "High", 2: "Medium", 3: "Low"}
+PRI_COLOR = {1: WARN_RED, 2: YELLOW, 3: TXT}
+STATE_TEXT = {UNACK: "Active, unacked", ACKED: "Active", RTN_UNACK: "Cleared, unacked"}
+SHELVES = (("Shelve 15 min", 900), ("Shelve 1 h", 3600), ("Shelve 8 h", 8 * 3600))
+STYLE = ("QPushButton { color:white; padding:4px 8px; border-radius:6px; background:#2E3239; "
+         "border:1px solid rgba(255,255,255,0.12);} QPushButton:checked { background:#005C85; } "
+         "QPushButton:disabled { color:#6B7683; }")
+TABLE = ("QTableView { background:#1E2024; color:#EAECEE; gridline-color:#2E3239; border:1px solid #2E3239; "
+         "selection-background-color:#005C85; } QHeaderView::section { background:#2E3239; color:#C8D1D9; "
+         "border:0; padding:3px 6px; }")
+
+def _clock(t: float) -> str: return time.strftime("%m-%d %H:%M:%S", time.localtime(t))
+
+def _value(v) -> str:
+    if v is None: return ""
+    if isinstance(v, bool): return "on" if v else "off"
+    return f"{v:.1f}" if isinstance(v, float) else str(v)
+
+class AlarmModel(QAbstractTableModel):
+    """Listed alarms (engine order: priority, unacked first, newest), then the shelved ones greyed out."""
+    HEAD = ("Time", "Priority", "Alarm", "Value", "State")
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent); self.engine = engine; self.rows = []; self._bold = QFont(); self._bold.setBold(True)
+
+    def refresh(self):
+        self.beginResetModel(); self.rows = self.engine.listed() + self.engine.shelved(); self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.rows)
+    def columnCount(self, parent=QModelIndex()): return len(self.HEAD)
+
+    def headerData(self, s, o, role=Qt.DisplayRole):
+        return self.HEAD[s] if o == Qt.Horizontal and role == Qt.DisplayRole else None
+
+    def data(self, ix, role=Qt.DisplayRole):
+        a = self.rows[ix.row()]; c = ix.column()
+        if role == Qt.DisplayRole:
+            if c == 0: return _clock(a.t) if a.t else ""
+            if c == 1: return PRI_NAME.get(a.d.priority, str(a.d.priority))
+            if c == 2: return a.d.text
+            if c == 3: return _value(a.value)
+            return f"Shelved until {time.strftime('%H:%M', time.localtime(a.shelved_until))}" if a.shelved_until \
+                else STATE_TEXT.get(a.state, a.state)
+        if role == Qt.ForegroundRole:
+            return STEEL_DK if a.shelved_until else (PRI_COLOR.get(a.d.priority, TXT) if a.active else GREY_TEXT)
+        if role == Qt.FontRole and not a.acked and not a.shelved_until: return self._bold
+        return None
+
+class JournalModel(QAbstractTableModel):
+    """Journal events newest first, fetched a page at a time as the view scrolls (canFetchMore/fetchMore)."""
+    HEAD = ("Time", "Event", "Priority", "Alarm", "Value")
+    PAGE = 200
+
+    def __init__(self, reader, parent=None):
+        super().__init__(parent); self.reader = reader; self.rows: list[tuple] = []; self._more = True
+
+    def reload(self):
+        self.beginResetModel(); self.rows = self.reader.page(self.PAGE); self._more = len(self.rows) == self.PAGE
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()): return self._more and bool(self.rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        page = self.reader.page(self.PAGE, before=self.rows[-1][0]); self._more = len(page) == self.PAGE
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows += page; self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.rows)
+    def columnCount(self, parent=QModelIndex()): return len(self.HEAD)
+
+    def headerData(self, s, o, role=Qt.DisplayRole):
+        return self.HEAD[s] if o == Qt.Horizontal and role == Qt.DisplayRole else None
+
+    def data(self, ix, role=Qt.DisplayRole):
+        _, t, alarm, kind, pri, value, text = self.rows[ix.row()]; c = ix.column()
+        if role == Qt.DisplayRole:
+            return (_clock(t), kind, PRI_NAME.get(pri, ""), text or alarm, "" if value is None else f"{value:.1f}")[c]
+        if role == Qt.ForegroundRole:
+            return PRI_COLOR.get(pri, GREY_TEXT) if kind in ("raise", "flood") else GREY_TEXT
+        return None
+
+class AlarmPanel(QWidget):
+    """
+    Summary line, operator buttons (ack / ack all / shelve / unshelve) and the alarm list; "History" swaps
+    in the journal. Redrawn at refresh_ms only when the engine's version (or the journal) moved.
+    """
+    def __init__(self, engine, reader=None, journal=None, refresh_ms: int = 500, parent=None):
+        super().__init__(parent)
+        self.engine = engine; self.journal = journal; self._seen = (-1, -1)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(4)
+        self.summary = QLabel(); self.summary.setStyleSheet("QLabel { color:#C8D1D9; }")
+        lay.addWidget(self.summary)
+        bar = QHBoxLayout(); bar.setSpacing(4)
+        self.b_ack = QPushButton("Ack"); self.b_ack_all = QPushButton("Ack All"); self.b_unshelve = QPushButton("Unshelve")
+        self.b_shelve = [QPushButton(label) for label, _ in SHELVES]
+        self.b_history = QPushButton("History"); self.b_history.setCheckable(True); self.b_history.setEnabled(reader is not None)
+        for b in (self.b_ack, self.b_ack_all, *self.b_shelve, self.b_unshelve): b.setStyleSheet(STYLE); bar.addWidget(b)
+        bar.addStretch(1); self.b_history.setStyleSheet(STYLE); bar.addWidget(self.b_history)
+        lay.addLayout(bar)
+        self.model = AlarmModel(engine, self); self.table = self._table(self.model)
+        self.stack = QStackedWidget(self); self.stack.addWidget(self.table)
+        self.history = None
+        if reader is not None:
+            self.history = JournalModel(reader, self); self.stack.addWidget(self._table(self.history, fit=False))
+        lay.addWidget(self.stack, 1)
+        self.b_ack.clicked.connect(lambda: self._each(engine.ack))
+        self.b_ack_all.clicked.connect(lambda: engine.ack())
+        for b, (_, secs) in zip(self.b_shelve, SHELVES): b.clicked.connect(lambda _=False, s=secs: self._each(lambda aid: engine.shelve(aid, s)))
+        self.b_unshelve.clicked.connect(lambda: self._each(engine.unshelve))
+        self.b_history.toggled.connect(self._show_history)
+        self.timer = QTimer(self); self.timer.setInterval(int(refresh_ms)); self.timer.timeout.connect(self.refresh); self.timer.start()
+        self.refresh()
+
+    def _table(self, model, fit: bool = True) -> QTableView:
+        """fit: columns sized to their contents (the short alarm list; the history keeps fixed widths, so a
+        page fetched while scrolling costs its own rows only)."""
+        t = QTableView(self); t.setModel(model); t.setStyleSheet(TABLE); t.verticalHeader().setVisible(False)
+        t.setSelectionBehavior(QAbstractItemView.SelectRows); t.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        h = t.horizontalHeader(); h.setStretchLastSection(True)
+        if fit: h.setSectionResizeMode(QHeaderView.ResizeToContents)
+        else:
+            for c, w in enumerate((120, 80, 70, 260)): t.setColumnWidth(c, w)
+        t.verticalHeader().setDefaultSectionSize(22)
+        return t
+
+    def _each(self, fn):
+        """fn(alarm id) for every selected alarm row."""
+        for aid in {self.model.rows[ix.row()].d.id for ix in self.table.selectionModel().selectedRows()}: fn(aid)
+        self.refresh()
+
+    def _show_history(self, on: bool):
+        self.stack.setCurrentIndex(1 if on else 0); self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        if not self.isVisible() and not force: return
+        e = self.engine; seen = (e.version, self.journal.written if self.journal else 0)
+        if seen == self._seen and not force: return
+        if seen[0] != self._seen[0] or force:
+            sel = {self.model.rows[ix.row()].d.id for ix in self.table.selectionModel().selectedRows()}
+            self.model.refresh()
+            sm = self.table.selectionModel()
+            for r, a in enumerate(self.model.rows):                # keep the operator's selection across redraws
+                if a.d.id in sel: sm.select(self.model.index(r, 0), QItemSelectionModel.Select | QItemSelectionModel.Rows)
+            listed = e.listed(); unack = sum(not a.acked for a in listed); shelved = len(e.shelved())
+            supp = sum(a.suppressed for a in e.alarms)
+            text = f"{len(listed)} alarm(s), {unack} unacknowledged" + (f" · {shelved} shelved" if shelved else "")
+            if e.flood: text += f" · ALARM FLOOD: {supp} lower-priority alarm(s) suppressed"
+            self.summary.setText(text)
+            self.summary.setStyleSheet("QLabel { color:%s; font-weight:%s; }" % (
+                WARN_RED.name() if e.flood or unack else "#C8D1D9", "600" if e.flood or unack else "400"))
+        if self.history is not None and self.stack.currentIndex() == 1 and (seen[1] != self._seen[1] or force):
+            self.history.reload()
+        self._seen = seen
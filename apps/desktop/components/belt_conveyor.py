@@ -2,6 +2,7 @@ from __future__ import annotations
 from PySide6.QtCore import QRectF, Qt
 from PySide6.QtGui import QPainter, QPen, QBrush, QColor
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
+from components.lod import lod, ARROWS
 
 class BeltConveyor(QGraphicsObject):
     def __init__(self, length_px: float = 600, belt_h: float = 28, draggable: bool = True, parent=None):
@@ -26,6 +27,7 @@ class BeltConveyor(QGraphicsObject):
         p.setPen(Qt.NoPen); p.setBrush(QBrush(self._roller_color)); r=self.h*0.9
         p.drawEllipse(0-r/2,(self.h-r)/2,r,r); p.drawEllipse(self.w-r/2,(self.h-r)/2,r,r)
         p.setPen(QPen(self._edge_color,2)); p.setBrush(QBrush(self._belt_color)); p.drawRoundedRect(0,0,self.w,self.h,6,6)
+        if lod(p)<ARROWS: return
         pen=QPen(QColor("#D7DDE3")); pen.setWidth(2); p.setPen(pen); step=max(20,self.h*1.6)
         offset=self._phase%step; y=self.h/2; x=-step+offset
         while x<=self.w+step:
@@ -3,8 +3,10 @@ from PySide6.QtCore import QRectF, QPointF, Qt
 from PySide6.QtGui import (
     QPainter, QPen, QBrush, QColor, QFont, QLinearGradient
 )
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsSimpleTextItem
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
 from theme import YELLOW, STEEL_EDGE, TXT
+from components.overlays import PaintOverlay
+from components.lod import lod, LodText, GLASS as GLASS_LOD, TEXT, ARROWS
 import math
 
 # ===== Palette (calm & readable) ===============================================
@@ -32,16 +34,19 @@ GATE_FILL      = QColor("#D9DEE5")
 class CollectingHopper(QGraphicsObject):
     """
     Minimal, clean collecting hopper with:
-      - 4 per-segment amounts (Agg 1..4)
+      - one segment per aggregate hopper (Agg 1..N, 4 until labels/bind say otherwise)
       - active aggregate name + kg in center bezel
       - Total weight + slim progress bar
       - Gate open/close with animated stream
+    The frame/pan shell is cached; tag values, bezel, bar fill and
+    gate/stream are child overlays repainted only when their values change.
     PUBLIC API:
       set_title(text)
-      set_segment_amounts([a1..a4])  -> auto total
+      set_segment_count(n)
+      set_segment_amounts([a1..aN])  -> auto total
       set_active_segment(idx or None)
       set_active_and_amount(idx, kg)
-      set_segment_labels([lbl1..lbl4])
+      set_segment_labels([lbl1..lblN])  -> also sets the count
       set_weight_kg(kg)/get_weight_kg()     # manual total override
       set_capacity_kg(kg)/get_capacity_kg()
       open_gate()/close_gate()/is_gate_open()
@@ -53,8 +58,9 @@ class CollectingHopper(QGraphicsObject):
 
         # model
         self._title = "COLLECTING HOPPER"
-        self._seg_amounts = [0.0, 0.0, 0.0, 0.0]
-        self._seg_labels  = ["Agg 1", "Agg 2", "Agg 3", "Agg 4"]
+        self._n = 4
+        self._seg_amounts = [0.0] * self._n
+        self._seg_labels  = [f"Agg {i+1}" for i in range(self._n)]
         self._active_idx  = None
 
         self._capacity_kg = 6000.0
@@ -70,18 +76,25 @@ class CollectingHopper(QGraphicsObject):
             self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
+        # animated / value-driven parts
+        self._tags_overlay  = PaintOverlay(self, self._tags_rect, self._paint_tag_values, pad=30)
+        self._bezel_overlay = PaintOverlay(self, self._bezel_rect, self._paint_bezel, z=2)
+        self._bar_overlay   = PaintOverlay(self, self._bar_rect, self._paint_bar_fill)
+        self._gate_overlay  = PaintOverlay(self, self._gate_rect, self._paint_gate, pad=8)
+
         # header + total labels
-        self.title_item = QGraphicsSimpleTextItem(self._title, self)
+        self.title_item = LodText(self._title, self)
         tf = self.title_item.font(); tf.setBold(True); tf.setPointSize(12)
         self.title_item.setFont(tf); self.title_item.setBrush(QBrush(TXT))
 
-        self.total_item = QGraphicsSimpleTextItem("WEIGHT: 0.00 kg", self)
+        self.total_item = LodText("WEIGHT: 0.00 kg", self)
         tlf = self.total_item.font(); tlf.setPointSize(11)
         self.total_item.setFont(tlf); self.total_item.setBrush(QBrush(TXT))
 
-        self.pct_item = QGraphicsSimpleTextItem("0%", self)
+        self.pct_item = LodText("0%", self)
         pf = self.pct_item.font(); pf.setBold(True); pf.setPointSize(13)
         self.pct_item.setFont(pf); self.pct_item.setBrush(QBrush(TXT))
+        self._place_title(); self._place_totals()
 
     # ---------- geometry ----------
     def boundingRect(self) -> QRectF:
@@ -103,17 +116,34 @@ class CollectingHopper(QGraphicsObject):
         return top_beam, left_post, right_post, pan, gate
 
     def _segments(self, pan: QRectF):
-        seg_w = pan.width()/4.0
+        n = max(1, self._n); seg_w = pan.width()/n; tw = min(112.0, seg_w - 8)
         segs, tags = [], []
-        for i in range(4):
+        for i in range(n):
             left = pan.left() + seg_w*i
             rect = QRectF(left, pan.top(), seg_w, pan.height())
             segs.append(rect)
             # small tag above mid-height of pan
-            tag = QRectF(rect.center().x()-56, pan.top() + pan.height()*0.18 - 14, 112, 28)
+            tag = QRectF(rect.center().x()-tw/2, pan.top() + pan.height()*0.18 - 14, tw, 28)
             tags.append(tag)
         return segs, tags
 
+    def _tags_rect(self) -> QRectF:
+        _, tags = self._segments(self._geom()[3])
+        r = QRectF(tags[0])
+        for t in tags[1:]: r = r.united(t)
+        return r
+
+    def _bezel_rect(self) -> QRectF:
+        return QRectF(-240/2, -70/2, 240, 70)
+
+    def _bar_rect(self) -> QRectF:
+        rpost = self._geom()[2]
+        return QRectF(-self.w*0.40, rpost.bottom()+26, self.w*0.80, 10)
+
+    def _gate_rect(self) -> QRectF:
+        gate = self._geom()[4]
+        return QRectF(gate.left(), gate.top()-6, gate.width(), gate.height()+6+86+24)
+
     # ---------- helpers ----------
     def _total_frac(self):
         if self._pct_override is not None:
@@ -121,23 +151,41 @@ class CollectingHopper(QGraphicsObject):
         cap = max(1.0, self._capacity_kg)
         return max(0.0, min(1.0, self._weight_kg / cap))
 
-    # ---------- painting ----------
+    def _place_title(self):
+        top_beam = self._geom()[0]
+        self.title_item.setText(self._title)
+        tbr = self.title_item.boundingRect()
+        self.title_item.setPos(-tbr.width()/2, top_beam.top()-tbr.height()-8)
+
+    def _place_totals(self):
+        # total (auto from segs if auto mode)
+        if self._auto_total:
+            self._weight_kg = sum(self._seg_amounts)
+        frac = self._total_frac()
+        rpost, bar = self._geom()[2], self._bar_rect()
+
+        self.total_item.setText(f"WEIGHT: {self._weight_kg:0.2f} kg")
+        tbr = self.total_item.boundingRect()
+        self.total_item.setPos(-tbr.width()/2, rpost.bottom()+6)
+
+        self.pct_item.setText(f"{int(round(frac*100))}%")
+        pbr = self.pct_item.boundingRect()
+        self.pct_item.setPos(bar.center().x()-pbr.width()/2, bar.top() - pbr.height() - 4)
+        self._bar_overlay.update()
+
+    # ---------- painting (static shell; cached) ----------
     def paint(self, p: QPainter, option, widget=None):
         del option, widget
         p.setRenderHint(QPainter.Antialiasing, True)
 
-        top_beam, lpost, rpost, pan, gate = self._geom()
-
-        # title
-        self.title_item.setText(self._title)
-        tbr = self.title_item.boundingRect()
-        self.title_item.setPos(-tbr.width()/2, top_beam.top()-tbr.height()-8)
+        top_beam, lpost, rpost, pan, gate = self._geom(); shade = lod(p) >= GLASS_LOD
 
         # top beam + posts
         p.setPen(QPen(FRAME_EDGE, 3)); p.setBrush(QBrush(FRAME))
         p.drawRoundedRect(top_beam, 6, 6)
-        p.setPen(Qt.NoPen); p.setBrush(QBrush(SHADOW))
-        p.drawRoundedRect(top_beam.adjusted(4,4,-4,-4), 6, 6)
+        if shade:
+            p.setPen(Qt.NoPen); p.setBrush(QBrush(SHADOW))
+            p.drawRoundedRect(top_beam.adjusted(4,4,-4,-4), 6, 6)
 
         p.setPen(QPen(EDGE, 2)); p.setBrush(QBrush(POST))
         p.drawRoundedRect(lpost, 4, 4); p.drawRoundedRect(rpost, 4, 4)
@@ -145,32 +193,48 @@ class CollectingHopper(QGraphicsObject):
         # pan
         p.setPen(QPen(PAN_EDGE, 3)); p.setBrush(QBrush(PAN_FACE))
         p.drawRoundedRect(pan, 8, 8)
-        p.setPen(Qt.NoPen); p.setBrush(QBrush(SHADOW))
-        p.drawRoundedRect(pan.adjusted(6,6,-6,-6), 8, 8)
+        if shade:
+            p.setPen(Qt.NoPen); p.setBrush(QBrush(SHADOW))
+            p.drawRoundedRect(pan.adjusted(6,6,-6,-6), 8, 8)
 
-        # segments & tags
+        # segment tags (values live in _tags_overlay)
         segs, tags = self._segments(pan)
-        for i, tag in enumerate(tags):
+        for tag in tags:
             p.setBrush(QBrush(TAG_FACE)); p.setPen(QPen(EDGE, 2))
             p.drawRoundedRect(tag, 8, 8)
+
+        # slim progress bar track (fill lives in _bar_overlay)
+        bar = self._bar_rect()
+        p.setPen(QPen(EDGE, 1)); p.setBrush(QBrush(BAR_BG))
+        p.drawRoundedRect(bar, 5, 5)
+
+    # ---------- overlays ----------
+    def _paint_tag_values(self, p: QPainter):
+        if lod(p) < TEXT: return
+        _, tags = self._segments(self._geom()[3])
+        p.setPen(QPen(TAG_TEXT))
+        f = QFont(); f.setPointSize(9); f.setBold(True); p.setFont(f)
+        for i, tag in enumerate(tags):
             lbl = self._seg_labels[i] if i < len(self._seg_labels) else f"Agg {i+1}"
             val = self._seg_amounts[i] if i < len(self._seg_amounts) else 0.0
             text = f"{lbl}: {val:,.0f} kg"
-            p.setPen(QPen(TAG_TEXT))
-            f = QFont(); f.setPointSize(9); f.setBold(True); p.setFont(f)
             tw = p.fontMetrics().horizontalAdvance(text)
             p.drawText(QPointF(tag.center().x()-tw/2, tag.center().y()+3), text)
 
-        # center bezel: show active aggregate
-        bezel = QRectF(-240/2, -70/2, 240, 70)
+    def _paint_bezel(self, p: QPainter):
+        # center bezel: show active aggregate (drawn above the tag overlay, like the old single paint)
+        bezel = self._bezel_rect()
         p.setPen(QPen(EDGE, 3)); p.setBrush(QBrush(TAG_FACE))
         p.drawRoundedRect(bezel, 10, 10)
-        p.setPen(QPen(QColor(230,235,245), 2)); p.setBrush(Qt.NoBrush)
-        p.drawRoundedRect(bezel.adjusted(8,8,-8,-8), 8, 8)
+        l = lod(p)
+        if l >= GLASS_LOD:
+            p.setPen(QPen(QColor(230,235,245), 2)); p.setBrush(Qt.NoBrush)
+            p.drawRoundedRect(bezel.adjusted(8,8,-8,-8), 8, 8)
+        if l < TEXT: return
 
         p.setPen(QPen(TAG_TEXT))
         f = QFont(); f.setBold(True); f.setPointSize(11); p.setFont(f)
-        if self._active_idx is not None and 0 <= self._active_idx < 4:
+        if self._active_idx is not None and 0 <= self._active_idx < self._n:
             lbl = self._seg_labels[self._active_idx]
             val = self._seg_amounts[self._active_idx]
             line1 = f"{lbl} DISCHARGING"
@@ -184,30 +248,16 @@ class CollectingHopper(QGraphicsObject):
             tw2 = p.fontMetrics().horizontalAdvance(line2)
             p.drawText(QPointF(-tw2/2, bezel.center().y()+18), line2)
 
-        # total (auto from segs if auto mode)
-        if self._auto_total:
-            self._weight_kg = sum(self._seg_amounts)
-        frac = self._total_frac()
-
-        self.total_item.setText(f"WEIGHT: {self._weight_kg:0.2f} kg")
-        tbr = self.total_item.boundingRect()
-        self.total_item.setPos(-tbr.width()/2, rpost.bottom()+6)
-
-        # slim progress bar
-        bar = QRectF(-self.w*0.40, rpost.bottom()+26, self.w*0.80, 10)
-        p.setPen(QPen(EDGE, 1)); p.setBrush(QBrush(BAR_BG))
-        p.drawRoundedRect(bar, 5, 5)
+    def _paint_bar_fill(self, p: QPainter):
+        bar = self._bar_rect(); frac = self._total_frac()
         fill = QRectF(bar.left()+2, bar.top()+2, (bar.width()-4)*frac, bar.height()-4)
         if fill.width() > 0:
             g = QLinearGradient(fill.left(), fill.top(), fill.left(), fill.bottom())
             g.setColorAt(0.0, BAR_GRAD_TOP); g.setColorAt(1.0, BAR_GRAD_BOT)
             p.setPen(Qt.NoPen); p.setBrush(QBrush(g)); p.drawRoundedRect(fill, 4, 4)
 
-        self.pct_item.setText(f"{int(round(frac*100))}%")
-        pbr = self.pct_item.boundingRect()
-        self.pct_item.setPos(bar.center().x()-pbr.width()/2, bar.top() - pbr.height() - 4)
-
-        # gate
+    def _paint_gate(self, p: QPainter):
+        gate = self._geom()[4]
         p.setPen(QPen(GATE_EDGE, 2))
         if not self._gate_open:
             p.setBrush(QBrush(GATE_FILL)); p.drawRoundedRect(gate, 4, 4)
@@ -222,7 +272,7 @@ class CollectingHopper(QGraphicsObject):
         wobble = 6.5
         xoff = math.sin(self._phase) * wobble
         p.drawRoundedRect(QRectF(start.x()-12 + xoff*0.12, start.y()+6, 24, h), 8, 8)
-        for i in range(3):
+        for i in range(3 if lod(p) >= ARROWS else 0):
             t = (self._phase*0.65 + i*0.85) % 1.0
             dy = t * h
             dx = xoff * (0.25 + 0.25*t)
@@ -231,66 +281,89 @@ class CollectingHopper(QGraphicsObject):
 
     # ---------- API ----------
     def set_title(self, text: str):
-        self._title = str(text); self.update()
+        self._title = str(text); self._place_title()
+
+    def set_segment_count(self, n: int):
+        """Number of segments (aggregate hoppers); amounts/labels are kept or padded."""
+        n = max(1, int(n))
+        if n == self._n: return
+        self._n = n
+        self._seg_amounts = (self._seg_amounts + [0.0]*n)[:n]
+        self._seg_labels = (self._seg_labels + [f"Agg {i+1}" for i in range(len(self._seg_labels), n)])[:n]
+        if self._active_idx is not None and self._active_idx >= n: self._active_idx = None
+        self.update(); self._tags_overlay.relayout(); self._bezel_overlay.update(); self._place_totals()
 
     def set_segment_amounts(self, amounts):
         if not amounts: return
-        a = [float(x) for x in amounts[:4]]
-        while len(a) < 4: a.append(0.0)
+        a = [float(x) for x in amounts[:self._n]]
+        while len(a) < self._n: a.append(0.0)
+        if a == self._seg_amounts and self._auto_total: return
         self._seg_amounts = a
         self._auto_total = True
-        self.update()
+        self._tags_overlay.update(); self._bezel_overlay.update(); self._place_totals()
+
+    def set_segment_amount(self, idx, kg):
+        """One segment only (tag-bus updates); the active segment is left alone."""
+        i = int(idx); kg = max(0.0, float(kg))
+        if not 0 <= i < self._n: return
+        if self._seg_amounts[i] == kg and self._auto_total: return
+        self._seg_amounts[i] = kg; self._auto_total = True
+        self._tags_overlay.update(); self._bezel_overlay.update(); self._place_totals()
+
+    def bind(self, bus, prefixes):
+        """One segment per prefix; segment i follows <prefixes[i]>.weight_kg on a TagBus."""
+        if prefixes: self.set_segment_count(len(prefixes))
+        for i, pre in enumerate(prefixes):
+            bus.subscribe(f"{pre}.weight_kg", lambda kg, i=i: self.set_segment_amount(i, kg))
 
     def set_segment_labels(self, labels):
         if not labels: return
-        lst = [str(x) for x in labels[:4]]
-        while len(lst) < 4: lst.append(f"Agg {len(lst)+1}")
-        self._seg_labels = lst; self.update()
+        self.set_segment_count(len(labels))
+        self._seg_labels = [str(x) for x in labels]; self._tags_overlay.update(); self._bezel_overlay.update()
 
     def set_active_segment(self, idx):
         if idx is None:
-            self._active_idx = None
+            new_idx = None
         else:
             i = int(idx)
-            self._active_idx = i if 0 <= i < 4 else None
-        self.update()
+            new_idx = i if 0 <= i < self._n else None
+        if new_idx != self._active_idx:
+            self._active_idx = new_idx; self._bezel_overlay.update()
 
     def set_active_and_amount(self, idx, kg):
         i = int(idx)
-        if 0 <= i < 4:
-            if i >= len(self._seg_amounts):
-                self._seg_amounts += [0.0]*(i-len(self._seg_amounts)+1)
+        if 0 <= i < self._n:
             self._seg_amounts[i] = max(0.0, float(kg))
             self._active_idx = i
             self._auto_total = True
-            self.update()
+            self._tags_overlay.update(); self._bezel_overlay.update(); self._place_totals()
 
     def set_weight_kg(self, kg: float):
         """Manual total override (disables auto-sum until next set_segment_amounts)."""
         self._weight_kg = max(0.0, float(kg))
         self._auto_total = False
-        self.update()
+        self._place_totals()
 
     def get_weight_kg(self) -> float:
         return self._weight_kg
 
     def set_capacity_kg(self, kg: float):
-        self._capacity_kg = max(1.0, float(kg)); self.update()
+        self._capacity_kg = max(1.0, float(kg)); self._place_totals()
 
     def get_capacity_kg(self) -> float:
         return self._capacity_kg
 
     def set_level_pct(self, pct: float):
-        self._pct_override = max(0.0, min(100.0, float(pct))); self.update()
+        self._pct_override = max(0.0, min(100.0, float(pct))); self._place_totals()
 
     def clear_level_pct_override(self):
-        self._pct_override = None; self.update()
+        self._pct_override = None; self._place_totals()
 
-    def open_gate(self):  self._gate_open = True;  self.update()
-    def close_gate(self): self._gate_open = False; self.update()
+    def open_gate(self):  self._gate_open = True;  self._gate_overlay.update()
+    def close_gate(self): self._gate_open = False; self._gate_overlay.update()
     def is_gate_open(self) -> bool: return self._gate_open
 
     def advance_phase(self, d: float = 2.0):
         if self._gate_open:
             self._phase = (self._phase + d/60.0) % (2*math.pi)
-            self.update()
+            self._gate_overlay.update()
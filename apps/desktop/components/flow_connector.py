@@ -3,8 +3,10 @@ from __future__ import annotations
 from typing import Callable, Literal, Optional
 
 from PySide6.QtCore import QObject, QPointF, QRectF, QTimer, QElapsedTimer, QEvent, Qt
-from PySide6.QtGui import QPainterPath, QPen, QPainter, QColor, QLinearGradient
+from PySide6.QtGui import QBrush, QPainterPath, QPen, QPainter, QColor, QLinearGradient
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsDropShadowEffect
+from components.lod import lod, BOLTS, SEAMS, GLASS
+from components.plant_view import on_screen
 
 Shape = Literal["L", "U", "auto"]
 
@@ -37,6 +39,7 @@ class FlowConnectorItem(QGraphicsObject):
         self._get_dst = get_dst; self._set_dst = set_dst
         self._enabled_fn = enabled_fn
         self._rate = float(rate_kgps)
+        self._transfer = True
         self._src_cap = src_capacity_kg; self._dst_cap = dst_capacity_kg
         self._shape: Shape = shape
         self._path = QPainterPath()
@@ -92,28 +95,34 @@ class FlowConnectorItem(QGraphicsObject):
 
     def paint(self, p: QPainter, opt, widget=None):
         p.setRenderHint(QPainter.Antialiasing, True)
-        br = self._path.boundingRect()
-        p.save()
-        cs_pen = QPen(QColor(0, 0, 0, 70), self._outer_w + 4, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        p.setPen(cs_pen); p.translate(1.2, 1.6); p.drawPath(self._path)
-        p.restore()
-        g_outer = QLinearGradient(br.topLeft(), br.bottomRight())
-        g_outer.setColorAt(0.00, QColor("#7f8a93"))
-        g_outer.setColorAt(0.35, QColor("#b7c1c8"))
-        g_outer.setColorAt(0.50, QColor("#e7edf2"))
-        g_outer.setColorAt(0.70, QColor("#aab4bc"))
-        g_outer.setColorAt(1.00, QColor("#6e7780"))
-        p.setPen(QPen(g_outer, self._outer_w, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)); p.drawPath(self._path)
-        g_inner = QLinearGradient(br.bottomLeft(), br.topRight())
-        g_inner.setColorAt(0.00, QColor("#cdd5db")); g_inner.setColorAt(1.00, QColor("#aeb7bf"))
-        p.setPen(QPen(g_inner, self._inner_w, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)); p.drawPath(self._path)
+        p.setBrush(Qt.NoBrush)  # view uses DontSavePainterState; open paths must not inherit a fill
+        br = self._path.boundingRect(); l = lod(p)
+        if l >= GLASS:      # drop shadow + shaded steel; zoomed out, flat steel of the same mid tones
+            p.save()
+            cs_pen = QPen(QColor(0, 0, 0, 70), self._outer_w + 4, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+            p.setPen(cs_pen); p.translate(1.2, 1.6); p.drawPath(self._path)
+            p.restore()
+            g_outer = QLinearGradient(br.topLeft(), br.bottomRight())
+            g_outer.setColorAt(0.00, QColor("#7f8a93"))
+            g_outer.setColorAt(0.35, QColor("#b7c1c8"))
+            g_outer.setColorAt(0.50, QColor("#e7edf2"))
+            g_outer.setColorAt(0.70, QColor("#aab4bc"))
+            g_outer.setColorAt(1.00, QColor("#6e7780"))
+            g_inner = QLinearGradient(br.bottomLeft(), br.topRight())
+            g_inner.setColorAt(0.00, QColor("#cdd5db")); g_inner.setColorAt(1.00, QColor("#aeb7bf"))
+            outer, inner = QBrush(g_outer), QBrush(g_inner)
+        else:
+            outer, inner = QBrush(QColor("#aab4bc")), QBrush(QColor("#bec6cd"))
+        p.setPen(QPen(outer, self._outer_w, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)); p.drawPath(self._path)
+        p.setPen(QPen(inner, self._inner_w, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)); p.drawPath(self._path)
         flow_pen = QPen(self._flow_color(), self._bore_width(), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
         flow_pen.setDashPattern(self._flow_dash)
         c = flow_pen.color(); c.setAlpha(int(80 + 175 * self._enabled_blend)); flow_pen.setColor(c)
         flow_pen.setDashOffset(self._dash_phase)
         p.setPen(flow_pen); p.drawPath(self._path)
-        rings = QPen(QColor(0, 0, 0, 42), max(2, int(self._outer_w * 0.12)), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        rings.setDashPattern([1, max(120, int(self._outer_w * 7.2))]); p.setPen(rings); p.drawPath(self._path)
+        if l >= SEAMS:
+            rings = QPen(QColor(0, 0, 0, 42), max(2, int(self._outer_w * 0.12)), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+            rings.setDashPattern([1, max(120, int(self._outer_w * 7.2))]); p.setPen(rings); p.drawPath(self._path)
         cap_pen = QPen(QColor(60, 65, 72, 180), 1)
         p.setPen(cap_pen); p.setBrush(QColor("#c5ccd2")); r_cap = self._outer_w * 0.52
         try:
@@ -122,7 +131,7 @@ class FlowConnectorItem(QGraphicsObject):
             pass
         if self._flanges:
             for cpt in self._flanges:
-                self._draw_flange(p, cpt, self._outer_w * 0.8)
+                self._draw_flange(p, cpt, self._outer_w * 0.8, 6 if l >= BOLTS else 0)
 
     def _draw_flange(self, p: QPainter, center: QPointF, ro: float, bolts: int = 6):
         ri = ro * 0.58; p.save()
@@ -158,6 +167,12 @@ class FlowConnectorItem(QGraphicsObject):
     def set_rate(self, kgps: float):
         self._rate = max(0.0, float(kgps))
 
+    def set_transfer(self, on: bool):
+        """False: only animate; the kg are moved elsewhere (control.FeedSim at the dosing rate)."""
+        self._transfer = bool(on)
+
+    def source_fns(self): return self._get_src, self._set_src
+
     def _try_install_filters(self):
         if self._filters_installed: return
         sc = self.scene()
@@ -174,13 +189,13 @@ class FlowConnectorItem(QGraphicsObject):
         target = 1.0 if self._enabled_fn() else 0.0
         self._enabled_blend += (target - self._enabled_blend) * 0.15
         dt = max(0.0, self._elapsed.restart() / 1000.0)
-        if self._enabled_fn():
+        if self._transfer and self._enabled_fn():
             src = float(self._get_src()); dst = float(self._get_dst())
             move = min(self._rate * dt, max(0.0, src))
             if self._dst_cap is not None:
                 free = max(0.0, self._dst_cap - dst); move = min(move, free)
             if move > 0.0: self._set_src(src - move); self._set_dst(dst + move)
-        self.update()
+        if on_screen(self): self.update()
 
     def rebuild(self):
         self._try_install_filters()
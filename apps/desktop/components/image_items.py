@@ -1,29 +1,29 @@
 from __future__ import annotations
 from PySide6.QtCore import QRectF, QPointF, Qt
-from PySide6.QtGui import QPainter, QPixmap, QTransform
+from PySide6.QtGui import QPainter
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
+from components.sprites import sprite
 
 class PixmapItem(QGraphicsObject):
+    """Image item; the pixmap is loaded and scaled once per (path, scale) and shared by every instance."""
     def __init__(self, img_path: str, *, scale: float = 1.0, draggable: bool = True, parent=None):
         super().__init__(parent)
-        self.pix = QPixmap(img_path)
+        self.pix = sprite(img_path, scale)
         self.scale = float(scale)
         if draggable:
             self.setFlag(QGraphicsItem.ItemIsMovable, True)
             self.setFlag(QGraphicsItem.ItemIsSelectable, True)
             self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
-        self._w = self.pix.width() * self.scale
-        self._h = self.pix.height() * self.scale
+        self._w = float(self.pix.width())
+        self._h = float(self.pix.height())
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def boundingRect(self) -> QRectF:
         return QRectF(0, 0, self._w, self._h)
 
     def paint(self, p: QPainter, opt, widget=None):
-        p.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        if self.scale != 1.0:
-            t = QTransform(); t.scale(self.scale, self.scale)
-            p.setWorldTransform(p.worldTransform() * t)
-        p.drawPixmap(0, 0, self.pix)
+        del opt, widget
+        p.drawPixmap(0, 0, self.pix)           # already at item size: no per-paint scaling
 
     def anchor_point(self, where: str) -> QPointF:
         m = {
@@ -5,12 +5,14 @@ from PySide6.QtGui import (
     QPainter, QPen, QBrush, QPolygonF, QColor, QPainterPath,
     QLinearGradient, QRadialGradient
 )
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsSimpleTextItem
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
 from theme import (
     YELLOW, YELLOW_DK, OK_GREEN,
     BLUE_MOTOR, BLUE_MOTOR_DK,
     STEEL_LT, STEEL_DK, STEEL_EDGE, TXT
 )
+from components.overlays import PaintOverlay
+from components.lod import lod, LodText, BOLTS, SEAMS, GLASS, TEXT, ARROWS
 
 # Capsule gauge palette (shared with silo/hopper)
 GLASS_BG    = QColor(255, 255, 255, 28)
@@ -40,6 +42,8 @@ class Mixer(QGraphicsObject):
       - twin paddles (viewport)
       - side capsule gauge (only one gauge shown; center ring removed)
       - discharge gate: CLOSED plate, OPEN “||” with falling stream
+    Static housing is cached; paddles, lid arrows, gate/stream and gauge fill
+    are child overlays so a tick only repaints those small regions.
     API (unchanged):
       start/stop/is_running, advance_phase(d),
       set_charge_progress(pct), get_charge_progress(),
@@ -59,9 +63,16 @@ class Mixer(QGraphicsObject):
             self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
+        # animated parts
+        self._paddles_overlay = PaintOverlay(self, self._viewport_rect, self._paint_paddles)
+        self._lid_overlay     = PaintOverlay(self, self._lid_rect, self._paint_lid_arrows)
+        self._gate_overlay    = PaintOverlay(self, self._gate_rect, self._paint_gate)
+        self._gauge_overlay   = PaintOverlay(self, self._side_gauge_rect, self._paint_side_gauge_fill, pad=16)
+
         # badge; (we no longer draw center % text)
-        self.badge = QGraphicsSimpleTextItem("JS2000", self)
-        self.badge.setBrush(QBrush(TXT))
+        self.badge = LodText("JS2000", self)
+        self.badge.setBrush(QBrush(TXT)); self.badge.setZValue(2)
+        self.badge.setPos(-70+20, -32+12)
 
     # ---------- geometry ----------
     def boundingRect(self) -> QRectF:
@@ -76,7 +87,25 @@ class Mixer(QGraphicsObject):
         r = self._body_rect()
         return self.mapToScene(QPointF(r.left() - 22, 0))
 
-    # ---------- paint ----------
+    def _viewport_rect(self) -> QRectF:
+        b = self._body_rect()
+        return QRectF(b.left()+28, b.top()+b.height()*0.28, b.width()-56, b.height()*0.46)
+
+    def _lid_rect(self) -> QRectF:
+        return QRectF(-84, -176, 168, 168)   # arrows ring: center (0,-92), r=78, pen 6
+
+    def _gate_rect(self) -> QRectF:
+        _, outlet = self._discharge_geometry()
+        plate_w = outlet.width() + 32
+        return QRectF(outlet.center().x() - plate_w/2 - 4, outlet.top() - 4,
+                      plate_w + 8, outlet.height() + FLOW_H + 30)
+
+    def _side_gauge_rect(self) -> QRectF:
+        body = self._body_rect()
+        gw = body.width() * 0.28 * GAUGE_WIDTH_SCALE
+        return QRectF(body.right() + 30, body.top() + 4, gw, body.height() - 8)
+
+    # ---------- paint (static housing; cached) ----------
     def paint(self, p: QPainter, option, widget=None):
         del option, widget
         p.setRenderHint(QPainter.Antialiasing, True)
@@ -86,19 +115,17 @@ class Mixer(QGraphicsObject):
         self._paint_inlet(p)
         self._paint_motor_train(p)
 
-        # paddles viewport (arrows spin when running)
+        # paddles viewport glass (shafts live in _paddles_overlay)
         self._paint_viewport(p)
 
-        # discharge zone
+        # discharge zone (gate + stream live in _gate_overlay)
         self._paint_discharge_zone(p)
 
         # SIDE CAPSULE GAUGE (only one gauge now; center ring removed)
         self._paint_side_gauge(p)
 
-        # top details & badge
+        # top details (badge backdrop sits over the paddles, so it is drawn by _paint_paddles)
         self._paint_top_details(p)
-        self._paint_lid_arrows(p)
-        self._paint_badge(p)
 
     # ---------- frame/body/inlet/motor ----------
     def _paint_frame(self, p: QPainter):
@@ -111,15 +138,17 @@ class Mixer(QGraphicsObject):
         p.setBrush(QBrush(STEEL_LT)); p.setPen(QPen(STEEL_EDGE, 2))
         for r in (base_left, base_right, leg_left, leg_right, cross):
             p.drawRoundedRect(r, 6, 6)
+        if lod(p) < BOLTS: return
         p.setBrush(QBrush(STEEL_DK)); p.setPen(QPen(STEEL_EDGE, 1.5))
         for cx in (base_left.center().x(), base_right.center().x()):
             p.drawRoundedRect(QRectF(cx-23, 112, 46, 8), 2, 2)
 
     def _paint_body(self, p: QPainter):
-        body = self._body_rect(); bevel = 42
+        body = self._body_rect(); bevel = 42; l = lod(p)
         # soft background shadow
-        sh = QPainterPath(); sh.addRoundedRect(body.adjusted(5,5,5,5), 12, 12)
-        p.fillPath(sh, QColor(0,0,0,20))
+        if l >= GLASS:
+            sh = QPainterPath(); sh.addRoundedRect(body.adjusted(5,5,5,5), 12, 12)
+            p.fillPath(sh, QColor(0,0,0,20))
         # beveled housing polygon
         poly = [
             QPointF(body.left()+bevel, body.top()),
@@ -134,6 +163,7 @@ class Mixer(QGraphicsObject):
         p.setBrush(QBrush(YELLOW)); p.setPen(QPen(YELLOW_DK, 2.6))
         p.drawPolygon(QPolygonF(poly))
         # seams
+        if l < SEAMS: return
         p.setPen(QPen(QColor(0,0,0,40), 1))
         p.drawLine(QPointF(body.center().x(), body.top()+6), QPointF(body.center().x(), body.bottom()-6))
         p.drawLine(QPointF(body.left()+body.width()*0.33, body.top()+8), QPointF(body.left()+body.width()*0.33, body.bottom()-8))
@@ -149,7 +179,7 @@ class Mixer(QGraphicsObject):
         p.setBrush(QBrush(BLUE_MOTOR)); p.setPen(QPen(BLUE_MOTOR_DK, 2))
         p.drawRoundedRect(motor, 12, 12)
         p.setPen(QPen(BLUE_MOTOR_DK, 3))
-        for i in range(7):
+        for i in range(7 if lod(p) >= BOLTS else 0):
             x = motor.left() + 18 + i*14
             p.drawLine(QPointF(x, motor.top()+10), QPointF(x, motor.bottom()-10))
         reducer = QRectF(168, -34, 48, 68)
@@ -173,7 +203,8 @@ class Mixer(QGraphicsObject):
         p.setBrush(QBrush(QColor(220,220,220,140))); p.drawPath(hopper)
         p.setBrush(QBrush(QColor(210,210,210,150))); p.drawRoundedRect(outlet, 4, 4)
 
-        # gate
+    def _paint_gate(self, p: QPainter):
+        _, outlet = self._discharge_geometry()
         p.setBrush(QBrush(BAR_CLR)); p.setPen(QPen(BAR_EDGE, 2.2))
         if not self._gate_open:
             plate_h = BAR_W + 4
@@ -182,6 +213,7 @@ class Mixer(QGraphicsObject):
             plate_x = outlet.center().x() - plate_w/2
             p.drawRoundedRect(QRectF(plate_x, plate_y, plate_w, plate_h), 5, 5)
             # small hinge dots
+            if lod(p) < BOLTS: return
             cap_r = 4.5
             p.setBrush(QBrush(QColor(90,100,115))); p.setPen(QPen(BAR_EDGE, 1.2))
             p.drawEllipse(QPointF(plate_x + 6,  plate_y + plate_h/2), cap_r, cap_r)
@@ -203,7 +235,7 @@ class Mixer(QGraphicsObject):
         p.setPen(Qt.NoPen)
         p.setBrush(QBrush(FLOW_CLR))
         p.drawRoundedRect(QRectF(cx - 14 + wobble*0.12, top_y + 2, 28, h), 8, 8)
-        for i in range(3):
+        for i in range(3 if lod(p) >= ARROWS else 0):
             t = (self._flow_phase*0.7 + i*0.85) % 1.0
             dy = t * h
             dx = wobble * (0.25 + 0.25*t)
@@ -212,10 +244,13 @@ class Mixer(QGraphicsObject):
 
     # ---------- paddles viewport ----------
     def _paint_viewport(self, p: QPainter) -> QRectF:
-        b = self._body_rect()
-        vp = QRectF(b.left()+28, b.top()+b.height()*0.28, b.width()-56, b.height()*0.46)
+        vp = self._viewport_rect()
         p.setBrush(QBrush(GLASS_BG)); p.setPen(QPen(GLASS_EDGE, 2.2)); p.drawRoundedRect(vp, 10, 10)
-        p.fillRect(QRectF(vp.left()+8, vp.top()+6, vp.width()-16, vp.height()*0.22), QColor(255,255,255,70))
+        if lod(p) >= GLASS: p.fillRect(QRectF(vp.left()+8, vp.top()+6, vp.width()-16, vp.height()*0.22), QColor(255,255,255,70))
+        return vp
+
+    def _paint_paddles(self, p: QPainter):
+        vp = self._viewport_rect()
         p.save(); p.setClipRect(vp.adjusted(3,3,-3,-3))
         cy = vp.center().y()
         left_cx  = vp.left() + vp.width()*0.33
@@ -223,8 +258,10 @@ class Mixer(QGraphicsObject):
         self._draw_shaft(p, QPointF(left_cx,  cy), vp.height()*0.40,  self._phase, QColor(60,70,85))
         self._draw_shaft(p, QPointF(right_cx, cy), vp.height()*0.40, -self._phase, QColor(60,70,85))
         p.restore()
-        p.setPen(QPen(QColor(255,255,255,120), 1)); p.drawRoundedRect(vp.adjusted(2.5,2.5,-2.5,-2.5), 9, 9)
-        return vp
+        if lod(p) >= GLASS:
+            p.setPen(QPen(QColor(255,255,255,120), 1)); p.setBrush(Qt.NoBrush)
+            p.drawRoundedRect(vp.adjusted(2.5,2.5,-2.5,-2.5), 9, 9)
+        self._paint_badge(p)
 
     def _draw_shaft(self, p: QPainter, center: QPointF, span: float, phase_deg: float, metal: QColor):
         p.setBrush(QBrush(metal)); p.setPen(QPen(QColor(40,45,55), 1.6)); p.drawEllipse(center, 8, 8)
@@ -240,19 +277,16 @@ class Mixer(QGraphicsObject):
 
     # ---------- side capsule gauge (ONLY gauge shown) ----------
     def _paint_side_gauge(self, p: QPainter):
-        body = self._body_rect()
-        gx = body.right() + 30
-        gy = body.top() + 4
-        gw = body.width() * 0.28 * GAUGE_WIDTH_SCALE
-        gh = body.height() - 8
-        r = QRectF(gx, gy, gw, gh)
+        r = self._side_gauge_rect()
         radius = r.width()/2
 
         # casing
         p.setBrush(QBrush(GLASS_BG)); p.setPen(QPen(GLASS_EDGE, 2))
         p.drawRoundedRect(r, radius, radius)
+        l = lod(p)
 
         # ticks
+        if l < SEAMS: return
         p.setPen(QPen(TICK_MINOR, 1))
         for i in range(1, 20):
             if i % 2 == 0: continue
@@ -264,12 +298,17 @@ class Mixer(QGraphicsObject):
             p.drawLine(QPointF(r.left()+6, y), QPointF(r.right()-6, y))
 
         # labels
+        if l < TEXT: return
         p.setPen(QPen(LABEL_COL))
         f = p.font(); f.setBold(True); f.setPointSize(8); p.setFont(f)
         p.drawText(QPointF(r.right()+8, r.top()+10), "FULL")
         p.drawText(QPointF(r.right()+8, r.bottom()-2), "EMPTY")
 
+    def _paint_side_gauge_fill(self, p: QPainter):
+        r = self._side_gauge_rect()
+
         # fill from charge progress
+        l = lod(p)
         frac = max(0.0, min(1.0, self._charge_progress/100.0))
         fill_h = (r.height() - 8) * frac
         if fill_h > 1:
@@ -281,13 +320,15 @@ class Mixer(QGraphicsObject):
             p.drawRoundedRect(fill_rect, (r.width()-8)/2, (r.width()-8)/2)
 
             # meniscus glow
-            glow = QRadialGradient(fill_rect.center().x(), fill_rect.top()+10, r.width())
-            glow.setColorAt(0.0, QColor(255,255,255,90))
-            glow.setColorAt(1.0, QColor(255,255,255,0))
-            p.setBrush(QBrush(glow))
-            p.drawEllipse(QPointF(fill_rect.center().x(), fill_rect.top()+10), r.width()*0.45, r.width()*0.18)
+            if l >= GLASS:
+                glow = QRadialGradient(fill_rect.center().x(), fill_rect.top()+10, r.width())
+                glow.setColorAt(0.0, QColor(255,255,255,90))
+                glow.setColorAt(1.0, QColor(255,255,255,0))
+                p.setBrush(QBrush(glow))
+                p.drawEllipse(QPointF(fill_rect.center().x(), fill_rect.top()+10), r.width()*0.45, r.width()*0.18)
 
         # big % inside capsule
+        if l < TEXT: return
         pct_text = f"{int(round(frac*100))}%"
         p.setPen(QPen(PCT_COL))
         ff = p.font(); ff.setBold(True); ff.setPointSize(16); p.setFont(ff)
@@ -299,12 +340,13 @@ class Mixer(QGraphicsObject):
     def _paint_top_details(self, p: QPainter):
         hatch = QRectF(-52, -128, 104, 36)
         p.setBrush(QBrush(STEEL_LT)); p.setPen(QPen(STEEL_EDGE, 2)); p.drawRoundedRect(hatch, 8, 8)
+        if lod(p) < BOLTS: return
         p.setPen(QPen(STEEL_EDGE, 2)); p.drawLine(QPointF(hatch.left()+10, hatch.top()+10), QPointF(hatch.left()+30, hatch.top()+10))
         p.setBrush(QBrush(STEEL_DK)); p.setPen(QPen(STEEL_EDGE, 1))
         for dx in (16,32,64,80): p.drawEllipse(QPointF(hatch.left()+dx, hatch.bottom()-8), 2.5, 2.5)
 
     def _paint_lid_arrows(self, p: QPainter):
-        if not self._running: return
+        if not self._running or lod(p) < ARROWS: return
         center = QPointF(0, -92); radius = 78
         p.save(); p.translate(center); p.rotate(self._phase)
         p.setPen(QPen(OK_GREEN, 6)); p.setBrush(QBrush(OK_GREEN))
@@ -320,26 +362,33 @@ class Mixer(QGraphicsObject):
         badge_r = QRectF(-70, -32, 140, 64)
         p.setBrush(QBrush(QColor(30,30,30,190))); p.setPen(Qt.NoPen)
         p.drawRoundedRect(badge_r, 12, 12)
-        self.badge.setPos(badge_r.left()+20, badge_r.top()+12)
 
     # ---------- API ----------
-    def start(self) -> None: self._running = True; self.update()
-    def stop(self) -> None:  self._running = False; self.update()
+    def start(self) -> None: self._running = True; self._lid_overlay.update()
+    def stop(self) -> None:  self._running = False; self._lid_overlay.update()
     def is_running(self) -> bool: return self._running
     def advance_phase(self, d: float = 3.0) -> None:
         if self._running or self._gate_open:
             self._phase = (self._phase + d) % 360.0
             self._flow_phase = (self._flow_phase + d/60.0) % (2*math.pi)
-            self.update()
+            self._paddles_overlay.update()
+            if self._running:   self._lid_overlay.update()
+            if self._gate_open: self._gate_overlay.update()
     def set_charge_progress(self, pct: float) -> None:
-        self._charge_progress = max(0.0, min(100.0, float(pct))); self.update()
+        pct = max(0.0, min(100.0, float(pct)))
+        if pct != self._charge_progress:
+            self._charge_progress = pct; self._gauge_overlay.update()
     def get_charge_progress(self) -> float:
         return self._charge_progress
     def open_gate(self) -> None:
         if not self._gate_open:
-            self._gate_open = True; self.update()
+            self._gate_open = True; self._gate_overlay.update()
     def close_gate(self) -> None:
         if self._gate_open:
-            self._gate_open = False; self.update()
+            self._gate_open = False; self._gate_overlay.update()
     def is_gate_open(self) -> bool:
         return self._gate_open
+    def bind(self, bus, prefix: str = "mixer") -> None:
+        """Follow <prefix>.run and <prefix>.gate_open on a TagBus."""
+        bus.subscribe(f"{prefix}.run", lambda on: self.start() if on else self.stop())
+        bus.subscribe(f"{prefix}.gate_open", lambda on: self.open_gate() if on else self.close_gate())
@@ -11,6 +11,7 @@ class MotorBadge(QGraphicsObject):
     def set_running(self, running: bool): 
         if self._running != bool(running): self._running = bool(running); self.update()
     def is_running(self) -> bool: return self._running
+    def bind(self, bus, tag: str): bus.subscribe(tag, self.set_running)
     def refresh(self): self._update_position()
     def boundingRect(self) -> QRectF: d = self._r*2; return QRectF(0, 0, d, d)
     def paint(self, p: QPainter, opt, widget=None):
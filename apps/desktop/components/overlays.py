@@ -0,0 +1,36 @@
+# components/overlays.py
+from typing import Callable
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QGraphicsItem
+
+class PaintOverlay(QGraphicsItem):
+    """
+    Small uncached child item that paints one animated region of its parent.
+    The parent keeps its static body in DeviceCoordinateCache and only calls
+    overlay.update(), so a tick repaints this rect instead of the whole body.
+      rect_fn()  -> QRectF in parent coords (re-read on relayout())
+      paint_fn(p)   draws in parent coords
+      pad           grows the rect for pen widths / text that overhangs it
+    """
+    def __init__(self, parent: QGraphicsItem, rect_fn: Callable[[], QRectF],
+                 paint_fn: Callable[[QPainter], None], z: float = 1.0, pad: float = 2.0):
+        super().__init__(parent)
+        self._rect_fn = rect_fn; self._paint_fn = paint_fn; self._pad = float(pad)
+        self._rect = self._padded()
+        self.setZValue(z)
+        self.setAcceptedMouseButtons(Qt.NoButton)   # clicks fall through to the draggable parent
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def _padded(self) -> QRectF:
+        d = self._pad; return QRectF(self._rect_fn()).adjusted(-d, -d, d, d)
+
+    def relayout(self):
+        self.prepareGeometryChange(); self._rect = self._padded(); self.update()
+
+    def paint(self, p: QPainter, option, widget=None):
+        del option, widget
+        p.setRenderHint(QPainter.Antialiasing, True)
+        self._paint_fn(p)
@@ -1,28 +1,166 @@
 # components/plant_view.py
-from PySide6.QtWidgets import QGraphicsView
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPainter
+import os, time
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsView
+from PySide6.QtCore import Qt, QRectF, QEvent, QTimer
+from PySide6.QtGui import QPainter, QGuiApplication, QPixmapCache, QRegion
 from theme import BG
+from components import lod as _lod
+
+UPDATE_MODES = {
+    "minimal":  QGraphicsView.MinimalViewportUpdate,
+    "smart":    QGraphicsView.SmartViewportUpdate,
+    "bounding": QGraphicsView.BoundingRectViewportUpdate,
+    "full":     QGraphicsView.FullViewportUpdate,
+}
+
+# platforms where a QOpenGLWidget viewport either fails or is software-rendered anyway
+_NO_GL_PLATFORMS = ("offscreen", "minimal", "vnc", "linuxfb")
+
+def on_screen(item) -> bool:
+    """True when a shown view of the item's scene has part of it in its viewport; animation that no view
+    shows skips its repaint (an item scrolled into view is exposed and painted with its current state)."""
+    sc = item.scene()
+    if sc is None: return False
+    r = item.sceneBoundingRect()
+    for v in sc.views():
+        if v.isVisible() and v.mapToScene(v.viewport().rect()).boundingRect().intersects(r): return True
+    return False
+
+def gl_available() -> bool:
+    """True when an accelerated (QOpenGLWidget) viewport is worth trying on this platform."""
+    if os.environ.get("QT_OPENGL", "").lower() == "software": return False
+    if QGuiApplication.platformName() in _NO_GL_PLATFORMS: return False
+    try:
+        from PySide6.QtOpenGLWidgets import QOpenGLWidget  # noqa: F401 (optional Qt module)
+    except Exception:
+        return False
+    return True
 
 class PlantView(QGraphicsView):
-    def __init__(self, *a, **kw):
+    """
+    Plant canvas.
+      accelerated  -> QOpenGLWidget viewport (falls back to raster under offscreen/software GL)
+      update_mode  -> "minimal" | "smart" | "bounding" | "full"  (default: smart;
+                      an accelerated viewport always repaints fully, so it uses "full")
+      antialias    -> item paint() methods still opt in per item; this only sets the view hint
+      lod          -> items skip fine details (bolts, seams, glass, text) when zoomed out (components.lod);
+                      per view: set for the items while this view paints, so panes can differ
+      zoom         -> wheel zooms under the mouse and dragging the background pans (detail panes)
+      focus        -> focus() -> QRectF of scene items to fit; None fits every item (overview)
+      max_fps      -> repaint at most this often for scene changes (detail panes; 0: every change). A paint
+                      asked for sooner is held back, its region collected and painted once the interval is up;
+                      zooming, panning and resizing the pane repaint at once. Raster viewports only.
+    Every view keeps its own DeviceCoordinateCache pixmaps in the global QPixmapCache, so resizing sizes
+    that cache for all views of the scene (the 10 MB default made a second view evict the first's items).
+    The fit rect is cached; resizeEvent reuses it instead of walking itemsBoundingRect(). Once the user
+    zooms or pans, resizing keeps that view; double-click off the equipment fits again.
+    """
+    ZOOM_STEP  = 1.15
+    ZOOM_RANGE = (0.05, 4.0)
+    CACHE_SCREENS = 3.0       # item cache per view, in viewports (cached items overhang the edges)
+    max_fps = 0.0             # until __init__ sets it (Qt sends viewport events during construction)
+
+    def __init__(self, *a, accelerated: bool = False, update_mode: str = "smart",
+                 antialias: bool = True, lod: bool = True, zoom: bool = False, focus=None, max_fps: float = 0.0, **kw):
         super().__init__(*a, **kw)
-        self.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing)
+        self._fit_rect = None
+        self._focus = focus; self._user_view = False
+        self.zoom = bool(zoom)
+        self.lod = bool(lod)
+        self.accelerated = bool(accelerated) and gl_available()
+        if self.accelerated:
+            from PySide6.QtOpenGLWidgets import QOpenGLWidget
+            self.setViewport(QOpenGLWidget())
+            update_mode = "full"
+        self.setViewportUpdateMode(UPDATE_MODES.get(str(update_mode).lower(), QGraphicsView.SmartViewportUpdate))
+        # items set pen/brush/hints before drawing, so the per-item save()/restore() is not needed
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+
+        hints = QPainter.TextAntialiasing
+        if antialias: hints |= QPainter.Antialiasing
+        self.setRenderHints(hints)
         self.setBackgroundBrush(BG)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setDragMode(QGraphicsView.RubberBandDrag)
+        self.setDragMode(QGraphicsView.ScrollHandDrag if self.zoom else QGraphicsView.RubberBandDrag)
+        if self.zoom: self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.max_fps = 0.0 if self.accelerated else max(0.0, float(max_fps))
+        self._owed = QRegion(); self._painted_at = float("-inf"); self._live_until = 0.0
+        if self.max_fps:
+            vp = self.viewport()                     # keep the last frame's pixels where a paint is held back
+            vp.setAutoFillBackground(False); vp.setAttribute(Qt.WA_OpaquePaintEvent)
+            self._owed_timer = QTimer(self); self._owed_timer.setSingleShot(True); self._owed_timer.timeout.connect(self._paint_owed)
+
+    # ---------- repaint rate (max_fps) ----------
+    def viewportEvent(self, e):
+        if self.max_fps and e.type() == QEvent.Paint:
+            now = time.monotonic(); wait = self._painted_at + 1.0 / self.max_fps - now
+            if wait > 0 and now >= self._live_until:
+                self._owed += e.region()
+                if not self._owed_timer.isActive(): self._owed_timer.start(max(1, int(wait * 1000.0 + 0.5)))
+                return True
+            self._painted_at = now
+        return super().viewportEvent(e)
+
+    def _paint_owed(self):
+        r, self._owed = self._owed, QRegion()
+        self._painted_at = float("-inf"); self.viewport().update(r)
+
+    def _user_moved(self):
+        """Zoom, pan or resize: paint at full rate for a moment; held-back regions no longer line up."""
+        if not self.max_fps: return
+        self._live_until = time.monotonic() + 0.3
+        if not self._owed.isEmpty(): self._owed = QRegion(); self.viewport().update()
 
-    def wheelEvent(self, e):  # disable zoom
-        e.ignore()
+    def scrollContentsBy(self, dx, dy):
+        self._user_moved(); super().scrollContentsBy(dx, dy)
+
+    def paintEvent(self, e):
+        _lod.ENABLED = self.lod                     # what lod(p) answers, item caches included, while this view paints
+        try: super().paintEvent(e)
+        finally: _lod.ENABLED = True
+
+    def wheelEvent(self, e):
+        if not self.zoom: e.ignore(); return         # overview: always the fitted plant
+        k = self.ZOOM_STEP ** (e.angleDelta().y() / 120.0); s = self.transform().m11() * k
+        if self.ZOOM_RANGE[0] <= s <= self.ZOOM_RANGE[1]: self._user_moved(); self.scale(k, k); self._user_view = True
+        e.accept()
+
+    def _scroll(self) -> tuple[int, int]:
+        return self.horizontalScrollBar().value(), self.verticalScrollBar().value()
+
+    def mousePressEvent(self, e):
+        self._pressed_at = self._scroll()
+        super().mousePressEvent(e)
+
+    def mouseDoubleClickEvent(self, e):
+        it = self.itemAt(e.position().toPoint())
+        if it is None or not it.topLevelItem().flags() & QGraphicsItem.ItemIsMovable:   # not on equipment
+            self._user_view = False; self.fit_to_items(); return
+        super().mouseDoubleClickEvent(e)
 
     def resizeEvent(self, e):
-        super().resizeEvent(e)
-        self.fit_to_items()
+        self._user_moved(); super().resizeEvent(e)
+        self._size_pixmap_cache()
+        if not self._user_view: self.fit_to_items(refresh=False)
+
+    def _size_pixmap_cache(self):
+        sc = self.scene()
+        if not sc: return
+        kb = sum(v.viewport().width() * v.viewport().height() for v in sc.views()) * 4 * self.CACHE_SCREENS / 1024
+        if kb > QPixmapCache.cacheLimit(): QPixmapCache.setCacheLimit(int(kb))   # never lowered
+
+    def mouseReleaseEvent(self, e):
+        super().mouseReleaseEvent(e)
+        self._fit_rect = None  # equipment may have been dragged; re-measure on next fit
+        if self.zoom and self._scroll() != getattr(self, "_pressed_at", None): self._user_view = True   # panned
 
-    def fit_to_items(self):
+    def fit_to_items(self, refresh: bool = True):
         sc = self.scene()
         if not sc: return
-        rect = sc.itemsBoundingRect()
-        if rect.isEmpty(): return
-        self.fitInView(rect.adjusted(-40, -40, 40, 40), Qt.KeepAspectRatio)
+        if refresh or self._fit_rect is None:
+            rect = QRectF(self._focus()) if self._focus else sc.itemsBoundingRect()
+            if rect.isEmpty(): return
+            self._fit_rect = rect.adjusted(-40, -40, 40, 40)
+        self.fitInView(self._fit_rect, Qt.KeepAspectRatio)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 from PySide6.QtCore import QRectF, QPointF, QTimer, Qt
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
+from components.lod import lod, TEXT
+from components.plant_view import on_screen
 
 class PumpMotor(QGraphicsObject):
     def __init__(self, *, title: str = "PUMP", color: str = "#4CC3FF",
@@ -39,13 +41,13 @@ class PumpMotor(QGraphicsObject):
         stub_w = self._w * 0.18; p.setPen(QPen(QColor("#2f8fdc"), 3))
         p.drawLine(self._w - 2, self._h*0.5, self._w + stub_w, self._h*0.5)
         p.drawLine(0 - stub_w, self._h*0.5, 2, self._h*0.5)
-        p.setPen(QPen(QColor("#c7d2de"))); p.drawText(0, -8, self._w, 14, Qt.AlignCenter, self._title)
+        if lod(p) >= TEXT: p.setPen(QPen(QColor("#c7d2de"))); p.setFont(QFont()); p.drawText(0, -8, self._w, 14, Qt.AlignCenter, self._title)
         led = QColor("#0EA65E") if self.is_running() else QColor("#D14343")
         p.setBrush(QBrush(led)); p.setPen(Qt.NoPen); p.drawEllipse(self._w - 14, 4, 10, 10)
 
     def _tick(self):
-        dt = 0.03
+        dt = 0.03; rpm = self._rpm
         self._rpm = (min(self._rpm_target, self._rpm + self._accel*dt)
                      if self._rpm < self._rpm_target else
                      max(self._rpm_target, self._rpm - self._accel*dt))
-        self.update()
+        if self._rpm != rpm and on_screen(self): self.update()   # the rotor only turns while ramping
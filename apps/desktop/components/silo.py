@@ -5,8 +5,10 @@ from PySide6.QtGui import (
     QPainter, QPen, QBrush, QPolygonF, QPainterPath, QColor,
     QLinearGradient, QRadialGradient
 )
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsSimpleTextItem
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem
 from theme import BODY_BLUE, BODY_BLUE_DK, STEEL_LT, STEEL_DK, STEEL_EDGE, TXT
+from components.overlays import PaintOverlay
+from components.lod import lod, LodText, SEAMS, GLASS, TEXT
 
 # Capsule gauge palette
 GLASS_BG    = QColor(255, 255, 255, 28)
@@ -23,6 +25,7 @@ GAUGE_WIDTH_SCALE = 0.50   # ← 50% width (narrower capsule)
 class Silo(QGraphicsObject):
     """
     Cement silo with straight body + cone and an external capsule gauge.
+    Static shell is cached; material level and gauge fill are child overlays.
     PUBLIC API: start/stop/is_running, set_percent/get_percent, pipe_origin_scene().
     """
     def __init__(self, body_w=260, body_h=460, draggable=True, parent=None):
@@ -41,8 +44,13 @@ class Silo(QGraphicsObject):
             self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
-        self.percent_item = QGraphicsSimpleTextItem("0%", self)
-        self.percent_item.setBrush(TXT)
+        # animated parts: level inside body/cone + capsule fill (repaint only these on set_percent)
+        self._level_overlay = PaintOverlay(self, self._level_rect, self._paint_level)
+        self._gauge_overlay = PaintOverlay(self, self._gauge_rect, self._paint_gauge_fill, pad=16)
+
+        self.percent_item = LodText("0%", self)
+        self.percent_item.setBrush(TXT); self.percent_item.setZValue(2)
+        self._place_percent_label()
 
     # ---------- geometry ----------
     def boundingRect(self) -> QRectF:
@@ -107,7 +115,16 @@ class Silo(QGraphicsObject):
                 QRectF(right_x_attach + splay - pw/2, 0, pw, 8)]
         return (left, right), pads
 
-    # ---------- paint ----------
+    def _gauge_rect(self) -> QRectF:
+        body = self._body_rect()
+        gw = self.body_w * 0.28 * GAUGE_WIDTH_SCALE   # ← narrower
+        return QRectF(body.right() + 30, body.top() + 4, gw, body.height() - 8)
+
+    def _level_rect(self) -> QRectF:
+        body = self._body_rect()
+        return QRectF(body.left(), body.top(), body.width(), self.body_h + self.cone_h)
+
+    # ---------- paint (static shell; cached) ----------
     def paint(self, p: QPainter, option, widget=None):
         del option, widget
         p.setRenderHint(QPainter.Antialiasing, True)
@@ -123,20 +140,23 @@ class Silo(QGraphicsObject):
         p.setBrush(QBrush(STEEL_LT)); p.setPen(QPen(STEEL_EDGE, 2.0))
         p.drawPolygon(QPolygonF(cone))
 
-        self._paint_fill(p, body, cone)
-
         p.setBrush(QBrush(STEEL_LT)); p.setPen(QPen(STEEL_EDGE, 1.6))
         p.drawPolygon(legL); p.drawPolygon(legR)
         p.setBrush(QBrush(STEEL_DK))
         for r in pads: p.drawRoundedRect(r, 2, 2)
 
+        # external capsule gauge casing (fill + % live in _gauge_overlay)
+        self._paint_side_capsule_gauge(p, body)
+
+    def _place_percent_label(self):
         # small % label inside body
         self.percent_item.setText(f"{int(round(self._pct))}%")
         br = self.percent_item.boundingRect()
-        self.percent_item.setPos(-br.width()/2, body.center().y() - br.height()/2)
+        self.percent_item.setPos(-br.width()/2, self._body_rect().center().y() - br.height()/2)
 
-        # external capsule gauge (50% width)
-        self._paint_side_capsule_gauge(p, body)
+    # ---------- overlays (animated) ----------
+    def _paint_level(self, p: QPainter):
+        self._paint_fill(p, self._body_rect(), self._cone_poly())
 
     def _paint_fill(self, p: QPainter, body_rect: QRectF, cone_pts):
         cone_h = self.cone_h; total = cone_h + self.body_h
@@ -175,18 +195,16 @@ class Silo(QGraphicsObject):
 
     # ----- modern capsule gauge (50% width) -----
     def _paint_side_capsule_gauge(self, p: QPainter, body: QRectF):
-        gx = body.right() + 30
-        gy = body.top() + 4
-        gw = self.body_w * 0.28 * GAUGE_WIDTH_SCALE   # ← narrower
-        gh = body.height() - 8
-        r = QRectF(gx, gy, gw, gh)
+        r = self._gauge_rect()
         radius = r.width()/2
 
         # casing
         p.setBrush(QBrush(GLASS_BG)); p.setPen(QPen(GLASS_EDGE, 2))
         p.drawRoundedRect(r, radius, radius)
+        l = lod(p)
 
         # minor ticks
+        if l < SEAMS: return
         p.setPen(QPen(TICK_MINOR, 1))
         for i in range(1, 20):
             if i % 2 == 0:  # major tick
@@ -201,12 +219,17 @@ class Silo(QGraphicsObject):
             p.drawLine(QPointF(r.left()+6, y), QPointF(r.right()-6, y))
 
         # labels
+        if l < TEXT: return
         p.setPen(QPen(LABEL_COL))
         f = p.font(); f.setBold(True); f.setPointSize(8); p.setFont(f)
         p.drawText(QPointF(r.right()+8, r.top()+10), "FULL")
         p.drawText(QPointF(r.right()+8, r.bottom()-2), "EMPTY")
 
+    def _paint_gauge_fill(self, p: QPainter):
+        r = self._gauge_rect()
+
         # fill
+        l = lod(p)
         frac = max(0.0, min(1.0, self._pct/100.0))
         fill_h = (r.height() - 8) * frac
         if fill_h > 1:
@@ -218,13 +241,15 @@ class Silo(QGraphicsObject):
             p.drawRoundedRect(fill_rect, (r.width()-8)/2, (r.width()-8)/2)
 
             # soft meniscus glow
-            glow = QRadialGradient(fill_rect.center().x(), fill_rect.top()+10, r.width())
-            glow.setColorAt(0.0, QColor(255,255,255,90))
-            glow.setColorAt(1.0, QColor(255,255,255,0))
-            p.setBrush(QBrush(glow))
-            p.drawEllipse(QPointF(fill_rect.center().x(), fill_rect.top()+10), r.width()*0.45, r.width()*0.18)
+            if l >= GLASS:
+                glow = QRadialGradient(fill_rect.center().x(), fill_rect.top()+10, r.width())
+                glow.setColorAt(0.0, QColor(255,255,255,90))
+                glow.setColorAt(1.0, QColor(255,255,255,0))
+                p.setBrush(QBrush(glow))
+                p.drawEllipse(QPointF(fill_rect.center().x(), fill_rect.top()+10), r.width()*0.45, r.width()*0.18)
 
         # big % inside capsule
+        if l < TEXT: return
         pct_text = f"{int(round(frac*100))}%"
         p.setPen(QPen(PCT_COL))
         ff = p.font(); ff.setBold(True); ff.setPointSize(16); p.setFont(ff)
@@ -237,8 +262,16 @@ class Silo(QGraphicsObject):
     def stop(self) -> None:  self._running = False
     def is_running(self) -> bool: return self._running
     def set_percent(self, value: float) -> None:
-        self._pct = max(0.0, min(100.0, float(value))); self.update()
+        pct = max(0.0, min(100.0, float(value)))
+        if pct == self._pct: return
+        self._pct = pct
+        self._level_overlay.update(); self._gauge_overlay.update()
+        if self.percent_item.text() != f"{int(round(pct))}%": self._place_percent_label()
     def get_percent(self) -> float: return self._pct
+    def bind(self, bus, prefix: str) -> None:
+        """Follow <prefix>.level_pct and <prefix>.run on a TagBus."""
+        bus.subscribe(f"{prefix}.level_pct", self.set_percent)
+        bus.subscribe(f"{prefix}.run", lambda on: self.start() if on else self.stop())
     def pipe_origin_scene(self):
         cone = self._cone_poly()
         y = cone[2].y()
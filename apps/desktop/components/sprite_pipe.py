@@ -1,81 +1,103 @@
+# components/sprite_pipe.py — orthogonal pipe drawn from shared sprites as one item (no child item per tile)
 from __future__ import annotations
 from typing import List
 from PySide6.QtCore import QPointF, QRectF
-from PySide6.QtGui import QPixmap, QTransform
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsPixmapItem
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsObject
+from components.sprites import PipeSprites
 
 class SpritePipe(QGraphicsObject):
+    """
+    Pipe along axis-aligned path points. Each straight segment is one blit of the style's tiled
+    strip for its length and each corner one blit from the style's atlas, so a pipe is a single
+    cached item however many tiles it shows; every pipe of one style shares the pixmaps.
+    """
+    SLACK = 64.0                                                # px of bounds kept around the content
     def __init__(self, straight: str, elbow: str, flange: str | None = None, scale: float = 1.0, parent=None):
         super().__init__(parent)
-        self._straight = QPixmap(straight)
-        self._elbow    = QPixmap(elbow)
-        self._flange   = QPixmap(flange) if flange else None
-        self._scale    = float(scale)
+        self._sp = PipeSprites.get(straight, elbow, flange, scale)
         self._points: List[QPointF] = []
-        self._children: List[QGraphicsPixmapItem] = []
-        self._wet = 0.0
+        self._runs: list[tuple[QRectF, QPixmap] | None] = []    # per segment: (target rect, tiled strip)
+        self._corners: list[tuple] = []                         # per inner point: ((atlas tile, target rect), ...)
+        self._bounds = QRectF(0, 0, 1, 1)
+        self._opacity = 1.0                                     # 0.9..1.0 once set_wetness() is used
         self.setZValue(-0.5)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)   # static between path/wetness changes
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)   # exposedRect: repaint only what moved
 
     def set_wetness(self, k: float):
-        self._wet = max(0.0, min(1.0, float(k)))
-        for c in self._children:
-            c.setOpacity(0.9 + 0.1 * self._wet)
+        op = 0.9 + 0.1 * max(0.0, min(1.0, float(k)))
+        if op != self._opacity: self._opacity = op; self.update()
 
     def boundingRect(self) -> QRectF:
-        if not self._points: return QRectF(0, 0, 1, 1)
-        xs = [p.x() for p in self._points]; ys = [p.y() for p in self._points]
-        return QRectF(min(xs)-100, min(ys)-100, (max(xs)-min(xs))+200, (max(ys)-min(ys))+200)
+        return self._bounds
 
-    def paint(self, p, opt, widget=None): pass
-
-    def _clear(self):
-        for c in self._children:
-            if c.scene(): c.scene().removeItem(c)
-        self._children.clear()
+    def paint(self, p: QPainter, opt, widget=None):
+        del widget
+        sp = self._sp; ex = opt.exposedRect            # only the part update(rect) invalidated is redrawn
+        if self._opacity < 1.0: p.setOpacity(self._opacity)
+        for run in self._runs:
+            if run and run[0].intersects(ex): r = run[0]; p.drawPixmap(r, run[1], QRectF(0, 0, r.width(), r.height()))
+        for tiles in self._corners:
+            for name, r in tiles:
+                if r.intersects(ex): p.drawPixmap(r, sp.atlas, sp.src[name])
 
+    # ---------- path ----------
     def set_path_points(self, pts: List[QPointF]):
-        self._points = pts[:] if pts else []
-        self._rebuild()
+        """New route. With the same number of points, only the segments and corners touching a moved
+        point are laid out again and only their area is repainted (dragging an anchor moves one end)."""
+        new = [QPointF(q) for q in pts] if pts else []; old = self._points
+        if len(new) != len(old):
+            self._points = new
+            self._runs = [self._run(a, b) for a, b in zip(new, new[1:])]
+            self._corners = [self._corner(*t) for t in zip(new, new[1:], new[2:])]
+            self._fit(True); return
+        moved = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+        if not moved: return
+        self._points = new; dirty = QRectF()
+        for j in {j for i in moved for j in (i - 1, i) if 0 <= j < len(new) - 1}:          # segment j: points j, j+1
+            if self._runs[j]: dirty = dirty.united(self._runs[j][0])
+            self._runs[j] = run = self._run(new[j], new[j + 1])
+            if run: dirty = dirty.united(run[0])
+        for j in {j for i in moved for j in (i - 2, i - 1, i) if 0 <= j < len(new) - 2}:   # corner j: on point j+1
+            for _, r in self._corners[j]: dirty = dirty.united(r)
+            self._corners[j] = tiles = self._corner(new[j], new[j + 1], new[j + 2])
+            for _, r in tiles: dirty = dirty.united(r)
+        if not self._fit(False): self.update(dirty.adjusted(-1, -1, 1, 1))
 
-    def _rebuild(self):
-        self._clear()
-        if len(self._points) < 2: return
+    def _fit(self, full: bool) -> bool:
+        """Bounds follow the content with SLACK px to spare, so small drags keep the cached pixmap."""
+        r = QRectF()
+        for run in self._runs:
+            if run: r = r.united(run[0])
+        for tiles in self._corners:
+            for _, t in tiles: r = r.united(t)
+        b = self._bounds; m = 2 * self.SLACK
+        if not full and b.contains(r) and max(r.left() - b.left(), r.top() - b.top(),
+                                              b.right() - r.right(), b.bottom() - r.bottom()) <= m:
+            return False
+        self.prepareGeometryChange()
+        self._bounds = r.adjusted(-self.SLACK, -self.SLACK, self.SLACK, self.SLACK) if not r.isNull() else QRectF(0, 0, 1, 1)
+        self.update(); return True
 
-        for i in range(len(self._points)-1):
-            a = self._points[i]; b = self._points[i+1]
-            horiz = abs(a.y()-b.y()) < 0.5; vert = abs(a.x()-b.x()) < 0.5
-            if not (horiz or vert): continue
-            if horiz:
-                x1,x2 = sorted([a.x(),b.x()]); y=a.y()
-                step = max(1.0, self._straight.width()*self._scale); x=x1
-                while x < x2:
-                    tile=QGraphicsPixmapItem(self._straight, self)
-                    tile.setScale(self._scale)
-                    tile.setPos(x, y - (self._straight.height()*self._scale)/2.0)
-                    self._children.append(tile); x += step
-            else:
-                y1,y2 = sorted([a.y(),b.y()]); x=a.x()
-                step = max(1.0, self._straight.height()*self._scale); y=y1
-                while y < y2:
-                    tile=QGraphicsPixmapItem(self._straight, self)
-                    tile.setScale(self._scale)
-                    tile.setTransform(QTransform().rotate(90), True)
-                    tile.setPos(x - (self._straight.height()*self._scale)/2.0, y)
-                    self._children.append(tile); y += step
+    def _run(self, a: QPointF, b: QPointF):
+        """(tile rect centred on the segment, its strip) or None for a diagonal/empty segment."""
+        th = self._sp.thickness
+        if abs(a.y() - b.y()) < 0.5:
+            x1, x2 = sorted((a.x(), b.x()))
+            return (QRectF(x1, a.y() - th / 2.0, x2 - x1, th), self._sp.strip(x2 - x1, False)) if x2 > x1 else None
+        if abs(a.x() - b.x()) < 0.5:
+            y1, y2 = sorted((a.y(), b.y()))
+            return (QRectF(a.x() - th / 2.0, y1, th, y2 - y1), self._sp.strip(y2 - y1, True)) if y2 > y1 else None
+        return None
 
-        for i in range(1, len(self._points)-1):
-            prev=self._points[i-1]; cur=self._points[i]; nxt=self._points[i+1]
-            dx1,dy1=cur.x()-prev.x(),cur.y()-prev.y(); dx2,dy2=nxt.x()-cur.x(),nxt.y()-cur.y()
-            angle=0
-            if   (dx1>0 and dy2>0) or (dy1>0 and dx2<0): angle=0
-            elif (dy1>0 and dx2>0) or (dx1>0 and dy2<0): angle=90
-            elif (dx1<0 and dy2<0) or (dy1<0 and dx2>0): angle=180
-            elif (dy1<0 and dx2<0) or (dx1<0 and dy2>0): angle=270
-            elbow=QGraphicsPixmapItem(self._elbow, self)
-            elbow.setScale(self._scale); elbow.setTransform(QTransform().rotate(angle), True)
-            elbow.setPos(cur.x()-(self._elbow.width()*self._scale)/2.0, cur.y()-(self._elbow.height()*self._scale)/2.0)
-            self._children.append(elbow)
-            if self._flange:
-                fl=QGraphicsPixmapItem(self._flange, self); fl.setScale(self._scale)
-                fl.setPos(cur.x()-(self._flange.width()*self._scale)/2.0, cur.y()-(self._flange.height()*self._scale)/2.0)
-                self._children.append(fl)
+    def _corner(self, prev: QPointF, cur: QPointF, nxt: QPointF) -> tuple:
+        """((atlas tile, target rect), ...) for the elbow (and flange) on `cur`."""
+        dx1, dy1 = cur.x() - prev.x(), cur.y() - prev.y(); dx2, dy2 = nxt.x() - cur.x(), nxt.y() - cur.y()
+        angle = 0
+        if   (dx1 > 0 and dy2 > 0) or (dy1 > 0 and dx2 < 0): angle = 0
+        elif (dy1 > 0 and dx2 > 0) or (dx1 > 0 and dy2 < 0): angle = 90
+        elif (dx1 < 0 and dy2 < 0) or (dy1 < 0 and dx2 > 0): angle = 180
+        elif (dy1 < 0 and dx2 < 0) or (dx1 < 0 and dy2 > 0): angle = 270
+        names = (f"elbow{angle}", "flange") if self._sp.has_flange else (f"elbow{angle}",)
+        return tuple((n, self._sp.rect(n, cur.x(), cur.y())) for n in names)
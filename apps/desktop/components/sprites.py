@@ -0,0 +1,74 @@
+# components/sprites.py — shared sprite pixmaps: loaded once, pre-scaled/pre-rotated, elbows packed into an atlas
+from __future__ import annotations
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QPainter, QPixmap, QPixmapCache, QTransform
+
+ANGLES = (0, 90, 180, 270)
+
+def sprite(path: str, scale: float = 1.0, angle: int = 0) -> QPixmap:
+    """The image at `path`, scaled then rotated (multiples of 90) once and shared through QPixmapCache.
+    Items keep the returned QPixmap (implicitly shared), so a cache eviction never costs a reload while they live."""
+    key = f"sprite:{path}:{scale:g}:{angle % 360}"
+    pm = QPixmapCache.find(key)
+    if pm is not None and not pm.isNull(): return pm
+    if scale == 1.0 and angle % 360 == 0:
+        pm = QPixmap(path)
+    else:
+        pm = sprite(path)
+        if scale != 1.0 and not pm.isNull():
+            pm = pm.scaled(max(1, round(pm.width() * scale)), max(1, round(pm.height() * scale)),
+                           Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        if angle % 360: pm = pm.transformed(QTransform().rotate(angle % 360), Qt.SmoothTransformation)
+    QPixmapCache.insert(key, pm)
+    return pm
+
+class PipeSprites:
+    """
+    One pipe style (straight, elbow, flange images at one scale), shared by every SpritePipe using it:
+      run_h / run_v     straight tile, horizontal and pre-rotated vertical
+      strip(len, vert)  that tile repeated over a whole straight run, drawn as one pixmap
+      atlas, src[name]  the four elbow rotations and the flange side by side in one pixmap
+    """
+    _styles: dict[tuple, "PipeSprites"] = {}
+
+    @classmethod
+    def get(cls, straight: str, elbow: str, flange: str | None = None, scale: float = 1.0) -> "PipeSprites":
+        key = (straight, elbow, flange, float(scale))
+        if key not in cls._styles: cls._styles[key] = cls(straight, elbow, flange, float(scale))
+        return cls._styles[key]
+
+    def __init__(self, straight: str, elbow: str, flange: str | None, scale: float):
+        self.key = f"{straight}:{elbow}:{flange}:{scale:g}"
+        self.run_h = sprite(straight, scale); self.run_v = sprite(straight, scale, 90)
+        tiles = {f"elbow{a}": sprite(elbow, scale, a) for a in ANGLES}
+        if flange: tiles["flange"] = sprite(flange, scale)
+        w = sum(pm.width() for pm in tiles.values()) + 2 * len(tiles); h = max(pm.height() for pm in tiles.values())
+        self.atlas = QPixmap(max(1, w), max(1, h)); self.atlas.fill(Qt.transparent)
+        self.src: dict[str, QRectF] = {}
+        p = QPainter(self.atlas); x = 0
+        for name, pm in tiles.items():                  # 2 px gutter: smooth scaling never samples a neighbour
+            p.drawPixmap(x, 0, pm); self.src[name] = QRectF(x, 0, pm.width(), pm.height()); x += pm.width() + 2
+        p.end()
+        self.has_flange = flange is not None
+        self.thickness = float(self.run_h.height())
+
+    def strip(self, length: float, vertical: bool) -> QPixmap:
+        """The straight tile repeated over `length` px, shared through QPixmapCache. A zoomed device cache
+        redraws a run as one scaled blit; drawTiledPixmap under a scale is several times slower."""
+        n = max(1, int(length + 0.999)); key = f"strip:{self.key}:{n}:{int(vertical)}"
+        pm = QPixmapCache.find(key)
+        if pm is not None and not pm.isNull(): return pm
+        tile = self.run_v if vertical else self.run_h; th = int(self.thickness)
+        pm = QPixmap(th, n) if vertical else QPixmap(n, th); pm.fill(Qt.transparent)
+        p = QPainter(pm); p.drawTiledPixmap(0, 0, pm.width(), pm.height(), tile); p.end()
+        QPixmapCache.insert(key, pm)
+        return pm
+
+    def rect(self, name: str, cx: float, cy: float) -> QRectF:
+        """Where tile `name` goes when centred on (cx, cy)."""
+        s = self.src[name]
+        return QRectF(cx - s.width() / 2.0, cy - s.height() / 2.0, s.width(), s.height())
+
+    def blit(self, p: QPainter, name: str, cx: float, cy: float):
+        """Tile `name` centred on (cx, cy), straight from the atlas."""
+        p.drawPixmap(self.rect(name, cx, cy), self.atlas, self.src[name])
@@ -0,0 +1,150 @@
+# components/trend_view.py — historian trend panel (one lane per tag, min/max per pixel column)
+import math, time
+from PySide6.QtCore import Qt, QTimer, QRectF, QPointF
+from PySide6.QtGui import QPainter, QPen, QColor, QFont
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QButtonGroup, QSizePolicy
+from historian import MAX_SPAN_S
+from theme import BG, TXT, GREY_TEXT, STEEL_EDGE, YELLOW, BODY_BLUE, OK_GREEN, WARN_RED, PELLET
+
+SERIES_COLORS = [YELLOW, PELLET, OK_GREEN, WARN_RED, BODY_BLUE, GREY_TEXT]
+SPANS = (("10 min", 600), ("1 h", 3600), ("8 h", 8 * 3600), ("24 h", 24 * 3600))
+
+class TrendCanvas(QWidget):
+    """
+    Paints stacked lanes. Each lane asks the TrendSource for exactly one (min, max) pair per
+    pixel column and draws it as a vertical stroke, so paint cost depends on the widget width,
+    not on how many samples the visible range holds.
+      wheel = zoom around the cursor, drag = pan (leaves live mode), double-click = back to live
+    """
+    def __init__(self, source, series: list[tuple[str, str]], parent=None):
+        super().__init__(parent)
+        self.source = source; self.series = list(series)
+        self.span = 3600.0; self.end = time.time(); self.live = True
+        self._cols_key = None; self._cols = []
+        self._drag = None
+        self.setMinimumSize(320, 80 * max(1, len(series)))
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    # ---------- range ----------
+    def set_span(self, seconds: float):
+        self.span = max(60.0, min(float(MAX_SPAN_S), float(seconds))); self.update()
+
+    def follow_live(self, on: bool = True):
+        self.live = bool(on)
+        if self.live: self.end = time.time()
+        self.update()
+
+    def tick(self):
+        if self.live: self.end = time.time(); self.update()
+
+    def _plot_rect(self) -> QRectF:
+        return QRectF(8, 4, max(10, self.width() - 70), max(10, self.height() - 24))
+
+    # ---------- data ----------
+    def _columns(self, n: int):
+        key = (round(self.end - self.span, 3), round(self.end, 3), n)
+        if key != self._cols_key:
+            t0 = self.end - self.span
+            self._cols = [self.source.columns(tag, t0, self.end, n) for tag, _ in self.series]
+            self._cols_key = key
+        return self._cols
+
+    # ---------- paint ----------
+    def paintEvent(self, e):
+        p = QPainter(self); p.fillRect(self.rect(), BG)
+        if not self.series: return
+        r = self._plot_rect(); n = int(r.width())
+        cols = self._columns(n)
+        lane_h = r.height() / len(self.series)
+        f = QFont(p.font()); f.setPointSize(8); p.setFont(f)
+        for k, ((tag, label), (mins, maxs)) in enumerate(zip(self.series, cols)):
+            lane = QRectF(r.left(), r.top() + k * lane_h, r.width(), lane_h - 4)
+            p.setPen(QPen(STEEL_EDGE, 1)); p.setBrush(Qt.NoBrush); p.drawRect(lane)
+            finite = [v for v in mins if v == v] + [v for v in maxs if v == v]
+            color = SERIES_COLORS[k % len(SERIES_COLORS)]
+            p.setPen(QPen(GREY_TEXT)); p.drawText(QPointF(lane.left() + 4, lane.top() + 12), label)
+            if not finite: continue
+            lo, hi = min(finite), max(finite)
+            if hi - lo < 1e-6: lo -= 0.5; hi += 0.5
+            pad = (hi - lo) * 0.08; lo -= pad; hi += pad
+            sy = (lane.height() - 16) / (hi - lo); base = lane.bottom() - 2
+            p.setPen(QPen(color, 1))
+            prev = None
+            for x in range(n):
+                a, b = mins[x], maxs[x]
+                if a != a: prev = None; continue
+                y0 = base - (a - lo) * sy; y1 = base - (b - lo) * sy
+                if prev is not None:                     # join to the previous column so steps stay connected
+                    y0 = max(y0, min(prev)); y1 = min(y1, max(prev))
+                xx = lane.left() + x + 0.5
+                p.drawLine(QPointF(xx, y0), QPointF(xx, min(y1, y0 - 0.5)))
+                prev = (base - (a - lo) * sy, base - (b - lo) * sy)
+            last = next((maxs[x] for x in range(n - 1, -1, -1) if maxs[x] == maxs[x]), None)
+            p.setPen(QPen(TXT))
+            p.drawText(QPointF(lane.right() + 4, lane.top() + 12), f"{hi - pad:.1f}")
+            p.drawText(QPointF(lane.right() + 4, lane.bottom() - 2), f"{lo + pad:.1f}")
+            if last is not None:
+                p.setPen(QPen(color)); p.drawText(QPointF(lane.right() + 4, lane.center().y() + 4), f"{last:.1f}")
+        self._paint_time_axis(p, r)
+
+    def _paint_time_axis(self, p: QPainter, r: QRectF):
+        t0 = self.end - self.span
+        step = next(s for s in (60, 300, 600, 1800, 3600, 7200, 14400, 21600, 43200, 86400)
+                    if self.span / s <= 8)
+        p.setPen(QPen(GREY_TEXT))
+        t = math.ceil(t0 / step) * step
+        while t <= self.end:
+            x = r.left() + (t - t0) / self.span * r.width()
+            p.drawLine(QPointF(x, r.bottom()), QPointF(x, r.bottom() + 4))
+            p.drawText(QPointF(x - 14, r.bottom() + 16), time.strftime("%H:%M", time.localtime(t)))
+            t += step
+        if not self.live:
+            p.drawText(QPointF(r.right() - 60, r.bottom() + 16), "paused")
+
+    # ---------- interaction ----------
+    def wheelEvent(self, e):
+        r = self._plot_rect(); frac = min(1.0, max(0.0, (e.position().x() - r.left()) / r.width()))
+        anchor = self.end - self.span * (1.0 - frac)
+        factor = 0.8 if e.angleDelta().y() > 0 else 1.25
+        new_span = max(60.0, min(float(MAX_SPAN_S), self.span * factor))
+        self.end = anchor + new_span * (1.0 - frac); self.span = new_span
+        if self.end < time.time() - 1.0: self.live = False
+        self.update(); e.accept()
+
+    def mousePressEvent(self, e):
+        self._drag = (e.position().x(), self.end)
+
+    def mouseMoveEvent(self, e):
+        if self._drag is None: return
+        dx = e.position().x() - self._drag[0]
+        self.end = min(time.time(), self._drag[1] - dx / self._plot_rect().width() * self.span)
+        self.live = False; self.update()
+
+    def mouseReleaseEvent(self, e):
+        self._drag = None
+
+    def mouseDoubleClickEvent(self, e):
+        self.follow_live(True)
+
+class TrendPanel(QWidget):
+    """Span buttons + TrendCanvas; refreshed at refresh_ms while following live data."""
+    def __init__(self, source, series: list[tuple[str, str]], refresh_ms: int = 1000, parent=None):
+        super().__init__(parent)
+        self.canvas = TrendCanvas(source, series, self)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(4)
+        bar = QHBoxLayout(); bar.setSpacing(4)
+        self._spans = QButtonGroup(self); self._spans.setExclusive(True)
+        style = ("QPushButton { color:white; padding:4px 8px; border-radius:6px; background:#2E3239; "
+                 "border:1px solid rgba(255,255,255,0.12);} QPushButton:checked { background:#005C85; }")
+        for i, (label, secs) in enumerate(SPANS):
+            b = QPushButton(label); b.setCheckable(True); b.setStyleSheet(style)
+            b.setChecked(secs == 3600); self._spans.addButton(b, i); bar.addWidget(b)
+        self._spans.idClicked.connect(lambda i: self.canvas.set_span(SPANS[i][1]))
+        live = QPushButton("Live"); live.setStyleSheet(style); live.clicked.connect(lambda: self.canvas.follow_live(True))
+        bar.addStretch(1); bar.addWidget(live)
+        lay.addLayout(bar); lay.addWidget(self.canvas, 1)
+        self.timer = QTimer(self); self.timer.setInterval(int(refresh_ms))
+        self.timer.timeout.connect(self._refresh); self.timer.start()
+
+    def _refresh(self):
+        if self.isVisible(): self.canvas.tick()
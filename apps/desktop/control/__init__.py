@@ -0,0 +1,4 @@
+# control package — plant control logic that runs on the TagBus (no Qt): dosing, batch sequencing, feeder simulation
+from .dosing import DosingEngine, Feeder, feeder_config
+from .feed_sim import FeedSim, FeedLine
+from .sequencer import BatchSequencer, BatchTiming
@@ -0,0 +1,167 @@
+# control/dosing.py — target-driven dosing of the weigh hoppers (coarse/fine feed, in-flight compensation)
+import json, os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+IDLE, COARSE, FINE, SETTLE, TOPUP, DONE, ABORTED = "idle", "coarse", "fine", "settle", "topup", "done", "aborted"
+
+@dataclass
+class Feeder:
+    """One weighed ingredient: its weight tag, the outputs that feed it and its cut-off tuning."""
+    name: str
+    weight_tag: str
+    run_tag: str
+    fine_tag: str | None = None       # None: single-speed feeder (cut-off only, top-ups pulse run)
+    fine_kg: float = 0.0              # switch to fine feed this far before the cut-off point (must exceed
+                                      # the coarse in-flight, coarse kg/s x fall time, or fine never acts)
+    inflight_kg: float = 0.0          # still falling at cut-off; learned from every batch
+    tolerance_kg: float = 0.5         # short by more than this after settling -> top-up pulse
+    settle_s: float = 1.0
+    topup_s: float = 0.3
+    max_topups: int = 3
+    timeout_s: float = 180.0          # no cut-off by then (empty bin, interlock) -> aborted
+    max_kg: float | None = None       # hopper capacity: a target that cannot fit is refused at start
+    # runtime
+    state: str = IDLE
+    target: float = 0.0; tare: float = 0.0
+    t_start: float = 0.0; t_state: float = 0.0; topups: int = 0; learn_next: bool = False
+
+def feeder_config(dcfg: dict, name: str) -> dict | None:
+    """First dcfg["feeders"] entry whose key (a name pattern, e.g. "Agg*") matches `name`."""
+    return next((v for pat, v in (dcfg.get("feeders") or {}).items() if fnmatchcase(name, pat)), None)
+
+class DosingEngine:
+    """
+    Doses every started Feeder to its target net weight, one fixed control step at a time:
+      coarse  run until remaining <= fine_kg + inflight_kg
+      fine    run + fine until remaining <= inflight_kg (the material in the air lands by itself)
+      settle  outputs off for settle_s, then the net weight is final; the in-flight estimate grows by
+              `learn` x the settled error (final - target), so over batches the mean error goes to zero
+              (learning final - net at cut-off would miss the step between the cut-off point and the cut)
+      topup   fine pulse of topup_s while still short by more than tolerance_kg (counted per batch)
+    advance(now) runs as many steps of 1/rate_hz as have elapsed, so dosing does not depend on how
+    often the GUI gets to call it. `sim` (FeedSim) is stepped first when the plant is simulated.
+    """
+    def __init__(self, bus, feeders: list[Feeder], *, rate_hz: float = 20.0, learn: float = 0.3,
+                 sim=None, learned_path: str | None = None, on_done=None):
+        self.bus = bus; self.feeders = {f.name: f for f in feeders}
+        self.dt = 1.0 / max(1.0, float(rate_hz)); self.learn = max(0.0, min(1.0, float(learn)))
+        self.sim = sim; self.learned_path = learned_path; self.on_done = on_done
+        self.t = 0.0; self._wall: float | None = None
+        self.steps = 0; self.late_steps = 0
+        self.results: list[dict] = []; self.cycle: list[dict] = []   # all recent / this dosing run
+        self.after_step: list = []                                     # fn(dt) run after every step (sequencer)
+        self._load()
+
+    @classmethod
+    def from_config(cls, dcfg: dict, bus, ingredients: list[tuple], base_dir: str, **kw) -> "DosingEngine":
+        """ingredients: (name, weight tag[, hopper kg]); settings from feeder_config(dcfg, name), if any."""
+        feeders = []
+        for name, tag, *cap in ingredients:
+            fc = feeder_config(dcfg, name)
+            if fc is None or "run" not in fc: continue
+            num = "".join(c for c in name if c.isdigit())
+            fmt = lambda s: s.format(n=num) if s else s                # "agg{n}.feed" -> agg1.feed
+            feeders.append(Feeder(name, tag, fmt(fc["run"]), fmt(fc.get("fine")),
+                                  fine_kg=float(fc.get("fine_kg", 0.0)), inflight_kg=float(fc.get("inflight_kg", 0.0)),
+                                  tolerance_kg=float(fc.get("tolerance_kg", 0.5)), settle_s=float(fc.get("settle_s", 1.0)),
+                                  topup_s=float(fc.get("topup_s", 0.3)), max_topups=int(fc.get("max_topups", 3)),
+                                  timeout_s=float(fc.get("timeout_s", 180.0)), max_kg=cap[0] if cap else None))
+        path = dcfg.get("learned", "dosing_learned.json")
+        if path and not os.path.isabs(path): path = os.path.join(base_dir, path)
+        return cls(bus, feeders, rate_hz=dcfg.get("rate_hz", 20), learn=dcfg.get("learn", 0.3), learned_path=path, **kw)
+
+    # ---------- learned in-flight per feeder ----------
+    def _load(self):
+        if not self.learned_path or not os.path.exists(self.learned_path): return
+        try:
+            with open(self.learned_path, encoding="utf-8") as f: saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, kg in saved.items():
+            if name in self.feeders: self.feeders[name].inflight_kg = float(kg)
+
+    def save(self):
+        if not self.learned_path: return
+        tmp = self.learned_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({n: round(f_.inflight_kg, 4) for n, f_ in self.feeders.items()}, f, indent=1)
+        os.replace(tmp, self.learned_path)
+
+    # ---------- commands ----------
+    def start(self, targets: dict[str, float]) -> list[str]:
+        """Start dosing the given net kg per feeder (tare = weight now); returns the feeders started."""
+        started = []
+        if not self.active: self.cycle = []
+        for name, kg in targets.items():
+            f = self.feeders.get(name)
+            if f is None or kg <= 0 or f.state in (COARSE, FINE, SETTLE, TOPUP): continue
+            f.target = float(kg); f.tare = float(self.bus.value(f.weight_tag, 0.0)); f.topups = 0; f.t_start = self.t
+            if f.max_kg is not None and f.tare + f.target > f.max_kg:
+                self._finish(f, ABORTED, reason=f"{f.tare + f.target:.1f} kg > hopper {f.max_kg:.1f} kg"); continue
+            self._set(f, COARSE); started.append(name)
+        if started: self.bus.publish("dosing.active", True)
+        return started
+
+    def abort(self):
+        for f in self.feeders.values():
+            if f.state in (COARSE, FINE, SETTLE, TOPUP): self._finish(f, ABORTED, reason="operator")
+
+    @property
+    def active(self) -> bool:
+        return any(f.state in (COARSE, FINE, SETTLE, TOPUP) for f in self.feeders.values())
+
+    # ---------- control loop ----------
+    def advance(self, now: float, max_steps: int = 10) -> int:
+        """Run the fixed steps due by `now` (monotonic seconds); a long stall skips rather than bursts."""
+        if self._wall is None: self._wall = now
+        n = int((now - self._wall) / self.dt)
+        if n > max_steps: self.late_steps += n - max_steps; self._wall = now - max_steps * self.dt; n = max_steps
+        for _ in range(n): self.step()
+        self._wall += n * self.dt
+        return n
+
+    def step(self):
+        self.t += self.dt; self.steps += 1
+        if self.sim is not None: self.sim.step(self.dt)
+        for f in self.feeders.values():
+            if f.state in (IDLE, DONE, ABORTED): continue
+            net = float(self.bus.value(f.weight_tag, 0.0)) - f.tare; rem = f.target - net
+            if f.state == COARSE:
+                if f.fine_tag and rem <= f.fine_kg + f.inflight_kg: self._set(f, FINE)
+                elif rem <= f.inflight_kg: self._cut(f)
+                elif self.t - f.t_start > f.timeout_s: self._finish(f, ABORTED, reason="timeout")
+            elif f.state == FINE:
+                if rem <= f.inflight_kg: self._cut(f)
+                elif self.t - f.t_start > f.timeout_s: self._finish(f, ABORTED, reason="timeout")
+            elif f.state == SETTLE and self.t - f.t_state >= f.settle_s:
+                if f.learn_next:                           # main cut only; top-up pulses say little
+                    f.inflight_kg = max(0.0, f.inflight_kg + self.learn * (net - f.target))
+                    f.learn_next = False
+                if rem > f.tolerance_kg and f.topups < f.max_topups: f.topups += 1; self._set(f, TOPUP)
+                else: self._finish(f, DONE, net)
+            elif f.state == TOPUP and self.t - f.t_state >= f.topup_s:
+                self._set(f, SETTLE)
+        for fn in self.after_step: fn(self.dt)
+
+    def _cut(self, f: Feeder):
+        f.learn_next = True; self._set(f, SETTLE)
+
+    def _set(self, f: Feeder, state: str):
+        f.state = state; f.t_state = self.t
+        run = state in (COARSE, FINE, TOPUP); fine = state in (FINE, TOPUP)
+        self.bus.publish(f.run_tag, run)
+        if f.fine_tag: self.bus.publish(f.fine_tag, fine)
+        self.bus.publish(f"dosing.{f.name}.state", state)
+
+    def _finish(self, f: Feeder, state: str, net: float | None = None, reason: str = ""):
+        self._set(f, state)
+        net = float(self.bus.value(f.weight_tag, 0.0)) - f.tare if net is None else net
+        r = {"name": f.name, "state": state, "target": f.target, "actual": net, "error": net - f.target,
+             "topups": f.topups, "dose_s": self.t - f.t_start, "inflight_kg": f.inflight_kg, "reason": reason}
+        self.results.append(r); self.cycle.append(r)
+        self.bus.publish(f"dosing.{f.name}.out_of_tol", state != DONE or abs(net - f.target) > f.tolerance_kg)
+        if len(self.results) > 500: del self.results[:-200]
+        if not self.active:
+            self.bus.publish("dosing.active", False)
+            if self.on_done: self.on_done(list(self.cycle))
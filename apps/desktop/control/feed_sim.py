@@ -0,0 +1,62 @@
+# control/feed_sim.py — local stand-in for the feeders while no PLC is attached
+import random
+from collections import deque
+from .dosing import feeder_config
+
+class FeedLine:
+    """One feeder -> weigh hopper: flows while `run` is on, lands fall_s later (the in-flight column)."""
+    def __init__(self, bus, weight_tag: str, run_tag: str, fine_tag: str | None, *, coarse_kgps: float,
+                 fine_kgps: float, fall_s: float = 0.5, cap_kg: float | None = None, src=None, jitter: float = 0.05):
+        self.bus = bus; self.weight_tag = weight_tag; self.run_tag = run_tag; self.fine_tag = fine_tag
+        self.coarse = float(coarse_kgps); self.fine = float(fine_kgps); self.fall_s = float(fall_s)
+        self.cap = cap_kg; self.src = src; self.jitter = float(jitter)   # src: (get_kg, set_kg) or None (endless bin)
+        self.t = 0.0; self._air: deque[tuple[float, float]] = deque()
+
+    def step(self, dt: float):
+        self.t += dt
+        if self.bus.value(self.run_tag):
+            kg = (self.fine if self.fine_tag and self.bus.value(self.fine_tag) else self.coarse) * dt
+            kg *= 1.0 + random.uniform(-self.jitter, self.jitter)
+            if self.src is not None:
+                have = float(self.src[0]()); kg = min(kg, max(0.0, have)); self.src[1](have - kg)
+            if kg > 0.0: self._air.append((self.t + self.fall_s, kg))
+        landed = 0.0
+        while self._air and self._air[0][0] <= self.t: landed += self._air.popleft()[1]
+        if landed:
+            w = float(self.bus.value(self.weight_tag, 0.0)) + landed
+            self.bus.publish(self.weight_tag, w if self.cap is None else min(self.cap, w))
+
+    @property
+    def in_flight_kg(self) -> float: return sum(kg for _, kg in self._air)
+
+class FeedSim:
+    """All simulated feed lines, stepped by the DosingEngine at its fixed control rate."""
+    def __init__(self, bus, seed: int | None = None):
+        self.bus = bus; self.lines: list[FeedLine] = []
+        if seed is not None: random.seed(seed)
+
+    def add(self, weight_tag: str, run_tag: str, fine_tag: str | None = None, **kw) -> FeedLine:
+        line = FeedLine(self.bus, weight_tag, run_tag, fine_tag, **kw); self.lines.append(line); return line
+
+    def add_feeders(self, dosing, dcfg: dict, *, caps: dict | None = None, sources: dict | None = None, jitter: float = 0.05):
+        """One line per DosingEngine feeder; rates and fall time from its dcfg feeder entry's "sim"."""
+        for f in dosing.feeders.values():
+            sim = (feeder_config(dcfg, f.name) or {}).get("sim") or {}
+            self.add(f.weight_tag, f.run_tag, f.fine_tag, coarse_kgps=float(sim.get("coarse_kgps", 20.0)),
+                     fine_kgps=float(sim.get("fine_kgps", 4.0)), fall_s=float(sim.get("fall_s", 0.5)),
+                     cap_kg=(caps or {}).get(f.name), src=(sources or {}).get(f.name), jitter=jitter)
+
+    def add_discharges(self, ingredients: list[tuple[str, str, str]], sim: dict):
+        """Hopper gates -> mixer.load_kg (aggregates arrive belt_s later), mixer gate -> truck.load_kg."""
+        bus = self.bus
+        def tag_src(tag):
+            return (lambda: bus.value(tag, 0.0), lambda v: bus.publish(tag, max(0.0, v)))
+        for name, weight, gate in ingredients:
+            agg = name.startswith("Agg")
+            self.add("mixer.load_kg", gate, coarse_kgps=float(sim.get("agg_kgps" if agg else f"{name.lower()}_kgps", 50.0)),
+                     fine_kgps=0.0, fall_s=float(sim.get("belt_s", 4.0)) if agg else 0.3, src=tag_src(weight), jitter=0.0)
+        self.add("truck.load_kg", "mixer.gate_open", coarse_kgps=float(sim.get("mixer_kgps", 300.0)), fine_kgps=0.0,
+                 fall_s=0.0, src=tag_src("mixer.load_kg"), jitter=0.0)
+
+    def step(self, dt: float):
+        for line in self.lines: line.step(dt)
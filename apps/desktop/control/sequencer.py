@@ -0,0 +1,128 @@
+# control/sequencer.py — batch cycle with the next batch weighed while the mixer mixes the current one
+from dataclasses import dataclass, field
+
+IDLE, WEIGHING, WEIGHED, CHARGING = "idle", "weighing", "weighed", "charging"     # weigh side
+EMPTY, MIXING, DISCHARGING = "empty", "mixing", "discharging"                     # mixer side (+ CHARGING)
+STAGES = ("weigh", "wait", "charge", "mix", "discharge")
+
+@dataclass
+class BatchTiming:
+    """One batch through the plant; times are sequencer seconds."""
+    seq: int
+    t_weigh: float
+    t_weighed: float | None = None; t_charge: float | None = None; t_charged: float | None = None
+    t_mixed: float | None = None; t_out: float | None = None
+    actuals: list[dict] = field(default_factory=list)    # DosingEngine results of its weighing
+
+    def stages(self) -> dict[str, float]:
+        """weigh, wait (weighed -> mixer free), charge (gates open -> all material in), mix, discharge."""
+        return {"weigh": self.t_weighed - self.t_weigh, "wait": self.t_charge - self.t_weighed,
+                "charge": self.t_charged - self.t_charge, "mix": self.t_mixed - self.t_charged,
+                "discharge": self.t_out - self.t_mixed}
+
+class BatchSequencer:
+    """
+    Two coupled state machines stepped with the DosingEngine (same fixed rate):
+      weigh side  idle -> weighing (DosingEngine) -> weighed -> charging (hopper gates open) -> idle
+      mixer side  empty -> charging -> mixing (mix_s) -> discharging (mixer gate open) -> empty
+    Pipelined, the weigh side starts batch N+1 as soon as the hoppers have emptied into batch N, so
+    weighing overlaps mixing and discharge; otherwise it waits for the mixer to be empty again.
+    Interlocks: hoppers are weighed only with their gates shut and empty; charging needs the mixer
+    gate shut and the mixer running; aggregate gates only open while the belt runs (a stopped belt
+    holds them shut); the mixer only counts as charged charge_settle_s after the hoppers emptied
+    (material still on the belt).
+    """
+    def __init__(self, bus, dosing, ingredients: list[tuple[str, str, str]], *, mix_s: float = 30.0,
+                 empty_kg: float = 2.0, charge_settle_s: float = 4.0, pipelined: bool = True, on_batch=None):
+        self.bus = bus; self.dosing = dosing; self.on_batch = on_batch
+        self.ingr = ingredients                            # (name, weight tag, discharge gate tag)
+        self.mix_s = float(mix_s); self.empty_kg = float(empty_kg); self.charge_settle_s = float(charge_settle_s)
+        self.pipelined = bool(pipelined)
+        self.t = 0.0; self.weigh = IDLE; self.mixer = EMPTY
+        self.todo = 0; self.seq = 0; self.targets: dict[str, float] = {}
+        self.cur: BatchTiming | None = None; self.in_mixer: BatchTiming | None = None
+        self._t_emptied = 0.0; self.done: list[BatchTiming] = []; self.fault = ""
+        dosing.after_step.append(self.step)
+
+    @classmethod
+    def from_config(cls, scfg: dict, bus, dosing, ingredients, **kw) -> "BatchSequencer":
+        return cls(bus, dosing, ingredients, mix_s=scfg.get("mix_s", 30.0), empty_kg=scfg.get("empty_kg", 2.0),
+                   charge_settle_s=scfg.get("charge_settle_s", 4.0), pipelined=scfg.get("pipelined", True), **kw)
+
+    # ---------- commands ----------
+    def start(self, batches: int, targets: dict[str, float]):
+        self.todo = int(batches); self.targets = dict(targets); self.fault = ""
+        self._publish()
+
+    def stop(self):
+        """No new weighing; batches already weighed or in the mixer are finished."""
+        self.todo = 0; self._publish()
+
+    def abort(self, why: str = "operator"):
+        self.todo = 0; self.fault = why; self.dosing.abort(); self._gates(False)
+        if self.weigh in (WEIGHING, WEIGHED, CHARGING): self.weigh = IDLE; self.cur = None
+        self._publish()
+
+    @property
+    def running(self) -> bool:
+        return bool(self.todo) or self.weigh != IDLE or self.mixer != EMPTY
+
+    # ---------- helpers ----------
+    def _w(self, tag: str) -> float: return float(self.bus.value(tag, 0.0))
+
+    def _hoppers_empty(self) -> bool: return all(self._w(w) <= self.empty_kg for _, w, _ in self.ingr)
+
+    def _gates(self, open_: bool):
+        belt = bool(self.bus.value("belt.run"))
+        for name, _, gate in self.ingr:
+            want = open_ and (belt or not name.startswith("Agg"))    # aggregates go out over the belt
+            if bool(self.bus.value(gate)) != want: self.bus.publish(gate, want)
+
+    def _publish(self):
+        self.bus.publish("seq.weigh", self.weigh); self.bus.publish("seq.mixer", self.mixer)
+        self.bus.publish("seq.todo", self.todo); self.bus.publish("seq.done", len(self.done))
+
+    # ---------- fixed step ----------
+    def step(self, dt: float):
+        self.t += dt; before = (self.weigh, self.mixer)
+        # weigh side
+        if self.weigh == IDLE and self.todo > 0 and (self.pipelined or (self.mixer == EMPTY and self.in_mixer is None)):
+            if self._hoppers_empty() and not any(self.bus.value(g) for _, _, g in self.ingr):
+                self.seq += 1; self.todo -= 1; self.cur = BatchTiming(self.seq, self.t)
+                self.dosing.start(self.targets); self.weigh = WEIGHING
+        elif self.weigh == WEIGHING and not self.dosing.active:
+            self.cur.actuals = list(self.dosing.cycle); self.cur.t_weighed = self.t; self.weigh = WEIGHED
+            if any(r["state"] != "done" for r in self.cur.actuals):
+                self.abort("dosing " + ", ".join(r["name"] for r in self.cur.actuals if r["state"] != "done")); return
+        elif self.weigh == WEIGHED and self.mixer == EMPTY and self.in_mixer is None and not self.bus.value("mixer.gate_open"):
+            if not self.bus.value("mixer.run"): self.bus.publish("mixer.run", True)
+            if not self.bus.value("belt.run"): self.bus.publish("belt.run", True)
+            self.cur.t_charge = self.t; self.in_mixer = self.cur; self.cur = None
+            self.weigh = CHARGING; self.mixer = CHARGING; self._gates(True)
+        elif self.weigh == CHARGING:
+            if self._hoppers_empty():
+                self._gates(False); self.weigh = IDLE; self._t_emptied = self.t
+            else:
+                self._gates(True)                                      # re-applies the belt interlock
+        # mixer side
+        if self.mixer == CHARGING and self.weigh != CHARGING and self.t - self._t_emptied >= self.charge_settle_s:
+            self.in_mixer.t_charged = self.t; self.mixer = MIXING
+        elif self.mixer == MIXING and self.t - self.in_mixer.t_charged >= self.mix_s:
+            self.in_mixer.t_mixed = self.t; self.mixer = DISCHARGING; self.bus.publish("mixer.gate_open", True)
+        elif self.mixer == DISCHARGING and self._w("mixer.load_kg") <= self.empty_kg:
+            self.bus.publish("mixer.gate_open", False)
+            b = self.in_mixer; b.t_out = self.t; self.done.append(b); self.in_mixer = None; self.mixer = EMPTY
+            if self.on_batch: self.on_batch(b)
+            if not self.running: self.bus.publish("belt.run", False); self.bus.publish("mixer.run", False)
+        if (self.weigh, self.mixer) != before: self._publish()
+
+    # ---------- report ----------
+    def summary(self, last: int | None = None, batch_m3: float = 1.0) -> dict:
+        """Mean seconds per stage, cycle time (between discharges) and throughput over the done batches."""
+        bs = self.done[-last:] if last else self.done
+        if not bs: return {}
+        out = {s: sum(b.stages()[s] for b in bs) / len(bs) for s in STAGES}
+        outs = [b.t_out for b in bs]
+        cycle = (outs[-1] - outs[0]) / (len(outs) - 1) if len(outs) > 1 else outs[0] - bs[0].t_weigh
+        out.update(batches=len(bs), cycle=cycle, m3_per_h=batch_m3 * 3600.0 / cycle if cycle > 0 else 0.0)
+        return out
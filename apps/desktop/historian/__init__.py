@@ -0,0 +1,3 @@
+# historian package — time-series of plant tags (append-only hourly column files)
+from .store import Historian, HistorianReader
+from .pyramid import TrendSource, MAX_SPAN_S
@@ -0,0 +1,99 @@
+# historian/pyramid.py — trend columns from the per-hour min/max decimation pyramids
+#
+# Every tag-hour has 1 s / 10 s / 60 s / 600 s (min, max) buckets (HourPyramid). The Historian feeds
+# the open hour's pyramid as it stores points and seals it as <tag>.pyr at the hour boundary; hours
+# without a .pyr (older files, another writer) are rebuilt from the raw columns once. A trend column
+# combines at most ~10 buckets of the coarsest level finer than the column width, so a 24 h view
+# costs the same per pixel column as a 10 minute one. Sealed hours stay memory-mapped in an LRU of
+# MAX_SPAN_S worth of hours per tag (the widest trend view); evicted maps are closed, so the retention
+# sweep can delete their directories (Windows refuses while a file is mapped).
+import math, mmap, os, time
+from collections import OrderedDict
+from .store import HistorianReader, HourPyramid, LEVELS, NAN, CHUNK_S, chunk_key, chunk_name, chunk_start, _write_atomic
+
+MAX_SPAN_S = 7 * 86400                              # widest trend range (TrendCanvas clamps to it)
+
+class TrendSource:
+    """Column-wise min/max over any range, from the historian files (see module comment)."""
+    HOURS_PER_TAG = MAX_SPAN_S // CHUNK_S + 1           # an unaligned max span touches one more hour
+
+    def __init__(self, reader: HistorianReader, writer=None):
+        self.reader = reader; self.writer = writer        # writer: the live Historian, if in-process
+        self._closed: OrderedDict[tuple[int, str], tuple[HourPyramid, mmap.mmap | None]] = OrderedDict()
+        self._live: dict[tuple[int, str], HourPyramid] = {}
+        self._tags: set[str] = set()
+
+    def close(self):
+        """Drop every cached hour and close its map."""
+        while self._closed: self._evict()
+
+    def _evict(self):
+        _, (pyr, m) = self._closed.popitem(last=False); del pyr
+        if m is not None:
+            try: m.close()
+            except BufferError: pass                    # a caller still holds the pyramid; closed when freed
+
+    def _held_before(self, key: int, name: str) -> float | None:
+        pts = self.reader.raw(name, chunk_start(key), chunk_start(key))
+        return pts[0][1] if pts else None
+
+    def _build(self, key: int, name: str, pyr: HourPyramid | None = None) -> HourPyramid:
+        if pyr is None: pyr = HourPyramid(self._held_before(key, name))
+        col = self.reader._col(key, name)
+        for i in range(pyr.pos, len(col)): pyr.feed(col.t[i], float(col.v[i]))
+        pyr.pos = len(col)
+        return pyr
+
+    def hour(self, key: int, name: str, now: float | None = None) -> HourPyramid | None:
+        now = time.time() if now is None else now
+        if key > chunk_key(now): return None
+        if key == chunk_key(now):                   # open hour, held value extended to now
+            pyr = self.writer.live_pyramid(name, key) if self.writer else None
+            if pyr is None:
+                pyr = self._build(key, name, self._live.get((key, name))); self._live[(key, name)] = pyr
+            pyr.advance(int(now - chunk_start(key)))
+            return pyr
+        self._live.pop((key, name), None)
+        hit = self._closed.get((key, name))
+        if hit is not None:
+            self._closed.move_to_end((key, name)); return hit[0]
+        d = os.path.join(self.reader.root, chunk_name(key)); path = os.path.join(d, f"{name}.pyr"); m = None
+        if os.path.exists(path) and os.path.getsize(path) == HourPyramid.NBYTES:
+            with open(path, "rb") as f: m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            pyr = HourPyramid.from_buffer(m)
+        elif os.path.isdir(d):
+            pyr = self._build(key, name); pyr.advance(CHUNK_S)
+            if len(self.reader._col(key, name)): _write_atomic(path, pyr.to_bytes())
+        else:
+            return None
+        self._closed[(key, name)] = (pyr, m); self._tags.add(name)
+        while len(self._closed) > self.HOURS_PER_TAG * len(self._tags): self._evict()
+        return pyr
+
+    def columns(self, name: str, t0: float, t1: float, n: int, now: float | None = None):
+        """-> (mins, maxs), n floats each (NaN = no data) for equal columns over [t0, t1)."""
+        mins = [NAN] * n; maxs = [NAN] * n
+        if n <= 0 or t1 <= t0: return mins, maxs
+        dt = (t1 - t0) / n
+        if dt < LEVELS[0]:                          # sub-second columns: the raw points are few
+            for row in self.reader.query(name, t0, t1, n):
+                c = min(n - 1, int(round((row[0] - t0) / dt))); mins[c] = row[1]; maxs[c] = row[2]
+            return mins, maxs
+        L = max(l for l in LEVELS if l <= dt)
+        hours: dict[int, HourPyramid | None] = {}
+        for c in range(n):
+            a = t0 + c * dt; b = a + dt; lo = hi = NAN
+            while a < b:
+                key = chunk_key(a); hs = chunk_start(key)
+                if key not in hours: hours[key] = self.hour(key, name, now)
+                pyr = hours[key]; end = min(b, hs + CHUNK_S)
+                if pyr is not None:
+                    mn, mx = pyr.lv[L]
+                    for i in range(int((a - hs) // L), min(len(mn), int(math.ceil((end - hs) / L)))):
+                        v = mn[i]
+                        if v == v and not lo <= v: lo = v       # v == v skips NaN; NaN lo always loses
+                        v = mx[i]
+                        if v == v and not hi >= v: hi = v
+                a = end
+            mins[c] = lo; maxs[c] = hi
+        return mins, maxs
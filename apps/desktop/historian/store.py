@@ -0,0 +1,259 @@
+# historian/store.py — append-only hourly column files + downsampled range queries
+#
+# Layout (one directory per UTC hour, plain little-endian arrays, no headers):
+#   <root>/20261019T07/agg1.weight_kg.t     uint32  ms since the start of the hour
+#   <root>/20261019T07/agg1.weight_kg.f32   float32 value            (analog tags)
+#   <root>/20261019T07/mixer.run.u8         uint8   0/1              (boolean tags)
+# A sample is stored only when it leaves the tag's deadband or the heartbeat expires, so a flat
+# signal costs one sample per heartbeat. Reads mmap the files (no parsing, no copy); a torn append
+# after a crash is harmless because readers use min(len(t), len(value)).
+import array, bisect, calendar, mmap, os, shutil, time
+
+CHUNK_S = 3600
+KINDS = {"f32": "f", "u8": "B"}          # value column extension -> array typecode
+LEVELS = (1, 10, 60, 600)                # min/max pyramid: seconds per bucket (see historian/pyramid.py)
+NAN = float("nan")
+_DIR_FMT = "%Y%m%dT%H"
+
+def chunk_key(t: float) -> int: return int(t // CHUNK_S)
+def chunk_name(key: int) -> str: return time.strftime(_DIR_FMT, time.gmtime(key * CHUNK_S))
+def chunk_start(key: int) -> float: return key * CHUNK_S
+
+def _parse_chunk(name: str) -> int | None:
+    try: return calendar.timegm(time.strptime(name, _DIR_FMT)) // CHUNK_S
+    except ValueError: return None
+
+class HourPyramid:
+    """
+    min/max per bucket for every LEVELS entry of one tag-hour, step-hold (each bucket contains the
+    value held at its start), NaN before the first known value. Saved as <tag>.pyr: float32, per
+    level all mins then all maxs.
+    """
+    SIZES = [(L, CHUNK_S // L) for L in LEVELS]
+    NBYTES = 8 * sum(n for _, n in SIZES)
+
+    def __init__(self, held: float | None = None, levels: dict | None = None):
+        self.lv = levels or {L: (array.array("f", [NAN]) * n, array.array("f", [NAN]) * n) for L, n in self.SIZES}
+        self.held = held; self.sec = 0; self.pos = 0     # pos: raw samples consumed so far
+
+    def _touch(self, b: int, v: float):
+        for L, (mn, mx) in self.lv.items():
+            i = b // L
+            if not mn[i] <= v: mn[i] = v            # also replaces NaN
+            if not mx[i] >= v: mx[i] = v
+
+    def advance(self, sec: int):
+        """Open buckets up to `sec` (exclusive), seeding each with the held value."""
+        sec = min(int(sec), CHUNK_S)
+        if self.held is not None:
+            for b in range(self.sec, sec): self._touch(b, self.held)
+        self.sec = max(self.sec, sec)
+
+    def feed(self, ms: int, v: float):
+        b = min(CHUNK_S - 1, int(ms) // 1000)
+        self.advance(b + 1); self._touch(b, v); self.held = v
+
+    def to_bytes(self) -> bytes:
+        return b"".join(mn.tobytes() + mx.tobytes() for mn, mx in self.lv.values())
+
+    @classmethod
+    def from_buffer(cls, buf) -> "HourPyramid":
+        f = memoryview(buf).cast("f"); off = 0; lv = {}
+        for L, n in cls.SIZES:
+            lv[L] = (f[off:off + n], f[off + n:off + 2 * n]); off += 2 * n
+        p = cls(levels=lv); p.sec = CHUNK_S; return p
+
+class Historian:
+    """
+    Samples tags from a TagBus-like source (value(name), match(patterns)) at up to rate_hz.
+      tags        {"agg*.weight_kg": 0.5, "*.run": 0, ...}  name pattern -> storage deadband (numbers and
+                  on/off tags; text tags matching a pattern are skipped)
+      heartbeat_s store at least this often even when flat (trend ends stay current)
+      flush_s     buffered samples are appended to disk at this period (and on close())
+      retain_h    whole hour directories older than this are deleted
+    """
+    def __init__(self, root: str, source, tags: dict[str, float], *, rate_hz: float = 10.0,
+                 flush_s: float = 5.0, heartbeat_s: float = 60.0, retain_h: float = 168.0):
+        self.root = root; self.source = source; self.patterns = dict(tags)
+        self.min_dt = 1.0 / max(0.1, min(10.0, float(rate_hz))) * 0.9
+        self.flush_s = float(flush_s); self.heartbeat_s = float(heartbeat_s); self.retain_h = float(retain_h)
+        self._tags: dict[str, float] = {}             # resolved name -> deadband
+        self._last: dict[str, tuple[float, float]] = {}  # name -> (t, value) of the last stored sample
+        self._buf: dict[str, tuple[array.array, array.array, str]] = {}
+        self.pyramids: dict[str, HourPyramid] = {}          # open hour, fed as points are stored
+        self._key = None; self._last_sample = 0.0; self._last_flush: float | None = None
+        self.samples = 0; self.stored = 0; self.bytes = 0
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, hcfg: dict, source, base_dir: str) -> "Historian":
+        root = hcfg.get("dir", "history")
+        if not os.path.isabs(root): root = os.path.join(base_dir, root)
+        return cls(root, source, hcfg.get("tags") or {"*": 0.0}, rate_hz=hcfg.get("rate_hz", 10),
+                   flush_s=hcfg.get("flush_s", 5), heartbeat_s=hcfg.get("heartbeat_s", 60),
+                   retain_h=hcfg.get("retain_hours", 168))
+
+    # ---------- write side ----------
+    def sample(self, now: float | None = None) -> int:
+        """Take one sample of every historised tag; returns the number of points stored."""
+        now = time.time() if now is None else float(now)
+        if now - self._last_sample < self.min_dt: return 0
+        self._last_sample = now; self.samples += 1
+        found = self.source.match(self.patterns)
+        if len(found) != len(self._tags): self._tags = {n: float(self.patterns[p]) for n, p in found.items()}
+        key = chunk_key(now)
+        if key != self._key: self._roll(key, now)
+        ms = int((now - chunk_start(key)) * 1000.0)
+        n = 0
+        for name, db in self._tags.items():
+            v = self.source.value(name)
+            if not isinstance(v, (int, float)): continue      # None, or a text tag (seq.weigh, dosing.*.state)
+            kind = "u8" if isinstance(v, bool) else "f32"; fv = float(v)
+            last = self._last.get(name)
+            if last is not None and abs(fv - last[1]) <= db and (db > 0 or fv == last[1]) \
+                    and now - last[0] < self.heartbeat_s:
+                continue
+            ts, vals, _ = self._buf.get(name) or self._buf.setdefault(name, (array.array("I"), array.array(KINDS[kind]), kind))
+            ts.append(ms); vals.append(int(fv) if kind == "u8" else fv)
+            self._pyramid(name, last).feed(ms, fv)
+            self._last[name] = (now, fv); n += 1
+        self.stored += n
+        if self._last_flush is None: self._last_flush = now
+        elif now - self._last_flush >= self.flush_s: self.flush(now)
+        return n
+
+    def flush(self, now: float | None = None):
+        self._last_flush = time.time() if now is None else now
+        if not self._buf or self._key is None: self._buf.clear(); return
+        d = os.path.join(self.root, chunk_name(self._key)); os.makedirs(d, exist_ok=True)
+        for name, (ts, vals, kind) in self._buf.items():
+            if not ts: continue
+            with open(os.path.join(d, f"{name}.t"), "ab") as f: f.write(ts.tobytes())
+            with open(os.path.join(d, f"{name}.{kind}"), "ab") as f: f.write(vals.tobytes())
+            self.bytes += len(ts) * ts.itemsize + len(vals) * vals.itemsize
+        self._buf.clear()
+
+    def close(self): self.flush()
+
+    def _pyramid(self, name: str, last) -> HourPyramid:
+        pyr = self.pyramids.get(name)
+        if pyr is None:
+            # points already on disk for this hour (app restarted mid-hour) are folded in once
+            col = _Column(os.path.join(self.root, chunk_name(self._key)), name, self._key)
+            pyr = HourPyramid(None if last is None or len(col) else last[1])
+            for i in range(len(col)): pyr.feed(col.t[i], float(col.v[i]))
+            self.pyramids[name] = pyr
+        return pyr
+
+    def _roll(self, key: int, now: float):
+        """Hour boundary: flush the old hour, seal its pyramids as <tag>.pyr, start fresh ones."""
+        self.flush()
+        if self._key is not None:
+            d = os.path.join(self.root, chunk_name(self._key))
+            for name, pyr in self.pyramids.items():
+                pyr.advance(CHUNK_S)
+                if os.path.isdir(d): _write_atomic(os.path.join(d, f"{name}.pyr"), pyr.to_bytes())
+        self.pyramids = {name: HourPyramid(v) for name, (_, v) in self._last.items()}
+        self._key = key; self._prune(now)
+
+    def live_pyramid(self, name: str, key: int) -> HourPyramid | None:
+        """In-memory pyramid of the open hour (includes points not yet flushed)."""
+        return self.pyramids.get(name) if key == self._key else None
+
+    def _prune(self, now: float):
+        if self.retain_h <= 0: return
+        oldest = chunk_key(now - self.retain_h * 3600.0)
+        for name in os.listdir(self.root):
+            key = _parse_chunk(name)
+            if key is not None and key < oldest: shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+def _write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f: f.write(data)
+    os.replace(tmp, path)
+
+class _Column:
+    """mmap'd (t, value) arrays of one tag in one hour; empty when the files are missing."""
+    __slots__ = ("t", "v", "t0", "_maps")
+    def __init__(self, d: str, name: str, key: int):
+        self.t0 = chunk_start(key); self._maps = []; self.t = self.v = memoryview(b"")
+        tp = os.path.join(d, f"{name}.t")
+        for ext, code in KINDS.items():
+            vp = os.path.join(d, f"{name}.{ext}")
+            if os.path.exists(tp) and os.path.exists(vp):
+                t = self._map(tp); v = self._map(vp)
+                n = min(len(t) // 4, len(v) // array.array(code).itemsize)
+                self.t = t[:n * 4].cast("I"); self.v = v[:n * array.array(code).itemsize].cast(code)
+                break
+
+    def _map(self, path: str) -> memoryview:
+        size = os.path.getsize(path)
+        if size == 0: return memoryview(b"")
+        with open(path, "rb") as f: m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(m); return memoryview(m)
+
+    def __len__(self): return len(self.t)
+    def time(self, i: int) -> float: return self.t0 + self.t[i] / 1000.0
+
+    def index(self, t: float) -> int:
+        """First sample at or after t."""
+        return bisect.bisect_left(self.t, int((t - self.t0) * 1000.0))
+
+class HistorianReader:
+    """Read side; safe to use while a Historian appends (closed hours are cached, the open one is re-mapped)."""
+    def __init__(self, root: str):
+        self.root = root; self._cache: dict[tuple[int, str], _Column] = {}
+
+    def hours(self) -> list[int]:
+        if not os.path.isdir(self.root): return []
+        return sorted(k for k in (_parse_chunk(n) for n in os.listdir(self.root)) if k is not None)
+
+    def tags(self) -> list[str]:
+        out = set()
+        for k in self.hours():
+            for f in os.listdir(os.path.join(self.root, chunk_name(k))):
+                if f.endswith(".t"): out.add(f[:-2])
+        return sorted(out)
+
+    def _col(self, key: int, name: str) -> _Column:
+        live = key >= chunk_key(time.time())
+        col = None if live else self._cache.get((key, name))
+        if col is None:
+            col = _Column(os.path.join(self.root, chunk_name(key)), name, key)
+            if not live: self._cache[(key, name)] = col
+        return col
+
+    def raw(self, name: str, t0: float, t1: float) -> list[tuple[float, float]]:
+        """Stored points in [t0, t1), preceded by the last point before t0 (the value held at t0)."""
+        out: list[tuple[float, float]] = []
+        hours = self.hours()
+        before = [k for k in hours if k < chunk_key(t0)]
+        held = None
+        for k in [chunk_key(t0)] + before[::-1]:       # find the held value, newest hour first
+            c = self._col(k, name); i = c.index(t0) if k == chunk_key(t0) else len(c)
+            if i > 0: held = (c.time(i - 1), float(c.v[i - 1])); break
+        if held: out.append(held)
+        for k in (h for h in hours if chunk_key(t0) <= h <= chunk_key(t1)):
+            c = self._col(k, name)
+            i = c.index(t0) if k == chunk_key(t0) else 0
+            j = c.index(t1) if k == chunk_key(t1) else len(c)
+            out.extend((c.time(x), float(c.v[x])) for x in range(i, j))
+        return out
+
+    def query(self, name: str, t0: float, t1: float, buckets: int = 500) -> list[tuple[float, float, float, float]]:
+        """
+        [(bucket_start, min, max, last)] over `buckets` equal slices of [t0, t1), step-hold between
+        stored points (a bucket with no new point repeats the held value). Empty before the first point.
+        """
+        pts = self.raw(name, t0, t1)
+        if not pts or buckets <= 0 or t1 <= t0: return []
+        dt = (t1 - t0) / buckets; out = []; j = 0; held = None
+        if pts[0][0] < t0: held = pts[0][1]; j = 1
+        for b in range(buckets):
+            bs = t0 + b * dt; be = bs + dt
+            lo = hi = held
+            while j < len(pts) and pts[j][0] < be:
+                v = pts[j][1]; lo = v if lo is None else min(lo, v); hi = v if hi is None else max(hi, v)
+                held = v; j += 1
+            if held is not None: out.append((bs, lo, hi, held))
+        return out
@@ -0,0 +1,78 @@
+# ingredients.py — the plant's weighed ingredients as parallel arrays + the material registry shared with the API (no Qt)
+import json, os
+from array import array
+from dataclasses import dataclass
+
+# apps/ingredients.json: one list of materials for the desktop and the office API
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ingredients.json")
+KINDS = ("aggregate", "binder", "water", "admixture")
+
+@dataclass(frozen=True)
+class Ingredient:
+    """One weigh hopper's ingredient. name is the plant name (Agg1.., Cement, Water, Admix) used by
+    targets, dosing and the batch log; prefix is its bus tag prefix (<prefix>.weight_kg, <prefix>.gate_open)."""
+    name: str
+    label: str
+    prefix: str
+    kind: str                          # one of KINDS; aggregates go over the belt
+    target_kg: float
+    capacity_kg: float
+    feed_tag: str | None = None        # drive filling the hopper outside dosing (screw/pump), stopped at capacity
+    material: str | None = None        # registry key the API books the actuals under (None: not in the registry)
+
+    @property
+    def weight_tag(self) -> str: return f"{self.prefix}.weight_kg"
+
+    @property
+    def gate_tag(self) -> str: return f"{self.prefix}.gate_open"
+
+def load_registry(path: str = REGISTRY_PATH) -> list[dict]:
+    """[{key, label, kind, plant: [names]}] in display order; [] when the file is not deployed."""
+    try:
+        with open(path, "r", encoding="utf-8") as f: return list(json.load(f).get("materials") or [])
+    except FileNotFoundError:
+        return []
+
+def material_keys(registry: list[dict]) -> dict[str, str]:
+    """Plant ingredient name (lower case) -> registry key."""
+    return {n.lower(): m["key"] for m in registry for n in (m.get("plant") or [m["key"]])}
+
+class IngredientTable:
+    """
+    Per-ingredient state as parallel arrays (index i is items[i]), so loops run over indices and
+    a plant with six aggregates or a second binder is only longer arrays:
+      target, cap, actual   array('d') in kg; sample(get) refreshes actual from the bus in one pass
+      fed                   indices with a feed drive (stopped at FULL of capacity: interlocks.hopper_rules)
+    """
+    FULL = 0.995
+
+    def __init__(self, items):
+        self.items = tuple(items)
+        self.names = tuple(i.name for i in self.items); self.tags = tuple(i.weight_tag for i in self.items)
+        self.index = {n: k for k, n in enumerate(self.names)}
+        self.target = array("d", (i.target_kg for i in self.items))
+        self.cap = array("d", (i.capacity_kg for i in self.items))
+        self.actual = array("d", bytes(8 * len(self.items)))
+        self.fed = tuple(k for k, i in enumerate(self.items) if i.feed_tag)
+
+    def __len__(self) -> int: return len(self.items)
+
+    def of_kind(self, *kinds: str) -> tuple[int, ...]:
+        return tuple(k for k, i in enumerate(self.items) if i.kind in kinds)
+
+    def sample(self, get) -> array:
+        """actual[i] = get(tags[i], 0.0) for every ingredient (bus.value: latest, bus.shown: displayed)."""
+        self.actual = array("d", [float(get(t, 0.0)) for t in self.tags]); return self.actual
+
+    def targets(self) -> dict[str, float]:
+        return dict(zip(self.names, self.target))
+
+    def rows(self) -> list[tuple[str, str, float]]:
+        """(name, weight tag, target kg) per ingredient, config order."""
+        return list(zip(self.names, self.tags, self.target))
+
+    def batch_items(self, actuals: dict[str, float] | None = None) -> list[tuple[str, float, float]]:
+        """(name, target, actual) for a BatchRecord; actuals overrides the sampled values by name."""
+        a = self.actual
+        return [(n, t, float(actuals[n]) if actuals and n in actuals else a[k])
+                for k, (n, t) in enumerate(zip(self.names, self.target))]
@@ -0,0 +1,217 @@
+# interlocks.py — declarative interlock rules compiled into a dependency-indexed table, with a trip audit (no Qt)
+#
+# A rule forces tags for as long as all of its conditions hold:
+#   {"name": "Agg{n} gate needs the belt", "when": ["agg{n}.gate_open", "!belt.run"], "force": {"agg{n}.gate_open": false}}
+#   conditions: "tag" (on), "!tag" (off) or "tag OP value", OP one of >= > <= < == != and value a number,
+#   true or false; "{n}" repeats the rule for every aggregate hopper (agg1..aggN), as in the dosing feeders.
+# The rules are compiled once into flat arrays (tag, operator and constant per condition, a condition range
+# and the forced values per rule) and indexed by every tag a rule reads or forces. evaluate() re-checks only
+# the rules whose tags changed since the last call (TagBus.watch: latest values, not the deadbanded display).
+# A rule that has to force a tag is a trip: counted per rule, kept in `audit` and appended as a JSON line to
+# the audit file by a background thread.
+import json, operator, os, re, sys, time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from queue import SimpleQueue
+from writer_thread import WriterThread
+
+OPS = {">=": operator.ge, ">": operator.gt, "<=": operator.le, "<": operator.lt, "==": operator.eq, "!=": operator.ne}
+_COND = re.compile(r"^\s*(!?)\s*([A-Za-z_][\w.\-{}]*)\s*(?:(>=|<=|==|!=|>|<)\s*(\S+))?\s*$")
+
+class RuleError(ValueError):
+    """A rule that cannot be compiled (the message names the rule and what is wrong)."""
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    when: tuple[tuple[str, str, object], ...]      # (tag, op, constant); bool constants compare bool(value)
+    force: tuple[tuple[str, object], ...]          # (tag, value) published while `when` holds
+
+def _const(text: str):
+    low = text.lower()
+    if low in ("true", "on"): return True
+    if low in ("false", "off"): return False
+    try: return float(text)
+    except ValueError: raise RuleError(f"{text!r} is not a number, true or false") from None
+
+def parse_condition(text) -> tuple[str, str, object]:
+    m = _COND.match(text) if isinstance(text, str) else None
+    if not m: raise RuleError(f"condition {text!r}: expected 'tag', '!tag' or 'tag OP value'")
+    neg, tag, op, val = m.groups()
+    if op is None: return tag, "==", not neg
+    if neg: raise RuleError(f"condition {text!r}: '!' only goes before a bare tag")
+    k = _const(val)
+    if isinstance(k, bool):
+        if op not in ("==", "!="): raise RuleError(f"condition {text!r}: on/off tags compare with == or !=")
+        return tag, "==", k if op == "==" else not k
+    return tag, op, k
+
+def parse_rule(d: dict, n_aggs: int = 0) -> list[Rule]:
+    """One config rule -> Rule(s); a rule mentioning {n} becomes one rule per aggregate hopper."""
+    if not isinstance(d, dict): raise RuleError(f"expected an object, got {d!r}")
+    name = d.get("name")
+    if not isinstance(name, str) or not name: raise RuleError("rule without a name")
+    when = d.get("when"); force = d.get("force")
+    if isinstance(when, str): when = [when]
+    if not isinstance(when, list) or not when: raise RuleError(f"{name}: 'when' must list at least one condition")
+    if not isinstance(force, dict) or not force: raise RuleError(f"{name}: 'force' must map at least one tag to a value")
+    try:
+        conds = [parse_condition(c) for c in when]
+        acts = [(t, v if isinstance(v, bool) else _const(str(v))) for t, v in force.items()]
+    except RuleError as e:
+        raise RuleError(f"{name}: {e}") from None
+    templated = "{n}" in json.dumps(d)
+    out = []
+    for n in (range(1, n_aggs + 1) if templated else (None,)):
+        f = (lambda s: s.replace("{n}", str(n))) if n else (lambda s: s)
+        out.append(Rule(f(name), tuple((f(t), op, k) for t, op, k in conds), tuple((f(t), v) for t, v in acts)))
+    return out
+
+def hopper_rules(ingr) -> list[Rule]:
+    """The built-in rule per fed hopper: its screw/pump stops at IngredientTable.FULL of the capacity."""
+    return [Rule(f"{g.name} hopper full", ((g.weight_tag, ">=", ingr.cap[k] * ingr.FULL), (g.feed_tag, "==", True)),
+                 ((g.feed_tag, False),)) for k, g in ((k, ingr.items[k]) for k in ingr.fed)]
+
+def compile_rules(icfg: dict | None, ingr=None, n_aggs: int = 0) -> list[Rule]:
+    """Config rules (after the built-in full-hopper rules unless "hopper_full": false); raises RuleError."""
+    icfg = icfg or {}
+    rules = hopper_rules(ingr) if ingr is not None and icfg.get("hopper_full", True) else []
+    for d in icfg.get("rules") or []: rules += parse_rule(d, n_aggs)
+    seen = set()
+    for r in rules:
+        if r.name in seen: raise RuleError(f"{r.name}: rule name used twice")
+        seen.add(r.name)
+    return rules
+
+class RuleTable:
+    """
+    The rules as parallel arrays: condition c reads tags[c_tag[c]] and holds when c_op[c](value, c_k[c])
+    (c_op None: bool(value) == c_k[c]); rule r owns conditions c_at[r]:c_at[r+1] and forces force[r].
+    deps[tag] lists the rules that read or force the tag, in config order.
+    """
+    def __init__(self, rules: list[Rule]):
+        self.rules = tuple(rules)
+        self.tags = tuple(sorted({t for r in rules for t, _, _ in r.when} | {t for r in rules for t, _ in r.force}))
+        tid = {t: i for i, t in enumerate(self.tags)}
+        self.c_tag = array("i"); self.c_op: list = []; self.c_k: list = []; self.c_at = array("i", [0])
+        for r in rules:
+            for t, op, k in r.when:
+                self.c_tag.append(tid[t]); self.c_op.append(None if isinstance(k, bool) else OPS[op]); self.c_k.append(k)
+            self.c_at.append(len(self.c_tag))
+        self.force = tuple(r.force for r in rules)
+        deps: dict[str, list[int]] = {}
+        for i, r in enumerate(rules):
+            for t in dict.fromkeys([t for t, _, _ in r.when] + [t for t, _ in r.force]): deps.setdefault(t, []).append(i)
+        self.deps = {t: tuple(v) for t, v in deps.items()}
+
+    def holds(self, r: int, get) -> bool:
+        tags = self.tags; c_tag = self.c_tag; c_op = self.c_op; c_k = self.c_k
+        for c in range(self.c_at[r], self.c_at[r + 1]):
+            v = get(tags[c_tag[c]]); op = c_op[c]
+            if op is None:
+                if bool(v) is not c_k[c]: return False
+            elif v is None or v.__class__ is str or not op(v, c_k[c]): return False
+        return True
+
+    def inputs(self, r: int, get) -> dict:
+        return {self.tags[self.c_tag[c]]: get(self.tags[self.c_tag[c]]) for c in range(self.c_at[r], self.c_at[r + 1])}
+
+class InterlockEngine:
+    """
+    evaluate() (every plant tick) re-checks the rules whose tags changed; a rule that holds publishes its
+    forced values that differ from the bus. Its own publishes mark those rules again, so the next call
+    confirms them (no trip). full=True checks every rule (the benchmark's baseline).
+      stats: trips, per_rule (trips by rule name), evaluated (rule checks), audit (last `keep` trips)
+    """
+    def __init__(self, bus, rules: list[Rule], *, audit_path: str | None = None, keep: int = 500):
+        self.bus = bus; self.table = RuleTable(rules)
+        self._dirty = bus.watch(self.table.tags); self._dirty.update(self.table.tags)   # first call checks all
+        self.trips = 0; self.evaluated = 0; self.per_rule = [0] * len(self.table.rules)
+        self.audit: deque[dict] = deque(maxlen=keep)
+        self.writer = AuditWriter(audit_path) if audit_path else None
+
+    @classmethod
+    def from_config(cls, icfg: dict | None, bus, ingr=None, *, n_aggs: int = 0, base_dir: str | None = None) -> "InterlockEngine":
+        icfg = icfg or {}; path = icfg.get("audit", "interlocks.log") if base_dir else ""
+        if path and not os.path.isabs(path): path = os.path.join(base_dir, path)
+        return cls(bus, compile_rules(icfg, ingr, n_aggs), audit_path=path or None, keep=int(icfg.get("keep", 500)))
+
+    def start(self):
+        if self.writer and not self.writer.is_alive(): self.writer.start()
+
+    def evaluate(self, now: float | None = None, *, full: bool = False) -> int:
+        """Check the rules whose tags changed (all with full=True); returns the number of trips."""
+        t = self.table; dirty = self._dirty
+        if full: todo = range(len(t.rules)); dirty.clear()
+        elif not dirty: return 0
+        else:
+            deps = t.deps; marked = set()
+            for name in dirty: marked.update(deps[name])
+            dirty.clear(); todo = sorted(marked)
+        get = self.bus.value; publish = self.bus.publish; force = t.force; tripped = 0
+        self.evaluated += len(todo)
+        for r in todo:
+            if not t.holds(r, get): continue
+            forced = [(tag, v) for tag, v in force[r] if get(tag) != v]
+            if not forced: continue
+            entry = {"t": time.time() if now is None else now, "rule": t.rules[r].name, "inputs": t.inputs(r, get),
+                     "forced": dict(forced)}
+            for tag, v in forced: publish(tag, v)
+            tripped += 1; self.per_rule[r] += 1; self.audit.append(entry)
+            if self.writer: self.writer.submit(entry)
+        self.trips += tripped
+        return tripped
+
+    def stats(self) -> dict:
+        return {"rules": len(self.table.rules), "tags": len(self.table.tags), "trips": self.trips,
+                "evaluated": self.evaluated, "per_rule": {r.name: n for r, n in zip(self.table.rules, self.per_rule) if n}}
+
+    def close(self):
+        if self.writer: self.writer.close()
+
+class AuditWriter(WriterThread):
+    """Appends trip entries as JSON lines (flushed per line) so the plant tick never waits on the disk."""
+    def __init__(self, path: str):
+        super().__init__("interlock-audit")
+        self.path = path; self._q: SimpleQueue = SimpleQueue(); self.written = 0; self.errors = 0
+
+    def submit(self, entry: dict): self._q.put(entry)
+
+    def _signal_stop(self): self._q.put(None)
+
+    def _has_pending(self) -> bool: return not self._q.empty()
+
+    def run(self):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                while (e := self._q.get()) is not None:
+                    f.write(json.dumps(e, separators=(",", ":")) + "\n"); f.flush(); self.written += 1
+        except OSError:
+            self.errors += 1
+
+def read_audit(path: str, last: int = 20) -> list[dict]:
+    """The last `last` trips in the audit file (oldest first)."""
+    try:
+        with open(path, encoding="utf-8") as f: lines = deque(f, maxlen=last)
+    except FileNotFoundError:
+        return []
+    return [json.loads(l) for l in lines if l.strip()]
+
+if __name__ == "__main__":      # python interlocks.py [config.json]: the compiled rules and the latest trips
+    app = os.path.dirname(os.path.abspath(__file__))
+    from plant_config import ConfigError, check_file
+    from ingredients import IngredientTable
+    p = sys.argv[1] if len(sys.argv) > 1 else os.path.join(app, "config.json")
+    try: pc = check_file(p)
+    except ConfigError as e: sys.exit(f"{p}: {len(e.errors)} problem(s)\n  " + "\n  ".join(e.errors))
+    icfg = pc.raw.get("interlocks") or {}
+    table = RuleTable(compile_rules(icfg, IngredientTable(pc.ingredients), len(pc.hoppers)))
+    print(f"{len(table.rules)} rules over {len(table.tags)} tags")
+    cond = lambda t, op, k: (t if k else "!" + t) if isinstance(k, bool) else f"{t} {op} {k:g}"
+    for r in table.rules:
+        print(f"  {r.name:<28} when {' and '.join(cond(*c) for c in r.when)}"
+              f"  ->  {', '.join(f'{t} = {v}' for t, v in r.force)}")
+    audit = icfg.get("audit", "interlocks.log")
+    for e in read_audit(audit if os.path.isabs(audit) else os.path.join(app, audit)):
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['t']))}  {e['rule']}  {e['inputs']}  -> {e['forced']}")
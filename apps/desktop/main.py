@@ -1,17 +1,17 @@
 ﻿# main.py — FINAL (Cement + Water + Admixture; Pump→Hopper pipes; dynamic steel pipe; PLC-ready stubs)
-import os, json, csv
-from datetime import datetime
+import os, json, time
+STARTUP: list[tuple[str, float]] = [("start", time.perf_counter())]   # phase marks for --startup-time
 
-from PySide6.QtCore import Qt, QTimer, QPointF
+from PySide6.QtCore import Qt, QTimer, QPointF, QRectF, QObject, QEvent
 from PySide6.QtGui import QPainter
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QGraphicsScene, QFrame,
     QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QRadioButton, QButtonGroup,
-    QProgressBar, QSizePolicy
+    QProgressBar, QSizePolicy, QSplitter
 )
 
 # ---------- SAFE MODE SWITCH ----------
-USE_SPRITES = False  # keep False (no PNG/SVG); you can enable later
+USE_SPRITES = False  # keep False (no PNG/SVG); sprite modules are imported where used, only when this is on
 
 # ---------- THEME FALLBACK ----------
 # If you have theme.py with GREY_TEXT (QColor), this will use it; otherwise it falls back to hex.
@@ -21,17 +21,38 @@ try:
 except Exception:
     GREY_TEXT_CSS = "#9AA4AF"
 
-# ---------- PLC (FX5U) STUBS ----------
+# ---------- PLC (FX5U) I/O ----------
+# Reads come from the scanner's snapshot cache and writes are queued (change-only), so neither
+# touches the network on the GUI thread. `addr` may be a tag name from config.json or a raw address.
+PLC = None  # plc.worker.PlcWorker (or plc.scanner.PlcScanner), started by start_plc() when cfg["plc"]["enabled"]
+
+def _plc_tag(addr: str):
+    if PLC is None: return None
+    return addr if addr in PLC.table else getattr(PLC.table.by_addr(addr), "name", None)
+
 def plc_read_real(addr: str) -> float:
-    """TODO: replace with MC-Protocol read."""
-    return 0.0
+    name = _plc_tag(addr)
+    return float(PLC.get(name, 0.0) or 0.0) if name else 0.0
 
 def plc_write_real(addr: str, value: float):
-    """TODO: replace with MC-Protocol write."""
-    pass
+    name = _plc_tag(addr)
+    if name: PLC.write(name, value)
+
+def start_plc(cfg: dict):
+    global PLC
+    pcfg = cfg.get("plc") or {}
+    if not pcfg.get("enabled") or PLC is not None: return PLC
+    if pcfg.get("client", "asyncio") == "asyncio":
+        from plc.worker import PlcWorker      # needs the QApplication: snapshots arrive as queued signals
+        PLC = PlcWorker.from_config(pcfg)
+    else:
+        from plc.scanner import PlcScanner
+        PLC = PlcScanner.from_config(pcfg)
+    PLC.start()
+    return PLC
 
 from contracts import SiloLike, MixerLike
-from components.plant_view import PlantView
+from components.plant_view import PlantView, on_screen
 from components.silo import Silo
 from components.mixer import Mixer
 from components.agg_hopper import AggHopper
@@ -40,6 +61,11 @@ from components.belt_conveyor import BeltConveyor
 from components.cement_hopper import CementHopper
 from components.flow_connector import FlowConnectorItem
 from components.motor_badge import MotorBadge
+from ui_model import StatusModel
+from tagbus import TagBus
+from runtime.plant import Plant, TICK_S
+from plant_config import PlantConfig, ConfigError, compile_config
+# batchlog (sqlite), historian, mirror, control, plc, the alarm journal and the trend/alarm panels are imported when first used
 
 # Explicit classes for water/admixture visuals (code-only, no images)
 from components.water_hopper import WaterHopper
@@ -47,111 +73,116 @@ from components.admixture_hopper import AdmixtureHopper
 from components.water_pump import WaterPump
 from components.admixture_pump import AdmixturePump
 
-# (Sprites optional — not used when USE_SPRITES=False)
-if USE_SPRITES:
-    try:
-        from components.image_items import ScrewMotor, PipeStrip, PixmapItem
-        from components.sprite_pipe import SpritePipe
-    except Exception:
-        USE_SPRITES = False
+STARTUP.append(("imports", time.perf_counter()))
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(APP_DIR, "config.json")
-BATCH_LOG = os.path.join(APP_DIR, "batches.csv")
 
 def load_config():
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def ensure_csv_header(path):
-    header = [
-        "BatchTime","Recipe",
-        "Agg1_Target","Agg1_Actual","Agg1_VarPct",
-        "Agg2_Target","Agg2_Actual","Agg2_VarPct",
-        "Agg3_Target","Agg3_Actual","Agg3_VarPct",
-        "Agg4_Target","Agg4_Actual","Agg4_VarPct",
-        "Total_Target","Total_Actual","Total_VarPct"
-    ]
-    if not os.path.exists(path) or os.path.getsize(path) == 0:
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(header)
+class _FirstFrame(QObject):
+    """Calls fn() once, right after the first paint of the watched widget."""
+    def __init__(self, widget, fn):
+        super().__init__(widget); self.fn = fn; widget.installEventFilter(self)
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.Paint and self.fn:
+            fn, self.fn = self.fn, None; obj.removeEventFilter(self); QTimer.singleShot(0, fn)
+        return False
+
+class _BusTag:
+    """MainWindow attribute backed by a TagBus tag: reads the latest value, assignment publishes."""
+    def __init__(self, name: str, default):
+        self.name = name; self.default = default
+    def __get__(self, win, owner=None):
+        return self if win is None else win.bus.value(self.name, self.default)
+    def __set__(self, win, value):
+        win.bus.publish(self.name, value)
 
 class MainWindow(QMainWindow):
-    def __init__(self, cfg):
+    cement_screw_running = _BusTag("cement_screw.run", False)
+    water_pump_running   = _BusTag("water_pump.run", False)
+    admix_pump_running   = _BusTag("admix_pump.run", False)
+    water_tank_kg        = _BusTag("water_tank.kg", 0.0)
+    admix_tank_kg        = _BusTag("admix_tank.kg", 0.0)
+    active_feeder        = _BusTag("feeder.active", 1)
+
+    def __init__(self, cfg, pc: PlantConfig | None = None, *, restore: bool = True):
         super().__init__()
         self.cfg = cfg
+        self.pc = pc = pc or compile_config(cfg)       # typed + validated (raises ConfigError)
+        # every displayed value flows through the bus; widgets subscribe to the tags they show
+        self.bus = TagBus.from_config(cfg)
         self.setWindowTitle("RMC Plant — Cement/Water/Admixture (Pump→Hopper)")
         self.setStyleSheet("QMainWindow { background: #1E2024; color: #EAECEE; }")
 
-        # targets
-        tcfg = cfg.get("targets", {})
-        self.t_agg = [
-            float(tcfg.get("Agg1", 600)),
-            float(tcfg.get("Agg2", 500)),
-            float(tcfg.get("Agg3", 400)),
-            float(tcfg.get("Agg4", 300)),
-        ]
-        self.t_total = float(tcfg.get("Total", sum(self.t_agg)))
-        self.recipe = cfg.get("recipe", "Default")
+        # plant logic without drawing (sources, interlocks, local sim, dosing, records): runtime.Plant, also run headless
+        self.plant = Plant(pc, self.bus, base_dir=APP_DIR)
+        # weighed ingredients: targets, capacities and actuals as arrays (aggregates first, in hopper order)
+        self.ingr = self.plant.ingr; self.t_total = pc.t_total; self.recipe = pc.recipe
+        src = self.plant.sources()
 
         # central + scene/view
         central = QFrame(); central.setStyleSheet("QFrame { background:#1E2024; }")
         self.setCentralWidget(central)
         self.scene = QGraphicsScene(self); self.scene.setSceneRect(-3600, -1800, 7200, 3600)
-        self.view  = PlantView(self.scene)
-        flags = cfg.get("flags", {"draggable": True})
+        self.view  = PlantView(self.scene, accelerated=pc.view.accelerated, update_mode=pc.view.update_mode,
+                               antialias=pc.view.antialias, lod=pc.view.lod)
+        drag = pc.draggable
 
         # Mixer
-        self.mixer: MixerLike = Mixer(draggable=flags["draggable"])
-        self.mixer.setPos(*cfg["layout"]["mixer_pos"]); self.scene.addItem(self.mixer)
+        self.mixer: MixerLike = Mixer(draggable=drag)
+        self.mixer.setPos(*pc.mixer_pos); self.scene.addItem(self.mixer)
+        self.mixer.bind(self.bus, "mixer")
 
         # Cement silos (list)
         self.silos: list[SiloLike] = []
-        for s in cfg.get("silos", []):
-            silo = Silo(draggable=flags["draggable"])
-            silo.setPos(*s["pos"]); self.scene.addItem(silo); self.silos.append(silo)
+        for s in pc.silos:
+            silo = Silo(draggable=drag)
+            silo.setPos(*s.pos); self.scene.addItem(silo); self.silos.append(silo)
+            n = len(self.silos); silo.bind(self.bus, f"silo{n}")
+            self.bus.publish(f"silo{n}.level_pct", silo.get_percent()); self.bus.publish(f"silo{n}.run", False)
         self.active_feeder = 1
 
         # Aggregate hoppers
         self.hoppers: list[AggHopper] = []
-        for i, h in enumerate(cfg.get("hoppers", []), start=1):
-            hp = AggHopper(draggable=flags["draggable"])
-            if hasattr(hp, "set_title"): hp.set_title(h.get("name", f"Agg {i}"))
-            if hasattr(hp, "set_capacity_kg"): hp.set_capacity_kg(h.get("capacity_kg", 1500))
-            hp.setPos(*h["pos"]); self.scene.addItem(hp); self.hoppers.append(hp)
+        for i, h in enumerate(pc.hoppers, start=1):
+            hp = AggHopper(draggable=drag)
+            if hasattr(hp, "set_title"): hp.set_title(h.name)
+            if hasattr(hp, "set_capacity_kg"): hp.set_capacity_kg(h.capacity_kg)
+            hp.setPos(*h.pos); self.scene.addItem(hp); self.hoppers.append(hp)
+            hp.bind(self.bus, f"agg{i}"); self.bus.publish(f"agg{i}.weight_kg", hp.get_weight_kg())
 
         # Cement Weigh Hopper
         self.cement_hopper: CementHopper | None = None
-        ch = cfg.get("cement_hopper")
+        ch = pc.cement_hopper
         if ch:
-            self.cement_hopper = CementHopper(
-                capacity_kg=ch.get("capacity_kg", 500.0),
-                title=ch.get("name","Cement Weigh Hopper"),
-                draggable=flags["draggable"],
-            )
-            self.cement_hopper.setPos(*ch.get("pos",[560,-40])); self.scene.addItem(self.cement_hopper)
+            self.cement_hopper = CementHopper(capacity_kg=ch.capacity_kg, title=ch.name, draggable=drag)
+            self.cement_hopper.setPos(*ch.pos); self.scene.addItem(self.cement_hopper)
+            self.cement_hopper.bind(self.bus, "cement_hopper")
 
         # Collector + Belt
         self.collector: CollectingHopper | None = None
         self.belt: BeltConveyor | None = None
-        col = cfg.get("collector")
+        col = pc.collector
         if col:
-            self.collector = CollectingHopper(w=1500, h=260, draggable=flags["draggable"])
-            if hasattr(self.collector, "set_title"): self.collector.set_title(col.get("name","Collecting Hopper"))
-            if hasattr(self.collector, "set_capacity_kg"): self.collector.set_capacity_kg(col.get("capacity_kg",6000))
-            self.collector.setPos(*col["pos"]); self.scene.addItem(self.collector)
+            self.collector = CollectingHopper(w=1500, h=260, draggable=drag)
+            if hasattr(self.collector, "set_title"): self.collector.set_title(col.name)
+            if hasattr(self.collector, "set_capacity_kg"): self.collector.set_capacity_kg(col.capacity_kg)
+            self.collector.setPos(*col.pos); self.scene.addItem(self.collector)
 
             labels = [getattr(hp,"_title",f"Agg {i+1}") for i,hp in enumerate(self.hoppers)]
             if hasattr(self.collector, "set_segment_labels"): self.collector.set_segment_labels(labels)
+            self.collector.bind(self.bus, [f"agg{i+1}" for i in range(len(self.hoppers))])
+            if self.hoppers: self.collector.set_active_segment(max(0, min(len(self.hoppers)-1, self.active_feeder-1)))
 
-            belt_cfg = cfg.get("belt", {})
-            self.belt = BeltConveyor(length_px=self.collector.w,
-                                     belt_h=float(belt_cfg.get("height", 28)),
-                                     draggable=flags["draggable"])
-            self.belt.set_speed(float(belt_cfg.get("speed", 3.0)))
-            self.belt.set_direction(str(belt_cfg.get("direction","right")).lower())
+            bc = pc.belt
+            self.belt = BeltConveyor(length_px=self.collector.w, belt_h=bc.height, draggable=drag)
+            self.belt.set_speed(bc.speed); self.belt.set_direction(bc.direction)
             cx, cy = self.collector.pos().x(), self.collector.pos().y()
-            self.belt.setPos(cx, cy + float(belt_cfg.get("offset_y", 110)))
+            self.belt.setPos(cx, cy + bc.offset_y)
+            self.belt.set_length(self.collector.w)
             self.belt.start(); self.scene.addItem(self.belt)
 
         # -------------------- Runtime states --------------------
@@ -160,116 +191,116 @@ class MainWindow(QMainWindow):
         self.admix_pump_running   = False
 
         # Virtual source tanks (for pump→hopper flow; replace with FX5U later)
-        self.water_tank_capacity_kg = float(self.cfg.get("water_tank_capacity_kg", 1000.0))
-        self.water_tank_kg          = float(self.cfg.get("water_tank_start_kg", 800.0))
-        self.admix_tank_capacity_kg = float(self.cfg.get("admixture_tank_capacity_kg", 200.0))
-        self.admix_tank_kg          = float(self.cfg.get("admixture_tank_start_kg", 160.0))
+        self.water_tank_capacity_kg, self.water_tank_kg = pc.water_tank
+        self.admix_tank_capacity_kg, self.admix_tank_kg = pc.admix_tank
 
         # -------------------- Water & Admixture Hoppers --------------------
         self.water_hopper = None; self.admix_hopper = None
-        wh = cfg.get("water_hopper"); ah = cfg.get("admixture_hopper")
+        wh = pc.water_hopper; ah = pc.admix_hopper
         if wh:
-            self.water_hopper = WaterHopper(
-                capacity_kg=wh.get("capacity_kg", 100),
-                title=wh.get("name","Water Weigh Hopper"), draggable=flags["draggable"])
-            self.water_hopper.setPos(*wh.get("pos", [1160, -120])); self.scene.addItem(self.water_hopper)
+            self.water_hopper = WaterHopper(capacity_kg=wh.capacity_kg, title=wh.name, draggable=drag)
+            self.water_hopper.setPos(*wh.pos); self.scene.addItem(self.water_hopper)
+            self.water_hopper.bind(self.bus, "water_hopper")
         if ah:
-            self.admix_hopper = AdmixtureHopper(
-                capacity_kg=ah.get("capacity_kg", 10),
-                title=ah.get("name","Admixture Weigh Hopper"), draggable=flags["draggable"])
-            self.admix_hopper.setPos(*ah.get("pos", [1160, 120])); self.scene.addItem(self.admix_hopper)
+            self.admix_hopper = AdmixtureHopper(capacity_kg=ah.capacity_kg, title=ah.name, draggable=drag)
+            self.admix_hopper.setPos(*ah.pos); self.scene.addItem(self.admix_hopper)
+            self.admix_hopper.bind(self.bus, "admix_hopper")
 
-        # -------------------- Pumps (code visuals) --------------------
+        for name, h in (("cement_hopper", self.cement_hopper), ("water_hopper", self.water_hopper),
+                        ("admix_hopper", self.admix_hopper)):
+            if h: self.bus.publish(f"{name}.weight_kg", h.get_weight_kg())
+        self.bus.publish("mixer.run", False); self.bus.publish("mixer.gate_open", False)
+
+        # -------------------- Pumps (code visuals) — only for hoppers this plant has --------------------
         self.water_pump = None; self.admix_pump = None
-        wp_pos = self.cfg.get("water_pump", {}).get("pos", [900, -60])
-        ap_pos = self.cfg.get("admixture_pump", {}).get("pos", [900, 200])
-        self.water_pump = WaterPump(draggable=True); self.water_pump.setPos(*wp_pos); self.scene.addItem(self.water_pump)
-        self.admix_pump = AdmixturePump(draggable=True); self.admix_pump.setPos(*ap_pos); self.scene.addItem(self.admix_pump)
+        if self.water_hopper:
+            self.water_pump = WaterPump(draggable=True); self.water_pump.setPos(*pc.water_pump_pos); self.scene.addItem(self.water_pump)
+        if self.admix_hopper:
+            self.admix_pump = AdmixturePump(draggable=True); self.admix_pump.setPos(*pc.admix_pump_pos); self.scene.addItem(self.admix_pump)
 
         # -------------------- Cement: Silo[0] → Hopper (unchanged) --------------------
         self.cement_pipe: FlowConnectorItem | None = None
         self.cement_outlet_badge: MotorBadge | None = None
         if self.silos and self.cement_hopper:
             cement_silo = self.silos[0]
-            silo_cap = float(self.cfg.get("cement_silo_capacity_kg", 20000.0))
-            get_src_kg = lambda: max(0.0, min(100.0, cement_silo.get_percent())) * silo_cap / 100.0
-            def set_src_kg(v_kg): cement_silo.set_percent(0 if silo_cap<=0 else max(0,min(100,(v_kg/silo_cap)*100)))
-            get_dst_kg = self.cement_hopper.get_weight_kg
-            def set_dst_kg(v_kg): self.cement_hopper.set_weight_kg(max(0,min(self.cement_hopper.get_capacity_kg(), v_kg)))
-            pipe_cfg = self.cfg.get("cement_pipe", {})
+            silo_cap = pc.cement_silo_kg
+            bus = self.bus
+            get_src_kg, set_src_kg = src["Cement"]
+            get_dst_kg = lambda: bus.value("cement_hopper.weight_kg", 0.0)
+            def set_dst_kg(v_kg): bus.publish("cement_hopper.weight_kg", max(0,min(self.cement_hopper.get_capacity_kg(), v_kg)))
+            pp = pc.cement_pipe
             self.cement_pipe = FlowConnectorItem(
                 cement_silo, cement_silo.pipe_origin_scene,
                 self.cement_hopper, self.cement_hopper.inlet_scene,
                 get_src_kg, set_src_kg, get_dst_kg, set_dst_kg,
                 enabled_fn=lambda: self.cement_screw_running,
-                rate_kgps=float(pipe_cfg.get("rate_kgps", 22.5)),
-                src_capacity_kg=silo_cap,
+                rate_kgps=pp.rate_kgps, src_capacity_kg=silo_cap,
                 dst_capacity_kg=self.cement_hopper.get_capacity_kg(),
-                shape=pipe_cfg.get("shape","L"),
-                z=-1.0, diameter_px=int(pipe_cfg.get("diameter_px",18)), wall_px=int(pipe_cfg.get("wall_px",2))
+                shape=pp.shape, z=-1.0, diameter_px=pp.diameter_px, wall_px=pp.wall_px
             )
             self.scene.addItem(self.cement_pipe)
             self.cement_outlet_badge = MotorBadge(cement_silo.pipe_origin_scene, radius=10.0)
-            self.cement_outlet_badge.set_running(False); self.scene.addItem(self.cement_outlet_badge)
+            self.cement_outlet_badge.bind(self.bus, "cement_screw.run"); self.scene.addItem(self.cement_outlet_badge)
 
         # -------------------- Water: Pump → Water Hopper --------------------
         self.water_pipe = None; self.water_pump_badge = None
-        wp_cfg = self.cfg.get("water_pipe", {})
+        pp = pc.water_pipe
         if self.water_pump and self.water_hopper:
-            def get_src_w(): return self.water_tank_kg
-            def set_src_w(v): self.water_tank_kg = max(0.0, min(self.water_tank_capacity_kg, float(v)))
-            get_dst_w = self.water_hopper.get_weight_kg
+            get_src_w, set_src_w = src["Water"]
+            get_dst_w = lambda: self.bus.value("water_hopper.weight_kg", 0.0)
             def set_dst_w(v):
                 cap = self.water_hopper.get_capacity_kg()
-                self.water_hopper.set_weight_kg(max(0.0, min(cap, float(v))))
+                self.bus.publish("water_hopper.weight_kg", max(0.0, min(cap, float(v))))
             self.water_pipe = FlowConnectorItem(
                 self.water_pump, self.water_pump.outlet_scene,
                 self.water_hopper, self.water_hopper.inlet_scene,
                 get_src_w, set_src_w, get_dst_w, set_dst_w,
                 enabled_fn=lambda: self.water_pump_running and self.water_pump.is_running(),
-                rate_kgps=float(wp_cfg.get("rate_kgps", 18.0)),
-                src_capacity_kg=self.water_tank_capacity_kg,
+                rate_kgps=pp.rate_kgps, src_capacity_kg=self.water_tank_capacity_kg,
                 dst_capacity_kg=self.water_hopper.get_capacity_kg(),
-                shape=wp_cfg.get("shape", "L"),
-                z=-1.0, diameter_px=int(wp_cfg.get("diameter_px",16)), wall_px=int(wp_cfg.get("wall_px",2))
+                shape=pp.shape, z=-1.0, diameter_px=pp.diameter_px, wall_px=pp.wall_px
             )
             self.scene.addItem(self.water_pipe)
             self.water_pump_badge = MotorBadge(self.water_pump.outlet_scene, radius=9.0)
-            self.water_pump_badge.set_running(False); self.scene.addItem(self.water_pump_badge)
+            self.water_pump_badge.bind(self.bus, "water_pump.run"); self.scene.addItem(self.water_pump_badge)
 
         # -------------------- Admixture: Pump → Admixture Hopper --------------------
         self.admix_pipe = None; self.admix_pump_badge = None
-        ap_cfg = self.cfg.get("admixture_pipe", {})
+        pp = pc.admix_pipe
         if self.admix_pump and self.admix_hopper:
-            def get_src_a(): return self.admix_tank_kg
-            def set_src_a(v): self.admix_tank_kg = max(0.0, min(self.admix_tank_capacity_kg, float(v)))
-            get_dst_a = self.admix_hopper.get_weight_kg
+            get_src_a, set_src_a = src["Admix"]
+            get_dst_a = lambda: self.bus.value("admix_hopper.weight_kg", 0.0)
             def set_dst_a(v):
                 cap = self.admix_hopper.get_capacity_kg()
-                self.admix_hopper.set_weight_kg(max(0.0, min(cap, float(v))))
+                self.bus.publish("admix_hopper.weight_kg", max(0.0, min(cap, float(v))))
             self.admix_pipe = FlowConnectorItem(
                 self.admix_pump, self.admix_pump.outlet_scene,
                 self.admix_hopper, self.admix_hopper.inlet_scene,
                 get_src_a, set_src_a, get_dst_a, set_dst_a,
                 enabled_fn=lambda: self.admix_pump_running and self.admix_pump.is_running(),
-                rate_kgps=float(ap_cfg.get("rate_kgps", 3.5)),
-                src_capacity_kg=self.admix_tank_capacity_kg,
+                rate_kgps=pp.rate_kgps, src_capacity_kg=self.admix_tank_capacity_kg,
                 dst_capacity_kg=self.admix_hopper.get_capacity_kg(),
-                shape=ap_cfg.get("shape", "L"),
-                z=-1.0, diameter_px=int(ap_cfg.get("diameter_px",12)), wall_px=int(ap_cfg.get("wall_px",2))
+                shape=pp.shape, z=-1.0, diameter_px=pp.diameter_px, wall_px=pp.wall_px
             )
             self.scene.addItem(self.admix_pipe)
             self.admix_pump_badge = MotorBadge(self.admix_pump.outlet_scene, radius=8.0)
-            self.admix_pump_badge.set_running(False); self.scene.addItem(self.admix_pump_badge)
+            self.admix_pump_badge.bind(self.bus, "admix_pump.run"); self.scene.addItem(self.admix_pump_badge)
+
+        # pump visuals follow their run tags, whoever sets them (operator, dosing engine, PLC)
+        for pump, tag in ((self.water_pump, "water_pump.run"), (self.admix_pump, "admix_pump.run")):
+            if pump: self.bus.subscribe(tag, lambda v, p=pump: p.start() if v else p.stop(), replay=False)
+
+        # batch log, API sync and historian start right after the first frame (_start_background)
+        self.batch_log = None; self.batch_sync = None; self.historian = None; self.trends = None
+        self.mirror = None; self.snapshot = None
 
         # ---------- UI rows ----------
-        ensure_csv_header(BATCH_LOG)
         lay = QVBoxLayout(central); lay.setContentsMargins(12,12,12,12); lay.setSpacing(10)
 
         # Row 1 — silos + active + pumps + mixer
         row1 = QHBoxLayout(); row1.setSpacing(10)
-        for i, s in enumerate(cfg.get("silos", []), start=1):
-            b1 = QPushButton(f"{s['name']} Start"); b2 = QPushButton(f"{s['name']} Stop")
+        for i, s in enumerate(pc.silos, start=1):
+            b1 = QPushButton(f"{s.name} Start"); b2 = QPushButton(f"{s.name} Stop")
             for b in (b1, b2): b.setStyleSheet(self._btn_style())
             b1.clicked.connect(lambda _, n=i: self._set_silo(n, True))
             b2.clicked.connect(lambda _, n=i: self._set_silo(n, False))
@@ -278,11 +309,12 @@ class MainWindow(QMainWindow):
         if self.silos:
             row1.addSpacing(10); row1.addWidget(QLabel("Active Feeder:"))
             self.feeder_group = QButtonGroup(self); self.feeder_group.setExclusive(True)
-            for i, s in enumerate(cfg["silos"], start=1):
-                r = QRadioButton(s["name"]); r.setStyleSheet("color:#EAECEE;")
+            for i, s in enumerate(pc.silos, start=1):
+                r = QRadioButton(s.name); r.setStyleSheet("color:#EAECEE;")
                 row1.addWidget(r); self.feeder_group.addButton(r, i)
             self.feeder_group.buttons()[0].setChecked(True)
             self.feeder_group.idClicked.connect(self._set_active_feeder)
+            self.bus.subscribe("feeder.active", self._show_active_feeder, replay=False)
 
         row1.addSpacing(16); row1.addWidget(QLabel("Cement Screw:"))
         self.btn_screw_start = QPushButton("START"); self.btn_screw_stop = QPushButton("STOP")
@@ -328,8 +360,9 @@ class MainWindow(QMainWindow):
             addb.clicked.connect(lambda _,idx=i-1: self._bump_hopper(idx,+50))
             subb.clicked.connect(lambda _,idx=i-1: self._bump_hopper(idx,-50))
             rstb.clicked.connect(lambda _,idx=i-1: self._set_hopper(idx,0))
-            pb=QProgressBar(); pb.setRange(0,int(max(1,self.t_agg[i-1]))); pb.setValue(0)
-            pb.setFormat(f"{title} %p% (0/{self.t_agg[i-1]:.0f} kg)")
+            target=self.ingr.target[i-1]
+            pb=QProgressBar(); pb.setRange(0,int(max(1,target))); pb.setValue(0)
+            pb.setFormat(f"{title} %p% (0/{target:.0f} kg)")
             pb.setMinimumWidth(380); pb.setSizePolicy(QSizePolicy.Expanding,QSizePolicy.Fixed)
             hrow.addWidget(addb); hrow.addWidget(subb); hrow.addWidget(rstb); hrow.addSpacing(8); hrow.addWidget(pb,1)
             row2.addLayout(hrow); self.pb_aggs.append(pb)
@@ -351,53 +384,241 @@ class MainWindow(QMainWindow):
         if self.belt:
             bstart=QPushButton("Belt Start"); bstop=QPushButton("Belt Stop")
             for b in (bstart,bstop): b.setStyleSheet(self._btn_style_small())
-            bstart.clicked.connect(self._belt_start); bstop.clicked.connect(self._belt_stop)
+            bstart.clicked.connect(lambda: self.bus.publish("belt.run", True))
+            bstop.clicked.connect(lambda: self.bus.publish("belt.run", False))
+            self.bus.subscribe("belt.run", self._set_belt, replay=False)    # from the buttons and the sequencer alike
             row3.addSpacing(12); row3.addWidget(bstart); row3.addWidget(bstop)
         lay.addLayout(row3)
 
-        # View + status
-        lay.addWidget(self.view,1)
-        self.status=QLabel(self._status_text()); self.status.setStyleSheet(f"QLabel{{color:{GREY_TEXT_CSS};}}")
+        # View + status (published by StatusModel at ui.status_hz, not every animation tick)
+        self.split = QSplitter(Qt.Horizontal); self.split.setChildrenCollapsible(False)
+        self.split.addWidget(self.view); lay.addWidget(self.split,1)
+        self.detail_views: list[PlantView] = []
+        if pc.view.details: self._build_details(pc)
+        self.status=QLabel(); self.status.setStyleSheet(f"QLabel{{color:{GREY_TEXT_CSS};}}")
         lay.addWidget(self.status)
+        self.ui = StatusModel(self, self.status, self.pb_aggs, self.pb_total, hz=pc.status_hz, parent=self, bus=self.bus)
+        self.ui.publish(force=True)
+        # values held back by a deadband are delivered once the flow settles
+        self.settle_timer = QTimer(self); self.settle_timer.setInterval(pc.settle_ms)
+        self.settle_timer.timeout.connect(self.bus.flush); self.settle_timer.start()
+
+        # trends: the panel (and its module) is built the first time it is shown
+        self.btn_trends = None
+        if (cfg.get("historian") or {}).get("enabled"):
+            self.btn_trends = QPushButton("Trends"); self.btn_trends.setCheckable(True)
+            self.btn_trends.setStyleSheet(self._btn_style_small()); self.btn_trends.toggled.connect(self._show_trends)
+            row3.addSpacing(12); row3.addWidget(self.btn_trends)
+
+        # alarms: the list panel (and its module) is built the first time it is shown; the button shows the counts
+        self.btn_alarms = None; self.alarm_panel = None
+        if self.plant.alarms:
+            self.btn_alarms = QPushButton("Alarms"); self.btn_alarms.setCheckable(True)
+            self.btn_alarms.setStyleSheet(self._btn_style_small()); self.btn_alarms.toggled.connect(self._show_alarms)
+            row3.addSpacing(12); row3.addWidget(self.btn_alarms)
+            self.bus.subscribe("alarms.unacked", lambda _: self._alarm_badge(), replay=False)
+            self.bus.subscribe("alarms.listed", lambda _: self._alarm_badge(), replay=False)
+
+        # dosing: recipe targets, coarse/fine cut-off at a fixed control rate (not the 30 ms animation tick)
+        self.dosing = None; self.seq = None
+        dcfg = cfg.get("dosing") or {}
+        if dcfg.get("enabled"): self._build_dosing(dcfg, row3)
+
+        # last saved runtime state (tanks, hoppers, silos, drives, feeder) over the start values above
+        self.restored = (0, "off")
+        scfg = cfg.get("snapshot") or {}
+        if scfg.get("enabled") and restore:
+            import snapshot
+            self.restored = snapshot.restore(self.bus, snapshot.snapshot_path(scfg, APP_DIR),
+                                             max_age_s=float(scfg.get("max_age_h", 12)) * 3600.0)
 
         # wiring
-        self.timer=QTimer(self); self.timer.setInterval(30); self.timer.timeout.connect(self._tick)
+        self.timer=QTimer(self); self.timer.setInterval(int(TICK_S * 1000)); self.timer.timeout.connect(self._tick)
         self.btn_mix_start.clicked.connect(lambda: self._set_mixer(True))
         self.btn_mix_stop.clicked.connect(lambda: self._set_mixer(False))
         self.btn_discharge.clicked.connect(self._do_discharge)
         self.btn_fs.clicked.connect(self.toggle_fullscreen)
         if not self.timer.isActive(): self.timer.start()
 
-        self.showMaximized(); self.view.fit_to_items()
+        # shown by the caller (main: showMaximized once; the view fits itself on resize)
+        self.first_frame_hooks: list = []
+        _FirstFrame(self.view.viewport(), self._first_frame)
+
+    def _first_frame(self):
+        """The plant is on screen: start what the first frame did not need."""
+        STARTUP.append(("first frame", time.perf_counter()))
+        self._start_background(); STARTUP.append(("background", time.perf_counter()))
+        if self.btn_trends and (self.cfg.get("trends") or {}).get("visible"): self.btn_trends.setChecked(True)
+        for fn in self.first_frame_hooks: fn()
+
+    def _start_background(self):
+        """Batch log, API sync, historian, mirror, state snapshots and the interlock audit (threads, SQLite, files); also called if needed before the first frame."""
+        if self.batch_log is not None: return
+        from batchlog import BatchLogWriter, BatchSync
+        cfg = self.cfg
+        self.plant.start()                                       # interlock trips -> interlocks.log (a writer thread)
+        # batch records: queued here, written by a background thread (SQLite WAL or rotated CSV)
+        self.batch_log = BatchLogWriter.from_config(cfg.get("batch_log") or {}, APP_DIR); self.batch_log.start()
+        # ... and posted to the office API through a persistent outbox (survives restarts/outages)
+        scfg = cfg.get("sync") or {}
+        if scfg.get("enabled"):
+            self.batch_sync = BatchSync.from_config(scfg, APP_DIR); self.batch_sync.start()
+        # historian: samples bus tags (latest values, its own deadbands) into hourly column files
+        hcfg = cfg.get("historian") or {}
+        if hcfg.get("enabled"):
+            from historian import Historian
+            self.historian = Historian.from_config(hcfg, self.bus, APP_DIR)
+            self.hist_timer = QTimer(self); self.hist_timer.setInterval(int(1000.0 / max(0.1, min(10.0, float(hcfg.get("rate_hz", 10))))))
+            self.hist_timer.timeout.connect(self.historian.sample); self.hist_timer.start()
+        # mirror: delivered bus changes as binary frames to web viewers (a server thread; the HMI only queues)
+        mcfg = cfg.get("mirror") or {}
+        if mcfg.get("enabled"):
+            from mirror import BusMirror, plant_hello
+            self.mirror = BusMirror.from_config(mcfg, self.bus, plant_hello(self.pc))
+            self.mirror_timer = QTimer(self); self.mirror_timer.setInterval(int(1000.0 / self.mirror.rate_hz))
+            self.mirror_timer.timeout.connect(self.mirror.sample); self.mirror_timer.start()
+        # snapshots: changed runtime state encoded here every every_s, written (tmp + fsync + rename) by a thread
+        scfg = cfg.get("snapshot") or {}
+        if scfg.get("enabled"):
+            from snapshot import Snapshotter
+            self.snapshot = Snapshotter.from_config(scfg, self.bus, APP_DIR); self.snapshot.start()
+            self.snap_timer = QTimer(self); self.snap_timer.setInterval(int(1000.0 * max(0.1, float(self.snapshot.every_s))))
+            self.snap_timer.timeout.connect(self.snapshot.sample); self.snap_timer.start()
+
+    def _build_details(self, pc):
+        """Detail panes beside the overview: more views of the same scene, each fitted to its equipment
+        with its own zoom/pan. Items repaint only where a view shows them, so a pane adds the cost of its area,
+        at view.detail_fps instead of every tick."""
+        col = QSplitter(Qt.Vertical); col.setChildrenCollapsible(False)
+        for d in pc.view.details:
+            v = PlantView(self.scene, accelerated=pc.view.accelerated, update_mode=pc.view.update_mode,
+                          antialias=pc.view.antialias, lod=pc.view.lod, zoom=True, max_fps=pc.view.detail_fps,
+                          focus=lambda names=d.show: self._items_rect(names))
+            box = QFrame(); bl = QVBoxLayout(box); bl.setContentsMargins(0,0,0,0); bl.setSpacing(2)
+            title = QLabel(d.title); title.setStyleSheet(f"QLabel{{color:{GREY_TEXT_CSS};}}")
+            bl.addWidget(title); bl.addWidget(v,1); col.addWidget(box); self.detail_views.append(v)
+        self.split.addWidget(col); self.split.setStretchFactor(0, 3); self.split.setStretchFactor(1, 2)
+
+    def _items_rect(self, names) -> QRectF:
+        """Scene rect of the named equipment (plant_config.DETAIL_ITEMS), as placed now."""
+        r = QRectF()
+        for n in names:
+            it = getattr(self, n, None)
+            for x in (it if isinstance(it, (list, tuple)) else (it,)):
+                if x is not None: r = r.united(x.sceneBoundingRect())
+        return r
+
+    def _show_trends(self, on: bool):
+        """Trend panel beside the plant view, fed from the historian's min/max pyramids (built on first use)."""
+        if on and self.trends is None:
+            self._start_background()
+            from historian import HistorianReader, TrendSource
+            from components.trend_view import TrendPanel
+            tcfg = self.cfg.get("trends") or {}
+            series = [(s["tag"], s.get("label", s["tag"])) if isinstance(s, dict) else (s, s) for s in tcfg.get("series", [])]
+            self.trend_source = TrendSource(HistorianReader(self.historian.root), self.historian)
+            self.trends = TrendPanel(self.trend_source, series, refresh_ms=int(tcfg.get("refresh_ms", 1000)))
+            self.split.addWidget(self.trends); self.split.setStretchFactor(0, 3); self.split.setStretchFactor(self.split.indexOf(self.trends), 2)
+        if self.trends is not None: self.trends.setVisible(on)
+
+    def _show_alarms(self, on: bool):
+        """Alarm list beside the plant view; History pages through the journal (built on first use)."""
+        if on and self.alarm_panel is None:
+            self._start_background()
+            from components.alarm_view import AlarmPanel
+            from alarms import JournalReader
+            journal = self.plant.journal
+            self.alarm_panel = AlarmPanel(self.plant.alarms, JournalReader(journal.path) if journal else None, journal)
+            self.split.addWidget(self.alarm_panel); self.split.setStretchFactor(self.split.indexOf(self.alarm_panel), 2)
+        if self.alarm_panel is not None: self.alarm_panel.setVisible(on); self.alarm_panel.refresh(force=True)
+
+    def _alarm_badge(self):
+        n = self.bus.value("alarms.listed", 0); unack = self.bus.value("alarms.unacked", 0)
+        self.btn_alarms.setText(f"Alarms ({n})" if n else "Alarms")
+        self.btn_alarms.setStyleSheet(self._btn_style_small() + ("QPushButton { background:#8B1E1A; }" if unack else ""))
+
+    def _build_dosing(self, dcfg: dict, row: QHBoxLayout):
+        """DosingEngine on a precise timer; while simulating, FeedSim moves the kg at the same rate."""
+        ingr = self.ingr
+        self.dosing = self.plant.build_dosing(dcfg, APP_DIR, on_done=self._dosing_done); self.feed_sim = self.plant.feed_sim
+        for pipe in (self.cement_pipe, self.water_pipe, self.admix_pipe):
+            if pipe: pipe.set_transfer(False)                   # the pipe keeps animating, FeedSim moves the kg
+        for hp, k in zip(self.hoppers, ingr.of_kind("aggregate")):
+            f = self.dosing.feeders.get(ingr.names[k])
+            if f: self.bus.subscribe(f.run_tag, lambda v, hp=hp: v and hp.set_dosing(True), replay=False)
+        self.dose_timer = QTimer(self); self.dose_timer.setTimerType(Qt.PreciseTimer)
+        self.dose_timer.setInterval(max(1, int(round(self.dosing.dt * 1000))))
+        self.dose_timer.timeout.connect(lambda: self.dosing.advance(time.monotonic())); self.dose_timer.start()
+        bdose = QPushButton("Dose Batch"); babort = QPushButton("Dose Stop")
+        for b in (bdose, babort): b.setStyleSheet(self._btn_style_small())
+        bdose.clicked.connect(self._dose_batch); babort.clicked.connect(self.dosing.abort)
+        row.addSpacing(12); row.addWidget(bdose); row.addWidget(babort)
+        scfg = self.cfg.get("sequencer") or {}
+        if scfg.get("enabled"): self._build_sequencer(scfg, row)
+
+    def _build_sequencer(self, scfg: dict, row: QHBoxLayout):
+        """Automatic batches: the next batch is weighed while the mixer mixes and discharges this one."""
+        self.seq = self.plant.build_sequencer(scfg, on_batch=self._seq_batch)
+        if self.collector:
+            aggs = [self.ingr.items[k].gate_tag for k in self.ingr.of_kind("aggregate")]
+            gate = lambda _: self.collector.open_gate() if any(self.bus.value(g) for g in aggs) else self.collector.close_gate()
+            for g in aggs: self.bus.subscribe(g, gate, replay=False)
+        bauto = QPushButton(f"Auto {int(scfg.get('batches', 5))} Batches"); bstop = QPushButton("Seq Stop")
+        for b in (bauto, bstop): b.setStyleSheet(self._btn_style_small())
+        bauto.clicked.connect(lambda: self._seq_start(int(scfg.get("batches", 5)))); bstop.clicked.connect(self.seq.stop)
+        row.addSpacing(12); row.addWidget(bauto); row.addWidget(bstop)
+
+    def _seq_start(self, batches: int):
+        if self.seq.running: return
+        self.seq.start(batches, self.ingr.targets())
+        self._ensure_timer(); self._update_status(tag=f"AUTO 0/{batches}")
+
+    def _seq_batch(self, b):
+        """One batch out of the mixer: log the weighed actuals and show the per-stage times."""
+        self._log_batch({r["name"]: r["actual"] for r in b.actuals})
+        st = b.stages(); s = self.seq.summary(batch_m3=float((self.cfg.get("sequencer") or {}).get("batch_m3", 1.0)))
+        self._update_status(tag=f"AUTO {len(self.seq.done)}/{len(self.seq.done) + self.seq.todo + (self.seq.cur is not None)}  "
+                            + " ".join(f"{k} {v:.0f}s" for k, v in st.items())
+                            + (f"  cycle {s['cycle']:.0f}s {s['m3_per_h']:.0f} m3/h" if len(self.seq.done) > 1 else ""))
+
+    def _dose_batch(self):
+        if self.dosing.start(self.ingr.targets()):
+            self._ensure_timer(); self._update_status(tag="DOSING")
+        elif self.dosing.results and self.dosing.results[-1]["reason"]:
+            self._update_status(tag=f"DOSING REFUSED ({self.dosing.results[-1]['reason']})")
+
+    def _dosing_done(self, results: list[dict]):
+        self.dosing.save()                                  # learned in-flight per feeder (tiny JSON)
+        bad = [r for r in results if r["state"] != "done"]
+        if bad: self.ui.tag = "DOSING ABORTED: " + ", ".join(f"{r['name']} ({r['reason']})" for r in bad)
+        else:
+            worst = max(results, key=lambda r: abs(r["error"]), default=None)
+            self.ui.tag = None if worst is None else f"DOSED (worst {worst['name']} {worst['error']:+.1f} kg)"
+        self._update_status()
 
     # ===== Handlers =====
     def _ensure_timer(self):
         if not self.timer.isActive(): self.timer.start()
 
     def _set_cement_screw(self, run: bool):
-        self.cement_screw_running = bool(run)
-        if self.cement_outlet_badge: self.cement_outlet_badge.set_running(self.cement_screw_running)
+        self.cement_screw_running = bool(run)          # badge follows cement_screw.run
         self._ensure_timer(); self._update_status()
 
     def _set_water_pump(self, run: bool):
         self.water_pump_running = bool(run)
         if self.water_pump: (self.water_pump.start() if run else self.water_pump.stop())
-        if self.water_pump_badge: self.water_pump_badge.set_running(self.water_pump_running)
         self._ensure_timer(); self._update_status()
 
     def _set_admix_pump(self, run: bool):
         self.admix_pump_running = bool(run)
         if self.admix_pump: (self.admix_pump.start() if run else self.admix_pump.stop())
-        if self.admix_pump_badge: self.admix_pump_badge.set_running(self.admix_pump_running)
         self._ensure_timer(); self._update_status()
 
-    def _belt_start(self):
-        if self.belt:
-            self.belt.set_speed(float(self.cfg.get("belt", {}).get("speed", 3.0)) or 3.0)
-            self.belt.start(); self._ensure_timer()
-
-    def _belt_stop(self):
-        if self.belt: self.belt.stop(); self.belt.set_speed(0.0)
+    def _set_belt(self, run: bool):
+        """The belt widget follows belt.run (the interlocks and the sequencer read the tag, not the widget)."""
+        if not self.belt: return
+        if run: self.belt.set_speed(self.pc.belt.speed or 3.0); self.belt.start(); self._ensure_timer()
+        else: self.belt.stop(); self.belt.set_speed(0.0)
 
     def _btn_style(self):
         return ("QPushButton { color:white; font-weight:600; padding:8px 12px; border-radius:10px; "
@@ -410,147 +631,105 @@ class MainWindow(QMainWindow):
                 "QPushButton:hover { border-color: rgba(255,255,255,0.25);} ")
 
     def _set_active_feeder(self, feeder_id:int):
-        self.active_feeder = feeder_id; self._update_status()
+        self.active_feeder = int(feeder_id)              # collector and radio buttons follow feeder.active
+        self._update_status()
+
+    def _show_active_feeder(self, feeder_id):
+        feeder_id = int(feeder_id)
+        if self.collector and self.hoppers:
+            self.collector.set_active_segment(max(0, min(len(self.hoppers)-1, feeder_id-1)))
+        b = self.feeder_group.button(feeder_id)
+        if b and not b.isChecked(): b.setChecked(True)
 
     def _set_silo(self, n:int, run:bool):
-        idx = n-1; silo = self.silos[idx]
-        if run: silo.start()
-        else:   silo.stop()
+        self.bus.publish(f"silo{n}.run", bool(run))
         if run and not self.timer.isActive(): self.timer.start()
         self._update_status()
 
     def _set_mixer(self, run:bool):
-        if run: self.mixer.start()
-        else:   self.mixer.stop()
+        self.bus.publish("mixer.run", bool(run))
         if run and not self.timer.isActive(): self.timer.start()
         self._update_status()
 
     def _bump_hopper(self, idx:int, delta:float):
-        hp = self.hoppers[idx]
-        new_w = max(0.0, min(hp.get_weight_kg()+delta, hp.get_capacity_kg()))
-        hp.set_weight_kg(new_w)
-        if self.collector and hasattr(self.collector,"set_active_and_amount"):
-            self.collector.set_active_and_amount(idx, new_w)
-        if hasattr(hp,"set_dosing"): hp.set_dosing(True)
-        self._ensure_timer(); self._update_status()
+        self._set_hopper(idx, self.bus.value(f"agg{idx+1}.weight_kg", 0.0) + delta)
 
     def _set_hopper(self, idx:int, kg:float):
         hp = self.hoppers[idx]
-        hp.set_weight_kg(max(0.0, min(kg, hp.get_capacity_kg())))
-        if self.collector and hasattr(self.collector,"set_active_and_amount"):
-            self.collector.set_active_and_amount(idx, hp.get_weight_kg())
+        self.bus.publish(f"agg{idx+1}.weight_kg", max(0.0, min(kg, hp.get_capacity_kg())), force=True)
         if hasattr(hp,"set_dosing"): hp.set_dosing(True)
         self._ensure_timer(); self._update_status()
 
     def _do_discharge(self):
-        self.mixer.open_gate(); self.mixer.stop()
-        self._write_batch_csv()
+        self.bus.publish("mixer.gate_open", True); self.bus.publish("mixer.run", False)
+        self._log_batch()
         self._update_status(tag="DISCHARGING")
         QTimer.singleShot(1200, self._finish_discharge)
 
     def _finish_discharge(self):
-        self.mixer.close_gate(); self._update_status()
-
-    def _write_batch_csv(self):
-        a = [hp.get_weight_kg() for hp in self.hoppers]; tot = sum(a)
-        def varpct(t,x): return 0.0 if t==0 else (x-t)*100.0/t
-        row = [
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.recipe,
-            f"{self.t_agg[0]:.0f}", f"{a[0]:.0f}", f"{varpct(self.t_agg[0],a[0]):.2f}",
-            f"{self.t_agg[1]:.0f}", f"{a[1]:.0f}", f"{varpct(self.t_agg[1],a[1]):.2f}",
-            f"{self.t_agg[2]:.0f}", f"{a[2]:.0f}", f"{varpct(self.t_agg[2],a[2]):.2f}",
-            f"{self.t_agg[3]:.0f}", f"{a[3]:.0f}", f"{varpct(self.t_agg[3],a[3]):.2f}",
-            f"{self.t_total:.0f}", f"{tot:.0f}", f"{varpct(self.t_total,tot):.2f}"
-        ]
-        with open(BATCH_LOG,"a",newline="",encoding="utf-8") as f:
-            csv.writer(f).writerow(row)
+        self.bus.publish("mixer.gate_open", False); self.ui.tag = None; self._update_status()
+
+    def _log_batch(self, actuals: dict[str, float] | None = None):
+        """Queue the discharged batch for the background writer and the API sync (no disk or network here).
+        actuals: weighed kg per ingredient (sequencer); default is what the hoppers show now."""
+        self._start_background()
+        rec = self.plant.batch_record(actuals); self.batch_log.submit(rec)
+        if self.batch_sync: self.batch_sync.submit(rec)
 
     def _tick(self):
-        spd = self.cfg["speeds"]
+        """Animation + local simulation. Tag values go through the bus; widgets only hear about changes."""
+        spd = self.pc.speeds
 
         # badges follow pump outlets
         if getattr(self, "cement_outlet_badge", None): self.cement_outlet_badge.refresh()
         if getattr(self, "water_pump_badge", None): self.water_pump_badge.refresh()
         if getattr(self, "admix_pump_badge", None): self.admix_pump_badge.refresh()
 
-        # interlocks (close when hoppers almost full)
-        if self.cement_hopper and self.cement_hopper.get_weight_kg() >= self.cement_hopper.get_capacity_kg()*0.995:
-            self.cement_screw_running = False
-            if self.cement_outlet_badge: self.cement_outlet_badge.set_running(False)
-        if self.water_hopper and self.water_hopper.get_weight_kg() >= self.water_hopper.get_capacity_kg()*0.995:
-            self.water_pump_running = False
-            if self.water_pump_badge: self.water_pump_badge.set_running(False)
-            if getattr(self, "water_pump", None): self.water_pump.stop()
-        if self.admix_hopper and self.admix_hopper.get_weight_kg() >= self.admix_hopper.get_capacity_kg()*0.995:
-            self.admix_pump_running = False
-            if self.admix_pump_badge: self.admix_pump_badge.set_running(False)
-            if getattr(self, "admix_pump", None): self.admix_pump.stop()
-
-        # demo: silo fill/bleed (local sim; replace with PLC reads later)
-        for silo in self.silos:
-            pct = silo.get_percent()
-            delta = spd["silo_fill_per_tick"] if silo.is_running() else spd["silo_bleed_per_tick"]
-            silo.set_percent(max(0.0, min(100.0, pct + delta)))
-
-        # mixer anim
-        self.mixer.advance_phase(spd["mixer_arrow_deg_per_tick"])
-
-        # agg glow
-        for hp in self.hoppers: hp.advance_phase(2.4)
-
-        # collector + belt
-        if self.collector:
-            amounts=[hp.get_weight_kg() for hp in self.hoppers]
-            if hasattr(self.collector,"set_segment_amounts"):
-                self.collector.set_segment_amounts(amounts)
-                act_idx=max(0,min(len(self.hoppers)-1,self.active_feeder-1))
-                self.collector.set_active_segment(act_idx)
-                self.collector.advance_phase(2.4)
+        # interlocks (config rules + stop a screw/pump when its hopper is almost full; only rules whose tags
+        # changed are checked) and the local silo fill/bleed (pump visuals follow their run tags)
+        self.plant.tick()
 
-        if self.belt:
-            if self.collector: self.belt.set_length(self.collector.w)
-            self.belt.advance_phase(1.0)
-
-        # progress bars
-        for i,pb in enumerate(self.pb_aggs):
-            actual=self.hoppers[i].get_weight_kg(); target=self.t_agg[i]
-            pb.setMaximum(int(max(1,target))); pb.setValue(int(min(actual,target)))
-            pct = 0 if target==0 else int(round(actual*100.0/target))
-            title=getattr(self.hoppers[i],"_title",f"Agg {i+1}")
-            pb.setFormat(f"{title} {pct}% ({actual:.0f}/{target:.0f} kg)")
-
-        total=sum(hp.get_weight_kg() for hp in self.hoppers)
-        self.pb_total.setMaximum(int(max(1,self.t_total))); self.pb_total.setValue(int(min(total,self.t_total)))
-        pct_t = 0 if self.t_total==0 else int(round(total*100.0/self.t_total))
-        self.pb_total.setFormat(f"TOTAL %p% ({total:.0f}/{self.t_total:.0f} kg)")
-        self._update_status()
+        # animation phases (only for equipment some view shows; panes do not repaint what they cannot see)
+        if on_screen(self.mixer): self.mixer.advance_phase(spd["mixer_arrow_deg_per_tick"])
+        for hp in self.hoppers:
+            if on_screen(hp): hp.advance_phase(2.4)
+        if self.collector and on_screen(self.collector): self.collector.advance_phase(2.4)
+        if self.belt and on_screen(self.belt): self.belt.advance_phase(1.0)
 
-    def _status_text(self, tag: str | None = None):
-        parts=[]
-        for i,silo in enumerate(self.silos,start=1):
-            st="RUNNING" if silo.is_running() else "STOPPED"
-            parts.append(f"Silo{i}: {st} • {int(round(silo.get_percent()))}%")
-        for i,hp in enumerate(self.hoppers,start=1):
-            parts.append(f"Agg{i}: {hp.get_weight_kg():.0f}/{hp.get_capacity_kg():.0f} kg")
-        if self.cement_hopper:
-            parts.append(f"Cement: {self.cement_hopper.get_weight_kg():.0f}/{self.cement_hopper.get_capacity_kg():.0f} kg")
-        if self.water_hopper:
-            parts.append(f"Water: {self.water_hopper.get_weight_kg():.0f}/{self.water_hopper.get_capacity_kg():.0f} kg")
-        if self.admix_hopper:
-            parts.append(f"Admixture: {self.admix_hopper.get_weight_kg():.0f}/{self.admix_hopper.get_capacity_kg():.0f} kg")
-        parts.append(f"Water Tank: {self.water_tank_kg:.0f}/{self.water_tank_capacity_kg:.0f} kg")
-        parts.append(f"Admix Tank: {self.admix_tank_kg:.0f}/{self.admix_tank_capacity_kg:.0f} kg")
-        m_state="RUNNING" if self.mixer.is_running() else ("DISCHARGING" if tag=="DISCHARGING" else "STOPPED")
-        parts.append(f"Mixer: {m_state}")
-        parts.append(f"Cement Screw: {'ON' if self.cement_screw_running else 'OFF'}")
-        parts.append(f"Water Pump: {'ON' if self.water_pump_running else 'OFF'}")
-        parts.append(f"Admix Pump: {'ON' if self.admix_pump_running else 'OFF'}")
-        if self.silos and hasattr(self, "active_feeder"):
-            parts.append(f"Active Feeder: Silo {self.active_feeder}")
-        return "   |   ".join(parts)
+        # progress bars + status text are published by self.ui at ui.status_hz (dirty tags only)
+
+    def _status_text(self):
+        return self.ui.status_text(self.ui.snapshot())
 
     def _update_status(self, tag: str | None = None):
-        self.status.setText(self._status_text(tag))
+        """Operator actions publish immediately (still diffed); the tick relies on the UI timer."""
+        if tag is not None: self.ui.tag = tag
+        self.ui.mark_dirty(); self.ui.publish()
+
+    def attach_plc(self, plc):
+        """PLC tags replace the local simulation; snapshots are published into the bus (changes only)."""
+        self.plant.stop_simulation()
+        if self.dosing:                                          # real feeders: outputs go to the PLC
+            for f in self.dosing.feeders.values():
+                for tag in (f.run_tag, f.fine_tag):
+                    if tag and tag in plc.table.tags:
+                        self.bus.subscribe(tag, lambda v, t=tag: plc.write(t, v), replay=False)
+        if hasattr(plc, "snapshot") and hasattr(plc.snapshot, "connect"):
+            plc.snapshot.connect(self.bus.publish_many)          # PlcWorker: queued signal per scan
+        else:
+            t = QTimer(self); t.setInterval(int(plc.scan_s * 1000))  # PlcScanner: poll its cache
+            t.timeout.connect(lambda: self.bus.publish_many(plc.snapshot())); t.start()
+            self._plc_poll = t
+
+    def closeEvent(self, e):
+        if self.snapshot: self.snapshot.close()
+        self.plant.close()
+        if self.trends is not None: self.trend_source.close()
+        if self.historian: self.historian.close()
+        if self.mirror: self.mirror.close()
+        if self.batch_log: self.batch_log.close()
+        if self.batch_sync: self.batch_sync.close()
+        super().closeEvent(e)
 
     def toggle_fullscreen(self):
         if self.isFullScreen():
@@ -559,12 +738,37 @@ class MainWindow(QMainWindow):
             self.showFullScreen(); self.btn_fs.setText("Exit Fullscreen (F11)")
         self.view.fit_to_items()
 
+def _startup_report() -> str:
+    """Milliseconds per startup phase (since main.py began importing) up to the first painted frame."""
+    lines = [f"{'phase':<12} {'ms':>8} {'total ms':>9}"]
+    for (_, t0), (name, t1) in zip(STARTUP, STARTUP[1:]):
+        lines.append(f"{name:<12} {(t1 - t0) * 1000:8.1f} {(t1 - STARTUP[0][1]) * 1000:9.1f}")
+    return "\n".join(lines)
+
 def main():
-    import sys
-    cfg = load_config()
-    app = QApplication(sys.argv)
-    w = MainWindow(cfg)
-    w.setWindowFlag(Qt.Window); w.show()
+    import sys, argparse
+    from plant_config import check_file
+    ap = argparse.ArgumentParser(description="RMC plant desktop")
+    ap.add_argument("--check-config", action="store_true", help="validate config.json and exit")
+    ap.add_argument("--startup-time", action="store_true", help="print time to first frame per phase, then quit")
+    ap.add_argument("--fresh", action="store_true", help="start from config.json values, not the last state snapshot")
+    a, qt_args = ap.parse_known_args()
+    try:
+        pc = check_file(CONFIG_PATH)                   # before Qt: a bad config never opens a window
+    except ConfigError as e:
+        sys.exit(f"{CONFIG_PATH}: {len(e.errors)} problem(s)\n  " + "\n  ".join(e.errors))
+    for msg in pc.warnings: print(f"config warning: {msg}", file=sys.stderr)
+    if a.check_config: print(f"{CONFIG_PATH}: OK"); return
+    cfg = pc.raw; STARTUP.append(("config", time.perf_counter()))
+    app = QApplication(sys.argv[:1] + qt_args); STARTUP.append(("qapp", time.perf_counter()))
+    if start_plc(cfg): app.aboutToQuit.connect(PLC.stop)
+    w = MainWindow(cfg, pc, restore=not a.fresh); STARTUP.append(("window", time.perf_counter()))
+    if w.restored[0]: print(f"restored {w.restored[0]} tags from the state snapshot ({w.restored[1]})", file=sys.stderr)
+    elif w.restored[1] not in ("off", "no snapshot"): print(f"state snapshot not restored: {w.restored[1]}", file=sys.stderr)
+    if PLC is not None: w.attach_plc(PLC)
+    if a.startup_time:
+        w.first_frame_hooks.append(lambda: (print(_startup_report(), flush=True), w.close(), app.quit()))
+    w.showMaximized(); STARTUP.append(("show", time.perf_counter()))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+# mirror package — read-only plant state for remote web viewers (binary frames over a local WebSocket, no Qt)
+from .frames import TagTable, encode_names, encode_values, decode, header, NAMES, DELTA, FULL
+from .server import MirrorServer
+from .publisher import BusMirror, plant_hello
@@ -0,0 +1,80 @@
+# mirror/frames.py — binary state frames for remote viewers (little-endian, no Qt)
+#
+# Tags get small ids the first time they are sent; values then travel as (id, value) pairs.
+#   names  u8 1 | u16 n | n x (u16 id, u8 kind, u8 len, utf-8 name)
+#   delta  u8 2 | u32 seq | f64 t (epoch s) | u16 n | n x (u16 id, value)     changed tags since the last frame
+#   full   u8 3 | same as delta, every tag                                     on connect and after a resync
+# value by kind: 0 number -> f32, 1 bool -> u8, 2 text -> u8 len + utf-8
+import struct
+
+NAMES, DELTA, FULL = 1, 2, 3
+NUM, BOOL, TEXT = 0, 1, 2
+
+_HEAD = struct.Struct("<BIdH"); _NAMES = struct.Struct("<BH"); _NAME = struct.Struct("<HBB")
+_ID = struct.Struct("<H"); _F32 = struct.Struct("<Hf"); _U8 = struct.Struct("<HB")
+
+def _text(s) -> bytes:
+    """utf-8, at most 255 bytes, never cut inside a character."""
+    b = str(s).encode()
+    return b if len(b) <= 255 else b[:255].decode(errors="ignore").encode()
+
+def kind_of(value) -> int:
+    if isinstance(value, bool): return BOOL
+    if isinstance(value, (int, float)): return NUM
+    return TEXT
+
+class TagTable:
+    """name -> (id, kind); ids are never reused while the table lives (one per server)."""
+    def __init__(self):
+        self.ids: dict[str, int] = {}; self.kinds: list[int] = []; self.names: list[str] = []
+
+    def add(self, name: str, value) -> tuple[int, bool]:
+        """(id, new) for `name`; a new tag takes its kind from its first value."""
+        i = self.ids.get(name)
+        if i is not None: return i, False
+        if len(self.names) >= 0xFFFF: raise OverflowError("more than 65535 mirrored tags")
+        i = self.ids[name] = len(self.names); self.names.append(name); self.kinds.append(kind_of(value))
+        return i, True
+
+def encode_names(table: TagTable, ids) -> bytes:
+    out = [_NAMES.pack(NAMES, len(ids))]
+    for i in ids:
+        b = _text(table.names[i]); out.append(_NAME.pack(i, table.kinds[i], len(b))); out.append(b)
+    return b"".join(out)
+
+def encode_values(ftype: int, seq: int, t: float, table: TagTable, items) -> bytes:
+    """items: (id, value) pairs; values are written as the tag's kind (a number sent as text stays text)."""
+    out = [_HEAD.pack(ftype, seq & 0xFFFFFFFF, t, len(items))]
+    for i, v in items:
+        k = table.kinds[i]
+        if k == NUM:
+            try: out.append(_F32.pack(i, float(v)))
+            except (TypeError, ValueError): out.append(_F32.pack(i, float("nan")))
+        elif k == BOOL: out.append(_U8.pack(i, 1 if v else 0))
+        else:
+            b = _text(v); out.append(_U8.pack(i, len(b))); out.append(b)
+    return b"".join(out)
+
+def decode(buf: bytes, kinds: dict[int, int], names: dict[int, str]) -> tuple[int, dict]:
+    """(frame type, {name: value}) for a values frame, (NAMES, {id: name}) for a names frame; `kinds` and
+    `names` are the viewer's tables and are updated by names frames (what the web page does in TypeScript)."""
+    ftype = buf[0]
+    if ftype == NAMES:
+        _, n = _NAMES.unpack_from(buf, 0); pos = _NAMES.size; got = {}
+        for _ in range(n):
+            i, k, ln = _NAME.unpack_from(buf, pos); pos += _NAME.size
+            got[i] = names[i] = buf[pos:pos + ln].decode(); kinds[i] = k; pos += ln
+        return NAMES, got
+    _, _, _, n = _HEAD.unpack_from(buf, 0); pos = _HEAD.size; got = {}
+    for _ in range(n):
+        (i,) = _ID.unpack_from(buf, pos); k = kinds[i]
+        if k == NUM: _, v = _F32.unpack_from(buf, pos); pos += _F32.size
+        elif k == BOOL: _, b = _U8.unpack_from(buf, pos); v = bool(b); pos += _U8.size
+        else:
+            _, ln = _U8.unpack_from(buf, pos); pos += _U8.size; v = buf[pos:pos + ln].decode(); pos += ln
+        got[names[i]] = v
+    return ftype, got
+
+def header(buf: bytes) -> tuple[int, int, float]:
+    """(type, seq, t) of a values frame."""
+    ftype, seq, t, _ = _HEAD.unpack_from(buf, 0); return ftype, seq, t
@@ -0,0 +1,52 @@
+# mirror/publisher.py — GUI-thread side of the mirror: collects delivered bus changes, hands them over at <= 10 Hz
+from .server import MirrorServer
+
+MAX_RATE_HZ = 10.0
+
+def plant_hello(pc) -> dict:
+    """What a viewer needs to lay the plant out before the first frame (names, tags, capacities)."""
+    tank_cap = {"water": pc.water_tank[0], "admixture": pc.admix_tank[0]}
+    return {
+        "recipe": pc.recipe,
+        "silos": [{"name": s.name, "tag": f"silo{n}.level_pct", "run": f"silo{n}.run", "capacity_kg": pc.cement_silo_kg}
+                  for n, s in enumerate(pc.silos, 1)],
+        "ingredients": [{"name": g.name, "label": g.label, "kind": g.kind, "tag": g.weight_tag, "feed": g.feed_tag,
+                         "capacity_kg": g.capacity_kg, "target_kg": g.target_kg} for g in pc.ingredients],
+        "tanks": [{"name": f"{k.capitalize()} tank", "tag": t, "capacity_kg": tank_cap[k]}
+                  for k, t in (("water", "water_tank.kg"), ("admixture", "admix_tank.kg"))],
+        "mixer": {"run": "mixer.run", "gate": "mixer.gate_open"},
+    }
+
+class BusMirror:
+    """
+    Feeds a MirrorServer from a TagBus. subscribe_any marks delivered changes (already deadbanded) in a dict;
+    sample() (a QTimer at rate_hz) swaps that dict out and queues it to the server thread, so the HMI's cost
+    is one dict store per change and one queue put per sample, whatever the number of viewers.
+    """
+    def __init__(self, bus, server: MirrorServer, rate_hz: float = 5.0):
+        self.bus = bus; self.server = server; self.rate_hz = max(0.1, min(MAX_RATE_HZ, float(rate_hz)))
+        self._dirty = {n: bus.shown(n) for n in bus.names() if bus.shown(n) is not None}
+        bus.subscribe_any(self._changed)
+        self.samples = 0; self.pushed = 0
+
+    @classmethod
+    def from_config(cls, mcfg: dict, bus, hello: dict | None = None) -> "BusMirror":
+        server = MirrorServer(mcfg.get("host", "127.0.0.1"), int(mcfg.get("port", 8765)), hello=hello,
+                              token=mcfg.get("token", ""), max_viewers=int(mcfg.get("max_viewers", 64)),
+                              max_backlog=int(float(mcfg.get("max_backlog_kb", 256)) * 1024))
+        server.start()
+        return cls(bus, server, mcfg.get("rate_hz", 5))
+
+    def _changed(self, name: str, value):
+        self._dirty[name] = value
+
+    def sample(self) -> int:
+        """Queue the tags changed since the last sample; returns how many."""
+        self.samples += 1
+        if not self._dirty: return 0
+        d, self._dirty = self._dirty, {}
+        self.server.push(d); self.pushed += len(d)
+        return len(d)
+
+    def close(self):
+        self.server.close()
@@ -0,0 +1,203 @@
+# mirror/server.py — read-only WebSocket server (RFC 6455, stdlib) fanning plant state out to viewers
+#
+# The GUI thread only calls push(changes) at <= rate_hz. Everything else runs on this thread: it keeps
+# the mirrored state and the tag table, encodes each delta once and appends the same bytes to every
+# viewer's send queue (non-blocking sockets, one selector). Pushes that queue up while it is busy are
+# merged into one frame. A viewer whose buffer passes max_backlog (slow link) has it dropped and is
+# resynced with the names and a full frame, so a slow viewer never holds up the others or the HMI.
+import base64, hashlib, json, queue, selectors, socket, threading, time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+from .frames import TagTable, encode_names, encode_values, DELTA, FULL
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_REQUEST = 8192
+
+def ws_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """One unmasked, unfragmented server frame (0x2 binary, 0x1 text, 0x8 close, 0xA pong)."""
+    n = len(payload)
+    if n < 126: head = bytes((0x80 | opcode, n))
+    elif n < 65536: head = bytes((0x80 | opcode, 126)) + n.to_bytes(2, "big")
+    else: head = bytes((0x80 | opcode, 127)) + n.to_bytes(8, "big")
+    return head + payload
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+
+class _Viewer:
+    """One connection; out holds the frames not yet sent (the same bytes objects for every viewer), the
+    first possibly cut by a partial send (mid), queued their total length."""
+    __slots__ = ("sock", "addr", "inbuf", "out", "queued", "mid", "ws", "closing")
+    def __init__(self, sock, addr):
+        self.sock = sock; self.addr = addr; self.inbuf = bytearray(); self.out: deque = deque(); self.queued = 0
+        self.mid = False; self.ws = False; self.closing = False
+
+class MirrorServer(threading.Thread):
+    """
+    Plant mirror for browsers (see module comment).
+      ws://host:port/[?token=...]   first message: the hello JSON (text), then binary frames (mirror/frames.py)
+      stats: viewers, frames, bytes_out, resyncs, refused
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, *, hello: dict | None = None, token: str = "",
+                 max_viewers: int = 64, max_backlog: int = 256 * 1024):
+        super().__init__(name="state-mirror", daemon=True)
+        self.hello = json.dumps({"v": 1, **(hello or {})}).encode(); self.token = str(token)
+        self.max_viewers = max(1, int(max_viewers)); self.max_backlog = max(4096, int(max_backlog))
+        self._lsock = socket.create_server((host, int(port))); self._lsock.setblocking(False)
+        self.port = self._lsock.getsockname()[1]                     # port 0: the OS picks one
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False); self._wake_w.setblocking(False)
+        self._q: queue.SimpleQueue = queue.SimpleQueue(); self._halt = threading.Event()
+        self._viewers: dict[socket.socket, _Viewer] = {}; self._sel = selectors.DefaultSelector()
+        self.table = TagTable(); self.state: dict[int, object] = {}; self.seq = 0; self.t = 0.0
+        self._sync: tuple[int, bytes] | None = None
+        self.viewers = 0; self.frames = 0; self.bytes_out = 0; self.resyncs = 0; self.refused = 0
+
+    # ---------- producer (GUI thread) ----------
+    def push(self, changes: dict, t: float | None = None):
+        """Tags changed since the last push; the dict is handed over (the caller starts a new one)."""
+        self._q.put((time.time() if t is None else t, changes)); self._wake()
+
+    def close(self, timeout: float = 2.0):
+        self._halt.set(); self._wake()
+        if self.is_alive(): self.join(timeout)
+
+    def _wake(self):
+        try: self._wake_w.send(b"\0")
+        except OSError: pass                                        # buffer full: a wake-up is pending anyway
+
+    # ---------- server thread ----------
+    def run(self):
+        sel = self._sel
+        sel.register(self._lsock, selectors.EVENT_READ, "listen"); sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        try:
+            while not self._halt.is_set():
+                for key, ev in sel.select(timeout=0.5):
+                    if key.data == "listen": self._accept()
+                    elif key.data == "wake":
+                        try:
+                            while self._wake_r.recv(4096): pass
+                        except BlockingIOError: pass
+                        self._drain()
+                    else:
+                        v = key.data
+                        if ev & selectors.EVENT_READ: self._read(v)
+                        if ev & selectors.EVENT_WRITE and v.sock in self._viewers: self._flush(v)
+        finally:
+            for v in list(self._viewers.values()): self._drop(v)
+            for s in (self._lsock, self._wake_r, self._wake_w): s.close()
+            sel.close()
+
+    def _drain(self):
+        """Merge every queued push into one delta frame and queue it to each viewer."""
+        merged: dict = {}; t = None
+        while True:
+            try: t, changes = self._q.get_nowait()
+            except queue.Empty: break
+            merged.update(changes)
+        if not merged: return
+        new, items = [], []
+        for name, value in merged.items():
+            i, is_new = self.table.add(name, value)
+            if is_new: new.append(i)
+            self.state[i] = value; items.append((i, value))
+        self.seq += 1; self.t = t; self.frames += 1
+        msg = (ws_frame(encode_names(self.table, new)) if new else b"") + \
+              ws_frame(encode_values(DELTA, self.seq, t, self.table, items))
+        for v in list(self._viewers.values()):
+            if v.ws and not v.closing: self._send(v, msg)
+
+    def _sync_msg(self) -> bytes:
+        """All names + a full frame of the current state (cached per seq: resyncs and new viewers share it)."""
+        if self._sync is None or self._sync[0] != self.seq:
+            ids = list(range(len(self.table.names)))
+            self._sync = (self.seq, ws_frame(encode_names(self.table, ids)) +
+                          ws_frame(encode_values(FULL, self.seq, self.t, self.table, list(self.state.items()))))
+        return self._sync[1]
+
+    def _accept(self):
+        try: sock, addr = self._lsock.accept()
+        except OSError: return
+        sock.setblocking(False); sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        v = _Viewer(sock, addr); self._viewers[sock] = v
+        self._sel.register(sock, selectors.EVENT_READ, v)
+
+    def _read(self, v: _Viewer):
+        try: data = v.sock.recv(65536)
+        except BlockingIOError: return
+        except OSError: self._drop(v); return
+        if not data: self._drop(v); return
+        v.inbuf += data
+        if not v.ws: self._handshake(v)
+        else: self._client_frames(v)
+
+    def _handshake(self, v: _Viewer):
+        end = v.inbuf.find(b"\r\n\r\n")
+        if end < 0:
+            if len(v.inbuf) > MAX_REQUEST: self._refuse(v, "431 Request Header Fields Too Large")
+            return
+        lines = bytes(v.inbuf[:end]).decode("latin-1").split("\r\n"); del v.inbuf[:end + 4]
+        parts = lines[0].split(" ")
+        hdr = {k.strip().lower(): val.strip() for k, _, val in (ln.partition(":") for ln in lines[1:])}
+        if len(parts) < 2 or parts[0] != "GET": self._refuse(v, "405 Method Not Allowed"); return
+        if "websocket" not in hdr.get("upgrade", "").lower() or "sec-websocket-key" not in hdr:
+            self._refuse(v, "426 Upgrade Required"); return
+        if self.token and parse_qs(urlsplit(parts[1]).query).get("token", [""])[0] != self.token:
+            self._refuse(v, "403 Forbidden"); return
+        if self.viewers >= self.max_viewers: self._refuse(v, "503 Service Unavailable"); return
+        self._send(v, ("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                       f"Sec-WebSocket-Accept: {accept_key(hdr['sec-websocket-key'])}\r\n\r\n").encode()
+                   + ws_frame(self.hello, 0x1) + self._sync_msg())
+        v.ws = True; self.viewers += 1                                  # the handshake itself is never resynced
+
+    def _refuse(self, v: _Viewer, status: str):
+        self.refused += 1; v.closing = True
+        self._send(v, f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+
+    def _client_frames(self, v: _Viewer):
+        """Viewers only send control frames: answer ping, honour close, ignore the rest."""
+        buf = v.inbuf
+        while len(buf) >= 2:
+            op = buf[0] & 0x0F; n = buf[1] & 0x7F; pos = 2
+            if n == 126:
+                if len(buf) < 4: return
+                n = int.from_bytes(buf[2:4], "big"); pos = 4
+            elif n == 127:
+                if len(buf) < 10: return
+                n = int.from_bytes(buf[2:10], "big"); pos = 10
+            if n > 65536: self._drop(v); return
+            mask = buf[pos:pos + 4] if buf[1] & 0x80 else b""; pos += len(mask)
+            if len(buf) < pos + n: return
+            payload = bytes(buf[pos:pos + n]); del buf[:pos + n]
+            if mask: payload = bytes(b ^ mask[k & 3] for k, b in enumerate(payload))
+            if op == 0x8: v.closing = True; self._send(v, ws_frame(payload[:2], 0x8)); return
+            if op == 0x9: self._send(v, ws_frame(payload, 0xA))
+
+    def _send(self, v: _Viewer, data: bytes):
+        if v.ws and not v.closing and v.queued + len(data) > self.max_backlog:
+            keep = v.out[0] if v.mid else None                           # too far behind: start over from now,
+            v.out.clear(); v.queued = 0; self.resyncs += 1               # finishing the frame already on the wire
+            if keep is not None: v.out.append(keep); v.queued = len(keep)
+            data = self._sync_msg()
+        v.out.append(data); v.queued += len(data)
+        self._flush(v)
+
+    def _flush(self, v: _Viewer):
+        try:
+            while v.out:
+                head = v.out[0]; n = v.sock.send(head)
+                if n <= 0: break
+                v.queued -= n; self.bytes_out += n
+                if n < len(head): v.out[0] = memoryview(head)[n:]; v.mid = True; break
+                v.out.popleft(); v.mid = False
+        except BlockingIOError: pass
+        except OSError: self._drop(v); return
+        if not v.out and v.closing: self._drop(v); return
+        self._sel.modify(v.sock, selectors.EVENT_READ | (selectors.EVENT_WRITE if v.out else 0), v)
+
+    def _drop(self, v: _Viewer):
+        if self._viewers.pop(v.sock, None) is None: return
+        if v.ws: self.viewers -= 1
+        try: self._sel.unregister(v.sock)
+        except (KeyError, ValueError): pass
+        v.sock.close()
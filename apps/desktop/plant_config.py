@@ -0,0 +1,334 @@
+# plant_config.py — config.json compiled once into typed settings, validated before Qt starts (no Qt imports)
+#   python plant_config.py [config.json]      # check a config without starting the app
+from dataclasses import dataclass, field
+from ingredients import Ingredient, load_registry, material_keys
+from plc.mc_protocol import is_bit_device, parse_address
+from plc.tags import TAG_WIDTH, make_tag
+
+class ConfigError(ValueError):
+    """All problems found in one pass, one "path: message" per line."""
+    def __init__(self, errors: list[str]):
+        super().__init__("\n".join(errors)); self.errors = errors
+
+@dataclass(frozen=True)
+class Equip:
+    name: str
+    pos: tuple[float, float]
+    capacity_kg: float = 0.0
+
+@dataclass(frozen=True)
+class Pipe:
+    shape: str = "L"
+    rate_kgps: float = 10.0
+    diameter_px: int = 16
+    wall_px: int = 2
+
+@dataclass(frozen=True)
+class Belt:
+    height: float = 28.0
+    offset_y: float = 110.0
+    speed: float = 3.0
+    direction: str = "right"
+
+# equipment a detail pane can be focused on (MainWindow attributes; lists count as their items)
+DETAIL_ITEMS = ("mixer", "silos", "hoppers", "collector", "belt", "cement_hopper", "cement_pipe",
+                "water_hopper", "water_pump", "water_pipe", "admix_hopper", "admix_pump", "admix_pipe")
+
+@dataclass(frozen=True)
+class Detail:
+    title: str
+    show: tuple[str, ...]                        # DETAIL_ITEMS fitted into the pane
+
+@dataclass(frozen=True)
+class View:
+    accelerated: bool = False
+    update_mode: str = "smart"
+    antialias: bool = True
+    lod: bool = True
+    zoom: bool = False                           # wheel zoom/pan in the overview too
+    details: tuple[Detail, ...] = ()             # zoomable panes beside the overview, one shared scene
+    detail_fps: float = 15.0                     # panes repaint scene changes at most this often (0: every tick)
+
+@dataclass(frozen=True)
+class PlantConfig:
+    """What MainWindow builds the plant from. Subsystem sections (dosing, historian, plc, ...) are
+    checked here too but stay dicts in `raw`: each subsystem's from_config reads its own."""
+    recipe: str
+    draggable: bool
+    mixer_pos: tuple[float, float]
+    silos: tuple[Equip, ...]
+    hoppers: tuple[Equip, ...]
+    collector: Equip | None
+    belt: Belt
+    cement_hopper: Equip | None
+    water_hopper: Equip | None
+    admix_hopper: Equip | None
+    cement_silo_kg: float
+    cement_pipe: Pipe
+    water_pipe: Pipe
+    admix_pipe: Pipe
+    water_pump_pos: tuple[float, float]
+    admix_pump_pos: tuple[float, float]
+    water_tank: tuple[float, float]              # (capacity kg, start kg)
+    admix_tank: tuple[float, float]
+    targets: dict[str, float]
+    ingredients: tuple[Ingredient, ...]          # every weighed ingredient, aggregates first (IngredientTable order)
+    t_total: float
+    view: View
+    status_hz: float
+    settle_ms: int
+    speeds: dict[str, float]
+    raw: dict = field(repr=False, default_factory=dict)
+    warnings: tuple[str, ...] = ()
+
+# ---------- checked reads ----------
+class _Section:
+    """Typed reads from one dict; problems go to the shared error list, defaults keep compiling."""
+    def __init__(self, d, path: str, errors: list[str]):
+        self.path = path; self.errors = errors
+        if d is not None and not isinstance(d, dict): self.err("", "expected an object"); d = None
+        self.d = d or {}
+
+    def err(self, key, msg: str):
+        self.errors.append(f"{'.'.join(p for p in (self.path, str(key)) if p) or 'config'}: {msg}")
+
+    def has(self, key) -> bool: return key in self.d
+
+    def sub(self, key, path: str | None = None) -> "_Section":
+        return _Section(self.d.get(key), path or (f"{self.path}.{key}" if self.path else key), self.errors)
+
+    def num(self, key, default: float | None = None, *, lo: float | None = None, hi: float | None = None,
+            above: float | None = None, required: bool = False) -> float:
+        v = self.d.get(key, default)
+        if v is None:
+            if required: self.err(key, "missing")
+            return 0.0 if default is None else default
+        if isinstance(v, bool) or not isinstance(v, (int, float)): self.err(key, f"expected a number, got {v!r}"); return default or 0.0
+        if (lo is not None and v < lo) or (hi is not None and v > hi) or (above is not None and v <= above):
+            rng = f">= {lo}" if lo is not None else f"> {above}" if above is not None else ""
+            self.err(key, f"{v} out of range ({rng}{' and ' if rng and hi is not None else ''}{f'<= {hi}' if hi is not None else ''})")
+            return default if default is not None else float(v)
+        return float(v)
+
+    def text(self, key, default: str = "", choices: tuple[str, ...] | None = None) -> str:
+        v = self.d.get(key, default)
+        if not isinstance(v, str): self.err(key, f"expected text, got {v!r}"); return default
+        if choices and v not in choices: self.err(key, f"{v!r} is not one of {', '.join(choices)}"); return default
+        return v
+
+    def flag(self, key, default: bool = False) -> bool:
+        v = self.d.get(key, default)
+        if not isinstance(v, bool): self.err(key, f"expected true/false, got {v!r}"); return default
+        return v
+
+    def pos(self, key, default: tuple[float, float] | None = None) -> tuple[float, float]:
+        v = self.d.get(key, default)
+        if v is None: self.err(key, "missing"); return (0.0, 0.0)
+        if not (isinstance(v, (list, tuple)) and len(v) == 2 and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in v)):
+            self.err(key, f"expected [x, y], got {v!r}"); return default or (0.0, 0.0)
+        return (float(v[0]), float(v[1]))
+
+    def items(self, key) -> list["_Section"]:
+        v = self.d.get(key, [])
+        if not isinstance(v, list): self.err(key, "expected a list"); return []
+        return [_Section(x, f"{self.path + '.' if self.path else ''}{key}[{i}]", self.errors) for i, x in enumerate(v)]
+
+def _equip(s: _Section, name: str, cap: float | None, pos=None) -> Equip:
+    return Equip(s.text("name", name), s.pos("pos", pos), s.num("capacity_kg", cap, above=0) if cap is not None else 0.0)
+
+def _pipe(s: _Section, rate: float, dia: int) -> Pipe:
+    return Pipe(s.text("shape", "L", ("L", "U", "auto")), s.num("rate_kgps", rate, above=0),
+                int(s.num("diameter_px", dia, lo=2)), int(s.num("wall_px", 2, lo=0)))
+
+KNOWN = {"recipe", "flags", "layout", "silos", "conveyor", "hoppers", "collector", "belt", "cement_hopper",
+         "cement_silo_capacity_kg", "cement_pipe", "water_silo", "admixture_silo", "water_hopper", "admixture_hopper",
+         "water_pipe", "admixture_pipe", "water_pump", "admixture_pump", "water_tank_capacity_kg", "water_tank_start_kg",
+         "admixture_tank_capacity_kg", "admixture_tank_start_kg", "targets", "batch_log", "dosing", "sequencer",
+         "capacity", "sync", "ui", "view", "tagbus", "historian", "mirror", "trends",
+         "plc", "speeds", "snapshot", "interlocks", "alarms"}
+
+# ---------- compile ----------
+def compile_config(cfg: dict, registry: list[dict] | None = None) -> PlantConfig:
+    """Check every section and build the typed model; raises ConfigError listing all problems.
+    registry: the shared material list (default: apps/ingredients.json)."""
+    if not isinstance(cfg, dict): raise ConfigError([f"config: expected an object, got {type(cfg).__name__}"])
+    errors: list[str] = []; root = _Section(cfg, "", errors)
+    warnings = [f"{k}: unknown section (ignored)" for k in cfg if k not in KNOWN]
+
+    silos = tuple(_equip(s, f"Silo {i+1}", None) for i, s in enumerate(root.items("silos")))
+    hoppers = tuple(_equip(s, f"Agg {i+1}", 1500.0) for i, s in enumerate(root.items("hoppers")))
+    collector = _equip(root.sub("collector"), "Collecting Hopper", 6000.0) if root.has("collector") else None
+    b = root.sub("belt")
+    belt = Belt(b.num("height", 28.0, above=0), b.num("offset_y", 110.0), b.num("speed", 3.0, lo=0),
+                b.text("direction", "right", ("left", "right")))
+    hop = lambda key, name, cap, pos: _equip(root.sub(key), name, cap, pos) if root.has(key) else None
+    cement = hop("cement_hopper", "Cement Weigh Hopper", 500.0, (560, -40))
+    water = hop("water_hopper", "Water Weigh Hopper", 100.0, (1160, -120))
+    admix = hop("admixture_hopper", "Admixture Weigh Hopper", 10.0, (1160, 120))
+    wtank = (root.num("water_tank_capacity_kg", 1000.0, above=0), root.num("water_tank_start_kg", 800.0, lo=0))
+    atank = (root.num("admixture_tank_capacity_kg", 200.0, above=0), root.num("admixture_tank_start_kg", 160.0, lo=0))
+    for name, (cap, start) in (("water_tank", wtank), ("admixture_tank", atank)):
+        if start > cap: errors.append(f"{name}_start_kg: {start:g} kg > capacity {cap:g} kg")
+
+    # targets: one per weighed ingredient, each must fit its weigh hopper (dosing refuses otherwise)
+    t = root.sub("targets"); defaults = [600, 500, 400, 300]
+    spec = [(f"Agg{i+1}", h.name, f"agg{i+1}", "aggregate", h, None) for i, h in enumerate(hoppers)]
+    spec += [(n, h.name, pre, kind, h, feed) for n, pre, kind, h, feed in (
+        ("Cement", "cement_hopper", "binder", cement, "cement_screw.run"), ("Water", "water_hopper", "water", water, "water_pump.run"),
+        ("Admix", "admix_hopper", "admixture", admix, "admix_pump.run")) if h]
+    reg = load_registry() if registry is None else registry; keys = material_keys(reg)
+    ingredients = []
+    for i, (n, label, pre, kind, h, feed) in enumerate(spec):
+        kg = t.num(n, (defaults[i] if i < len(defaults) else 0) if kind == "aggregate" else 0.0, lo=0)
+        if kg > h.capacity_kg: errors.append(f"targets.{n}: {kg:g} kg does not fit its weigh hopper ({h.capacity_kg:g} kg)")
+        if keys and n.lower() not in keys: warnings.append(f"targets.{n}: not in ingredients.json (the API will not book its actuals)")
+        ingredients.append(Ingredient(n, label, pre, kind, kg, h.capacity_kg, feed, keys.get(n.lower())))
+    targets = {g.name: g.target_kg for g in ingredients}
+    for m in reg:                                   # recipes would ask for material no hopper weighs
+        if not any(g.material == m["key"] for g in ingredients):
+            warnings.append(f"ingredients.json: {m['key']!r} is weighed by no ingredient of this plant (its recipe kg are never booked)")
+    for k in t.d:
+        if k not in targets and k != "Total":
+            warnings.append(f"targets.{k}: no weigh hopper of that name (ignored)")
+    t_total = t.num("Total", sum(g.target_kg for g in ingredients if g.kind == "aggregate"), lo=0)
+
+    v = root.sub("view")
+    details = []
+    for d in v.items("details"):
+        show = d.d.get("show", [])
+        if not (isinstance(show, list) and show and all(isinstance(x, str) for x in show)):
+            d.err("show", f"expected a list of names, got {show!r}"); continue
+        bad = [x for x in show if x not in DETAIL_ITEMS]
+        if bad: d.err("show", f"{', '.join(map(repr, bad))} not one of {', '.join(DETAIL_ITEMS)}"); continue
+        details.append(Detail(d.text("title", ", ".join(show)), tuple(show)))
+    view = View(v.flag("accelerated", False), v.text("update_mode", "smart", ("minimal", "smart", "bounding", "full")),
+                v.flag("antialias", True), v.flag("lod", True), v.flag("zoom", False), tuple(details),
+                v.num("detail_fps", 15.0, lo=0))
+    sp = root.sub("speeds")
+    speeds = {k: sp.num(k, d) for k, d in (("silo_fill_per_tick", 0.02), ("silo_bleed_per_tick", -0.015),
+                                           ("mixer_arrow_deg_per_tick", 2.4))}
+    pc = dict(
+        recipe=root.text("recipe", "Default"), draggable=root.sub("flags").flag("draggable", True),
+        mixer_pos=root.sub("layout").pos("mixer_pos"), silos=silos, hoppers=hoppers, collector=collector, belt=belt,
+        cement_hopper=cement, water_hopper=water, admix_hopper=admix,
+        cement_silo_kg=root.num("cement_silo_capacity_kg", 20000.0, above=0),
+        cement_pipe=_pipe(root.sub("cement_pipe"), 22.5, 18), water_pipe=_pipe(root.sub("water_pipe"), 18.0, 16),
+        admix_pipe=_pipe(root.sub("admixture_pipe"), 3.5, 12),
+        water_pump_pos=root.sub("water_pump").pos("pos", (900, -60)), admix_pump_pos=root.sub("admixture_pump").pos("pos", (900, 200)),
+        water_tank=wtank, admix_tank=atank, targets=targets, ingredients=tuple(ingredients), t_total=t_total, view=view,
+        status_hz=root.sub("ui").num("status_hz", 4.0, above=0), settle_ms=int(root.sub("tagbus").num("settle_ms", 1000, lo=10)),
+        speeds=speeds)
+    _check_subsystems(root, errors)
+    if errors: raise ConfigError(errors)
+    return PlantConfig(**pc, raw=cfg, warnings=tuple(warnings))
+
+def _check_subsystems(root: _Section, errors: list[str]):
+    """Types and ranges of the sections other modules read with their own from_config."""
+    tb = root.sub("tagbus").sub("deadbands")
+    for k in tb.d: tb.num(k, lo=0)
+    h = root.sub("historian")
+    if h.flag("enabled", False):
+        h.text("dir", "history"); h.num("rate_hz", 10, above=0, hi=10); h.num("flush_s", 5, above=0)
+        h.num("heartbeat_s", 60, above=0); h.num("retain_hours", 168, above=0)
+        for k in h.sub("tags").d: h.sub("tags").num(k, lo=0)
+    sn = root.sub("snapshot")
+    if sn.flag("enabled", False):
+        sn.text("path", "state.snap"); sn.num("every_s", 1.0, above=0); sn.num("max_age_h", 12, lo=0)
+        tags = sn.d.get("tags", [])
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            sn.err("tags", f"expected a list of tag name patterns, got {tags!r}")
+    m = root.sub("mirror")
+    if m.flag("enabled", False):
+        m.text("host", "127.0.0.1"); m.num("port", 8765, lo=1, hi=65535); m.num("rate_hz", 5, above=0, hi=10)
+        m.num("max_viewers", 64, lo=1); m.num("max_backlog_kb", 256, lo=4); m.text("token", "")
+    tr = root.sub("trends"); tr.flag("visible", False); tr.num("refresh_ms", 1000, lo=50)
+    for s in tr.items("series"):
+        if not s.has("tag"): s.err("tag", "missing")
+    bl = root.sub("batch_log")
+    bl.text("backend", "sqlite", ("sqlite", "csv")); bl.text("fsync", "batch", ("always", "batch", "interval", "off"))
+    bl.num("fsync_s", 5, above=0)
+    d = root.sub("dosing")
+    if d.flag("enabled", False):
+        d.num("rate_hz", 20, above=0, hi=200); d.num("learn", 0.3, lo=0, hi=1)
+        fs = d.sub("feeders")
+        for pat in fs.d:
+            f = fs.sub(pat)
+            if not f.has("run"): f.err("run", "missing (the output that runs this feeder)")
+            for k in ("fine_kg", "inflight_kg", "tolerance_kg", "settle_s", "topup_s", "timeout_s"): f.num(k, lo=0)
+            sim = f.sub("sim")
+            for k in ("coarse_kgps", "fine_kgps"): sim.num(k, above=0)
+            sim.num("fall_s", lo=0)
+    sq = root.sub("sequencer")
+    if sq.flag("enabled", False):
+        if not d.flag("enabled", False): sq.err("enabled", "needs dosing.enabled")
+        sq.flag("pipelined", True); sq.num("batches", 5, lo=1); sq.num("batch_m3", 1.0, above=0)
+        sq.num("mix_s", 30, lo=0); sq.num("empty_kg", 2.0, lo=0); sq.num("charge_settle_s", 4.0, lo=0)
+        ss = sq.sub("sim")
+        for k in ss.d: ss.num(k, above=0) if k.endswith("kgps") else ss.num(k, lo=0)
+    il = root.sub("interlocks")
+    il.flag("hopper_full", True); il.text("audit", "interlocks.log"); il.num("keep", 500, lo=1)
+    rules = il.d.get("rules", [])
+    if not isinstance(rules, list): il.err("rules", f"expected a list of rules, got {rules!r}")
+    else:
+        from interlocks import RuleError, parse_rule
+        for i, r in enumerate(rules):
+            try: parse_rule(r)
+            except RuleError as e: il.err(f"rules[{i}]", str(e))
+        names = [r.get("name") for r in rules if isinstance(r, dict)]
+        for n in sorted({n for n in names if isinstance(n, str) and names.count(n) > 1}): il.err("rules", f"{n}: rule name used twice")
+    al = root.sub("alarms")
+    if al.flag("enabled", False):
+        al.text("journal", "alarms.db"); al.num("retain_days", 90, lo=0); al.num("max_shelve_h", 8, above=0)
+        al.flag("overfill", True); al.flag("tolerance", True)
+        fl = al.sub("flood"); fl.num("window_s", 10, above=0); fl.num("max", 10, lo=1); fl.text("keep", "high", ("high", "medium", "low"))
+        defs = al.d.get("defs", [])
+        if not isinstance(defs, list): al.err("defs", f"expected a list of alarms, got {defs!r}")
+        else:
+            from interlocks import RuleError
+            from alarms.engine import parse_alarm
+            for i, d in enumerate(defs):
+                try: parse_alarm(d)
+                except RuleError as e: al.err(f"defs[{i}]", str(e))
+            ids = [d.get("id") for d in defs if isinstance(d, dict)]
+            for n in sorted({n for n in ids if isinstance(n, str) and ids.count(n) > 1}): al.err("defs", f"{n}: alarm id used twice")
+    sy = root.sub("sync")
+    if sy.flag("enabled", False):
+        url = sy.text("url", "")
+        if not url.startswith(("http://", "https://")): sy.err("url", f"expected an http(s) URL, got {url!r}")
+        sy.num("batch_max", 50, lo=1); sy.num("timeout_s", 5, above=0); sy.num("backoff_max_s", 60, above=0)
+        sy.num("park_after", 10, lo=1)
+    for tk in root.sub("capacity").items("trucks"): tk.num("capacity_m3", 15.0, above=0)
+    p = root.sub("plc")
+    if p.flag("enabled", False):
+        p.text("host", ""); p.num("port", 5007, lo=1, hi=65535); p.text("client", "asyncio"); p.num("scan_ms", 100, lo=1)
+    tags = p.sub("tags")
+    for name in tags.d:                                  # built as start_plc() will, so a bad tag fails here, not after Qt
+        tg = tags.sub(name)
+        if not tg.has("addr"): tg.err("addr", "missing"); continue
+        addr = tg.text("addr", None); typ = tg.text("type", "real", tuple(TAG_WIDTH))
+        if addr is None: continue
+        try: parse_address(addr)
+        except ValueError: tg.err("addr", f"{addr!r} is not a PLC address (D100, M10, X17, ...)"); continue
+        try: make_tag(name, addr, typ)
+        except ValueError: tg.err("type", f"{typ!r} does not fit {addr} ({'bit' if is_bit_device(addr.strip()[0].upper()) else 'real, dint or word'})")
+
+def check_file(path: str) -> PlantConfig:
+    """Load + compile; a JSON syntax error is reported like the other problems."""
+    import json
+    try:
+        with open(path, encoding="utf-8") as f: cfg = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigError([f"{path}: line {e.lineno} column {e.colno}: {e.msg}"]) from None
+    except OSError as e:
+        raise ConfigError([f"{path}: {e.strerror}"]) from None
+    return compile_config(cfg)
+
+if __name__ == "__main__":
+    import os, sys
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+    try:
+        pc = check_file(path)
+    except ConfigError as e:
+        print(f"{path}: {len(e.errors)} problem(s)\n  " + "\n  ".join(e.errors), file=sys.stderr); sys.exit(2)
+    for w in pc.warnings: print(f"warning: {w}", file=sys.stderr)
+    print(f"{path}: OK ({len(pc.silos)} silos, {len(pc.hoppers)} aggregate hoppers, recipe {pc.recipe!r})")
@@ -0,0 +1,4 @@
+# plantsim package — discrete-event capacity model of the plant (m3/h, bottlenecks, truck waits), no Qt
+from .model import PlantParams, Feed, trucks_from_api, with_overrides
+from .engine import PlantSim
+from .sweep import sweep, grid
@@ -0,0 +1,70 @@
+# plantsim/__main__.py — capacity planning from the command line (run from apps/desktop)
+#   python -m plantsim run                                   # config.json plant + capacity.trucks, 2000 batches
+#   python -m plantsim run --api http://127.0.0.1:8000       # trucks from the office API (Vehicle.capacity_m3)
+#   python -m plantsim sweep --set trucks=3,4,6,8 --set mix_s=20,30,45 --seeds 3
+#   python -m plantsim sweep --set rate.Cement=15,22.5,30 --set trip_min=30,45,60 --workers 4
+import argparse, json, os, sys, time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path: sys.path.insert(0, APP_DIR)
+from plantsim import PlantParams, PlantSim, sweep, trucks_from_api
+
+UTIL = ("weigh", "mixer", "belt", "bay", "trucks")
+
+def _value(s: str):
+    try: return json.loads(s)
+    except ValueError: return s
+
+def _table(headers: list[str], rows: list[list]):
+    cells = [headers] + [[f"{c:.2f}" if isinstance(c, float) else str(c) for c in r] for r in rows]
+    w = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    for n, r in enumerate(cells):
+        print("  ".join(c.rjust(w[i]) if i else c.ljust(w[i]) for i, c in enumerate(r)))
+        if n == 0: print("  ".join("-" * x for x in w))
+
+def _row(label: str, r: dict) -> list:
+    return [label, r["m3_per_h"], r["cycle_s"]] + [r["util"][k] * 100.0 for k in UTIL] + \
+           [r["mixer_blocked"] * 100.0, r["cement_starved"] * 100.0, r["truck_wait_mean"] / 60.0,
+            r["truck_wait_p95"] / 60.0, r["bottleneck"]]
+
+HEAD = ["case", "m3/h", "cycle s"] + [f"{k} %" for k in UTIL] + ["no truck %", "no cement %", "wait min", "p95 min", "bottleneck"]
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m plantsim", description="Plant throughput simulator")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("run", "sweep"):
+        sp = sub.add_parser(name)
+        sp.add_argument("--config", default=os.path.join(APP_DIR, "config.json"))
+        sp.add_argument("--api", help="office API base URL: trucks from GET /api/vehicles")
+        sp.add_argument("--batches", type=int, default=2000)
+        sp.add_argument("--seeds", type=int, default=3)
+        if name == "sweep":
+            sp.add_argument("--set", action="append", default=[], metavar="KEY=V1,V2,..",
+                            help="field, trucks, truck_m3, trip_min, rate.<Ingredient>, target.<Ingredient>")
+            sp.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU, 1 = inline)")
+    a = ap.parse_args()
+
+    with open(a.config, encoding="utf-8") as f: cfg = json.load(f)
+    p = PlantParams.from_config(cfg, trucks_from_api(a.api) if a.api else None)
+    fleet = ", ".join(f"{n} {c:g} m3" for n, c in p.trucks) or "none (never waits for a truck)"
+    print(f"== {a.batches} batches x {p.batch_m3:g} m3, mix {p.mix_s:g} s, {'pipelined' if p.pipelined else 'sequential'}; trucks: {fleet}")
+    if a.cmd == "run":
+        t = time.perf_counter(); r = sweep(p, {}, batches=a.batches, seeds=tuple(range(1, a.seeds + 1)), workers=1)[0]
+        _table(HEAD, [_row("config", r)])
+        print(f"({a.seeds} x {a.batches} batches = {r['hours'] * a.seeds:.0f} plant hours in {time.perf_counter() - t:.2f} s)")
+        return
+    spec = {}
+    for s in a.set:
+        k, _, vs = s.partition("=")
+        if not vs: ap.error(f"--set {s}: expected KEY=V1,V2,..")
+        spec[k.strip()] = [_value(v) for v in vs.split(",")]
+    t = time.perf_counter()
+    try:
+        rows = sweep(p, spec, batches=a.batches, seeds=tuple(range(1, a.seeds + 1)), workers=a.workers)
+    except ValueError as e:
+        ap.error(str(e))
+    _table(HEAD, [_row(" ".join(f"{k}={v}" for k, v in r["case"].items()) or "config", r) for r in rows])
+    print(f"({len(rows)} cases x {a.seeds} seeds in {time.perf_counter() - t:.2f} s)")
+
+if __name__ == "__main__":
+    main()
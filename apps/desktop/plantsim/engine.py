@@ -0,0 +1,177 @@
+# plantsim/engine.py — discrete-event simulation of the batch cycle, trucks and cement supply (no Qt, no ticks)
+import heapq, math, random
+from collections import deque
+from .model import PlantParams
+
+# weigh station / mixer / loading bay states (mixer follows control.sequencer; "blocked" = mixed, no truck)
+IDLE, STARVED, WEIGHING, WEIGHED, CHARGING = "idle", "starved", "weighing", "weighed", "charging"
+EMPTY, MIXING, BLOCKED, DISCHARGING = "empty", "mixing", "blocked", "discharging"
+FREE, POSITIONING, LOADING = "free", "positioning", "loading"
+
+class Track:
+    """Seconds spent in each state since the last reset."""
+    def __init__(self, state: str, t: float = 0.0):
+        self.state = state; self.t = t; self.acc: dict[str, float] = {}
+
+    def set(self, state: str, t: float):
+        self.acc[self.state] = self.acc.get(self.state, 0.0) + t - self.t; self.state = state; self.t = t
+
+    def reset(self, t: float): self.acc = {}; self.t = t
+
+    def share(self, t: float, *states: str) -> float:
+        span = sum(self.acc.values()) + t - self.t
+        s = sum(self.acc.get(x, 0.0) for x in states) + (t - self.t if self.state in states else 0.0)
+        return s / span if span > 0 else 0.0
+
+class Truck:
+    __slots__ = ("name", "capacity_m3", "load_m3", "batches", "t_arrive", "loads")
+    def __init__(self, name: str, capacity_m3: float):
+        self.name = name; self.capacity_m3 = capacity_m3; self.load_m3 = 0.0; self.batches = 0
+        self.t_arrive = 0.0; self.loads = 0
+
+class PlantSim:
+    """
+    Event-driven model of one plant, following the BatchSequencer cycle:
+      weigh    all weigh hoppers in parallel (Feed.time_s), cement only if the silo holds the target
+      charge   once the mixer is empty: hoppers discharge (aggregates over the belt, +belt_s), +charge_settle_s
+      mix      mix_s, then discharge into the truck under the mixer (blocked while there is none)
+    A truck leaves when it holds no room for another batch, comes back after a lognormal round trip and
+    queues for the bay (bay_s to change trucks). The silo orders a tanker below reorder_kg.
+    run() jumps from event to event, so thousands of batches take milliseconds.
+    """
+    def __init__(self, p: PlantParams, seed: int | None = None):
+        self.p = p; self.rng = random.Random(seed); self.t = 0.0; self._q: list = []; self._n = 0
+        self.ws = Track(IDLE); self.mixer = Track(EMPTY); self.bay = Track(FREE); self.belt = Track(IDLE)
+        self.todo = 0; self.done = 0; self.weighed = 0; self.m3 = 0.0
+        self.silo = float(min(p.silo_kg, p.silo_start_kg)); self.tanker_due = False; self.tankers = 0
+        self.trucks = [Truck(n, c) for n, c in p.trucks]; self.queue: deque[Truck] = deque(self.trucks)
+        self.at_bay: Truck | None = None; self.waits: list[float] = []; self.fleet_wait = 0.0
+        self.t0 = 0.0; self.done0 = 0; self.m3_0 = 0.0
+
+    # ---------- event queue ----------
+    def at(self, dt: float, fn, *args):
+        heapq.heappush(self._q, (self.t + dt, self._n, fn, args)); self._n += 1
+
+    def _j(self, x: float) -> float:
+        return x * (1.0 + self.rng.uniform(-self.p.jitter, self.p.jitter)) if self.p.jitter else x
+
+    def run(self, batches: int, warmup: int | None = None) -> dict:
+        """Simulate `batches` batches; statistics exclude the first `warmup` (default 5 %, at least 3)."""
+        self.todo = int(batches); warmup = max(3, batches // 20) if warmup is None else int(warmup)
+        warmup = min(warmup, max(0, batches - 2))
+        if warmup == 0: self._mark()
+        self._next_truck(); self._try_weigh()
+        while self._q and self.done < batches:
+            t, _, fn, args = heapq.heappop(self._q); self.t = t; fn(*args)
+            if self.done == warmup and self.done0 != warmup and warmup: self._mark()
+        return self.report()
+
+    def _mark(self):
+        """Start of the measured window (after the pipeline and the truck queue have filled)."""
+        self.t0 = self.t; self.done0 = self.done; self.m3_0 = self.m3; self.waits = []; self.fleet_wait = 0.0
+        for tr in (self.ws, self.mixer, self.bay, self.belt): tr.reset(self.t)
+        for trk in self.queue: trk.t_arrive = max(trk.t_arrive, self.t)
+
+    # ---------- weigh station ----------
+    def _try_weigh(self):
+        p = self.p
+        if self.ws.state not in (IDLE, STARVED) or self.todo <= 0: return
+        if not p.pipelined and (self.mixer.state != EMPTY): return
+        cement = p.targets.get("Cement", 0.0)
+        if cement > self.silo:
+            self.ws.set(STARVED, self.t); self._order_tanker(); return
+        self.silo -= cement
+        if self.silo < p.reorder_kg: self._order_tanker()
+        self.todo -= 1; self.ws.set(WEIGHING, self.t)
+        self.at(max(self._j(p.feeds[n].time_s(kg)) for n, kg in p.targets.items() if kg > 0), self._weighed)
+
+    def _weighed(self):
+        self.weighed += 1; self.ws.set(WEIGHED, self.t); self._try_charge()
+
+    def _order_tanker(self):
+        if self.tanker_due: return
+        self.tanker_due = True; self.at(self.p.tanker_lead_s + self.p.tanker_kg / self.p.tanker_kgps, self._tanker_in)
+
+    def _tanker_in(self):
+        self.silo = min(self.p.silo_kg, self.silo + self.p.tanker_kg); self.tanker_due = False; self.tankers += 1
+        if self.silo < self.p.reorder_kg: self._order_tanker()
+        self._try_weigh()
+
+    # ---------- mixer ----------
+    def _try_charge(self):
+        p = self.p
+        if self.ws.state != WEIGHED or self.mixer.state != EMPTY: return
+        self.ws.set(CHARGING, self.t); self.mixer.set(CHARGING, self.t)
+        out = {n: self._j(kg / p.discharge_kgps[n]) for n, kg in p.targets.items() if kg > 0}
+        agg = max((s for n, s in out.items() if n.startswith("Agg")), default=0.0)
+        rest = max((s for n, s in out.items() if not n.startswith("Agg")), default=0.0)
+        if agg: self.belt.set("run", self.t); self.at(agg + p.belt_s, self._belt_idle)
+        self.at(max(agg, rest), self._hoppers_empty)
+        self.at(max(agg + (p.belt_s if agg else 0.0), rest) + p.charge_settle_s, self._charged)
+
+    def _belt_idle(self): self.belt.set(IDLE, self.t)
+
+    def _hoppers_empty(self):
+        self.ws.set(IDLE, self.t); self._try_weigh()
+
+    def _charged(self):
+        self.mixer.set(MIXING, self.t); self.at(self.p.mix_s, self._mixed)
+
+    def _mixed(self):
+        self.mixer.set(BLOCKED, self.t); self._try_discharge()
+
+    def _try_discharge(self):
+        if self.mixer.state != BLOCKED: return
+        if self.trucks and (self.at_bay is None or self.bay.state != LOADING): return
+        self.mixer.set(DISCHARGING, self.t); self.at(self._j(self.p.batch_kg / self.p.mixer_kgps), self._discharged)
+
+    def _discharged(self):
+        self.done += 1; self.m3 += self.p.batch_m3; self.mixer.set(EMPTY, self.t)
+        trk = self.at_bay
+        if trk is not None:
+            trk.load_m3 += self.p.batch_m3; trk.batches += 1
+            if trk.batches >= self.p.batches_per_truck(trk.capacity_m3): self._depart(trk)
+        self._try_charge(); self._try_weigh()
+
+    # ---------- trucks ----------
+    def _trip(self) -> float:
+        p = self.p
+        if p.trip_cv <= 0: return p.trip_s
+        sigma = math.sqrt(math.log(1.0 + p.trip_cv ** 2))
+        return self.rng.lognormvariate(math.log(p.trip_s) - sigma * sigma / 2.0, sigma)
+
+    def _depart(self, trk: Truck):
+        trk.loads += 1; trk.load_m3 = 0.0; trk.batches = 0
+        self.at_bay = None; self.bay.set(FREE, self.t); self.at(self._trip(), self._truck_back, trk); self._next_truck()
+
+    def _truck_back(self, trk: Truck):
+        trk.t_arrive = self.t; self.queue.append(trk); self._next_truck()
+
+    def _next_truck(self):
+        if self.at_bay is not None or not self.queue: return
+        trk = self.queue.popleft(); w = self.t - trk.t_arrive
+        self.waits.append(w); self.fleet_wait += w
+        self.at_bay = trk; self.bay.set(POSITIONING, self.t); self.at(self.p.bay_s, self._truck_ready)
+
+    def _truck_ready(self):
+        self.bay.set(LOADING, self.t); self._try_discharge()
+
+    # ---------- report ----------
+    def report(self) -> dict:
+        """m3/h, cycle, state shares (0..1) and truck waits (s) over the measured window."""
+        t = self.t; span = t - self.t0; n = self.done - self.done0
+        queued = sum(t - trk.t_arrive for trk in self.queue)          # still waiting at the end
+        waits = sorted(self.waits); nt = len(self.trucks)
+        util = {"weigh": self.ws.share(t, WEIGHING), "mixer": self.mixer.share(t, CHARGING, MIXING, DISCHARGING),
+                "belt": self.belt.share(t, "run"),                                       # bay: truck changes + pouring
+                "bay": self.bay.share(t, POSITIONING) + (self.mixer.share(t, DISCHARGING) if nt else 0.0),
+                "trucks": 1.0 - (self.fleet_wait + queued) / (nt * span) if nt and span > 0 else 0.0}
+        starved = self.ws.share(t, STARVED)
+        return {"batches": n, "hours": span / 3600.0, "m3_per_h": (self.m3 - self.m3_0) * 3600.0 / span if span > 0 else 0.0,
+                "cycle_s": span / n if n else 0.0, "util": util,
+                "bottleneck": "cement supply" if starved >= 0.05 else max(util, key=util.get),
+                "mixer_blocked": self.mixer.share(t, BLOCKED), "mixer_starved": self.mixer.share(t, EMPTY),
+                "cement_starved": starved, "tankers": self.tankers,
+                "truck_wait_mean": sum(waits) / len(waits) if waits else 0.0,
+                "truck_wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "truck_wait_max": waits[-1] if waits else 0.0, "loads": sum(trk.loads for trk in self.trucks)}
@@ -0,0 +1,97 @@
+# plantsim/model.py — plant parameters for the capacity simulator, read from config.json (and the API's vehicles)
+import json, math, urllib.request
+from dataclasses import dataclass, field, fields, replace
+from control.dosing import feeder_config
+
+@dataclass
+class Feed:
+    """One weigh-hopper feeder: coarse, then fine for the last fine_kg, then fall + settle (as DosingEngine does)."""
+    coarse_kgps: float
+    fine_kgps: float
+    fine_kg: float = 0.0
+    fall_s: float = 0.5
+    settle_s: float = 1.0
+
+    def time_s(self, kg: float) -> float:
+        fine = min(kg, self.fine_kg) if self.fine_kgps > 0 else 0.0
+        return (kg - fine) / self.coarse_kgps + (fine / self.fine_kgps if fine else 0.0) + self.fall_s + self.settle_s
+
+@dataclass
+class PlantParams:
+    """Everything the simulator needs; times in seconds, rates in kg/s. Sweeps override fields by name."""
+    targets: dict[str, float]                    # kg per batch per ingredient (Agg1.., Cement, Water, Admix)
+    feeds: dict[str, Feed]                       # bins/silo/tanks -> weigh hoppers
+    discharge_kgps: dict[str, float]             # weigh hopper -> mixer (aggregates onto the belt)
+    trucks: list[tuple[str, float]] = field(default_factory=list)   # (name, capacity_m3); [] = never waits for a truck
+    batch_m3: float = 1.0
+    belt_s: float = 4.0                          # aggregate transit on the belt
+    charge_settle_s: float = 4.0
+    mix_s: float = 30.0
+    mixer_kgps: float = 300.0                    # mixer -> truck
+    pipelined: bool = True                       # weigh the next batch while the mixer runs (BatchSequencer)
+    trip_s: float = 2700.0                       # truck round trip (drive, pour, return), mean
+    trip_cv: float = 0.25                        # its coefficient of variation (lognormal)
+    bay_s: float = 60.0                          # truck change under the mixer
+    silo_kg: float = 20000.0                     # cement silo: capacity, stock at start, tanker ordered below reorder_kg
+    silo_start_kg: float = 20000.0
+    reorder_kg: float = 6000.0
+    tanker_kg: float = 15000.0
+    tanker_lead_s: float = 3600.0                # order -> tanker on site; then tanker_kg / tanker_kgps to blow in
+    tanker_kgps: float = 15.0
+    jitter: float = 0.05                         # +/- fraction on every feed and trip time
+
+    @property
+    def batch_kg(self) -> float: return sum(self.targets.values())
+
+    def batches_per_truck(self, capacity_m3: float) -> int:
+        return max(1, int(math.floor(capacity_m3 / self.batch_m3 + 1e-9)))
+
+    @classmethod
+    def from_config(cls, cfg: dict, trucks: list[tuple[str, float]] | None = None) -> "PlantParams":
+        """Targets, feeder rates (pipe rate_kgps for cement/water/admix), sequencer timing and cfg["capacity"]."""
+        t = cfg.get("targets", {}); dcfg = cfg.get("dosing") or {}; scfg = cfg.get("sequencer") or {}
+        sim = scfg.get("sim") or {}; ccfg = cfg.get("capacity") or {}
+        names = [f"Agg{i+1}" for i in range(len(cfg.get("hoppers", [])))]
+        pipes = {"Cement": ("cement_hopper", "cement_pipe"), "Water": ("water_hopper", "water_pipe"),
+                 "Admix": ("admixture_hopper", "admixture_pipe")}
+        names += [n for n, (hop, _) in pipes.items() if cfg.get(hop)]
+        feeds, dis = {}, {}
+        for n in names:
+            fc = feeder_config(dcfg, n) or {}; fs = fc.get("sim") or {}
+            coarse = float((cfg.get(pipes[n][1]) or {}).get("rate_kgps", 0) if n in pipes else 0) or float(fs.get("coarse_kgps", 20.0))
+            feeds[n] = Feed(coarse, float(fs.get("fine_kgps", 4.0)), float(fc.get("fine_kg", 0.0)),
+                            float(fs.get("fall_s", 0.5)), float(fc.get("settle_s", 1.0)))
+            dis[n] = float(sim.get("agg_kgps" if n.startswith("Agg") else f"{n.lower()}_kgps", 50.0))
+        if trucks is None: trucks = [(v.get("name", f"Truck-{i+1:02d}"), float(v.get("capacity_m3", 15.0)))
+                                     for i, v in enumerate(ccfg.get("trucks", []))]
+        kw = {f.name: ccfg[f.name] for f in fields(cls) if f.name in ccfg and f.name not in ("targets", "feeds", "trucks")}
+        for k in ("trip", "tanker_lead"):                                # config in minutes
+            if f"{k}_min" in ccfg: kw[f"{k}_s"] = float(ccfg[f"{k}_min"]) * 60.0
+        return cls({n: float(t.get(n, 0.0)) for n in names}, feeds, dis, trucks,
+                   batch_m3=float(scfg.get("batch_m3", 1.0)), belt_s=float(sim.get("belt_s", 4.0)),
+                   charge_settle_s=float(scfg.get("charge_settle_s", 4.0)), mix_s=float(scfg.get("mix_s", 30.0)),
+                   mixer_kgps=float(sim.get("mixer_kgps", 300.0)), pipelined=bool(scfg.get("pipelined", True)),
+                   silo_kg=float(cfg.get("cement_silo_capacity_kg", 20000.0)), **kw)
+
+def trucks_from_api(base_url: str, timeout_s: float = 5.0) -> list[tuple[str, float]]:
+    """The office API's vehicles (GET /api/vehicles): [(name, capacity_m3)]."""
+    with urllib.request.urlopen(base_url.rstrip("/") + "/api/vehicles", timeout=timeout_s) as resp:
+        return [(str(v["name"]), float(v.get("capacity_m3") or 15.0)) for v in json.loads(resp.read())]
+
+def with_overrides(p: PlantParams, ov: dict) -> PlantParams:
+    """Copy of p with sweep overrides: any field name, "trucks" (count, first truck's size), "truck_m3",
+    "trip_min", "rate.<Ingredient>" (coarse feed kg/s) or "target.<Ingredient>" (kg)."""
+    p = replace(p, targets=dict(p.targets), feeds=dict(p.feeds), trucks=list(p.trucks))
+    names = {f.name for f in fields(p)}
+    for k, v in ov.items():
+        if k == "trucks":
+            cap = p.trucks[0][1] if p.trucks else 15.0; p.trucks = [(f"Truck-{i+1:02d}", cap) for i in range(int(v))]
+        elif k == "truck_m3": p.trucks = [(n, float(v)) for n, _ in p.trucks]
+        elif k == "trip_min": p.trip_s = float(v) * 60.0
+        elif k.startswith("rate.") and k[5:] in p.feeds: p.feeds[k[5:]] = replace(p.feeds[k[5:]], coarse_kgps=float(v))
+        elif k.startswith("target.") and k[7:] in p.targets: p.targets[k[7:]] = float(v)
+        elif k in names and k not in ("targets", "feeds", "discharge_kgps"):
+            setattr(p, k, type(getattr(p, k))(v))
+        else:
+            raise ValueError(f"unknown parameter: {k}")
+    return p
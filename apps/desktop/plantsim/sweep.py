@@ -0,0 +1,39 @@
+# plantsim/sweep.py — parameter sweeps over PlantSim, one case per worker process
+import itertools, os
+from concurrent.futures import ProcessPoolExecutor
+from .model import PlantParams, with_overrides
+from .engine import PlantSim
+
+def grid(spec: dict[str, list]) -> list[dict]:
+    """{"mix_s": [20, 30], "trucks": [3, 6]} -> every combination as an overrides dict."""
+    keys = list(spec)
+    return [dict(zip(keys, vals)) for vals in itertools.product(*(spec[k] for k in keys))]
+
+def run_case(case: tuple) -> dict:
+    """(params, overrides, batches, seed) -> PlantSim report + the overrides (top level: picklable)."""
+    p, ov, batches, seed = case
+    r = PlantSim(with_overrides(p, ov), seed=seed).run(batches); r["case"] = ov; r["seed"] = seed
+    return r
+
+def mean_reports(reps: list[dict]) -> dict:
+    """Seed-averaged report (numbers and util shares); the bottleneck is the most frequent one."""
+    out = dict(reps[0]); out["seeds"] = len(reps)
+    for k, v in reps[0].items():
+        if isinstance(v, (int, float)) and not isinstance(v, bool): out[k] = sum(r[k] for r in reps) / len(reps)
+    out["util"] = {k: sum(r["util"][k] for r in reps) / len(reps) for k in reps[0]["util"]}
+    names = [r["bottleneck"] for r in reps]; out["bottleneck"] = max(set(names), key=names.count)
+    return out
+
+def sweep(p: PlantParams, spec: dict[str, list], *, batches: int = 2000, seeds=(1, 2, 3),
+          workers: int | None = None) -> list[dict]:
+    """All grid(spec) cases x seeds; workers=1 runs in this process, otherwise a process pool
+    (the GIL keeps threads from helping: every case is pure Python)."""
+    cases = [(p, ov, batches, s) for ov in grid(spec) for s in seeds]
+    if workers == 1 or len(cases) == 1:
+        reps = [run_case(c) for c in cases]
+    else:
+        workers = workers or min(len(cases), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            reps = list(ex.map(run_case, cases, chunksize=max(1, len(cases) // (workers * 4))))
+    n = len(seeds)
+    return [mean_reports(reps[i:i + n]) for i in range(0, len(reps), n)]
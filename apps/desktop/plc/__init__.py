@@ -0,0 +1 @@
+# plc package marker (FX5U MC-Protocol I/O)
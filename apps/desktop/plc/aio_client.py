@@ -0,0 +1,122 @@
+# plc/aio_client.py — asyncio MC-Protocol 3E client: persistent connection, pipelining, reconnect
+import asyncio, collections, time
+from . import mc_protocol as mc
+
+class LatencyStats:
+    """Round-trip times of the last `window` requests plus lifetime counters."""
+    def __init__(self, window: int = 512):
+        self.samples = collections.deque(maxlen=window)
+        self.requests = 0; self.timeouts = 0; self.errors = 0; self.reconnects = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds); self.requests += 1
+
+    def summary(self) -> dict:
+        s = sorted(self.samples); n = len(s)
+        pick = lambda q: s[min(n - 1, int(q * n))] * 1000.0 if n else 0.0
+        return {"n": self.requests, "mean_ms": (sum(s) / n * 1000.0) if n else 0.0,
+                "p50_ms": pick(0.50), "p95_ms": pick(0.95), "max_ms": s[-1] * 1000.0 if n else 0.0,
+                "timeouts": self.timeouts, "req_errors": self.errors, "reconnects": self.reconnects}
+
+class AsyncMcClient:
+    """
+    One TCP connection reused for every request. Up to `max_inflight` requests are written
+    back-to-back without waiting; the 3E frame has no serial number, so a single reader task
+    matches responses to requests in FIFO order (the PLC answers in order on one connection).
+    A timeout or socket error drops the connection and fails everything in flight — the stream
+    can no longer be trusted — and the next request reconnects after an exponential backoff.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 5007, *, timeout: float = 1.0,
+                 max_inflight: int = 8, backoff_min: float = 0.2, backoff_max: float = 5.0):
+        self.host = host; self.port = int(port); self.timeout = float(timeout)
+        self.backoff_min = float(backoff_min); self.backoff_max = float(backoff_max)
+        self._backoff = 0.0; self._next_try = 0.0
+        self._max_inflight = max(1, int(max_inflight))
+        self._sem: asyncio.Semaphore | None = None
+        self._conn_lock: asyncio.Lock | None = None
+        self._reader = self._writer = None; self._rx_task = None
+        self._inflight: collections.deque = collections.deque()
+        self.stats = LatencyStats()
+
+    @property
+    def connected(self) -> bool: return self._writer is not None
+
+    # ---------- connection ----------
+    async def connect(self):
+        if self._conn_lock is None:
+            self._conn_lock = asyncio.Lock(); self._sem = asyncio.Semaphore(self._max_inflight)
+        async with self._conn_lock:
+            if self._writer is not None: return
+            wait = self._next_try - time.monotonic()
+            if wait > 0: await asyncio.sleep(wait)
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                self._backoff = min(self.backoff_max, max(self.backoff_min, self._backoff * 2))
+                self._next_try = time.monotonic() + self._backoff
+                raise ConnectionError(f"PLC {self.host}:{self.port} unreachable (retry in {self._backoff:.1f}s)")
+            if self._backoff: self.stats.reconnects += 1
+            self._backoff = 0.0
+            self._rx_task = asyncio.get_running_loop().create_task(self._rx_loop(self._reader))
+
+    async def close(self):
+        self._drop(ConnectionError("client closed"))
+        if self._rx_task is not None:
+            self._rx_task.cancel()
+            try: await self._rx_task
+            except (asyncio.CancelledError, Exception): pass
+            self._rx_task = None
+
+    def _drop(self, exc: Exception):
+        if self._writer is not None:
+            self._writer.close(); self._writer = self._reader = None
+            self._backoff = max(self._backoff, self.backoff_min)
+            self._next_try = time.monotonic() + self._backoff
+        while self._inflight:
+            fut = self._inflight.popleft()
+            if not fut.done(): fut.set_exception(exc)
+
+    async def _rx_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                head = await reader.readexactly(mc.HEADER_LEN)
+                body = await reader.readexactly(mc.response_length(head) - mc.HEADER_LEN)
+                if not self._inflight: raise mc.McError("unsolicited response")
+                fut = self._inflight.popleft()
+                if not fut.done(): fut.set_result(head + body)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if reader is self._reader: self._drop(ConnectionError(f"PLC link lost: {e}"))
+
+    # ---------- requests ----------
+    async def request(self, frame: bytes) -> bytes:
+        await self.connect()
+        async with self._sem:
+            if self._writer is None: raise ConnectionError("PLC link lost")
+            fut = asyncio.get_running_loop().create_future()
+            t0 = time.perf_counter()
+            self._inflight.append(fut); self._writer.write(frame)
+            try:
+                resp = await asyncio.wait_for(fut, self.timeout)
+            except asyncio.TimeoutError:
+                self.stats.timeouts += 1; self._drop(ConnectionError("PLC response timeout"))
+                raise TimeoutError(f"PLC did not answer within {self.timeout:.2f}s")
+            except Exception:
+                self.stats.errors += 1; raise
+            self.stats.add(time.perf_counter() - t0)
+        return mc.parse_response(resp)
+
+    async def read(self, dev: str, start: int, points: int) -> list[int]:
+        data = await self.request(mc.read_request(dev, start, points))
+        return mc.unpack_bits(data, points) if mc.is_bit_device(dev) else mc.unpack_words(data, points)
+
+    async def write(self, dev: str, start: int, points: list[int]):
+        frame = (mc.write_bits_request if mc.is_bit_device(dev) else mc.write_words_request)(dev, start, points)
+        await self.request(frame)
+
+    async def read_blocks(self, blocks) -> list:
+        """Pipelined: all block reads are on the wire before the first answer comes back."""
+        raws = await asyncio.gather(*(self.read(b.dev, b.start, b.points) for b in blocks))
+        return list(zip(blocks, raws))
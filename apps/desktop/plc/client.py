@@ -0,0 +1,72 @@
+# plc/client.py — blocking MC-Protocol 3E client over one persistent TCP connection
+import socket, threading
+from . import mc_protocol as mc
+
+class McClient:
+    """
+    One socket, reused across requests (reconnects lazily after an error).
+    Thread-safe: a lock serialises request/response pairs.
+      read_words("D", 100, 20) -> [int]      read_bits("M", 0, 16) -> [0/1]
+      write_words("D", 100, [..])            write_bits("M", 0, [..])
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 5007, timeout: float = 1.0):
+        self.host = host; self.port = int(port); self.timeout = float(timeout)
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+        self.frames = 0           # request/response round-trips since creation
+
+    # ---------- connection ----------
+    def connect(self):
+        if self._sock is None:
+            s = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = s
+
+    def close(self):
+        if self._sock is not None:
+            try: self._sock.close()
+            except OSError: pass
+            self._sock = None
+
+    @property
+    def connected(self) -> bool: return self._sock is not None
+
+    def _recv_exact(self, n: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self._sock.recv(n - len(buf))
+            if not chunk: raise ConnectionError("PLC closed the connection")
+            buf += chunk
+        return bytes(buf)
+
+    def request(self, frame: bytes) -> bytes:
+        """Send one request frame, return the response data (end code checked)."""
+        with self._lock:
+            try:
+                self.connect()
+                self._sock.sendall(frame)
+                head = self._recv_exact(mc.HEADER_LEN)
+                rest = self._recv_exact(mc.response_length(head) - mc.HEADER_LEN)
+            except (OSError, ConnectionError):
+                self.close(); raise
+            self.frames += 1
+        return mc.parse_response(head + rest)
+
+    # ---------- batch read / write ----------
+    def read_words(self, dev: str, start: int, points: int) -> list[int]:
+        return mc.unpack_words(self.request(mc.read_request(dev, start, points)), points)
+
+    def read_bits(self, dev: str, start: int, points: int) -> list[int]:
+        return mc.unpack_bits(self.request(mc.read_request(dev, start, points)), points)
+
+    def read(self, dev: str, start: int, points: int) -> list[int]:
+        return (self.read_bits if mc.is_bit_device(dev) else self.read_words)(dev, start, points)
+
+    def write_words(self, dev: str, start: int, words: list[int]):
+        self.request(mc.write_words_request(dev, start, words))
+
+    def write_bits(self, dev: str, start: int, bits: list[int]):
+        self.request(mc.write_bits_request(dev, start, bits))
+
+    def write(self, dev: str, start: int, points: list[int]):
+        (self.write_bits if mc.is_bit_device(dev) else self.write_words)(dev, start, points)
@@ -0,0 +1,115 @@
+# plc/mc_protocol.py — MELSEC MC-Protocol, 3E binary frame (FX5U built-in Ethernet)
+# Only what the plant needs: batch read/write of word (D, R, W) and bit (M, X, Y, B) devices.
+import struct
+
+SUBHEADER_REQ  = 0x0050          # bytes 50 00 on the wire
+SUBHEADER_RESP = 0x00D0          # bytes D0 00 on the wire
+
+CMD_BATCH_READ  = 0x0401
+CMD_BATCH_WRITE = 0x1401
+SUB_WORD = 0x0000
+SUB_BIT  = 0x0001
+
+# device code (iQ-F / Q-series 3E binary codes); X/Y are octal on the FX5U
+DEVICE_CODES = {"D": 0xA8, "R": 0xAF, "W": 0xB4, "M": 0x90, "X": 0x9C, "Y": 0x9D, "B": 0xA0}
+BIT_DEVICES  = {"M", "X", "Y", "B"}
+OCTAL_DEVICES = {"X", "Y"}
+
+MAX_WORD_POINTS = 960           # per batch read/write request
+MAX_BIT_POINTS  = 3584 * 2      # bit units (two points per byte)
+
+HEADER_LEN = 9                  # subheader..data length (response)
+
+class McError(Exception):
+    """Non-zero end code from the PLC, or a malformed frame."""
+    def __init__(self, msg: str, end_code: int | None = None):
+        super().__init__(msg); self.end_code = end_code
+
+def parse_address(addr: str) -> tuple[str, int]:
+    """'D100' -> ('D', 100); 'X17' -> ('X', 15) (octal on FX5U)."""
+    a = str(addr).strip().upper()
+    dev = a[0]; num = a[1:]
+    if dev not in DEVICE_CODES or not num:
+        raise ValueError(f"unsupported PLC address: {addr!r}")
+    return dev, int(num, 8 if dev in OCTAL_DEVICES else 10)
+
+def is_bit_device(dev: str) -> bool:
+    return dev in BIT_DEVICES
+
+# ---------- request frames ----------
+def _frame(command: int, sub: int, body: bytes, *, monitor_timer: int = 0x0010) -> bytes:
+    """3E frame: subheader, net, pc, io, station, length, timer(250 ms units), cmd, sub, body."""
+    payload = struct.pack("<HHH", monitor_timer, command, sub) + body
+    return struct.pack("<HBBHBH", SUBHEADER_REQ, 0x00, 0xFF, 0x03FF, 0x00, len(payload)) + payload
+
+def _device_spec(dev: str, start: int, points: int) -> bytes:
+    return struct.pack("<I", start)[:3] + bytes([DEVICE_CODES[dev]]) + struct.pack("<H", points)
+
+def read_request(dev: str, start: int, points: int, **kw) -> bytes:
+    sub = SUB_BIT if is_bit_device(dev) else SUB_WORD
+    return _frame(CMD_BATCH_READ, sub, _device_spec(dev, start, points), **kw)
+
+def write_words_request(dev: str, start: int, words: list[int], **kw) -> bytes:
+    body = _device_spec(dev, start, len(words)) + struct.pack(f"<{len(words)}H", *(w & 0xFFFF for w in words))
+    return _frame(CMD_BATCH_WRITE, SUB_WORD, body, **kw)
+
+def write_bits_request(dev: str, start: int, bits: list[int], **kw) -> bytes:
+    return _frame(CMD_BATCH_WRITE, SUB_BIT, _device_spec(dev, start, len(bits)) + pack_bits(bits), **kw)
+
+# ---------- payload helpers ----------
+def pack_bits(bits: list[int]) -> bytes:
+    """Bit units: two points per byte, first point in the high nibble."""
+    out = bytearray((len(bits) + 1) // 2)
+    for i, b in enumerate(bits):
+        if b: out[i // 2] |= 0x10 if i % 2 == 0 else 0x01
+    return bytes(out)
+
+def unpack_bits(data: bytes, points: int) -> list[int]:
+    return [((data[i // 2] >> (4 if i % 2 == 0 else 0)) & 0x1) for i in range(points)]
+
+def unpack_words(data: bytes, points: int) -> list[int]:
+    return list(struct.unpack_from(f"<{points}H", data))
+
+def words_to_real(lo: int, hi: int) -> float:
+    """FX5U REAL (float32) occupies two D words, low word first."""
+    return struct.unpack("<f", struct.pack("<HH", lo, hi))[0]
+
+def real_to_words(value: float) -> tuple[int, int]:
+    return struct.unpack("<HH", struct.pack("<f", float(value)))
+
+def words_to_dint(lo: int, hi: int) -> int:
+    return struct.unpack("<i", struct.pack("<HH", lo, hi))[0]
+
+def dint_to_words(value: int) -> tuple[int, int]:
+    return struct.unpack("<HH", struct.pack("<i", int(value)))
+
+# ---------- responses ----------
+def response_length(header: bytes) -> int:
+    """Given the first HEADER_LEN bytes of a response, total frame length."""
+    sub, _, _, _, _, length = struct.unpack("<HBBHBH", header[:HEADER_LEN])
+    if sub != SUBHEADER_RESP: raise McError(f"bad response subheader 0x{sub:04X}")
+    return HEADER_LEN + length
+
+def parse_response(frame: bytes) -> bytes:
+    """Returns the data part; raises McError on a non-zero end code."""
+    total = response_length(frame)
+    if len(frame) < total: raise McError("truncated response")
+    end_code = struct.unpack_from("<H", frame, HEADER_LEN)[0]
+    if end_code != 0: raise McError(f"PLC end code 0x{end_code:04X}", end_code)
+    return frame[HEADER_LEN + 2:total]
+
+def response_frame(data: bytes = b"", end_code: int = 0) -> bytes:
+    """Build a 3E response (used by the simulator)."""
+    body = struct.pack("<H", end_code) + data
+    return struct.pack("<HBBHBH", SUBHEADER_RESP, 0x00, 0xFF, 0x03FF, 0x00, len(body)) + body
+
+def parse_request(frame: bytes) -> tuple[int, int, str, int, int, bytes]:
+    """Simulator side: -> (command, sub, device, start, points, write_payload)."""
+    sub_hdr, _, _, _, _, length = struct.unpack_from("<HBBHBH", frame, 0)
+    if sub_hdr != SUBHEADER_REQ: raise McError(f"bad request subheader 0x{sub_hdr:04X}")
+    _, cmd, sub = struct.unpack_from("<HHH", frame, HEADER_LEN)
+    spec = frame[HEADER_LEN + 6:HEADER_LEN + 12]
+    start = int.from_bytes(spec[:3], "little"); code = spec[3]; points = struct.unpack_from("<H", spec, 4)[0]
+    dev = next((d for d, c in DEVICE_CODES.items() if c == code), None)
+    if dev is None: raise McError(f"unknown device code 0x{code:02X}", 0xC056)
+    return cmd, sub, dev, start, points, frame[HEADER_LEN + 12:HEADER_LEN + length]
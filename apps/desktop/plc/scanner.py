@@ -0,0 +1,127 @@
+# plc/scanner.py — background scan thread: block reads into a snapshot cache, change-only writes
+import threading, time
+from .client import McClient
+from .tags import TagTable, Tag, decode, encode
+
+class TagCache:
+    """
+    Last-known tag values plus the change-only write queue, shared by the GUI thread and an
+    I/O thread. write() drops values the PLC already holds; the I/O side drains with take()
+    and reports back with commit() / requeue() / update().
+    """
+    def __init__(self, table: TagTable):
+        self.table = table
+        self._lock = threading.Lock()
+        self._values: dict[str, object] = {}
+        self._pending: dict[str, object] = {}
+        self.stamp = 0.0
+
+    def get(self, name: str, default=None):
+        with self._lock: return self._values.get(name, default)
+
+    def snapshot(self) -> dict:
+        with self._lock: return dict(self._values)
+
+    def write(self, name: str, value) -> bool:
+        """Queue a write; returns False if the PLC already holds this value (nothing sent)."""
+        tag = self.table[name]
+        raw = encode(tag, value)
+        with self._lock:
+            if name in self._values and encode(tag, self._values[name]) == raw:
+                self._pending.pop(name, None); return False     # cancels a not-yet-sent different value
+            if name in self._pending and encode(tag, self._pending[name]) == raw:
+                return False
+            self._pending[name] = value
+        return True
+
+    def take(self) -> list:
+        """Drain the queue -> coalesced runs [(dev, start, raw_points, [(tag, value)])]."""
+        with self._lock:
+            if not self._pending: return []
+            pending = self._pending; self._pending = {}
+        return _coalesce([(self.table[n], v) for n, v in pending.items()])
+
+    def commit(self, run):
+        with self._lock:
+            for t, v in run[3]: self._values[t.name] = v
+
+    def requeue(self, runs):
+        with self._lock:               # newer GUI writes win over the unacknowledged ones
+            for _, _, _, tags in runs:
+                for t, v in tags: self._pending.setdefault(t.name, v)
+
+    def update(self, fresh: dict):
+        with self._lock: self._values.update(fresh); self.stamp = time.time()
+
+    def decode_blocks(self, blocks_raw) -> dict:
+        """[(Block, raw_points)] -> {name: value}"""
+        return {t.name: decode(t, raw, t.index - blk.start) for blk, raw in blocks_raw for t in blk.tags}
+
+class PlcScanner(threading.Thread):
+    """
+    Every scan_ms:
+      1) flush queued writes — only tags whose value differs from the last known PLC value,
+         adjacent registers of one device coalesced into a single batch write
+      2) one batch read per plan block (see TagTable.plan) -> decoded into the cache
+    The GUI thread only touches get()/snapshot()/write() (a TagCache), which never block on the network.
+    """
+    def __init__(self, table: TagTable, client: McClient, scan_ms: int = 100, backoff_s: float = 2.0):
+        super().__init__(name="plc-scan", daemon=True)
+        self.table = table; self.client = client
+        self.scan_s = max(0.01, int(scan_ms) / 1000.0); self.backoff_s = float(backoff_s)
+        self.cache = TagCache(table); self._halt = threading.Event()
+        # stats
+        self.scans = 0; self.errors = 0; self.last_error = ""
+        self.last_scan_ms = 0.0; self.frames_per_scan = 0
+
+    @classmethod
+    def from_config(cls, plc_cfg: dict) -> "PlcScanner":
+        client = McClient(plc_cfg.get("host", "127.0.0.1"), plc_cfg.get("port", 5007),
+                          plc_cfg.get("timeout_s", 1.0))
+        return cls(TagTable.from_config(plc_cfg), client, plc_cfg.get("scan_ms", 100))
+
+    # ---------- GUI-side API ----------
+    def get(self, name: str, default=None): return self.cache.get(name, default)
+    def snapshot(self) -> dict:             return self.cache.snapshot()
+    def write(self, name: str, value) -> bool: return self.cache.write(name, value)
+
+    @property
+    def connected(self) -> bool: return self.client.connected
+
+    def stop(self, timeout: float = 2.0):
+        self._halt.set(); self.join(timeout); self.client.close()
+
+    # ---------- scan ----------
+    def run(self):
+        while not self._halt.is_set():
+            t0 = time.perf_counter()
+            try:
+                self.scan_once()
+            except Exception as e:  # network / PLC errors: keep the last snapshot, retry after backoff
+                self.errors += 1; self.last_error = str(e)
+                self._halt.wait(self.backoff_s); continue
+            self._halt.wait(max(0.0, self.scan_s - (time.perf_counter() - t0)))
+
+    def scan_once(self):
+        t0 = time.perf_counter(); f0 = self.client.frames
+        runs = self.cache.take()
+        for i, run in enumerate(runs):
+            try: self.client.write(*run[:3])
+            except Exception: self.cache.requeue(runs[i:]); raise
+            self.cache.commit(run)
+        raw = [(blk, self.client.read(blk.dev, blk.start, blk.points)) for blk in self.table.plan]
+        self.cache.update(self.cache.decode_blocks(raw))
+        self.scans += 1; self.frames_per_scan = self.client.frames - f0
+        self.last_scan_ms = (time.perf_counter() - t0) * 1000.0
+
+def _coalesce(items: list[tuple[Tag, object]]):
+    """-> [(dev, start, raw_points, [(tag, value)])] with strictly adjacent tags merged."""
+    runs = []
+    for tag, value in sorted(items, key=lambda tv: (tv[0].dev, tv[0].index)):
+        raw = encode(tag, value)
+        last = runs[-1] if runs else None
+        if last and last[0] == tag.dev and last[1] + len(last[2]) == tag.index:
+            last[2].extend(raw); last[3].append((tag, value))
+        else:
+            runs.append((tag.dev, tag.index, raw, [(tag, value)]))
+    return runs
@@ -0,0 +1,116 @@
+# plc/sim_server.py — local simulated FX5U speaking MC-Protocol 3E binary (batch read/write only)
+#   python -m plc.sim_server --port 5007            (run from apps/desktop)
+import argparse, socket, socketserver, struct, threading, time
+from . import mc_protocol as mc
+
+DEVICE_SIZE = {"D": 8000, "R": 32768, "W": 8192, "M": 8192, "X": 1024, "Y": 1024, "B": 8192}
+
+class PlcMemory:
+    """Flat per-device point arrays (words: 0..65535, bits: 0/1), guarded by one lock."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dev = {d: [0] * n for d, n in DEVICE_SIZE.items()}
+
+    def read(self, dev: str, start: int, points: int) -> list[int]:
+        with self.lock: return self.dev[dev][start:start + points]
+
+    def write(self, dev: str, start: int, values: list[int]):
+        with self.lock: self.dev[dev][start:start + len(values)] = values
+
+    def set_real(self, addr: str, value: float):
+        dev, i = mc.parse_address(addr); self.write(dev, i, list(mc.real_to_words(value)))
+
+    def get_real(self, addr: str) -> float:
+        dev, i = mc.parse_address(addr); return mc.words_to_real(*self.read(dev, i, 2))
+
+    def set_bit(self, addr: str, on: bool):
+        dev, i = mc.parse_address(addr); self.write(dev, i, [1 if on else 0])
+
+    def get_bit(self, addr: str) -> bool:
+        dev, i = mc.parse_address(addr); return bool(self.read(dev, i, 1)[0])
+
+def handle_frame(mem: PlcMemory, frame: bytes) -> bytes:
+    """One request frame -> one response frame (error end codes as the FX5U reports them)."""
+    try:
+        cmd, sub, dev, start, points, payload = mc.parse_request(frame)
+    except mc.McError as e:
+        return mc.response_frame(end_code=e.end_code or 0xC059)
+    bit = sub == mc.SUB_BIT
+    if bit != mc.is_bit_device(dev):                 # word-unit access to bit devices is not simulated
+        return mc.response_frame(end_code=0xC05C)
+    limit = mc.MAX_BIT_POINTS if bit else mc.MAX_WORD_POINTS
+    if points <= 0 or points > limit or start + points > DEVICE_SIZE[dev]:
+        return mc.response_frame(end_code=0xC051)
+    if cmd == mc.CMD_BATCH_READ:
+        vals = mem.read(dev, start, points)
+        return mc.response_frame(mc.pack_bits(vals) if bit else struct.pack(f"<{points}H", *vals))
+    if cmd == mc.CMD_BATCH_WRITE:
+        vals = mc.unpack_bits(payload, points) if bit else mc.unpack_words(payload, points)
+        mem.write(dev, start, vals); return mc.response_frame()
+    return mc.response_frame(end_code=0xC059)
+
+class _Handler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.conn_lock: self.server.conns.add(self.request)
+
+    def finish(self):
+        with self.server.conn_lock: self.server.conns.discard(self.request)
+
+    def handle(self):
+        srv = self.server; sock = self.request; buf = bytearray()
+        while True:
+            try: chunk = sock.recv(65536)
+            except OSError: return
+            if not chunk: return
+            buf += chunk
+            if srv.latency_s: time.sleep(srv.latency_s)   # once per segment: models link round-trip time
+            # several pipelined requests may arrive in one read; answer them in order, in one send
+            out = bytearray()
+            while len(buf) >= mc.HEADER_LEN:
+                total = mc.HEADER_LEN + int.from_bytes(buf[7:9], "little")
+                if len(buf) < total: break
+                frame = bytes(buf[:total]); del buf[:total]
+                srv.frames += 1
+                out += handle_frame(srv.memory, frame)
+            if out:
+                try: sock.sendall(out)
+                except OSError: return
+
+class SimFx5u(socketserver.ThreadingTCPServer):
+    daemon_threads = True; allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5007, memory: PlcMemory | None = None,
+                 latency_ms: float = 0.0):
+        super().__init__((host, port), _Handler)
+        self.memory = memory or PlcMemory(); self.frames = 0
+        self.latency_s = max(0.0, float(latency_ms)) / 1000.0
+        self.conns: set = set(); self.conn_lock = threading.Lock()
+
+    @property
+    def port(self) -> int: return self.server_address[1]
+
+    def start(self) -> "SimFx5u":
+        threading.Thread(target=self.serve_forever, name="sim-fx5u", daemon=True).start(); return self
+
+    def stop(self):
+        """Stop listening and drop every open connection (what a PLC power-cycle looks like)."""
+        self.shutdown(); self.server_close()
+        with self.conn_lock: conns = list(self.conns)
+        for c in conns:
+            try: c.shutdown(socket.SHUT_RDWR)
+            except OSError: pass
+
+def main():
+    ap = argparse.ArgumentParser(description="Simulated FX5U (MC-Protocol 3E binary)")
+    ap.add_argument("--host", default="127.0.0.1"); ap.add_argument("--port", type=int, default=5007)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="simulated link delay per TCP segment")
+    a = ap.parse_args()
+    srv = SimFx5u(a.host, a.port, latency_ms=a.latency_ms)
+    print(f"simulated FX5U on {a.host}:{srv.port}  (Ctrl+C to stop)")
+    try: srv.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: srv.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# plc/tags.py — tag table (from config.json "plc.tags") and the block read plan
+from dataclasses import dataclass, field
+from .mc_protocol import (parse_address, is_bit_device, MAX_WORD_POINTS, MAX_BIT_POINTS,
+                          words_to_real, real_to_words, words_to_dint, dint_to_words)
+
+TAG_WIDTH = {"real": 2, "dint": 2, "word": 1, "bit": 1}   # points occupied on the device
+
+@dataclass(frozen=True)
+class Tag:
+    name: str
+    addr: str            # "D100", "M10", ...
+    type: str = "real"   # real | dint | word | bit
+    dev: str = ""
+    index: int = 0
+
+    @property
+    def width(self) -> int: return TAG_WIDTH[self.type]
+
+@dataclass
+class Block:
+    """One batch read: `points` consecutive points of `dev` starting at `start`."""
+    dev: str
+    start: int
+    points: int
+    tags: list[Tag] = field(default_factory=list)
+
+def make_tag(name: str, addr: str, type: str = "real") -> Tag:
+    dev, index = parse_address(addr)
+    type = str(type).lower()
+    if type not in TAG_WIDTH: raise ValueError(f"tag {name}: unknown type {type!r}")
+    if is_bit_device(dev) != (type == "bit"):
+        raise ValueError(f"tag {name}: type {type!r} does not fit device {dev}")
+    return Tag(name, addr.upper(), type, dev, index)
+
+# ---------- decode / encode against a block's raw points ----------
+def decode(tag: Tag, raw: list[int], offset: int):
+    if tag.type == "bit":  return bool(raw[offset])
+    if tag.type == "word": return raw[offset]
+    lo, hi = raw[offset], raw[offset + 1]
+    return words_to_real(lo, hi) if tag.type == "real" else words_to_dint(lo, hi)
+
+def encode(tag: Tag, value) -> list[int]:
+    if tag.type == "bit":  return [1 if value else 0]
+    if tag.type == "word": return [int(value) & 0xFFFF]
+    return list(real_to_words(value) if tag.type == "real" else dint_to_words(value))
+
+class TagTable:
+    """
+    Name -> Tag lookup plus a read plan: per device, tags sorted by address and merged into
+    blocks while the gap stays <= max_gap points and the block fits one MC frame.
+    A full scan is then len(plan) frames instead of one per tag.
+    """
+    def __init__(self, tags: list[Tag], max_gap: int = 16):
+        self.tags = {}
+        for t in tags:
+            if t.name in self.tags: raise ValueError(f"duplicate PLC tag {t.name!r}")
+            self.tags[t.name] = t
+        self.max_gap = int(max_gap)
+        self.plan = self._plan()
+
+    @classmethod
+    def from_config(cls, plc_cfg: dict) -> "TagTable":
+        tags = [make_tag(name, spec["addr"], spec.get("type", "real"))
+                for name, spec in (plc_cfg.get("tags") or {}).items()]
+        return cls(tags, max_gap=plc_cfg.get("max_gap", 16))
+
+    def __contains__(self, name: str) -> bool: return name in self.tags
+    def __getitem__(self, name: str) -> Tag:   return self.tags[name]
+    def __len__(self) -> int:                  return len(self.tags)
+
+    def by_addr(self, addr: str) -> Tag | None:
+        a = str(addr).upper()
+        return next((t for t in self.tags.values() if t.addr == a), None)
+
+    def _plan(self) -> list[Block]:
+        by_dev: dict[str, list[Tag]] = {}
+        for t in self.tags.values(): by_dev.setdefault(t.dev, []).append(t)
+        plan = []
+        for dev in sorted(by_dev):
+            limit = MAX_BIT_POINTS if is_bit_device(dev) else MAX_WORD_POINTS
+            cur = None
+            for t in sorted(by_dev[dev], key=lambda t: t.index):
+                end = t.index + t.width
+                if cur and t.index - (cur.start + cur.points) <= self.max_gap and end - cur.start <= limit:
+                    cur.points = max(cur.points, end - cur.start); cur.tags.append(t)
+                else:
+                    cur = Block(dev, t.index, t.width, [t]); plan.append(cur)
+        return plan
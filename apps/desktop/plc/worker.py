@@ -0,0 +1,94 @@
+# plc/worker.py — asyncio PLC scan loop in a QThread; snapshots reach the GUI through queued signals
+import asyncio, threading, time
+from PySide6.QtCore import QThread, Signal
+from .aio_client import AsyncMcClient
+from .scanner import TagCache
+from .tags import TagTable
+
+class PlcWorker(QThread):
+    """
+    Runs its own event loop: each scan flushes the change-only write queue, then pipelines
+    every plan block read over one AsyncMcClient connection and emits the decoded values.
+      snapshot(dict)  tag name -> value, emitted after every successful scan
+      link(dict)      connection state + latency stats, emitted at most once per second
+    Signals are emitted from the worker thread; receivers living in the GUI thread get them
+    as queued calls, so a slow or dead PLC never stalls the HMI. get()/write() have the same
+    shape as PlcScanner, so plc_read_real/plc_write_real work with either.
+    """
+    snapshot = Signal(dict)
+    link = Signal(dict)
+
+    def __init__(self, table: TagTable, client: AsyncMcClient, scan_ms: int = 100, parent=None):
+        super().__init__(parent)
+        self.table = table; self.client = client; self.cache = TagCache(table)
+        self.scan_s = max(0.01, int(scan_ms) / 1000.0)
+        self._stop = threading.Event()                  # set by stop(), even before the loop exists
+        self._loop: asyncio.AbstractEventLoop | None = None; self._halt: asyncio.Event | None = None   # wakes the scan wait
+        self.scans = 0; self.errors = 0; self.last_error = ""; self.last_scan_ms = 0.0
+        self._link_at = 0.0
+
+    @classmethod
+    def from_config(cls, plc_cfg: dict, parent=None) -> "PlcWorker":
+        client = AsyncMcClient(plc_cfg.get("host", "127.0.0.1"), plc_cfg.get("port", 5007),
+                               timeout=plc_cfg.get("timeout_s", 1.0),
+                               max_inflight=plc_cfg.get("max_inflight", 8),
+                               backoff_max=plc_cfg.get("backoff_max_s", 5.0))
+        return cls(TagTable.from_config(plc_cfg), client, plc_cfg.get("scan_ms", 100), parent)
+
+    # ---------- GUI-side API ----------
+    def get(self, name: str, default=None): return self.cache.get(name, default)
+    def write(self, name: str, value) -> bool: return self.cache.write(name, value)
+
+    @property
+    def connected(self) -> bool: return self.client.connected
+
+    def link_state(self) -> dict:
+        return {"connected": self.connected, "scans": self.scans, "errors": self.errors,
+                "last_error": self.last_error, "scan_ms": round(self.last_scan_ms, 2),
+                **self.client.stats.summary()}
+
+    def stop(self, timeout_ms: int = 2000):
+        self._stop.set()
+        loop, halt = self._loop, self._halt
+        if loop is not None and halt is not None:
+            try: loop.call_soon_threadsafe(halt.set)
+            except RuntimeError: pass                   # loop already closed: the thread is finishing
+        self.wait(timeout_ms)
+
+    # ---------- worker thread ----------
+    def run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._halt = asyncio.Event(); self._loop = asyncio.get_running_loop()
+        try:
+            while not self._stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    await self.scan_once()
+                except Exception as e:   # the client handles reconnect/backoff; keep the last snapshot
+                    self.errors += 1; self.last_error = str(e)
+                self._emit_link()
+                delay = max(0.0, self.scan_s - (time.perf_counter() - t0))
+                try: await asyncio.wait_for(self._halt.wait(), delay)
+                except asyncio.TimeoutError: pass
+        finally:
+            await self.client.close()
+
+    async def scan_once(self):
+        t0 = time.perf_counter()
+        runs = self.cache.take()
+        try:
+            await asyncio.gather(*(self.client.write(*r[:3]) for r in runs))
+        except Exception:
+            self.cache.requeue(runs); raise
+        for r in runs: self.cache.commit(r)
+        fresh = self.cache.decode_blocks(await self.client.read_blocks(self.table.plan))
+        self.cache.update(fresh)
+        self.scans += 1; self.last_scan_ms = (time.perf_counter() - t0) * 1000.0
+        self.snapshot.emit(fresh)
+
+    def _emit_link(self):
+        now = time.monotonic()
+        if now - self._link_at >= 1.0:
+            self._link_at = now; self.link.emit(self.link_state())
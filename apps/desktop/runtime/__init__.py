@@ -0,0 +1,3 @@
+# runtime package — the plant's logic without Qt: shared with MainWindow, and runnable headless (python -m runtime)
+from .plant import Plant, TICK_S
+from .headless import HeadlessRuntime
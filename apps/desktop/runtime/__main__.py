@@ -0,0 +1,53 @@
+# runtime/__main__.py — run the plant headless (no Qt import) for soak tests and servers (run from apps/desktop)
+#   python -m runtime --batches 1000                       # as fast as possible; learned in-flight + log in a temp dir
+#   python -m runtime --batches 20 --speed 1               # real time
+#   python -m runtime --batches 5000 --out soak --log      # keep soak/batches.db and soak/dosing_learned.json
+import argparse, json, os, shutil, sys, tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path: sys.path.insert(0, APP_DIR)
+from plant_config import ConfigError, check_file
+from runtime import HeadlessRuntime
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless plant runtime (same logic as the HMI, no Qt)")
+    ap.add_argument("--config", default=os.path.join(APP_DIR, "config.json"))
+    ap.add_argument("--batches", type=int, default=100)
+    ap.add_argument("--speed", type=float, default=0.0, help="x real time; 0 = as fast as possible")
+    ap.add_argument("--out", help="directory for the learned in-flight file and the batch log (default: temporary)")
+    ap.add_argument("--log", action="store_true", help="write every batch to the batch log (config batch_log)")
+    ap.add_argument("--no-refill", action="store_true", help="no silo/tanker refills (the plant runs dry)")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    a = ap.parse_args()
+    try: pc = check_file(a.config)
+    except ConfigError as e: sys.exit(f"{a.config}: {len(e.errors)} problem(s)\n  " + "\n  ".join(e.errors))
+    out = a.out or tempfile.mkdtemp(prefix="rmc-headless-"); os.makedirs(out, exist_ok=True)
+    try:
+        log = None
+        if a.log:
+            from batchlog import BatchLogWriter
+            bcfg = dict(pc.raw.get("batch_log") or {}); bcfg.pop("import_csv", None)
+            log = BatchLogWriter.from_config(bcfg, out); log.start()
+        rt = HeadlessRuntime(pc.raw, pc, base_dir=out, log=log, speed=a.speed, refill=not a.no_refill)
+        r = rt.run(a.batches)
+        rt.dosing.save(); rt.plant.close()
+        if log: log.close()
+        r["qt_imported"] = any(m == "PySide6" or m.startswith("PySide6.") for m in sys.modules)
+        if a.json: print(json.dumps(r, indent=1))
+        else:
+            print(f"{r['batches']}/{a.batches} batches in {r['sim_s'] / 3600:.2f} h plant time, {r['wall_s']:.1f} s wall "
+                  f"({r['speedup']:,.0f}x real time); cycle {r['cycle_s']:.1f} s, {r['m3_per_h']:.1f} m3/h")
+            print(f"fault: {r['fault'] or 'none'}  stalled: {r['stalled']}  interlock trips: {r['trips']}  "
+                  f"refills: {r['refills']}  logged: {r['logged']}  Qt imported: {'yes' if r['qt_imported'] else 'no'}")
+            if r["alarms"]:
+                al = r["alarms"]; print(f"alarms: {al['raised']} raised, {al['suppressed']} suppressed in {al['floods']} flood(s), "
+                                        f"{al['listed']} listed at the end")
+            for n, k in r["interlocks"].items(): print(f"  interlock {n}: {k} trip(s)")
+            for n, d in r["dosing"].items():
+                print(f"  {n:<8} mean |err| {d['mean_abs']:7.3f} kg  max {d['max_abs']:7.3f} kg  out of tolerance {d['out_of_tol']}")
+        sys.exit(1 if r["fault"] or r["stalled"] or r["qt_imported"] or r["batches"] < a.batches else 0)
+    finally:
+        if not a.out: shutil.rmtree(out, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# runtime/headless.py — the plant with no window: Plant, dosing, sequencer and batch log on a virtual clock (no Qt)
+import time
+from tagbus import TagBus
+from plant_config import compile_config
+from .plant import Plant, TICK_S
+
+class HeadlessRuntime:
+    """
+    Steps a Plant the way MainWindow's timers do — dosing.step() (FeedSim, DosingEngine, BatchSequencer)
+    every dosing dt, plant.tick() (interlocks, silo fill/bleed) every TICK_S — but on simulated time, so
+    batches run as fast as the CPU allows (speed 0) or at speed x real time (sleeping between steps).
+      refill     keeps the plant supplied for long soaks: silo fill on below refill_lo % and off at
+                 refill_hi %, a tanker tops a tank up below refill_lo % (counted in `refills`)
+      log        a batchlog.BatchLogWriter (or None); records carry simulated timestamps from t0
+    """
+    def __init__(self, cfg: dict, pc=None, *, base_dir: str, log=None, speed: float = 0.0,
+                 refill: bool = True, refill_lo: float = 20.0, refill_hi: float = 90.0, t0: float | None = None):
+        self.cfg = cfg; self.pc = pc = pc or compile_config(cfg)
+        self.bus = TagBus.from_config(cfg); self.plant = Plant(pc, self.bus, base_dir=base_dir)
+        self.plant.publish_start_values()
+        dcfg = cfg.get("dosing") or {}
+        if not dcfg.get("feeders"): raise ValueError("dosing.feeders: the headless runtime needs the dosing section")
+        self.dosing = self.plant.build_dosing(dcfg, base_dir)
+        self.scfg = cfg.get("sequencer") or {}
+        self.seq = self.plant.build_sequencer(self.scfg, on_batch=self._batch)
+        self.log = log; self.speed = max(0.0, float(speed))
+        self.refill = refill; self.refill_lo = float(refill_lo); self.refill_hi = float(refill_hi)
+        self.t0 = time.time() if t0 is None else float(t0)
+        self.t = 0.0; self._next_tick = 0.0; self.ticks = 0; self.refills = 0; self.logged = 0
+        self.wall_s = 0.0
+
+    @property
+    def ingr(self): return self.plant.ingr
+
+    def _batch(self, b):
+        rec = self.plant.batch_record({r["name"]: r["actual"] for r in b.actuals}); rec.t = self.t0 + self.t
+        if self.log is not None: self.log.submit(rec); self.logged += 1
+
+    def _supply(self):
+        bus = self.bus
+        for n in range(1, len(self.pc.silos) + 1):
+            pct = bus.value(f"silo{n}.level_pct", 0.0); run = bus.value(f"silo{n}.run", False)
+            if not run and pct < self.refill_lo: bus.publish(f"silo{n}.run", True); self.refills += 1
+            elif run and pct >= self.refill_hi: bus.publish(f"silo{n}.run", False)
+        for tag, (cap, _) in (("water_tank.kg", self.pc.water_tank), ("admix_tank.kg", self.pc.admix_tank)):
+            if cap > 0 and bus.value(tag, 0.0) < cap * self.refill_lo / 100.0:
+                bus.publish(tag, cap * self.refill_hi / 100.0); self.refills += 1
+
+    def step(self):
+        """One dosing step, and the plant ticks that fall inside it."""
+        self.dosing.step(); self.t += self.dosing.dt
+        while self._next_tick <= self.t:
+            self.plant.tick(self.t0 + self._next_tick); self.ticks += 1; self._next_tick += TICK_S
+            if self.refill: self._supply()
+
+    def run(self, batches: int, *, max_sim_s: float | None = None) -> dict:
+        """Run `batches` recipe batches (config targets) through the sequencer; returns report()."""
+        self.plant.start()
+        if self.refill: self._supply()
+        self.seq.start(batches, self.ingr.targets())
+        limit = max_sim_s if max_sim_s is not None else 600.0 * max(1, batches)    # a stuck plant ends the run
+        wall0 = time.perf_counter(); t_start = self.t; end = t_start + limit
+        while self.seq.running and not self.seq.fault and self.t < end:
+            self.step()
+            if self.speed > 0:
+                ahead = (self.t - t_start) / self.speed - (time.perf_counter() - wall0)
+                if ahead > 0.002: time.sleep(ahead)
+        self.wall_s = time.perf_counter() - wall0
+        return self.report()
+
+    def report(self) -> dict:
+        """Throughput, per-ingredient dosing error and out-of-tolerance count, faults, run speed."""
+        seq = self.seq; tol = {f.name: f.tolerance_kg for f in self.dosing.feeders.values()}
+        err: dict[str, list[float]] = {n: [] for n in self.ingr.names}
+        for b in seq.done:
+            for r in b.actuals: err.setdefault(r["name"], []).append(r["error"])
+        dosing = {n: {"mean_abs": sum(abs(e) for e in es) / len(es), "max_abs": max(abs(e) for e in es),
+                      "out_of_tol": sum(1 for e in es if abs(e) > tol.get(n, 0.0))} for n, es in err.items() if es}
+        s = seq.summary(batch_m3=float(self.scfg.get("batch_m3", 1.0)))
+        wall = self.wall_s
+        return {"batches": len(seq.done), "fault": seq.fault, "stalled": seq.running and not seq.fault,
+                "sim_s": self.t, "wall_s": wall, "speedup": self.t / wall if wall > 0 else 0.0,
+                "steps": self.dosing.steps, "ticks": self.ticks, "cycle_s": s.get("cycle", 0.0),
+                "m3_per_h": s.get("m3_per_h", 0.0), "trips": self.plant.trips, "refills": self.refills,
+                "logged": self.logged, "dosing": dosing, "interlocks": self.plant.interlocks.stats()["per_rule"],
+                "alarms": self.plant.alarms.stats() if self.plant.alarms else {}}
@@ -0,0 +1,111 @@
+# runtime/plant.py — the plant's logic on a TagBus, shared by the window and the headless runtime (no Qt)
+from ingredients import IngredientTable
+from interlocks import InterlockEngine
+
+TICK_S = 0.03          # MainWindow's tick; speeds "*_per_tick" (silo fill/bleed) are per this tick
+
+class Plant:
+    """
+    Everything the HMI does to plant tags that does not draw: start values, the material each fed hopper
+    draws from, interlocks, the local silo fill/bleed, dosing + feed simulation + batch sequencing and
+    batch records. MainWindow drives it from QTimers (tick() every TICK_S, dosing at its own rate);
+    HeadlessRuntime drives the same object from a virtual clock.
+      simulate     local stand-ins (silo fill/bleed, FeedSim) move the material; stop_simulation() for a PLC
+      interlocks   config "interlocks" rules + the full-hopper rules (interlocks.InterlockEngine); its trips
+                   go to <base_dir>/interlocks.log once start() runs (no file without base_dir)
+      alarms       alarms.AlarmEngine when config "alarms" is enabled (else None), journal in <base_dir>
+    """
+    def __init__(self, pc, bus, *, simulate: bool = True, base_dir: str | None = None):
+        self.pc = pc; self.bus = bus; self.simulate = simulate
+        self.ingr = IngredientTable(pc.ingredients)
+        self.dosing = None; self.feed_sim = None; self.seq = None
+        self.interlocks = InterlockEngine.from_config(pc.raw.get("interlocks"), bus, self.ingr,
+                                                      n_aggs=len(pc.hoppers), base_dir=base_dir)
+        self.alarms = None; self.journal = None
+        acfg = pc.raw.get("alarms") or {}
+        if acfg.get("enabled"):
+            from alarms import AlarmEngine, AlarmJournal
+            if base_dir: self.journal = AlarmJournal.from_config(acfg, base_dir)
+            dosed = self.ingr.names if (pc.raw.get("dosing") or {}).get("enabled") else ()
+            self.alarms = AlarmEngine.from_config(acfg, bus, self.ingr, dosed=dosed, n_aggs=len(pc.hoppers),
+                                                  n_silos=len(pc.silos), journal=self.journal)
+
+    @property
+    def trips(self) -> int: return self.interlocks.trips
+
+    def start(self):
+        """Background work (the interlock audit and alarm journal writers)."""
+        self.interlocks.start()
+        if self.journal and not self.journal.is_alive(): self.journal.start()
+
+    def close(self):
+        self.interlocks.close()
+        if self.journal: self.journal.close()
+
+    def publish_start_values(self):
+        """The tags MainWindow's widgets start the plant with (empty silos and hoppers, config tank levels)."""
+        bus = self.bus; pc = self.pc
+        for n in range(1, len(pc.silos) + 1): bus.publish(f"silo{n}.level_pct", 0.0); bus.publish(f"silo{n}.run", False)
+        bus.publish("feeder.active", 1)
+        for tag in self.ingr.tags: bus.publish(tag, 0.0)
+        for k in self.ingr.fed: bus.publish(self.ingr.items[k].feed_tag, False)
+        bus.publish("water_tank.kg", pc.water_tank[1]); bus.publish("admix_tank.kg", pc.admix_tank[1])
+        bus.publish("mixer.run", False); bus.publish("mixer.gate_open", False)
+
+    def sources(self) -> dict[str, tuple]:
+        """(get_kg, set_kg) of what each fed hopper draws from: Cement from silo 1, Water/Admix from their tanks."""
+        bus = self.bus; pc = self.pc; out = {}
+        if pc.silos and pc.cement_hopper:
+            silo_cap = pc.cement_silo_kg
+            out["Cement"] = (lambda: max(0.0, min(100.0, bus.value("silo1.level_pct", 0.0))) * silo_cap / 100.0,
+                             lambda kg: bus.publish("silo1.level_pct",
+                                                    0 if silo_cap <= 0 else max(0, min(100, (kg / silo_cap) * 100))))
+        for name, tag, cap, hopper in (("Water", "water_tank.kg", pc.water_tank[0], pc.water_hopper),
+                                       ("Admix", "admix_tank.kg", pc.admix_tank[0], pc.admix_hopper)):
+            if hopper:
+                out[name] = (lambda t=tag: bus.value(t, 0.0),
+                             lambda kg, t=tag, c=cap: bus.publish(t, max(0.0, min(c, float(kg)))))
+        return out
+
+    # ---------- every TICK_S ----------
+    def tick(self, now: float | None = None):
+        """Interlocks on the latest values (not the deadbanded display), then the local silo fill/bleed."""
+        bus = self.bus
+        self.interlocks.evaluate(now)                        # only rules whose tags changed since the last tick
+        if self.alarms: self.alarms.evaluate(now)           # ... alarms likewise, plus due delays and shelves
+        if self.simulate:                                    # the PLC publishes these tags when attached
+            spd = self.pc.speeds
+            for i in range(1, len(self.pc.silos) + 1):
+                pct = bus.value(f"silo{i}.level_pct", 0.0)
+                delta = spd["silo_fill_per_tick"] if bus.value(f"silo{i}.run") else spd["silo_bleed_per_tick"]
+                bus.publish(f"silo{i}.level_pct", max(0.0, min(100.0, pct + delta)))
+
+    # ---------- control ----------
+    def build_dosing(self, dcfg: dict, base_dir: str, *, on_done=None):
+        """DosingEngine over the weighed ingredients; FeedSim moves the kg (from sources()) while simulating."""
+        from control import DosingEngine, FeedSim
+        ingr = self.ingr
+        self.dosing = DosingEngine.from_config(dcfg, self.bus, list(zip(ingr.names, ingr.tags, ingr.cap)),
+                                               base_dir, on_done=on_done)
+        self.feed_sim = FeedSim(self.bus)
+        self.feed_sim.add_feeders(self.dosing, dcfg, caps=dict(zip(ingr.names, ingr.cap)), sources=self.sources())
+        self.dosing.sim = self.feed_sim if self.simulate else None
+        return self.dosing
+
+    def build_sequencer(self, scfg: dict, *, on_batch=None):
+        from control import BatchSequencer
+        ingr = [(g.name, g.weight_tag, g.gate_tag) for g in self.ingr.items]
+        self.seq = BatchSequencer.from_config(scfg, self.bus, self.dosing, ingr, on_batch=on_batch)
+        self.feed_sim.add_discharges(ingr, scfg.get("sim") or {})
+        return self.seq
+
+    def stop_simulation(self):
+        """A PLC moves the material from now on."""
+        self.simulate = False
+        if self.dosing: self.dosing.sim = None
+
+    def batch_record(self, actuals: dict[str, float] | None = None):
+        """BatchRecord of the discharged batch; actuals: weighed kg per ingredient (default: the hoppers now)."""
+        from batchlog import BatchRecord
+        self.ingr.sample(self.bus.value)
+        return BatchRecord(self.pc.recipe, self.ingr.batch_items(actuals))
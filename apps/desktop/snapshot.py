@@ -0,0 +1,145 @@
+# snapshot.py — plant runtime state saved every second and restored at startup (binary, atomic, no Qt)
+#
+# A crashed or restarted HMI comes back with the tanks, hopper weights, silo levels, drives and active
+# feeder it had, instead of the config.json start values. One file, replaced atomically (tmp + fsync +
+# rename), so a crash mid-write leaves the previous snapshot; a CRC rejects anything else that is damaged.
+#   u32 magic "RMCS" | u8 version | f64 t (epoch s) | u16 n | n x (u8 kind, u8 len, name, value) | u32 crc32
+#   value by kind: 0 float -> f64, 1 bool -> u8, 2 int -> i64, 3 text -> u16 len + utf-8
+import os, struct, sys, threading, time, zlib
+from writer_thread import WriterThread
+
+MAGIC = b"RMCS"; VERSION = 1
+NUM, BOOL, INT, TEXT = 0, 1, 2, 3
+DEFAULT_TAGS = ("*.weight_kg", "silo*.level_pct", "*_tank.kg", "*.run", "feeder.active")
+
+_HEAD = struct.Struct("<4sBdH"); _ENTRY = struct.Struct("<BB"); _CRC = struct.Struct("<I")
+_F64 = struct.Struct("<d"); _I64 = struct.Struct("<q"); _U16 = struct.Struct("<H")
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot this version can read (truncated, damaged, other format)."""
+
+def encode(values: dict, t: float) -> bytes:
+    out = [_HEAD.pack(MAGIC, VERSION, t, len(values))]
+    for name, v in values.items():
+        b = name.encode()[:255]
+        if isinstance(v, bool): out += (_ENTRY.pack(BOOL, len(b)), b, bytes((1 if v else 0,)))
+        elif isinstance(v, int): out += (_ENTRY.pack(INT, len(b)), b, _I64.pack(v))
+        elif isinstance(v, float): out += (_ENTRY.pack(NUM, len(b)), b, _F64.pack(v))
+        else:
+            s = str(v).encode()[:0xFFFF]; out += (_ENTRY.pack(TEXT, len(b)), b, _U16.pack(len(s)), s)
+    body = b"".join(out)
+    return body + _CRC.pack(zlib.crc32(body))
+
+def decode(buf: bytes) -> tuple[float, dict]:
+    """(t, {name: value}); raises SnapshotError."""
+    if len(buf) < _HEAD.size + _CRC.size: raise SnapshotError("truncated")
+    body = buf[:-_CRC.size]
+    if _CRC.unpack_from(buf, len(body))[0] != zlib.crc32(body): raise SnapshotError("checksum mismatch")
+    magic, ver, t, n = _HEAD.unpack_from(body, 0)
+    if magic != MAGIC or ver != VERSION: raise SnapshotError(f"not a version {VERSION} snapshot")
+    pos = _HEAD.size; values = {}
+    try:
+        for _ in range(n):
+            kind, ln = _ENTRY.unpack_from(body, pos); pos += _ENTRY.size
+            name = body[pos:pos + ln].decode(); pos += ln
+            if kind == NUM: (v,) = _F64.unpack_from(body, pos); pos += 8
+            elif kind == BOOL: v = body[pos] != 0; pos += 1
+            elif kind == INT: (v,) = _I64.unpack_from(body, pos); pos += 8
+            elif kind == TEXT:
+                (sl,) = _U16.unpack_from(body, pos); pos += 2; v = body[pos:pos + sl].decode(); pos += sl
+            else: raise SnapshotError(f"unknown value kind {kind}")
+            values[name] = v
+    except (struct.error, IndexError, UnicodeDecodeError) as ex:
+        raise SnapshotError(f"damaged entry: {ex}") from None
+    return t, values
+
+def write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data); f.flush(); os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load(path: str) -> tuple[float, dict] | None:
+    """(t, values) from the snapshot file, None when there is none; raises SnapshotError."""
+    try:
+        with open(path, "rb") as f: return decode(f.read())
+    except FileNotFoundError:
+        return None
+
+def restore(bus, path: str, *, max_age_s: float = 0.0, now: float | None = None) -> tuple[int, str]:
+    """Publish the saved values of the tags this plant has (already on the bus) with force, so every
+    widget and subscriber follows. Returns (tags restored, why not / from when) — never raises."""
+    try: snap = load(path)
+    except (OSError, SnapshotError) as ex: return 0, f"unreadable ({ex})"
+    if snap is None: return 0, "no snapshot"
+    t, values = snap; age = (time.time() if now is None else now) - t
+    if max_age_s > 0 and age > max_age_s: return 0, f"older than {max_age_s / 3600.0:g} h ({age / 3600.0:.1f} h)"
+    n = 0
+    for name, v in values.items():
+        cur = bus.value(name)
+        if cur is None or (type(cur) is bool) != isinstance(v, bool): continue   # not this plant's, or changed type
+        bus.publish(name, v, force=True); n += 1
+    return n, f"{age:.1f} s old"
+
+class Snapshotter(WriterThread):
+    """
+    sample() (GUI thread, every every_s) reads the tags matching `patterns` from the bus and, if any
+    changed, encodes them (~20 µs) and leaves the bytes for this thread, which writes the newest one
+    (fsync + rename never runs on the GUI thread). close() takes a last sample and waits for it.
+      stats: samples, written, unchanged, errors, last_error, max_write_ms
+    """
+    def __init__(self, path: str, source, patterns=DEFAULT_TAGS, every_s: float = 1.0):
+        super().__init__("state-snapshot")
+        self.path = path; self.source = source; self.patterns = tuple(patterns); self.every_s = float(every_s)
+        self._last: dict | None = None
+        self._slot: bytes | None = None; self._cv = threading.Condition(); self._halt = False
+        self.samples = 0; self.written = 0; self.unchanged = 0; self.errors = 0; self.last_error = ""; self.max_write_ms = 0.0
+
+    @classmethod
+    def from_config(cls, scfg: dict, source, base_dir: str) -> "Snapshotter":
+        return cls(snapshot_path(scfg, base_dir), source, scfg.get("tags") or DEFAULT_TAGS, scfg.get("every_s", 1.0))
+
+    def sample(self, now: float | None = None) -> bool:
+        """Queue a snapshot if a saved tag changed since the last one; True when queued."""
+        self.samples += 1; get = self.source.value
+        values = {n: get(n) for n in self.source.match(self.patterns)}
+        if values == self._last: self.unchanged += 1; return False
+        self._last = values
+        data = encode({k: v for k, v in values.items() if v is not None}, time.time() if now is None else now)
+        with self._cv: self._slot = data; self._cv.notify()
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.sample(); super().close(timeout)
+
+    def _signal_stop(self):
+        with self._cv: self._halt = True; self._cv.notify()
+
+    def _has_pending(self) -> bool: return self._slot is not None
+
+    def run(self):
+        while True:
+            with self._cv:
+                while self._slot is None and not self._halt: self._cv.wait()
+                data, self._slot = self._slot, None
+            if data is not None: self._write(data)
+            elif self._halt: return
+
+    def _write(self, data: bytes):
+        s = time.perf_counter()
+        try: write_atomic(self.path, data)
+        except OSError as ex:
+            self.errors += 1; self.last_error = f"{type(ex).__name__}: {ex}"; return
+        self.written += 1; self.max_write_ms = max(self.max_write_ms, (time.perf_counter() - s) * 1000.0)
+
+def snapshot_path(scfg: dict, base_dir: str) -> str:
+    path = scfg.get("path", "state.snap")
+    return path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+if __name__ == "__main__":            # python snapshot.py [state.snap]: print what a restart would restore
+    p = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "state.snap")
+    try: snap = load(p)
+    except SnapshotError as e: sys.exit(f"{p}: {e}")
+    if snap is None: sys.exit(f"{p}: no snapshot")
+    print(f"{p}: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snap[0]))} ({time.time() - snap[0]:.0f} s ago)")
+    for k, v in snap[1].items(): print(f"  {k:<24} {v}")
@@ -0,0 +1,118 @@
+# tagbus.py — tag-change publish/subscribe between the PLC scan (or local simulation) and the widgets
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import Any, Callable
+
+_UNSET = object()
+
+class TagBus:
+    """
+    Producers publish tag values; only changes that clear the tag's deadband are delivered,
+    and only to the callbacks subscribed to that tag, so per-scan UI work follows the number
+    of changed tags rather than the size of the plant.
+      value(name)   latest published value, delivered or not (use it for control logic)
+      shown(name)   last value delivered to subscribers (what the widgets display)
+      watch(names)  a set the changed names are added to, before the deadband (interlocks)
+      match(pats)   {name: first matching pattern} over the published names (historian, snapshot)
+      deadbands     {"*.weight_kg": 0.5, "silo*.level_pct": 0.1, ...}; first matching pattern wins,
+                    exact names beat patterns; bools/strings are delivered on any change
+    """
+    def __init__(self, deadbands: dict[str, float] | None = None):
+        self._deadbands = dict(deadbands or {})
+        self._db_cache: dict[str, float] = {}
+        self._subs: dict[str, list[Callable[[Any], None]]] = {}
+        self._any: list[Callable[[str, Any], None]] = []
+        self._watch: dict[str, list[set]] = {}
+        self._match: dict[tuple, list] = {}              # patterns -> [names seen, {name: pattern}]
+        self._latest: dict[str, Any] = {}
+        self._shown: dict[str, Any] = {}
+        self.published = 0; self.delivered = 0; self.suppressed = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "TagBus":
+        return cls((cfg.get("tagbus") or {}).get("deadbands"))
+
+    # ---------- subscribers ----------
+    def subscribe(self, name: str, fn: Callable[[Any], None], *, replay: bool = True):
+        """fn(value) on every delivered change of `name` (called once now if it already has a value)."""
+        self._subs.setdefault(name, []).append(fn)
+        if replay and name in self._shown: fn(self._shown[name])
+        return fn
+
+    def subscribe_any(self, fn: Callable[[str, Any], None]):
+        """fn(name, value) on every delivered change of any tag (status line, historian, mirrors)."""
+        self._any.append(fn); return fn
+
+    def watch(self, names) -> set[str]:
+        """A set that a publish changing the latest value of one of `names` adds the name to — before the
+        deadband, for control logic that must not miss a change (interlocks); the owner empties it."""
+        dirty: set[str] = set()
+        for n in names: self._watch.setdefault(n, []).append(dirty)
+        return dirty
+
+    def unsubscribe(self, name: str, fn):
+        subs = self._subs.get(name)
+        if subs and fn in subs: subs.remove(fn)
+
+    # ---------- producers ----------
+    def deadband(self, name: str) -> float:
+        db = self._db_cache.get(name)
+        if db is None:
+            db = self._deadbands.get(name)
+            if db is None:
+                db = next((float(v) for pat, v in self._deadbands.items() if fnmatchcase(name, pat)), 0.0)
+            self._db_cache[name] = db = float(db)
+        return db
+
+    def publish(self, name: str, value, *, force: bool = False) -> bool:
+        """Returns True when the change was delivered, False when it stayed inside the deadband."""
+        self.published += 1
+        if self._watch and name in self._watch and self._latest.get(name, _UNSET) != value:
+            for dirty in self._watch[name]: dirty.add(name)
+        self._latest[name] = value
+        if not force and name in self._shown:
+            last = self._shown[name]
+            if type(value) in (int, float) and type(last) in (int, float):
+                if abs(value - last) < self.deadband(name) or value == last:
+                    self.suppressed += 1; return False
+            elif value == last:
+                self.suppressed += 1; return False
+        self._shown[name] = value; self.delivered += 1
+        for fn in self._subs.get(name, ()): fn(value)
+        for fn in self._any: fn(name, value)
+        return True
+
+    def publish_many(self, values: dict) -> int:
+        return sum(1 for k, v in values.items() if self.publish(k, v))
+
+    def flush(self, names=None) -> int:
+        """Deliver latest values held back by the deadband (e.g. when a flow stops)."""
+        n = 0
+        for k in (names if names is not None else list(self._latest)):
+            if k in self._latest and self._latest[k] != self._shown.get(k):
+                self.publish(k, self._latest[k], force=True); n += 1
+        return n
+
+    # ---------- readers ----------
+    def value(self, name: str, default=None):
+        return self._latest.get(name, default)
+
+    def shown(self, name: str, default=None):
+        return self._shown.get(name, default)
+
+    def names(self) -> list[str]:
+        return sorted(self._latest)
+
+    def match(self, patterns) -> dict[str, str]:
+        """{name: first of `patterns` (fnmatch, in order) it matches} for the tags published so far. Kept per
+        pattern set and extended only with names published since the last call, so samplers can ask every
+        time and still pick up tags that appear later (PLC attach). The dict is shared: do not modify it."""
+        key = tuple(patterns); hit = self._match.get(key)
+        if hit is None: hit = self._match[key] = [0, {}]
+        if hit[0] < len(self._latest):                  # names are never removed: only the tail is new
+            out = hit[1]
+            for n in islice(self._latest, hit[0], None):
+                p = next((p for p in key if fnmatchcase(n, p)), None)
+                if p is not None: out[n] = p
+            hit[0] = len(self._latest)
+        return hit[1]
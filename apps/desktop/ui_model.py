@@ -0,0 +1,110 @@
+# ui_model.py — status/progress view-model published at a human-readable rate, driven by TagBus changes
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QLabel, QProgressBar
+
+def _drive_label(run_tag: str) -> str:
+    """"cement_screw.run" -> "Cement Screw"."""
+    return run_tag.split(".", 1)[0].replace("_", " ").title()
+
+class BarBinding:
+    """Pushes (maximum, value, format) into a QProgressBar only when one of them changed."""
+    def __init__(self, pb: QProgressBar):
+        self.pb = pb; self._max = None; self._val = None; self._fmt = None
+
+    def publish(self, maximum: int, value: int, fmt: str) -> bool:
+        changed = False
+        if maximum != self._max: self.pb.setMaximum(maximum); self._max = maximum; changed = True
+        if value != self._val:   self.pb.setValue(value);     self._val = value;   changed = True
+        if fmt != self._fmt:     self.pb.setFormat(fmt);      self._fmt = fmt;     changed = True
+        return changed
+
+class StatusModel(QObject):
+    """
+    Status-bar / progress-bar view-model. Subscribed to the TagBus: a delivered tag change
+    only marks the status line (and that tag's progress bar) dirty; publishing runs on its
+    own timer (status_hz, e.g. 4 Hz) and touches nothing when nothing is dirty.
+      snapshot()      -> hashable tuple of display values (ints/bools/strs, already rounded)
+      mark_dirty()    -> operator actions that are not tags (active feeder, DISCHARGING tag)
+      publish(force)  -> push dirty values to widgets (force: everything)
+    """
+    def __init__(self, win, label: QLabel, bars: list[QProgressBar], total_bar: QProgressBar,
+                 hz: float = 4.0, parent: QObject | None = None, bus=None):
+        super().__init__(parent)
+        self._win = win; self._label = label
+        self._bars = [BarBinding(pb) for pb in bars]
+        self._total = BarBinding(total_bar)
+        self._agg = win.ingr.of_kind("aggregate")[:len(bars)]   # bar i shows ingredient self._agg[i]
+        self._bar_kg = [round(hp.get_weight_kg()) for hp in win.hoppers[:len(self._agg)]]
+        self._dirty = True; self._dirty_bars: set[int] = set(range(len(self._bar_kg)))
+        self._last = None
+        self.tag: str | None = None          # e.g. "DISCHARGING" while the mixer gate is open
+        if bus is not None: self.bind(bus)
+        self._timer = QTimer(self); self._timer.setInterval(int(1000.0 / max(0.5, float(hz))))
+        self._timer.timeout.connect(self.publish); self._timer.start()
+
+    def bind(self, bus):
+        """Status line follows every delivered change; bar i follows its ingredient's weight tag only."""
+        bus.subscribe_any(lambda name, value: self.mark_dirty())
+        for i, k in enumerate(self._agg):
+            bus.subscribe(self._win.ingr.tags[k], lambda kg, i=i: self._bar_changed(i, kg), replay=False)
+
+    def mark_dirty(self): self._dirty = True
+
+    def _bar_changed(self, i: int, kg: float):
+        kg = round(kg)
+        if i < len(self._bar_kg) and kg != self._bar_kg[i]:
+            self._bar_kg[i] = kg; self._dirty_bars.add(i)
+
+    # ---------- model ----------
+    def snapshot(self) -> tuple:
+        w = self._win; ingr = w.ingr; bus = w.bus
+        silos   = tuple((s.is_running(), int(round(s.get_percent()))) for s in w.silos)
+        hoppers = tuple((round(bus.shown(t, 0.0)), round(c)) for t, c in zip(ingr.tags, ingr.cap))   # per ingredient
+        tanks = (round(w.water_tank_kg), round(w.water_tank_capacity_kg),
+                 round(w.admix_tank_kg), round(w.admix_tank_capacity_kg))
+        m_state = "RUNNING" if w.mixer.is_running() else ("DISCHARGING" if self.tag == "DISCHARGING" else "STOPPED")
+        drives = tuple(bool(bus.value(ingr.items[k].feed_tag, False)) for k in ingr.fed)
+        feeder = getattr(w, "active_feeder", None) if w.silos else None
+        return (silos, hoppers, tanks, m_state, drives, feeder)
+
+    def status_text(self, snap: tuple) -> str:
+        silos, hoppers, tanks, m_state, drives, feeder = snap[:6]
+        ingr = self._win.ingr
+        parts=[]
+        for i,(run,pct) in enumerate(silos,start=1):
+            parts.append(f"Silo{i}: {'RUNNING' if run else 'STOPPED'} • {pct}%")
+        for name,(kg,cap) in zip(ingr.names, hoppers):
+            parts.append(f"{name}: {kg}/{cap} kg")
+        parts.append(f"Water Tank: {tanks[0]}/{tanks[1]} kg")
+        parts.append(f"Admix Tank: {tanks[2]}/{tanks[3]} kg")
+        parts.append(f"Mixer: {m_state}")
+        for k,on in zip(ingr.fed, drives):
+            parts.append(f"{_drive_label(ingr.items[k].feed_tag)}: {'ON' if on else 'OFF'}")
+        if feeder is not None:
+            parts.append(f"Active Feeder: Silo {feeder}")
+        return "   |   ".join(parts)
+
+    # ---------- publish ----------
+    def publish(self, force: bool = False):
+        if force: self._dirty = True; self._dirty_bars.update(range(len(self._bar_kg)))
+        if self._dirty:
+            self._dirty = False
+            snap = self.snapshot()
+            if snap != self._last:
+                self._last = snap; self._label.setText(self.status_text(snap))
+        if self._dirty_bars:
+            dirty = self._dirty_bars; self._dirty_bars = set()
+            self._publish_bars(dirty)
+
+    def _publish_bars(self, dirty: set[int]):
+        w = self._win
+        for i in sorted(dirty):
+            if i >= len(self._bars): continue
+            actual = self._bar_kg[i]; target = w.ingr.target[self._agg[i]]
+            pct = 0 if target==0 else int(round(actual*100.0/target))
+            title=getattr(w.hoppers[i],"_title",f"Agg {i+1}")
+            self._bars[i].publish(int(max(1,target)), int(min(actual,target)),
+                                  f"{title} {pct}% ({actual:.0f}/{target:.0f} kg)")
+        total = sum(self._bar_kg); t_total = w.t_total
+        self._total.publish(int(max(1,t_total)), int(min(total,t_total)),
+                            f"TOTAL %p% ({total:.0f}/{t_total:.0f} kg)")
@@ -0,0 +1,27 @@
+# writer_thread.py — base for the daemon threads that keep disk writes off the GUI thread and the plant tick (no Qt)
+import threading
+from abc import ABCMeta, abstractmethod
+
+class WriterThread(threading.Thread, metaclass=ABCMeta):
+    """
+    run() drains queued work until the stop signal, then returns. close() sends that signal and joins;
+    a writer that is not running (never started: a headless run or a failed startup) runs its loop here
+    instead, so queued work is still written — only if there is any, so no empty file is created.
+    Subclasses provide run(), _signal_stop() and _has_pending(); one without them cannot be constructed.
+    """
+    def __init__(self, name: str):
+        super().__init__(name=name, daemon=True)
+
+    @abstractmethod
+    def run(self): ...
+
+    @abstractmethod
+    def _signal_stop(self): ...
+
+    @abstractmethod
+    def _has_pending(self) -> bool: ...
+
+    def close(self, timeout: float = 5.0):
+        pending = self._has_pending(); self._signal_stop()
+        if self.is_alive(): self.join(timeout)
+        elif pending: self.run()